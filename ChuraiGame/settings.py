@@ -60,6 +60,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'users.timing.ServerTimingMiddleware',  # 추천 단계별 Server-Timing 헤더
 ]
 
 ROOT_URLCONF = 'ChuraiGame.urls'
@@ -151,4 +152,43 @@ REST_FRAMEWORK = {
 # File upload settings
 # Default is 2.5MB which is too small for image uploads (base64 encoded images can be large)
 # Set to 10MB to allow AI profile image generation with user photos
-DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
\ No newline at end of file
+DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+# 외부 API 공용 HTTP 클라이언트 (games/http_client.py)
+# 호스트당 keep-alive 세션 1개, 429/5xx 지터 백오프 재시도 (Retry-After 우선)
+# 전체 기본값/호스트별 타임아웃은 games.http_client.DEFAULT_CONFIG 참고
+HTTP_CLIENT = {
+    'POOL_MAXSIZE': int(os.getenv('HTTP_POOL_MAXSIZE', 16)),
+    'TIMEOUT': float(os.getenv('HTTP_TIMEOUT', 10)),
+    'MAX_RETRIES': int(os.getenv('HTTP_MAX_RETRIES', 3)),
+    # 응답 녹화/재생 (games/http_cassette.py): off / record / replay / auto
+    'CASSETTE': {
+        'MODE': os.getenv('HTTP_CASSETTE', 'off'),
+        'DIR': os.getenv('HTTP_CASSETTE_DIR', str(BASE_DIR / 'cassettes')),
+        'LATENCY_MS': float(os.getenv('HTTP_CASSETTE_LATENCY_MS', 0)),
+        'INJECT_429': float(os.getenv('HTTP_CASSETTE_429_RATE', 0)),
+        'SEED': int(os.getenv('HTTP_CASSETTE_SEED', 0)),
+    },
+}
+
+# RAWG 응답 캐시 최대 행 수 (games/rawg_cache.py, 초과 시 LRU 삭제)
+RAWG_CACHE_MAX_ENTRIES = int(os.getenv('RAWG_CACHE_MAX_ENTRIES', 20000))
+
+# 번역 캐시 최대 행 수 (games/translation_cache.py, 초과 시 LRU 삭제)
+TRANSLATION_CACHE_MAX_ENTRIES = int(os.getenv('TRANSLATION_CACHE_MAX_ENTRIES', 50000))
+
+# 백그라운드 작업 큐 (games/jobs.py): run_workers 기본 동시 실행 수
+JOB_WORKER_CONCURRENCY = int(os.getenv('JOB_WORKER_CONCURRENCY', 4))
+
+# 웹 프로세스 안에서 작업을 처리할 스레드 수 (run_workers 를 따로 띄우면 0 으로)
+JOB_INPROCESS_WORKERS = int(os.getenv('JOB_INPROCESS_WORKERS', 2))
+
+# AI 챗봇 스트리밍 (users/ai_chat.py): 동시에 열 수 있는 Gemini 스트림 수 (업스트림 읽기 스레드 풀 크기)
+CHAT_STREAM_MAX_STREAMS = int(os.getenv('CHAT_STREAM_MAX_STREAMS', 64))
+
+# AI 챗봇 세션 (users/chat_session.py): 원문으로 보내는 최근 대화의 추정 토큰 상한 (넘으면 오래된 턴을 요약)
+CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv('CHAT_HISTORY_TOKEN_BUDGET', 2000))
+# 유저당 보관하는 대화 세션 수
+CHAT_SESSIONS_PER_USER = int(os.getenv('CHAT_SESSIONS_PER_USER', 20))
+
+# RAWG 전역 요청 속도 (fetch_rawg_data 비동기 파이프라인 토큰 버킷, 초당 요청 수)
+RAWG_RATE_LIMIT = float(os.getenv('RAWG_RATE_LIMIT', 5))
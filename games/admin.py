@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Game, Rating, GameScreenshot, GameTrailer, Tag, SteamReview
+from .models import Game, Rating, GameScreenshot, GameTrailer, Tag, SteamReview, GameGenre, RawgResponseCache, TranslationCache, CrawlRun, BackgroundJob, GameAlias
 
 class GameScreenshotInline(admin.TabularInline):
     model = GameScreenshot
@@ -28,12 +28,12 @@ class TagAdmin(admin.ModelAdmin):
 
 @admin.register(Game)
 class GameAdmin(admin.ModelAdmin):
-    list_display = ['title', 'genre', 'steam_appid', 'rawg_id', 'metacritic_score', 'tag_list', 'review_count']
+    list_display = ['title', 'genre', 'public_id', 'steam_appid', 'rawg_id', 'metacritic_score', 'tag_list', 'review_count']
     list_filter = ['genre', 'tags']
     search_fields = ['title', 'steam_appid']
     filter_horizontal = ['tags']  # 태그 선택 UI 개선
     inlines = [GameScreenshotInline, GameTrailerInline, SteamReviewInline]
-    readonly_fields = ['steam_appid']
+    readonly_fields = ['steam_appid', 'public_id']
     
     def tag_list(self, obj):
         return ", ".join([t.name for t in obj.tags.all()[:5]])
@@ -50,6 +50,49 @@ class RatingAdmin(admin.ModelAdmin):
     search_fields = ['user__username', 'game__title']
     readonly_fields = ['created_at', 'updated_at']
 
+@admin.register(GameGenre)
+class GameGenreAdmin(admin.ModelAdmin):
+    list_display = ['game', 'name', 'slug', 'quality_score']
+    list_filter = ['slug']
+    search_fields = ['game__title', 'name']
+    raw_id_fields = ['game']
+
+@admin.register(RawgResponseCache)
+class RawgResponseCacheAdmin(admin.ModelAdmin):
+    list_display = ['endpoint', 'status_code', 'key', 'expires_at', 'last_accessed']
+    list_filter = ['endpoint', 'status_code']
+    search_fields = ['key']
+    readonly_fields = ['created_at']
+
+@admin.register(TranslationCache)
+class TranslationCacheAdmin(admin.ModelAdmin):
+    list_display = ['source_hash', 'lang', 'prompt_version', 'origin', 'source_chars', 'hits', 'last_accessed']
+    list_filter = ['lang', 'prompt_version', 'origin']
+    search_fields = ['source_hash', 'translated']
+    readonly_fields = ['created_at']
+
+@admin.register(CrawlRun)
+class CrawlRunAdmin(admin.ModelAdmin):
+    list_display = ['command', 'status', 'processed', 'succeeded', 'failed', 'started_at', 'updated_at', 'finished_at']
+    list_filter = ['command', 'status']
+    raw_id_fields = ['resumed_from']
+    readonly_fields = ['started_at', 'updated_at']
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'key', 'status', 'priority', 'attempts', 'max_attempts', 'run_after', 'locked_by', 'created_at', 'finished_at']
+    list_filter = ['kind', 'status']
+    search_fields = ['key', 'last_error']
+    raw_id_fields = ['owner']
+    readonly_fields = ['created_at', 'updated_at']
+
+@admin.register(GameAlias)
+class GameAliasAdmin(admin.ModelAdmin):
+    list_display = ['source', 'external_id', 'game', 'created_at']
+    list_filter = ['source']
+    search_fields = ['external_id', 'game__title']
+    raw_id_fields = ['game']
+
 @admin.register(GameScreenshot)
 class GameScreenshotAdmin(admin.ModelAdmin):
     list_display = ['game', 'image_url']
@@ -0,0 +1,190 @@
+"""
+게임 장르 정규화 인덱스 (GameGenre)
+
+레거시 Game.genre 는 "Action, RPG" 같은 콤마 문자열이라 장르 필터가
+genre__icontains (LIKE '%...%') 풀스캔이 된다. 여기서는 장르를 slug 단위
+행(GameGenre)으로 펼쳐두고, 추천 쿼리는 (slug, -quality_score) 인덱스를
+타는 동등 조인으로 처리한다.
+
+사용 예시:
+    from games.genre_index import get_games_by_genres
+    games = get_games_by_genres(['RPG', 'Action'], exclude_ids=rated_ids, limit=10)
+"""
+import logging
+import math
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count, Min, Q
+from django.utils.text import slugify
+
+logger = logging.getLogger(__name__)
+
+# 인덱스에 넣지 않는 의미 없는 장르 값
+EXCLUDED_GENRES = {'unknown', '게임', ''}
+
+
+def genre_slug(name):
+    """장르명 → 인덱스 slug (한글 장르 허용)"""
+    return slugify((name or '').strip(), allow_unicode=True)[:60]
+
+
+def parse_genres(genre_string):
+    """
+    레거시 콤마 장르 문자열 파싱
+
+    Returns:
+        list: [(slug, name), ...] (입력 순서 유지, 중복 제거)
+    """
+    result = []
+    seen = set()
+    for part in (genre_string or '').split(','):
+        name = part.strip()
+        if name.lower() in EXCLUDED_GENRES:
+            continue
+        slug = genre_slug(name)
+        if not slug or slug in seen:
+            continue
+        seen.add(slug)
+        result.append((slug, name[:60]))
+    return result
+
+
+def calculate_quality_score(metacritic_score, positive_ratings=0):
+    """
+    추천 정렬용 품질 점수
+
+    - 메타크리틱 점수 (없으면 0 → 기존 nulls_last 정렬과 동일한 효과)
+    - 유저 긍정 평가 수 보너스 (log 스케일, 최대 15점)
+    """
+    base = float(metacritic_score or 0)
+    bonus = min(15.0, math.log1p(positive_ratings or 0) * 5)
+    return round(base + bonus, 3)
+
+
+def sync_game_genres(game):
+    """
+    단일 게임의 장르 인덱스/품질 점수 재계산 (Game 저장 시 호출)
+    """
+    from .models import Game, GameGenre
+
+    positive = game.user_ratings.filter(score__gt=0).count()
+    quality = calculate_quality_score(game.metacritic_score, positive)
+    if game.quality_score != quality:
+        Game.objects.filter(pk=game.pk).update(quality_score=quality)
+        game.quality_score = quality
+
+    rows = [
+        GameGenre(game_id=game.pk, slug=slug, name=name, quality_score=quality)
+        for slug, name in parse_genres(game.genre)
+    ]
+    with transaction.atomic():
+        GameGenre.objects.filter(game_id=game.pk).delete()
+        GameGenre.objects.bulk_create(rows)
+
+
+def rebuild_genre_index(queryset=None, batch_size=500):
+    """
+    장르 인덱스 일괄 재구축 (build_genre_index 커맨드용)
+
+    게임 단위 save() 없이 배치마다 quality_score bulk_update +
+    GameGenre 삭제/bulk_create 로 처리한다.
+
+    Returns:
+        dict: {'games': n, 'rows': n}
+    """
+    from .models import Game, GameGenre
+
+    if queryset is None:
+        queryset = Game.objects.all()
+    else:
+        # 호출자의 필터(조인 포함)와 집계 조인이 섞이지 않도록 pk 서브쿼리로 분리
+        queryset = Game.objects.filter(pk__in=queryset.values('pk'))
+
+    queryset = queryset.annotate(
+        positive_ratings=Count('user_ratings', filter=Q(user_ratings__score__gt=0))
+    ).only('id', 'genre', 'metacritic_score', 'quality_score').order_by('id')
+
+    stats = {'games': 0, 'rows': 0}
+    batch = []
+
+    def flush(games):
+        rows = []
+        for game in games:
+            game.quality_score = calculate_quality_score(game.metacritic_score, game.positive_ratings)
+            rows.extend(
+                GameGenre(game_id=game.pk, slug=slug, name=name, quality_score=game.quality_score)
+                for slug, name in parse_genres(game.genre)
+            )
+        with transaction.atomic():
+            Game.objects.bulk_update(games, ['quality_score'], batch_size=batch_size)
+            GameGenre.objects.filter(game_id__in=[g.pk for g in games]).delete()
+            GameGenre.objects.bulk_create(rows, batch_size=batch_size)
+        stats['games'] += len(games)
+        stats['rows'] += len(rows)
+
+    for game in queryset.iterator(chunk_size=batch_size):
+        batch.append(game)
+        if len(batch) >= batch_size:
+            flush(batch)
+            batch = []
+    if batch:
+        flush(batch)
+
+    return stats
+
+
+def get_games_by_genres(genres, exclude_ids=None, limit=10, min_metacritic=None):
+    """
+    장르(들)에 속한 게임을 품질 점수 순으로 반환
+
+    Args:
+        genres: 장르명 또는 slug 리스트
+        exclude_ids: 제외할 Game.id 집합 (평가/찜/이미 추천한 게임)
+        limit: 최대 개수
+        min_metacritic: 이 점수 미만 게임 제외 (점수 없는 게임은 허용)
+
+    Returns:
+        list: Game 객체 리스트 (quality_score 내림차순, 중복 없음)
+    """
+    from .models import Game, GameGenre
+
+    slugs = {genre_slug(g) for g in genres if g}
+    slugs.discard('')
+    if not slugs or limit <= 0:
+        return []
+
+    qs = GameGenre.objects.filter(slug__in=slugs)
+    if exclude_ids:
+        qs = qs.exclude(game_id__in=exclude_ids)
+    if min_metacritic is not None:
+        qs = qs.exclude(game__metacritic_score__lt=min_metacritic)
+
+    # 여러 장르에 동시에 속한 게임은 중복 행이 나오므로 넉넉히 가져와서 dedupe
+    rows = qs.order_by('-quality_score', '-game_id').values_list('game_id', flat=True)[:limit * len(slugs)]
+    game_ids = []
+    for game_id in rows:
+        if game_id not in game_ids:
+            game_ids.append(game_id)
+            if len(game_ids) >= limit:
+                break
+
+    games = Game.objects.in_bulk(game_ids)
+    return [games[gid] for gid in game_ids if gid in games]
+
+
+def count_genres(game_ids):
+    """
+    게임 집합의 장르 분포 (인덱스 GROUP BY)
+
+    Returns:
+        Counter: {장르명: 게임 수}
+    """
+    from .models import GameGenre
+
+    rows = (
+        GameGenre.objects.filter(game_id__in=game_ids)
+        .values('slug')
+        .annotate(genre_name=Min('name'), count=Count('id'))
+    )
+    return Counter({row['genre_name']: row['count'] for row in rows})
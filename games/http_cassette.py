@@ -0,0 +1,375 @@
+"""
+http_client 녹화/재생(cassette) 전송 계층 - 오프라인 크롤러 벤치마크 / 회귀 테스트용
+
+기존 방식:
+    수집 커맨드가 전부 실제 RAWG / Steam / SteamSpy / CheapShark / Xbox / Gemini 를 호출
+    → CI 나 오프라인 환경에서 처리량이나 결과를 재현할 수 없음
+
+cassette 방식:
+    - http_client 세션에 CassetteAdapter 를 마운트 (requests 전송 계층 교체, 호출 코드는 그대로)
+    - record : 실제 요청 후 응답을 저장
+    - replay : 저장된 응답만 반환 (없으면 CassetteMiss), 지연 / 429 주입 가능
+    - auto   : 저장된 응답이 있으면 재생, 없으면 실제 요청 후 녹화
+    - 저장소: <DIR>/<host>/<key[:2]>/<key>.json.gz (요청 1건 = gzip JSON 1개)
+      키 = sha256(메서드 + URL(쿼리 정렬, API 키 제외) + 본문 해시)
+    - 429 주입은 SEED 로 고정된 난수라 같은 설정이면 같은 요청 순서에서 같은 결과
+    - 녹화는 2xx / 404 응답만 (일시 오류를 재생하지 않도록), 스트리밍 응답(stream=True)과
+      로그인 토큰 / 사용자 정보 엔드포인트(NO_RECORD_URLS)는 녹화하지 않음
+
+설정 (settings.HTTP_CLIENT['CASSETTE'], 환경변수):
+    HTTP_CASSETTE=record|replay|auto|off    HTTP_CASSETTE_DIR=./cassettes
+    HTTP_CASSETTE_LATENCY_MS=80             HTTP_CASSETTE_429_RATE=0.05
+
+사용 예시:
+    HTTP_CASSETTE=record python manage.py fetch_steam_tags --limit=50 --force
+    HTTP_CASSETTE=replay HTTP_CASSETTE_LATENCY_MS=120 HTTP_CASSETTE_429_RATE=0.05 \\
+        python manage.py fetch_steam_tags --limit=50 --force --rate=50
+
+    # 런타임 전환 (벤치마크 코드)
+    from games import http_cassette
+    http_cassette.use_cassette('replay', latency_ms=50)
+
+    # --base-url 을 받는 커맨드는 로컬 stub 서버로도 재생 가능
+    python manage.py http_cassettes --serve --port 8765 --latency-ms 80
+    python manage.py fetch_rawg_data --base-url=http://127.0.0.1:8765/api.rawg.io/api
+"""
+
+import base64
+import gzip
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+logger = logging.getLogger(__name__)
+
+MODES = ('off', 'record', 'replay', 'auto')
+
+# 키 계산 / 저장에서 제외할 쿼리 파라미터 (API 키)
+SECRET_PARAMS = {'key', 'api_key', 'apikey', 'access_token', 'client_secret'}
+# 녹화하지 않을 URL 접두사 (OAuth 토큰 / 사용자 정보 응답을 디스크에 남기지 않음)
+NO_RECORD_URLS = (
+    'https://oauth2.googleapis.com/',
+    'https://www.googleapis.com/oauth2/',
+    'https://nid.naver.com/oauth2.0/',
+    'https://openapi.naver.com/v1/nid/',
+    'https://steamcommunity.com/openid/',
+)
+# 저장할 응답 헤더 (본문은 디코딩된 상태로 저장하므로 content-encoding 등은 제외)
+KEEP_HEADERS = ('content-type', 'retry-after', 'location')
+
+DEFAULT_CASSETTE = {
+    'MODE': 'off',
+    'DIR': 'cassettes',
+    'LATENCY_MS': 0,        # 재생 시 응답당 지연
+    'JITTER': 0.2,          # 지연 ± 비율
+    'INJECT_429': 0.0,      # 재생 시 429 응답 비율 (0~1)
+    'RETRY_AFTER': 0,       # 주입한 429 의 Retry-After (초)
+    'SEED': 0,
+}
+
+_override = None
+_stats = Counter()
+_stats_lock = threading.Lock()
+
+
+class CassetteMiss(requests.RequestException):
+    """replay 모드에서 저장된 응답이 없는 요청 (http_client 는 재시도하지 않음)"""
+
+
+def get_cassette_config():
+    user = (getattr(settings, 'HTTP_CLIENT', {}) or {}).get('CASSETTE', {}) or {}
+    config = {**DEFAULT_CASSETTE, **user, **(_override or {})}
+    config['MODE'] = (config['MODE'] or 'off').lower()
+    if config['MODE'] not in MODES:
+        raise ValueError(f"HTTP cassette mode must be one of {MODES}, got {config['MODE']!r}")
+    return config
+
+
+def is_enabled():
+    return get_cassette_config()['MODE'] != 'off'
+
+
+def use_cassette(mode, **options):
+    """
+    런타임에 cassette 모드 전환 (벤치마크 / 테스트용, 이미 만든 세션은 닫고 다시 마운트)
+
+    Args:
+        mode: 'record' / 'replay' / 'auto' / 'off'
+        **options: DEFAULT_CASSETTE 키의 소문자 이름 (dir, latency_ms, inject_429, seed ...)
+    """
+    global _override
+    from . import http_client
+
+    _override = {'MODE': mode, **{key.upper(): value for key, value in options.items()}}
+    get_cassette_config()  # 모드 검증
+    http_client.close_sessions()
+    reset_stats()
+
+
+def _normalize_url(url):
+    """쿼리 정렬 + API 키 제거"""
+    parts = urlsplit(url)
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k.lower() not in SECRET_PARAMS)
+    return f"{parts.scheme}://{parts.netloc}{parts.path}" + (f"?{urlencode(query)}" if query else '')
+
+
+def make_key(method, url, body=None):
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    body_hash = hashlib.sha256(body).hexdigest() if body else ''
+    raw = f"{method.upper()} {_normalize_url(url)} {body_hash}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class CassetteStore:
+    """요청 키 → gzip JSON 파일 저장소 (쓰기는 임시 파일 + rename 이라 스레드/프로세스 안전)"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def _path(self, host, key):
+        return self.root / (host or '_') / key[:2] / f"{key}.json.gz"
+
+    def load(self, host, key):
+        path = self._path(host, key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def save(self, host, key, entry):
+        path = self._path(host, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump(entry, f, ensure_ascii=False, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    def lookup(self, method, url, body=None):
+        return self.load(urlsplit(url).hostname, make_key(method, url, body))
+
+    def stats(self):
+        """호스트별 저장 건수 / 용량"""
+        hosts = {}
+        if not self.root.exists():
+            return hosts
+        for host_dir in sorted(p for p in self.root.iterdir() if p.is_dir()):
+            files = list(host_dir.glob('*/*.json.gz'))
+            hosts[host_dir.name] = {'entries': len(files), 'bytes': sum(f.stat().st_size for f in files)}
+        return hosts
+
+    def clear(self, host=None):
+        import shutil
+
+        target = self.root / host if host else self.root
+        if target.exists():
+            shutil.rmtree(target)
+
+
+def should_record(url, response, stream=False):
+    """
+    녹화 대상 여부 (성공 응답과 404 만, 스트리밍 / 인증 엔드포인트 제외)
+
+    stream=True 응답은 _encode_entry 가 본문을 끝까지 읽어 호출자가 받을 스트림이 비므로 녹화하지 않는다.
+    """
+    if stream or url.startswith(NO_RECORD_URLS):
+        return False
+    return 200 <= response.status_code < 300 or response.status_code == 404
+
+
+def _encode_entry(method, url, response):
+    headers = {k: v for k, v in response.headers.items() if k.lower() in KEEP_HEADERS}
+    content = response.content or b''
+    try:
+        body, encoding = content.decode('utf-8'), 'utf-8'
+    except UnicodeDecodeError:
+        body, encoding = base64.b64encode(content).decode('ascii'), 'base64'
+    return {
+        'method': method.upper(),
+        'url': _normalize_url(url),
+        'status': response.status_code,
+        'reason': response.reason or '',
+        'headers': headers,
+        'body': body,
+        'body_encoding': encoding,
+        'recorded_at': int(time.time()),
+    }
+
+
+def _entry_body(entry):
+    if entry.get('body_encoding') == 'base64':
+        return base64.b64decode(entry['body'])
+    return (entry.get('body') or '').encode('utf-8')
+
+
+class _Replayer:
+    """재생 지연 + 결정적 429 주입 (어댑터 / stub 서버 공용)"""
+
+    def __init__(self, config):
+        self.latency = float(config['LATENCY_MS']) / 1000
+        self.jitter = float(config['JITTER'])
+        self.inject_429 = float(config['INJECT_429'])
+        self.retry_after = config['RETRY_AFTER']
+        self._random = random.Random(config['SEED'])
+        self._lock = threading.Lock()
+
+    def delay(self):
+        if self.latency <= 0:
+            return
+        with self._lock:
+            factor = 1 + self._random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, self.latency * factor))
+
+    def should_inject_429(self):
+        if self.inject_429 <= 0:
+            return False
+        with self._lock:
+            return self._random.random() < self.inject_429
+
+
+def _record_stat(event):
+    with _stats_lock:
+        _stats[event] += 1
+
+
+def get_stats():
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+class CassetteAdapter(HTTPAdapter):
+    """cassette 모드에 따라 녹화 / 재생하는 requests 전송 어댑터"""
+
+    def __init__(self, config=None, **kwargs):
+        super().__init__(**kwargs)
+        self.config = config or get_cassette_config()
+        self.mode = self.config['MODE']
+        self.store = CassetteStore(self.config['DIR'])
+        self.replayer = _Replayer(self.config)
+
+    def send(self, request, **kwargs):
+        host = urlsplit(request.url).hostname
+        key = make_key(request.method, request.url, request.body)
+
+        if self.mode in ('replay', 'auto'):
+            entry = self.store.load(host, key)
+            if entry is not None:
+                self.replayer.delay()
+                if self.replayer.should_inject_429():
+                    _record_stat('injected_429')
+                    return self._build_response(request, {
+                        'status': 429, 'reason': 'Too Many Requests',
+                        'headers': {'Retry-After': str(self.replayer.retry_after)},
+                        'body': '{"error":"injected 429"}',
+                    })
+                _record_stat('hits')
+                return self._build_response(request, entry)
+            if self.mode == 'replay':
+                _record_stat('misses')
+                raise CassetteMiss(f"No cassette for {request.method} {_normalize_url(request.url)}", request=request)
+
+        response = super().send(request, **kwargs)
+        if self.mode in ('record', 'auto'):
+            if should_record(request.url, response, stream=kwargs.get('stream')):
+                self.store.save(host, key, _encode_entry(request.method, request.url, response))
+                _record_stat('recorded')
+            else:
+                _record_stat('not_recorded')
+        return response
+
+    def _build_response(self, request, entry):
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.reason = entry.get('reason', '')
+        response.headers = CaseInsensitiveDict(entry.get('headers') or {})
+        response._content = _entry_body(entry)
+        response._content_consumed = True
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """/<host>/<path>?<query> → https://<host>/<path>?<query> 의 저장된 응답"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _serve(self, method):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else None
+        host, _, rest = self.path.lstrip('/').partition('/')
+        url = f"https://{host}/{rest}"
+        server = self.server
+
+        entry = server.store.lookup(method, url, body)
+        server.replayer.delay()
+        if entry is None:
+            _record_stat('misses')
+            entry = {'status': 404, 'headers': {'Content-Type': 'application/json'}, 'body': '{"error":"cassette miss"}'}
+        elif server.replayer.should_inject_429():
+            _record_stat('injected_429')
+            entry = {'status': 429, 'headers': {'Retry-After': str(server.replayer.retry_after)}, 'body': ''}
+        else:
+            _record_stat('hits')
+
+        payload = _entry_body(entry)
+        self.send_response(entry['status'])
+        for name, value in (entry.get('headers') or {}).items():
+            if name.lower() != 'location':
+                self.send_header(name, value)
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._serve('GET')
+
+    def do_POST(self):
+        self._serve('POST')
+
+
+class CassetteStubServer(ThreadingHTTPServer):
+    """
+    cassette 저장소를 로컬 HTTP 로 재생하는 stub 서버 (--base-url 을 받는 커맨드용)
+
+    사용 예시:
+        server = CassetteStubServer(('127.0.0.1', 0), latency_ms=50)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/api.rawg.io/api"
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, cassette_dir=None, **options):
+        super().__init__(address, _StubHandler)
+        config = {**get_cassette_config(), **{key.upper(): value for key, value in options.items()}}
+        if cassette_dir:
+            config['DIR'] = cassette_dir
+        self.store = CassetteStore(config['DIR'])
+        self.replayer = _Replayer(config)
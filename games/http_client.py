@@ -0,0 +1,299 @@
+"""
+외부 API 공용 HTTP 클라이언트 (RAWG / Steam / CheapShark / Gemini)
+
+기존 방식:
+    모듈마다 requests.get/post 를 세션 없이 호출
+    → 요청마다 새 TCP + TLS 핸드셰이크, 타임아웃도 모듈별로 하드코딩
+
+공용 클라이언트:
+    - 업스트림 호스트(scheme://host:port)당 requests.Session 1개 (keep-alive 커넥션 풀)
+    - 풀 크기 / 호스트별 기본 타임아웃은 settings.HTTP_CLIENT 로 설정
+    - 429 / 5xx 응답과 연결 오류는 지터 포함 지수 백오프로 재시도 (Retry-After 헤더 우선)
+    - 호스트별 요청 속도 제한 (토큰 버킷, HOSTS 의 RATE/BURST 또는 set_rate_limit())
+    - 모든 호출은 users.timing.http_timer 로 측정 (Server-Timing 의 http 값)
+    - HTTP_CASSETTE 설정 시 응답 녹화/재생 (games/http_cassette.py, 오프라인 벤치마크용)
+
+사용 예시:
+    from games import http_client
+
+    response = http_client.get(f"{BASE_URL}/games", params=params)
+    response = http_client.post(url, json=payload, timeout=60, retries=0)
+    response = http_client.get(url, params=params, max_delay=http_client.INTERACTIVE_MAX_DELAY)  # 웹 요청 경로
+
+반환값과 예외는 requests 와 동일하다. (requests.Response / requests.RequestException)
+재시도를 모두 소진한 429/5xx 응답은 예외 없이 그대로 반환하므로
+기존 status_code / raise_for_status() 처리 코드가 그대로 동작한다.
+"""
+
+import email.utils
+import logging
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from users.timing import http_timer
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    'POOL_CONNECTIONS': 4,      # 세션(호스트)당 유지할 커넥션 풀 수
+    'POOL_MAXSIZE': 16,         # 풀당 최대 커넥션 수 (동시 요청 스레드 수 이상 권장)
+    'TIMEOUT': 10,              # 기본 타임아웃 (초)
+    'MAX_RETRIES': 3,           # 429/5xx/연결 오류 재시도 횟수
+    'BACKOFF_BASE': 0.5,        # 백오프 기본 대기 (초) → 0.5, 1, 2, ... 상한 내 무작위
+    'BACKOFF_MAX': 30,          # 한 번에 대기하는 최대 시간 (Retry-After 포함)
+    'RETRY_STATUSES': (429, 500, 502, 503, 504),
+    'USER_AGENT': 'ChuraiGame/1.0',
+    # 호스트별 덮어쓰기 (위 키 중 TIMEOUT / MAX_RETRIES / BACKOFF_BASE / POOL_MAXSIZE,
+    # 그리고 RATE(초당 요청 수) / BURST - 기본은 제한 없음)
+    'HOSTS': {
+        'api.rawg.io': {'TIMEOUT': 10},
+        'store.steampowered.com': {'TIMEOUT': 15},
+        'api.steampowered.com': {'TIMEOUT': 10},
+        'steamcommunity.com': {'TIMEOUT': 10},
+        'steamspy.com': {'TIMEOUT': 30},
+        'www.cheapshark.com': {'TIMEOUT': 30},
+        'gms.ssafy.io': {'TIMEOUT': 30, 'MAX_RETRIES': 1},
+    },
+}
+
+# 웹 요청 경로(사용자가 응답을 기다리는 곳)에서 재시도 1회에 기다리는 최대 시간 (초)
+INTERACTIVE_MAX_DELAY = 2
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_sessions_pid = os.getpid()
+_limiters = {}
+
+
+class RateLimiter:
+    """
+    스레드 안전 토큰 버킷 (초당 rate 개, 최대 burst 개 적립)
+
+    토큰이 없으면 미래 토큰을 예약하고 락 밖에서 기다리므로
+    여러 스레드가 동시에 호출해도 요청 간격이 고르게 벌어진다.
+    """
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 1개 획득 (필요하면 대기), 대기한 초 반환"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def get_config(host=None):
+    """
+    기본값 + settings.HTTP_CLIENT + 호스트별 설정 병합
+
+    Args:
+        host: 'api.rawg.io' 같은 호스트명 (None 이면 전역 설정만)
+    """
+    user_config = getattr(settings, 'HTTP_CLIENT', {}) or {}
+    config = {**DEFAULT_CONFIG, **user_config}
+    hosts = {**DEFAULT_CONFIG['HOSTS'], **user_config.get('HOSTS', {})}
+    config['HOSTS'] = hosts
+    if host and host in hosts:
+        config.update(hosts[host])
+    return config
+
+
+def _session_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}", parts.hostname or ''
+
+
+def _log_url(url):
+    """로그용 URL (쿼리스트링의 API 키 노출 방지)"""
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+def _mount_adapter(session, pool_connections, pool_maxsize):
+    from . import http_cassette
+
+    # HTTP_CASSETTE=record/replay/auto 면 녹화/재생 어댑터 (games/http_cassette.py)
+    adapter_class = http_cassette.CassetteAdapter if http_cassette.is_enabled() else HTTPAdapter
+    adapter = adapter_class(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=0,  # 재시도는 request() 에서 직접 처리 (Retry-After / 타이밍 측정)
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+
+def get_session(url, pool_maxsize=None):
+    """
+    URL 의 호스트 전용 Session 반환 (없으면 생성)
+
+    fork 된 워커 프로세스(gunicorn, ProcessPoolExecutor)는 부모 소켓을
+    공유하지 않도록 첫 호출 시 세션을 새로 만든다.
+
+    Args:
+        pool_maxsize: 이보다 작은 풀이면 키워서 다시 마운트 (동시 요청이 많은 배치 작업용)
+    """
+    global _sessions_pid
+
+    key, host = _session_key(url)
+    with _sessions_lock:
+        if _sessions_pid != os.getpid():
+            _sessions.clear()
+            _sessions_pid = os.getpid()
+
+        session = _sessions.get(key)
+        config = get_config(host)
+        if session is None:
+            session = requests.Session()
+            _mount_adapter(session, config['POOL_CONNECTIONS'], max(config['POOL_MAXSIZE'], pool_maxsize or 0))
+            session.headers['User-Agent'] = config['USER_AGENT']
+            _sessions[key] = session
+        elif pool_maxsize and session.get_adapter(url)._pool_maxsize < pool_maxsize:
+            _mount_adapter(session, config['POOL_CONNECTIONS'], pool_maxsize)
+        return session
+
+
+def set_rate_limit(url, rate, burst=1):
+    """
+    URL 호스트의 요청 속도 제한 설정 (rate=None 이면 해제)
+
+    크롤러 커맨드가 --rate 옵션으로 호스트 전체 속도를 맞출 때 사용
+    """
+    key, _ = _session_key(url)
+    with _sessions_lock:
+        if rate:
+            _limiters[key] = RateLimiter(rate, burst)
+        else:
+            _limiters[key] = None
+
+
+def _get_limiter(url):
+    key, host = _session_key(url)
+    with _sessions_lock:
+        if key not in _limiters:
+            config = get_config(host)
+            rate = config.get('RATE')
+            _limiters[key] = RateLimiter(rate, config.get('BURST', 1)) if rate else None
+        return _limiters[key]
+
+
+def close_sessions():
+    """모든 호스트 세션의 커넥션 풀 종료 (테스트 / 벤치마크용)"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+def parse_retry_after(value):
+    """
+    Retry-After 헤더 → 대기 초 (초 단위 숫자 또는 HTTP-date)
+
+    Returns:
+        float 또는 None (헤더 없음 / 파싱 불가)
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def backoff_delay(attempt, config, retry_after=None):
+    """
+    재시도 대기 시간 (full jitter 지수 백오프)
+
+    Retry-After 가 있으면 그 시간 + 작은 지터만큼 기다린다. (BACKOFF_MAX 상한)
+    """
+    cap = config['BACKOFF_MAX']
+    if retry_after is not None:
+        return min(cap, retry_after + random.uniform(0, config['BACKOFF_BASE']))
+    return random.uniform(0, min(cap, config['BACKOFF_BASE'] * (2 ** attempt)))
+
+
+def request(method, url, *, retries=None, max_delay=None, **kwargs):
+    """
+    풀링된 세션으로 HTTP 요청 (재시도 포함)
+
+    Args:
+        method: 'GET' / 'POST' 등
+        retries: 재시도 횟수 (None 이면 호스트 설정의 MAX_RETRIES)
+        max_delay: 한 번에 기다리는 최대 시간 (초, None 이면 호스트 설정의 BACKOFF_MAX)
+            웹 요청 경로용 - Retry-After 가 이보다 길면 기다리지 않고 그 응답을 그대로 반환
+        **kwargs: requests.Session.request 인자 (timeout 미지정 시 호스트 기본값)
+
+    Returns:
+        requests.Response
+
+    Raises:
+        requests.RequestException: 재시도를 모두 소진한 연결 오류 / 타임아웃
+    """
+    session = get_session(url)
+    config = get_config(_session_key(url)[1])
+    max_retries = config['MAX_RETRIES'] if retries is None else retries
+    if max_delay is not None:
+        config = {**config, 'BACKOFF_MAX': min(config['BACKOFF_MAX'], max_delay)}
+    kwargs.setdefault('timeout', config['TIMEOUT'])
+    # 연결 오류 재시도는 재전송해도 안전한 메서드만 (POST 는 서버가 처리했을 수 있음)
+    idempotent = method.upper() in ('GET', 'HEAD', 'OPTIONS')
+    limiter = _get_limiter(url)
+
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            with http_timer():
+                response = session.request(method, url, **kwargs)
+        except requests.ConnectionError as e:
+            # ReadTimeout 은 ConnectionError 가 아니므로 여기서 재시도하지 않는다
+            if not idempotent or attempt >= max_retries:
+                raise
+            delay = backoff_delay(attempt, config)
+            logger.warning(f"HTTP {method} {_log_url(url)} 연결 실패 ({e}), {delay:.2f}초 후 재시도 ({attempt + 1}/{max_retries})")
+        else:
+            if response.status_code not in config['RETRY_STATUSES'] or attempt >= max_retries:
+                return response
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if max_delay is not None and retry_after is not None and retry_after > max_delay:
+                return response
+            delay = backoff_delay(attempt, config, retry_after)
+            logger.warning(
+                f"HTTP {method} {_log_url(url)} → {response.status_code}, "
+                f"{delay:.2f}초 후 재시도 ({attempt + 1}/{max_retries})"
+            )
+            response.close()
+
+        time.sleep(delay)
+        attempt += 1
+
+
+def get(url, params=None, **kwargs):
+    return request('GET', url, params=params, **kwargs)
+
+
+def post(url, data=None, json=None, **kwargs):
+    return request('POST', url, data=data, json=json, **kwargs)
@@ -0,0 +1,344 @@
+"""
+DB 기반 백그라운드 작업 큐 (BackgroundJob, 외부 브로커 없음)
+
+기존 방식:
+    game_detail(RAWG 자동 생성 + 스크린샷), api_translate_game(RAWG 상세 + Gemini),
+    steam_style_recommendations_api(스크린샷), generate_ai_profile_api(이미지 생성, 최대 60초)가
+    요청 안에서 외부 API 를 기다림 → 부하가 몰리면 웹 워커가 전부 외부 응답 대기에 묶임
+
+작업 큐 방식:
+    - 뷰는 enqueue() 로 작업을 넣고 바로 응답 (202 + job_id), 클라이언트는 /games/api/jobs/<id>/ 를 폴링
+    - key 중복 제거: 같은 kind + key 의 대기/실행 중 작업이 있으면 새로 만들지 않고 그 작업을 반환
+      (같은 게임을 여러 명이 동시에 열어도 RAWG 조회는 1번)
+    - priority: 유저가 화면에서 기다리는 작업(높음) > 부가 정보(스크린샷 등, 낮음)
+    - claim: 조건부 UPDATE 로 리스를 잡은 워커만 실행 (여러 프로세스/스레드가 동시에 돌아도 한 번만 실행)
+      리스가 만료된 running 작업(워커가 죽은 경우)은 다시 가져감
+    - 실패 시 지수 백오프로 max_attempts 까지 재시도, PermanentJobError 는 바로 failed
+    - 처리: python manage.py run_workers (JOB_INPROCESS_WORKERS > 0 이면 웹 프로세스 스레드도 처리,
+      재시도 대기 / 리스 만료 작업은 그 시각에 타이머로 다시 처리)
+    - 폴링 응답의 실패 사유는 일반 메시지만 (예외 내용은 last_error / 로그에만)
+
+작업 종류 등록:
+    HANDLER_MODULES 의 모듈(games/tasks.py, users/tasks.py)에서 @job_handler 로 등록
+
+사용 예시:
+    from games.jobs import enqueue, job_status
+    job = enqueue('games.import_rawg_game', {'rawg_id': 3498}, key='rawg:3498', priority=10)
+    return JsonResponse(job_status(job), status=202)
+"""
+
+import logging
+import os
+import socket
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from importlib import import_module
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F, Min, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# 작업 핸들러가 정의된 모듈 (워커가 처음 작업을 가져갈 때 import)
+HANDLER_MODULES = ['games.tasks', 'users.tasks']
+# 실행 리스 (이 시간 안에 끝나지 않으면 워커가 죽은 것으로 보고 다른 워커가 다시 실행)
+DEFAULT_LEASE = timedelta(minutes=5)
+# 재시도 간격: RETRY_BASE * 2^(시도 횟수 - 1), 최대 RETRY_MAX
+RETRY_BASE = timedelta(seconds=10)
+RETRY_MAX = timedelta(minutes=10)
+# 한 번에 살펴보는 대기 작업 수 (다른 워커와 경합해서 놓친 경우 다음 후보 시도)
+CLAIM_CANDIDATES = 5
+ERROR_MAX_CHARS = 2000
+# 실패한 작업의 폴링 응답 메시지 (예외 내용은 사용자에게 보여주지 않음)
+FAILED_MESSAGE = '작업을 처리하지 못했습니다. 잠시 후 다시 시도해 주세요.'
+
+PRIORITY_HIGH = 10
+PRIORITY_NORMAL = 0
+PRIORITY_LOW = -10
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+_handlers = {}
+_handlers_loaded = False
+_handlers_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+_timer = None
+_timer_at = None
+_timer_lock = threading.Lock()
+
+
+class PermanentJobError(Exception):
+    """재시도해도 소용없는 실패 (입력 오류, 4xx 응답 등) → 바로 failed"""
+
+
+@dataclass
+class JobHandler:
+    kind: str
+    func: object
+    max_attempts: int = 3
+    lease: timedelta = DEFAULT_LEASE
+
+
+def job_handler(kind, max_attempts=3, lease=DEFAULT_LEASE):
+    """
+    작업 핸들러 등록 데코레이터
+
+    핸들러는 payload(dict)를 받아 JSON 으로 저장할 수 있는 결과를 반환한다.
+    같은 payload 로 다시 실행돼도 안전해야 한다. (리스 만료 / 재시도)
+    """
+    def decorator(func):
+        _handlers[kind] = JobHandler(kind=kind, func=func, max_attempts=max_attempts, lease=lease)
+        return func
+    return decorator
+
+
+def load_handlers():
+    global _handlers_loaded
+    with _handlers_lock:
+        if not _handlers_loaded:
+            for module in HANDLER_MODULES:
+                import_module(module)
+            _handlers_loaded = True
+    return _handlers
+
+
+def get_handler(kind):
+    return load_handlers().get(kind)
+
+
+def enqueue(kind, payload=None, key='', priority=PRIORITY_NORMAL, owner=None, delay=None, recent=None):
+    """
+    작업 추가 (key 가 같은 대기/실행 중 작업이 있으면 그 작업을 반환)
+
+    Args:
+        kind: 작업 종류 (job_handler 로 등록한 이름)
+        payload: 핸들러 입력 (JSON)
+        key: 중복 제거 키 ('' 이면 중복 제거 안 함)
+        priority: 높을수록 먼저 처리 (PRIORITY_HIGH / NORMAL / LOW)
+        owner: 결과를 조회할 수 있는 유저 (None 이면 로그인한 누구나)
+        delay: timedelta, 이 시간 뒤부터 실행
+        recent: timedelta, 같은 key 작업이 이 시간 안에 성공했으면 다시 넣지 않고 그 작업을 반환
+
+    Returns:
+        BackgroundJob
+    """
+    from .models import BackgroundJob
+
+    handler = get_handler(kind)
+    if handler is None:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    if key:
+        same_key = Q(status__in=ACTIVE_STATUSES)
+        if recent:
+            # 실패한 작업은 재사용하지 않음 (다음 요청에서 다시 시도)
+            same_key |= Q(status='done', finished_at__gte=timezone.now() - recent)
+        existing = BackgroundJob.objects.filter(kind=kind, key=key).filter(same_key).order_by('-id').first()
+        if existing is not None:
+            return existing
+
+    try:
+        with transaction.atomic():
+            job = BackgroundJob.objects.create(
+                kind=kind,
+                key=key,
+                payload=payload or {},
+                priority=priority,
+                owner=owner,
+                max_attempts=handler.max_attempts,
+                run_after=timezone.now() + (delay or timedelta()),
+            )
+    except IntegrityError:
+        # 동시에 같은 key 로 넣은 요청이 먼저 저장됨
+        existing = BackgroundJob.objects.filter(kind=kind, key=key, status__in=ACTIVE_STATUSES).first()
+        if existing is None:
+            raise
+        return existing
+
+    logger.info(f"Enqueued job {job}")
+    transaction.on_commit(_kick_inprocess)
+    return job
+
+
+def claim(worker_id, kinds=None):
+    """
+    실행할 작업 1개를 가져와 리스를 잡음 (없으면 None)
+
+    대기 중이고 run_after 가 지난 작업, 또는 리스가 만료된 실행 중 작업을
+    priority 높은 순 → run_after 이른 순으로 조건부 UPDATE 해서 성공한 1개를 반환
+    """
+    from .models import BackgroundJob
+
+    now = timezone.now()
+    claimable = (
+        Q(status='queued', run_after__lte=now)
+        | Q(status='running', locked_until__lt=now)
+    )
+    candidates = BackgroundJob.objects.filter(claimable)
+    if kinds:
+        candidates = candidates.filter(kind__in=kinds)
+    candidate_rows = list(
+        candidates.order_by('-priority', 'run_after', 'id').values_list('id', 'kind')[:CLAIM_CANDIDATES]
+    )
+
+    for job_id, kind in candidate_rows:
+        handler = get_handler(kind)
+        lease = handler.lease if handler else DEFAULT_LEASE
+        claimed = BackgroundJob.objects.filter(pk=job_id).filter(claimable).update(
+            status='running',
+            locked_by=worker_id,
+            locked_until=now + lease,
+            attempts=F('attempts') + 1,
+        )
+        if claimed == 1:
+            return BackgroundJob.objects.get(pk=job_id)
+    return None
+
+
+def run_job(job):
+    """
+    가져온 작업 실행 후 결과 저장
+
+    Returns:
+        str: 최종 상태 ('done' / 'queued'(재시도 예약) / 'failed' / 'lost'(리스를 다른 워커가 가져감))
+    """
+    from .models import BackgroundJob
+
+    handler = get_handler(job.kind)
+    # 리스를 잡은 워커만 결과를 쓸 수 있음 (리스 만료 후 다른 워커가 가져간 경우 덮어쓰지 않음)
+    mine = BackgroundJob.objects.filter(pk=job.pk, status='running', locked_by=job.locked_by)
+
+    try:
+        if handler is None:
+            raise PermanentJobError(f"등록되지 않은 작업 종류: {job.kind}")
+        result = handler.func(job.payload or {})
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+        retry = not isinstance(e, PermanentJobError) and job.attempts < job.max_attempts
+        if retry:
+            delay = min(RETRY_BASE * (2 ** max(job.attempts - 1, 0)), RETRY_MAX)
+            mine.update(
+                status='queued', run_after=timezone.now() + delay,
+                locked_by='', locked_until=None, last_error=error[:ERROR_MAX_CHARS],
+            )
+            logger.warning(f"Job {job.kind} #{job.pk} failed (attempt {job.attempts}/{job.max_attempts}), retrying in {delay}: {error}")
+            return 'queued'
+        mine.update(
+            status='failed', finished_at=timezone.now(), locked_until=None,
+            last_error=(error + '\n' + traceback.format_exc())[:ERROR_MAX_CHARS],
+        )
+        logger.error(f"Job {job.kind} #{job.pk} failed permanently: {error}")
+        return 'failed'
+
+    if not mine.update(status='done', result=result, finished_at=timezone.now(), locked_until=None):
+        logger.warning(f"Job {job.kind} #{job.pk} finished after its lease was taken over, result discarded")
+        return 'lost'
+    logger.info(f"Job {job.kind} #{job.pk} done")
+    return 'done'
+
+
+def run_next(worker_id, kinds=None):
+    """작업 1개를 가져와 실행 (없으면 None, 있으면 최종 상태)"""
+    job = claim(worker_id, kinds)
+    if job is None:
+        return None
+    return run_job(job)
+
+
+def make_worker_id(suffix=''):
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    return f"{name}:{suffix}" if suffix else name
+
+
+def job_status(job):
+    """폴링 응답 (status: queued / running / done / failed)"""
+    data = {
+        'job_id': job.pk,
+        'kind': job.kind,
+        'status': job.status,
+        'attempts': job.attempts,
+    }
+    if job.status == 'done':
+        data['result'] = job.result
+    elif job.status == 'failed':
+        data['error'] = FAILED_MESSAGE
+    return data
+
+
+def prune_jobs(older_than=timedelta(days=7)):
+    """끝난 지 오래된 작업 삭제 (대기/실행 중인 작업은 그대로)"""
+    from .models import BackgroundJob
+
+    deleted, _ = BackgroundJob.objects.filter(
+        status__in=['done', 'failed'], finished_at__lt=timezone.now() - older_than
+    ).delete()
+    return deleted
+
+
+def _get_executor(workers):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job-worker')
+        return _executor
+
+
+def _next_wakeup():
+    """다음에 작업이 실행 가능해지는 시각 (재시도 대기 run_after / 실행 중 작업의 리스 만료), 없으면 None"""
+    from .models import BackgroundJob
+
+    now = timezone.now()
+    times = [
+        BackgroundJob.objects.filter(status='queued', run_after__gt=now).aggregate(at=Min('run_after'))['at'],
+        BackgroundJob.objects.filter(status='running', locked_until__gt=now).aggregate(at=Min('locked_until'))['at'],
+    ]
+    times = [at for at in times if at is not None]
+    return min(times) if times else None
+
+
+def _schedule_kick(at):
+    """at 시각에 _kick_inprocess 예약 (타이머는 프로세스에 1개, 더 이른 예약이 있으면 그대로)"""
+    global _timer, _timer_at
+    with _timer_lock:
+        if _timer is not None and _timer.is_alive():
+            if _timer_at <= at:
+                return
+            _timer.cancel()
+        _timer = threading.Timer(max(0.0, (at - timezone.now()).total_seconds()), _kick_inprocess)
+        _timer.daemon = True
+        _timer_at = at
+        _timer.start()
+
+
+def _kick_inprocess():
+    """
+    웹 프로세스 안에서 작업 처리 예약 (JOB_INPROCESS_WORKERS > 0 일 때)
+
+    run_workers 를 따로 띄우지 않은 개발 환경에서도 작업이 처리되도록 하는 보조 경로.
+    claim 은 조건부 UPDATE 라 run_workers 와 함께 돌아도 같은 작업을 두 번 실행하지 않는다.
+    """
+    workers = getattr(settings, 'JOB_INPROCESS_WORKERS', 0)
+    if workers <= 0:
+        return
+
+    def run():
+        try:
+            # 방금 넣은 작업 + 그 사이 쌓인 실행 가능한 작업을 모두 처리
+            while run_next(make_worker_id(threading.current_thread().name)) is not None:
+                pass
+            # 재시도 대기 / 리스 만료 작업은 실행 가능해지는 시각에 다시 처리
+            wakeup = _next_wakeup()
+            if wakeup is not None:
+                _schedule_kick(wakeup)
+        except Exception as e:
+            logger.error(f"In-process job run failed: {e}")
+        finally:
+            connections.close_all()
+
+    _get_executor(workers).submit(run)
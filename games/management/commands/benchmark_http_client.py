@@ -0,0 +1,185 @@
+"""
+공용 HTTP 클라이언트 벤치마크 Management Command
+
+로컬 스텁 서버(127.0.0.1)에 같은 요청을 보내
+세션 없는 requests.get (요청마다 새 커넥션) 과 games.http_client (keep-alive 풀) 를 비교합니다.
+새 커넥션마다 --handshake-ms 만큼 지연을 넣어 TCP + TLS 핸드셰이크 비용을 흉내냅니다.
+
+사용법:
+    python manage.py benchmark_http_client
+    python manage.py benchmark_http_client --requests 500 --handshake-ms 60 --concurrency 8
+    python manage.py benchmark_http_client --handshake-ms 0      # 순수 로컬 TCP 연결 비용만
+"""
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.core.management.base import BaseCommand
+
+from games import http_client
+
+
+class StubServer(ThreadingHTTPServer):
+    """새 커넥션 수를 세고, 커넥션마다 핸드셰이크 지연을 넣는 스텁 서버"""
+
+    daemon_threads = True
+
+    def __init__(self, handshake_ms, latency_ms):
+        self.handshake_ms = handshake_ms
+        self.latency_ms = latency_ms
+        self.connections = 0
+        self.flaky_hits = 0
+        self.lock = threading.Lock()
+        super().__init__(('127.0.0.1', 0), StubHandler)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive 허용
+    disable_nagle_algorithm = True  # 헤더/본문 분할 전송 시 delayed ACK(40ms) 방지
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+        if self.server.handshake_ms:
+            time.sleep(self.server.handshake_ms / 1000)
+
+    def do_GET(self):
+        if self.path.startswith('/flaky'):
+            # 처음 두 번은 429 (Retry-After: 0) → 클라이언트 재시도 검증용
+            with self.server.lock:
+                self.server.flaky_hits += 1
+                hits = self.server.flaky_hits
+            if hits <= 2:
+                self._send(429, {'error': 'rate limited'}, {'Retry-After': '0'})
+                return
+
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+        self._send(200, {'results': [{'id': 1, 'name': 'stub'}]})
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class Command(BaseCommand):
+    help = '로컬 스텁 서버로 세션 없는 요청과 공용 HTTP 클라이언트(커넥션 풀)의 지연시간을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=200,
+            help='모드별 요청 수 (기본값: 200)'
+        )
+        parser.add_argument(
+            '--handshake-ms',
+            type=float,
+            default=30,
+            help='새 커넥션마다 넣을 지연 (TCP+TLS 핸드셰이크 흉내, 기본값: 30ms)'
+        )
+        parser.add_argument(
+            '--latency-ms',
+            type=float,
+            default=2,
+            help='응답마다 넣을 서버 처리 지연 (기본값: 2ms)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help='동시 요청 스레드 수 (기본값: 1)'
+        )
+
+    def handle(self, *args, **options):
+        total = options['requests']
+        concurrency = max(1, options['concurrency'])
+
+        server = StubServer(options['handshake_ms'], options['latency_ms'])
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        self.stdout.write("="*70)
+        self.stdout.write("🔌 HTTP 클라이언트 벤치마크 (로컬 스텁 서버)")
+        self.stdout.write("="*70)
+        self.stdout.write(
+            f"설정: requests={total}, handshake={options['handshake_ms']}ms, "
+            f"latency={options['latency_ms']}ms, concurrency={concurrency}"
+        )
+
+        try:
+            modes = [
+                ('requests.get (세션 없음)', lambda url: requests.get(url, timeout=10)),
+                ('http_client (커넥션 풀)', lambda url: http_client.get(url, timeout=10)),
+            ]
+            results = []
+            for label, fetch in modes:
+                http_client.close_sessions()
+                results.append((label, self._run(server, fetch, f"{base_url}/games", total, concurrency)))
+
+            self.stdout.write("")
+            self.stdout.write(f"{'모드':<26}{'커넥션':>8}{'총 시간':>10}{'req/s':>10}{'p50':>9}{'p95':>9}")
+            self.stdout.write("-"*70)
+            for label, r in results:
+                self.stdout.write(
+                    f"{label:<26}{r['connections']:>8}{r['elapsed']:>9.2f}s{r['rps']:>10.1f}"
+                    f"{r['p50_ms']:>7.1f}ms{r['p95_ms']:>7.1f}ms"
+                )
+
+            baseline, pooled = results[0][1], results[1][1]
+            if pooled['elapsed'] > 0:
+                self.stdout.write(
+                    f"\n⚡ 커넥션 풀: {baseline['connections'] - pooled['connections']}회 핸드셰이크 절약, "
+                    f"{baseline['elapsed'] / pooled['elapsed']:.1f}배 빠름"
+                )
+
+            # 429 + Retry-After 재시도 검증
+            started = time.perf_counter()
+            response = http_client.get(f"{base_url}/flaky", timeout=10)
+            self.stdout.write(
+                f"🔁 429 재시도: 최종 {response.status_code}, 서버 도달 {server.flaky_hits}회, "
+                f"{(time.perf_counter() - started) * 1000:.0f}ms"
+            )
+        finally:
+            http_client.close_sessions()
+            server.shutdown()
+            server.server_close()
+
+        self.stdout.write(self.style.SUCCESS("✅ 벤치마크 완료!"))
+
+    def _run(self, server, fetch, url, total, concurrency):
+        """같은 URL 에 total 번 요청 → 지연시간 / 새 커넥션 수 측정"""
+        connections_before = server.connections
+
+        def one(_):
+            started = time.perf_counter()
+            fetch(url).raise_for_status()
+            return (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            latencies = sorted(executor.map(one, range(total)))
+        elapsed = time.perf_counter() - started
+
+        return {
+            'connections': server.connections - connections_before,
+            'elapsed': elapsed,
+            'rps': total / elapsed if elapsed else 0.0,
+            'p50_ms': latencies[len(latencies) // 2],
+            'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+        }
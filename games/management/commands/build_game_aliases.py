@@ -0,0 +1,176 @@
+"""
+GameAlias(외부 ID → Game) 테이블 채우기 + 중복 게임 병합 Management Command
+
+Game.rawg_id 는 unique 가 아니라 같은 RAWG ID 의 게임이 여러 행 있을 수 있습니다.
+별칭은 ID 하나당 대표 게임 하나(pk 가 가장 작은 게임 = 기존 .filter(rawg_id=...).first() 와 같은 게임)만 가리킵니다.
+새로 저장되는 게임은 시그널이 자동으로 등록하므로, 테이블 도입 전 데이터나
+bulk_create 로 넣은 게임(load_games 등)을 맞출 때 실행하면 됩니다.
+
+--merge 를 주면 중복 게임의 유저 데이터(평가, 찜)와 스크린샷/트레일러/Steam 리뷰를 대표 게임으로 옮기고 중복 행을 삭제합니다.
+(같은 유저가 둘 다 평가했으면 최근에 수정한 평가를 남김)
+
+사용법:
+    python manage.py build_game_aliases            # 별칭 채우기 + 중복 목록 출력
+    python manage.py build_game_aliases --merge    # 중복 게임 병합까지
+"""
+
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from games.models import Game, GameAlias, GameScreenshot, GameTrailer, Rating, SteamReview
+from games.resolver import RAWG, STEAM, reset_alias_map
+
+BATCH_SIZE = 1000
+SHOW_DUPLICATES = 20
+
+
+class Command(BaseCommand):
+    help = 'GameAlias 별칭 테이블을 채우고 같은 RAWG ID 의 중복 게임을 찾거나 병합합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--merge',
+            action='store_true',
+            help='중복 게임의 평가/찜/스크린샷 등을 대표 게임으로 옮기고 중복 게임 삭제'
+        )
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+
+        self.stdout.write("="*70)
+        self.stdout.write("🔗 게임 ID 별칭(GameAlias) 동기화")
+        self.stdout.write("="*70)
+
+        # 1. 외부 ID → 게임 목록 (pk 순, 첫 번째가 대표)
+        groups = self._collect_ids()
+
+        duplicates = {external_id: pks for external_id, pks in groups[RAWG].items() if len(pks) > 1}
+        self.stdout.write(f"📋 RAWG ID {len(groups[RAWG])}개, Steam AppID {len(groups[STEAM])}개, 중복 RAWG ID {len(duplicates)}개")
+
+        if duplicates and options['merge']:
+            merged = self._merge_duplicates(duplicates)
+            self.stdout.write(self.style.SUCCESS(f"🧹 중복 게임 {merged}개를 대표 게임으로 병합"))
+            # 중복 게임의 steam_appid 가 대표 게임으로 옮겨졌을 수 있으므로 다시 읽음
+            groups = self._collect_ids()
+        elif duplicates:
+            self.stdout.write(self.style.WARNING("⚠️  같은 RAWG ID 를 가진 게임 (대표 게임 ← 중복):"))
+            for external_id, pks in list(duplicates.items())[:SHOW_DUPLICATES]:
+                self.stdout.write(f"   rawg {external_id}: {pks[0]} ← {', '.join(map(str, pks[1:]))}")
+            if len(duplicates) > SHOW_DUPLICATES:
+                self.stdout.write(f"   ... 외 {len(duplicates) - SHOW_DUPLICATES}개")
+            self.stdout.write("   병합하려면 --merge")
+
+        # 2. 별칭 맞추기 (없으면 추가, 대표가 아닌 게임을 가리키면 수정, 더 이상 없는 ID 는 삭제)
+        wanted = {
+            (source, external_id): pks[0]
+            for source, by_id in groups.items()
+            for external_id, pks in by_id.items()
+        }
+        existing = {
+            (alias.source, alias.external_id): alias
+            for alias in GameAlias.objects.only('id', 'source', 'external_id', 'game_id')
+        }
+
+        to_create = [
+            GameAlias(source=source, external_id=external_id, game_id=game_id)
+            for (source, external_id), game_id in wanted.items()
+            if (source, external_id) not in existing
+        ]
+        to_update = []
+        for key, alias in existing.items():
+            game_id = wanted.get(key)
+            if game_id is not None and alias.game_id != game_id:
+                alias.game_id = game_id
+                to_update.append(alias)
+        to_delete = [alias.id for key, alias in existing.items() if key not in wanted]
+
+        with transaction.atomic():
+            GameAlias.objects.bulk_create(to_create, batch_size=BATCH_SIZE, ignore_conflicts=True)
+            GameAlias.objects.bulk_update(to_update, ['game'], batch_size=BATCH_SIZE)
+            for i in range(0, len(to_delete), BATCH_SIZE):
+                GameAlias.objects.filter(id__in=to_delete[i:i + BATCH_SIZE]).delete()
+        reset_alias_map()
+
+        elapsed = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 별칭 {len(wanted)}개 동기화 완료 ({elapsed:.1f}초): "
+            f"추가 {len(to_create)}, 수정 {len(to_update)}, 삭제 {len(to_delete)}"
+        ))
+
+    def _collect_ids(self):
+        """{source: {external_id: [game pk, ...]}} (pk 오름차순)"""
+        groups = {RAWG: defaultdict(list), STEAM: defaultdict(list)}
+        for pk, rawg_id, steam_appid in Game.objects.order_by('pk').values_list('pk', 'rawg_id', 'steam_appid').iterator():
+            if rawg_id is not None:
+                groups[RAWG][rawg_id].append(pk)
+            if steam_appid is not None:
+                groups[STEAM][steam_appid].append(pk)
+        return groups
+
+    def _merge_duplicates(self, duplicates):
+        """중복 게임 → 대표 게임 (평가, 찜, 스크린샷/트레일러/리뷰, 빈 필드 이동 후 삭제)"""
+        from users.chat_context import invalidate_chat_context
+        from users.models import GameRating, User
+
+        merged = 0
+        moved_raters = set()
+        wishlist = User.wishlist.through
+        for external_id, pks in duplicates.items():
+            keep_pk, drop_pks = pks[0], pks[1:]
+            with transaction.atomic():
+                keep = Game.objects.get(pk=keep_pk)
+
+                # 평가 (users.GameRating, games.Rating): 같은 유저가 둘 다 평가했으면 최근 것 유지
+                moved_raters |= self._merge_ratings(GameRating, keep_pk, pks)
+                self._merge_ratings(Rating, keep_pk, pks)
+
+                # 찜
+                wished = set(wishlist.objects.filter(game_id=keep_pk).values_list('user_id', flat=True))
+                moving = set(wishlist.objects.filter(game_id__in=drop_pks).values_list('user_id', flat=True)) - wished
+                wishlist.objects.bulk_create([wishlist(user_id=user_id, game_id=keep_pk) for user_id in moving])
+
+                # 스크린샷 / 트레일러 / Steam 리뷰 (대표 게임에 없을 때만, 중복 게임 하나에서 통째로)
+                for media_model in (GameScreenshot, GameTrailer, SteamReview):
+                    self._move_media(media_model, keep_pk, drop_pks)
+
+                # 대표 게임의 빈 필드 채우기 (steam_appid 는 unique 라 중복 게임을 삭제한 뒤 저장)
+                updates = {}
+                for drop in Game.objects.filter(pk__in=drop_pks).order_by('pk'):
+                    for field in ('description', 'description_kr', 'background_image', 'image_url', 'metacritic_score'):
+                        if not getattr(keep, field) and getattr(drop, field) and field not in updates:
+                            updates[field] = getattr(drop, field)
+                    if keep.steam_appid is None and drop.steam_appid is not None and 'steam_appid' not in updates:
+                        updates['steam_appid'] = drop.steam_appid
+                Game.objects.filter(pk__in=drop_pks).delete()
+                if updates:
+                    for field, value in updates.items():
+                        setattr(keep, field, value)
+                    keep.save(update_fields=list(updates))
+
+            merged += len(drop_pks)
+            self.stdout.write(f"   rawg {external_id}: {keep_pk} ← {', '.join(map(str, drop_pks))}")
+
+        # update() 로 옮긴 평가는 시그널이 없으므로 챗봇 컨텍스트 직접 무효화
+        for user_id in moved_raters:
+            invalidate_chat_context(user_id)
+        return merged
+
+    def _merge_ratings(self, model, keep_pk, pks):
+        """유저당 가장 최근 평가만 남겨 대표 게임으로 이동 → 옮긴 유저 ID"""
+        latest = {}
+        for rating in model.objects.filter(game_id__in=pks).order_by('updated_at', 'pk').only('id', 'user_id', 'game_id'):
+            latest[rating.user_id] = rating
+        model.objects.filter(game_id__in=pks).exclude(pk__in=[r.pk for r in latest.values()]).delete()
+        moving = [r for r in latest.values() if r.game_id != keep_pk]
+        model.objects.filter(pk__in=[r.pk for r in moving]).update(game_id=keep_pk)
+        return {r.user_id for r in moving}
+
+    def _move_media(self, model, keep_pk, drop_pks):
+        if model.objects.filter(game_id=keep_pk).exists():
+            return
+        source_pk = model.objects.filter(game_id__in=drop_pks).order_by('game_id').values_list('game_id', flat=True).first()
+        if source_pk is not None:
+            model.objects.filter(game_id=source_pk).update(game_id=keep_pk)
@@ -0,0 +1,70 @@
+"""
+레거시 Game.genre 문자열로 장르 인덱스(GameGenre) + quality_score 를 재구축하는 management command
+
+사용법:
+    python manage.py build_genre_index
+    python manage.py build_genre_index --missing-only
+    python manage.py build_genre_index --limit=100 --batch-size=1000
+
+추천 API(steam_style_recommendations_api, get_recommendations_for_user 등)는
+genre__icontains 대신 이 인덱스를 조회하므로, 배포 직후 한 번 실행해야 합니다.
+이후에는 Game 저장 시 시그널로 자동 동기화되며, 유저 평가 수가 반영되는
+quality_score 갱신을 위해 주기적으로(예: 하루 1회) 실행하는 것을 권장합니다.
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from games.models import Game
+from games.genre_index import rebuild_genre_index
+
+
+class Command(BaseCommand):
+    help = 'Build normalized genre index (GameGenre) and quality scores'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=None,
+            help='Limit number of games to process'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Games per bulk write batch (default: 500)'
+        )
+        parser.add_argument(
+            '--missing-only',
+            action='store_true',
+            help='Only index games that have no GameGenre rows yet'
+        )
+
+    def handle(self, *args, **options):
+        limit = options.get('limit')
+        batch_size = options.get('batch_size')
+
+        games = Game.objects.all()
+        if options.get('missing_only'):
+            games = games.filter(genre_index__isnull=True)
+            self.stdout.write("🔍 Missing-only mode: indexing games without genre rows")
+
+        if limit:
+            games = Game.objects.filter(id__in=list(games.order_by('id').values_list('id', flat=True)[:limit]))
+
+        total = games.count()
+        if total == 0:
+            self.stdout.write(self.style.SUCCESS('✅ Genre index is up to date!'))
+            return
+
+        self.stdout.write(f"📚 Indexing {total} games (batch size: {batch_size})...")
+
+        started = time.time()
+        stats = rebuild_genre_index(games, batch_size=batch_size)
+        elapsed = time.time() - started
+
+        self.stdout.write("\n" + "="*70)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Done: {stats['games']} games → {stats['rows']} genre rows ({elapsed:.2f}s)"
+        ))
+        self.stdout.write("="*70)
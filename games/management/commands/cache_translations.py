@@ -1,4 +1,3 @@
-
 """
 게임 설명을 번역하여 DB에 캐싱하는 management command
 
@@ -6,17 +5,24 @@
     python manage.py cache_translations
     python manage.py cache_translations --limit=50
     python manage.py cache_translations --force
+    python manage.py cache_translations --workers=4 --rate=1 --batch-items=10
+    python manage.py cache_translations --force --resume   # 중단된 실행을 이어서
 
 이 스크립트는 DB에 있는 게임 중 description(영어)은 있지만 description_kr(한국어)이 없는 게임을 찾아
 Gemini API를 사용하여 번역하고 저장합니다.
 만약 description(영어)조차 없다면 RAWG API에서 설명을 먼저 가져옵니다.
+번역은 games/translation_batch.py 파이프라인으로 처리합니다:
+같은 설명은 한 번만 번역(이미 번역된 게임이나 공용 번역 캐시에 있으면 재사용)하고, 짧은 설명은 한 요청에 묶어
+여러 워커가 동시에 요청하며, 결과는 bulk_update 로 모아서 저장합니다.
+처리한 게임은 실행 기록(CrawlRun)에 남으며, 번역 API 오류로 실패한 게임만 --resume 에서 다시 시도합니다.
 """
 
-import time
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 from games.models import Game
-from games.utils import update_game_with_rawg, translate_text_gemini
+from games.run_ledger import RunLedger
+from games.translation_batch import BATCH_CHARS, BATCH_ITEMS, WRITE_BATCH, translate_descriptions
+from games.utils import update_game_with_rawg
 
 class Command(BaseCommand):
     help = 'Translate and cache game descriptions'
@@ -37,15 +43,51 @@ class Command(BaseCommand):
             '--delay',
             type=float,
             default=2.0,
-            help='Delay between API calls in seconds (default: 2.0s to respect limits)'
+            help='Seconds between translation requests when --rate is not given (default: 2.0s to respect limits)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=None,
+            help='Translation requests per second across all workers (default: 1 / --delay)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=3,
+            help='Concurrent translation requests (default: 3)'
+        )
+        parser.add_argument(
+            '--batch-chars',
+            type=int,
+            default=BATCH_CHARS,
+            help=f'Max source characters packed into one request (default: {BATCH_CHARS})'
+        )
+        parser.add_argument(
+            '--batch-items',
+            type=int,
+            default=BATCH_ITEMS,
+            help=f'Max descriptions packed into one request (default: {BATCH_ITEMS})'
+        )
+        parser.add_argument(
+            '--write-batch',
+            type=int,
+            default=WRITE_BATCH,
+            help=f'Games per bulk_update (default: {WRITE_BATCH})'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue from the last checkpoint if the previous run did not complete'
         )
 
     def handle(self, *args, **options):
         limit = options.get('limit')
         force = options.get('force')
         delay = options.get('delay')
-        
-        # 대상 게임 선정: 
+        rate = options.get('rate') or (1 / delay if delay > 0 else None)
+
+        # 대상 게임 선정:
         # 1. 한국어 설명이 없는 게임
         # 2. 또는 force 옵션이 켜진 게임
         if force:
@@ -55,58 +97,106 @@ class Command(BaseCommand):
             games_to_process = Game.objects.filter(
                 Q(description_kr__isnull=True) | Q(description_kr='')
             )
-            
+
+        ledger = RunLedger.start('cache_translations', options, resume=options.get('resume'))
+        if ledger.resumed:
+            games_to_process = games_to_process.exclude(id__in=[int(key) for key in ledger.done])
+            self.stdout.write(f"♻️  Resuming CrawlRun #{ledger.run.resumed_from_id}: {len(ledger.done)} games already done")
+
         if limit:
             games_to_process = games_to_process[:limit]
-            
+
         total = games_to_process.count()
         if total == 0:
+            ledger.finish()
             self.stdout.write(self.style.SUCCESS('✅ All games already translated!'))
             return
-            
+
         self.stdout.write(f"🔍 Found {total} games needing translation...")
-        self.stdout.write(f"⏱️  Delay: {delay}s per request")
-        
+        self.stdout.write(
+            f"⏱️  Rate: {f'{rate:.2f} req/s' if rate else 'unlimited'}, workers: {options['workers']}, "
+            f"batch: {options['batch_items']} items / {options['batch_chars']} chars"
+        )
+
         success_count = 0
         failed_count = 0
-        
-        for i, game in enumerate(games_to_process):
-            self.stdout.write(f"[{i+1}/{total}] Processing: {game.title}...", ending='')
-            
-            try:
-                # 1. 영어 설명이 없으면 RAWG에서 가져오기
+        summary = None
+
+        with ledger:
+            # 1. 영어 설명이 없으면 RAWG에서 가져오기
+            items = []
+            for game in games_to_process:
                 if not game.description:
-                    self.stdout.write(" (Fetch desc)...", ending='')
-                    updated = update_game_with_rawg(game)
+                    self.stdout.write(f"   (Fetch desc) {game.title}...", ending='')
+                    try:
+                        updated = update_game_with_rawg(game)
+                    except Exception as e:
+                        self.stdout.write(self.style.ERROR(f" ❌ Error: {e}"))
+                        failed_count += 1
+                        ledger.record(game.id, ok=False, error=type(e).__name__)
+                        continue
                     if not updated or not game.description:
                         self.stdout.write(self.style.WARNING(" ❌ No description found"))
                         failed_count += 1
+                        # 설명이 없는 게임은 재시도해도 같으므로 완료로 기록
+                        ledger.record(game.id, ok=False, error='no description', done=True)
                         continue
-                
-                # 2. 번역 실행
-                self.stdout.write(" (Translating)...", ending='')
-                translation = translate_text_gemini(game.description)
-                
-                if translation:
-                    game.description_kr = translation
-                    game.save(update_fields=['description_kr'])
-                    self.stdout.write(self.style.SUCCESS(" ✅ Done"))
-                    success_count += 1
-                else:
-                    self.stdout.write(self.style.ERROR(" ❌ Translation failed"))
-                    failed_count += 1
-                    
-            except Exception as e:
-                self.stdout.write(self.style.ERROR(f" ❌ Error: {e}"))
-                failed_count += 1
-            
-            # Rate limiting
-            time.sleep(delay)
-            
+                    self.stdout.write(self.style.SUCCESS(" ✅"))
+                items.append((game.id, game.description))
+
+            # 2. 번역 실행 (중복 제거 → 묶음 요청 → bulk_update)
+            def on_saved(game_ids):
+                for game_id in game_ids:
+                    ledger.record(game_id)
+
+            def on_failed(game_ids):
+                for game_id in game_ids:
+                    ledger.record(game_id, ok=False, error='translation failed')
+
+            def on_progress(progress):
+                self.stdout.write(
+                    f"   [{progress['translated']}/{progress['queued']}] "
+                    f"saved {progress['written']}, failed {progress['failed']}, {progress['requests']} requests, "
+                    f"{progress['descriptions_per_min']:.1f} desc/min"
+                )
+
+            if items:
+                summary = translate_descriptions(
+                    items,
+                    workers=max(1, options['workers']),
+                    rate=rate,
+                    batch_chars=options['batch_chars'],
+                    batch_items=max(1, options['batch_items']),
+                    write_batch=max(1, options['write_batch']),
+                    known={} if force else None,
+                    use_cache=not force,
+                    on_saved=on_saved,
+                    on_failed=on_failed,
+                    on_progress=on_progress,
+                )
+                success_count += summary['written']
+                failed_count += summary['failed']
+                ledger.add_stats(
+                    requests=summary['requests'],
+                    reused=summary['reused'],
+                    cached=summary['cached'],
+                    duplicates=summary['duplicates'],
+                )
+
         self.stdout.write("")
         self.stdout.write(self.style.SUCCESS("🎉 Translation cache completed!"))
         self.stdout.write(f"   ✅ Success: {success_count}")
         self.stdout.write(f"   ❌ Failed: {failed_count}")
-        
+        if summary:
+            self.stdout.write(
+                f"   ♻️  Reused: {summary['reused']} (known translations), {summary['cached']} (translation cache), "
+                f"deduplicated: {summary['duplicates']} (identical descriptions)"
+            )
+            self.stdout.write(
+                f"   ⚡ Throughput: {summary['descriptions_per_min']:.1f} descriptions/min "
+                f"({summary['translated']} translated in {summary['requests']} requests, {summary['elapsed']:.1f}s)"
+            )
+
         remaining = Game.objects.filter(Q(description_kr__isnull=True) | Q(description_kr='')).count()
         self.stdout.write(f"   📊 Remaining without translation: {remaining}")
+        self.stdout.write(f"   📒 {ledger.summary_line()}")
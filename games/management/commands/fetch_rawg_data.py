@@ -1,7 +1,24 @@
+"""
+RAWG 데이터(이미지, 설명, 트레일러) 보강 Management Command
+
+기본은 비동기 파이프라인(games/rawg_enrichment.py): 게임당 상세/스크린샷/트레일러를 동시에 요청하고,
+전역 토큰 버킷으로 RAWG 쿼터를 지키며, DB 반영은 writer 스레드 하나가 배치로 처리합니다.
+
+사용법:
+    python manage.py fetch_rawg_data
+    python manage.py fetch_rawg_data --limit=500 --concurrency=16 --rate=8
+    python manage.py fetch_rawg_data --sequential --delay=0.5      # 기존 순차 방식
+    python manage.py fetch_rawg_data --base-url=http://127.0.0.1:8001/api --no-steam-fallback  # 로컬 가짜 RAWG 서버
+    python manage.py fetch_rawg_data --force --resume  # 중단된 실행을 이어서 (DB 반영된 게임은 건너뜀)
+"""
+
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django.db.models import Q
 from games.models import Game
-from games.utils import update_game_with_rawg
+from games.utils import update_game_with_rawg, BASE_URL, RAWG_API_KEY
+from games.rawg_enrichment import SNAPSHOT_FIELDS, enrich_games
+from games.run_ledger import RunLedger
 import time
 import logging
 
@@ -30,7 +47,47 @@ class Command(BaseCommand):
             '--delay',
             type=float,
             default=0.5,
-            help='Delay between API requests in seconds (default: 0.5)'
+            help='Delay between games in --sequential mode (default: 0.5)'
+        )
+        parser.add_argument(
+            '--sequential',
+            action='store_true',
+            help='Use the legacy one-game-at-a-time update_game_with_rawg loop'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=8,
+            help='Games processed concurrently (default: 8)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=getattr(settings, 'RAWG_RATE_LIMIT', 5.0),
+            help='Global RAWG requests per second (default: settings.RAWG_RATE_LIMIT)'
+        )
+        parser.add_argument(
+            '--burst',
+            type=int,
+            default=10,
+            help='Token bucket burst size (default: 10)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Games per DB write batch (default: 50)'
+        )
+        parser.add_argument(
+            '--base-url',
+            type=str,
+            default=None,
+            help='RAWG API base URL override (e.g. a local fake RAWG server)'
+        )
+        parser.add_argument(
+            '--no-steam-fallback',
+            action='store_true',
+            help='Skip the Steam Store trailer fallback'
         )
         parser.add_argument(
             '--appid',
@@ -38,6 +95,11 @@ class Command(BaseCommand):
             default=None,
             help='Update only a specific game by Steam AppID'
         )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue from the last checkpoint if the previous run did not complete'
+        )
 
     def handle(self, *args, **options):
         limit = options['limit']
@@ -71,6 +133,11 @@ class Command(BaseCommand):
                 Q(description='')
             ).distinct()
         
+        ledger = RunLedger.start('fetch_rawg_data', options, resume=options['resume'])
+        if ledger.resumed:
+            games = games.exclude(id__in=[int(key) for key in ledger.done])
+            self.stdout.write(f'♻️  Resuming CrawlRun #{ledger.run.resumed_from_id}: {len(ledger.done)} games already done')
+        
         # Apply limit
         if limit:
             games = games[:limit]
@@ -78,6 +145,7 @@ class Command(BaseCommand):
         stats['total'] = games.count()
         
         if stats['total'] == 0:
+            ledger.finish()
             self.stdout.write(self.style.WARNING('No games to update. Use --force to update all games.'))
             return
         
@@ -86,10 +154,40 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS(f'{"="*70}'))
         self.stdout.write(f'Total games to process: {stats["total"]}')
         self.stdout.write(f'Force update: {force}')
-        self.stdout.write(f'API delay: {delay}s')
+        if options['sequential']:
+            self.stdout.write(f'Mode: sequential (API delay: {delay}s)')
+        else:
+            self.stdout.write(
+                f'Mode: async (concurrency: {options["concurrency"]}, rate: {options["rate"]}/s, '
+                f'burst: {options["burst"]}, batch: {options["batch_size"]})'
+            )
         self.stdout.write(self.style.SUCCESS(f'{"="*70}\n'))
         
-        # Process games
+        started = time.time()
+        with ledger:
+            if options['sequential']:
+                self._run_sequential(games, stats, force, delay, ledger)
+            else:
+                summary = self._run_async(games, options, ledger)
+                for key in ('success', 'skipped', 'failed'):
+                    stats[key] = summary[key]
+                ledger.add_stats(requests=summary.get('requests', 0), failed_games=summary['failed'])
+        elapsed = time.time() - started
+        
+        # Print summary
+        self.stdout.write(self.style.SUCCESS(f'\n{"="*70}'))
+        self.stdout.write(self.style.SUCCESS(f'  Summary'))
+        self.stdout.write(self.style.SUCCESS(f'{"="*70}'))
+        self.stdout.write(f'Total processed: {stats["total"]}')
+        self.stdout.write(self.style.SUCCESS(f'Successful: {stats["success"]}'))
+        self.stdout.write(self.style.WARNING(f'Skipped: {stats["skipped"]}'))
+        self.stdout.write(self.style.ERROR(f'Failed: {stats["failed"]}'))
+        self.stdout.write(f'Elapsed: {elapsed:.1f}s ({stats["total"] / elapsed if elapsed else 0:.2f} games/s)')
+        self.stdout.write(f'📒 {ledger.summary_line()}')
+        self.stdout.write(self.style.SUCCESS(f'{"="*70}\n'))
+
+    def _run_sequential(self, games, stats, force, delay, ledger):
+        """기존 방식: update_game_with_rawg 를 한 게임씩 호출"""
         for idx, game in enumerate(games, 1):
             progress = f'[{idx}/{stats["total"]}]'
             self.stdout.write(f'\n{progress} Processing: {game.title} (AppID: {game.steam_appid})')
@@ -103,6 +201,7 @@ class Command(BaseCommand):
                 else:
                     stats['skipped'] += 1
                     self.stdout.write(self.style.WARNING(f'  ⊘ Skipped or no data found'))
+                ledger.record(game.id, ok=bool(success), done=True)
                 
                 # Rate limiting to respect API quotas
                 # RAWG free tier: 20,000 requests/month ≈ 650/day ≈ 27/hour
@@ -110,14 +209,45 @@ class Command(BaseCommand):
                 
             except Exception as e:
                 stats['failed'] += 1
+                ledger.record(game.id, ok=False, error=type(e).__name__)
                 self.stdout.write(self.style.ERROR(f'  ✗ Error: {str(e)}'))
-        
-        # Print summary
-        self.stdout.write(self.style.SUCCESS(f'\n{"="*70}'))
-        self.stdout.write(self.style.SUCCESS(f'  Summary'))
-        self.stdout.write(self.style.SUCCESS(f'{"="*70}'))
-        self.stdout.write(f'Total processed: {stats["total"]}')
-        self.stdout.write(self.style.SUCCESS(f'Successful: {stats["success"]}'))
-        self.stdout.write(self.style.WARNING(f'Skipped: {stats["skipped"]}'))
-        self.stdout.write(self.style.ERROR(f'Failed: {stats["failed"]}'))
-        self.stdout.write(self.style.SUCCESS(f'{"="*70}\n'))
+
+    def _run_async(self, games, options, ledger):
+        """비동기 파이프라인: 스냅샷 → 동시 요청 → 단일 writer 배치 반영"""
+        api_key = RAWG_API_KEY or ('local' if options['base_url'] else None)
+        if not api_key:
+            self.stdout.write(self.style.ERROR('RAWG_API_KEY not configured'))
+            return {'success': 0, 'skipped': 0, 'failed': 0}
+
+        snapshots = list(games.values(*SNAPSHOT_FIELDS))
+
+        def on_saved(game_ids):
+            # DB 에 반영된 게임만 체크포인트에 기록 (writer 스레드)
+            for game_id in game_ids:
+                ledger.record(game_id, done=True)
+
+        def on_progress(summary):
+            self.stdout.write(
+                f"  [{summary['fetched']}/{summary['total']}] (saved {summary['done']}) "
+                f"{summary['games_per_sec']:.2f} games/s, {summary['requests_per_sec']:.2f} req/s, "
+                f"p95 {summary['p95_game_ms']:.0f}ms/game, failed {summary['failed']}"
+            )
+
+        summary = enrich_games(
+            snapshots,
+            api_key=api_key,
+            base_url=options['base_url'] or BASE_URL,
+            concurrency=max(1, options['concurrency']),
+            rate=options['rate'],
+            burst=options['burst'],
+            batch_size=options['batch_size'],
+            steam_fallback=not options['no_steam_fallback'],
+            on_progress=on_progress,
+            on_saved=on_saved,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f"\n⚡ Throughput: {summary['games_per_sec']:.2f} games/s, "
+            f"{summary['requests_per_sec']:.2f} req/s ({summary['requests']} requests), "
+            f"p50 {summary['p50_game_ms']:.0f}ms / p95 {summary['p95_game_ms']:.0f}ms per game"
+        ))
+        return summary
@@ -3,11 +3,20 @@ Steam 리뷰 크롤링 Management Command
 
 Steam Store API를 사용하여 게임별 한국어 리뷰를 수집합니다.
 
+- 워커 스레드 여러 개가 게임별로 cursor 페이지네이션을 따라가며 리뷰를 수집
+- 요청 간격은 고정 sleep 대신 호스트 단위 토큰 버킷(http_client.set_rate_limit)으로 제한
+- 저장은 메인 스레드에서 bulk_create(ignore_conflicts=True) 배치 (steam_review_id 유니크)
+- --incremental: 게임별로 이미 저장된 가장 최신 timestamp_updated 에 도달하면 중단
+- 실행 기록(CrawlRun): 리뷰가 DB 에 저장된 게임만 체크포인트에 남김, --resume 으로 이어서 실행
+
 사용법:
-    python manage.py fetch_steam_reviews              # 전체 게임
+    python manage.py fetch_steam_reviews              # 리뷰 없는 전체 게임
     python manage.py fetch_steam_reviews --limit=100  # 100개 게임만
-    python manage.py fetch_steam_reviews --reviews=10 # 게임당 10개 리뷰
+    python manage.py fetch_steam_reviews --reviews=50 # 게임당 최대 50개 리뷰 (여러 페이지)
     python manage.py fetch_steam_reviews --force      # 기존 리뷰 있어도 추가 수집
+    python manage.py fetch_steam_reviews --incremental --reviews=200 --workers=8
+    python manage.py fetch_steam_reviews --rate=4     # store.steampowered.com 초당 4회
+    python manage.py fetch_steam_reviews --force --resume  # 중단된 실행을 이어서
 
 데이터 출처: Steam Store API
 URL: https://store.steampowered.com/appreviews/{app_id}?json=1&language=koreana
@@ -15,10 +24,18 @@ URL: https://store.steampowered.com/appreviews/{app_id}?json=1&language=koreana
 
 import requests
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from django.core.management.base import BaseCommand
+from django.db.models import Max
 from django.utils import timezone
+from games import http_client
 from games.models import Game, SteamReview
+from games.run_ledger import RunLedger
+
+STEAM_REVIEWS_URL = "https://store.steampowered.com/appreviews/{app_id}"
+# Steam appreviews num_per_page 최대값
+MAX_PAGE_SIZE = 100
 
 
 class Command(BaseCommand):
@@ -35,94 +52,173 @@ class Command(BaseCommand):
             '--reviews',
             type=int,
             default=5,
-            help='게임당 가져올 리뷰 수 (기본: 5개)'
+            help='게임당 최대 저장 리뷰 수 (cursor 로 여러 페이지 수집, 기본: 5개)'
         )
         parser.add_argument(
             '--delay',
             type=float,
             default=0.3,
-            help='API 요청 간 딜레이 (초, 기본: 0.3)'
+            help='Steam 호스트 요청 최소 간격 (초, --rate 미지정 시 rate=1/delay, 기본: 0.3)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=None,
+            help='store.steampowered.com 초당 요청 수 (모든 워커 합산)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='동시 크롤링 워커 수 (기본: 4)'
         )
         parser.add_argument(
             '--force',
             action='store_true',
             help='이미 리뷰가 있는 게임도 다시 수집'
         )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='리뷰가 있는 게임도 포함하되, 저장된 최신 수정 시각 이전 리뷰에 도달하면 중단'
+        )
         parser.add_argument(
             '--min-length',
             type=int,
             default=20,
             help='최소 리뷰 길이 (기본: 20자)'
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='bulk_create 배치 크기 (기본: 500)'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='마지막 실행이 완료되지 않았으면 체크포인트에서 이어서 실행'
+        )
 
     def handle(self, *args, **options):
         limit = options['limit']
         reviews_per_game = options['reviews']
-        delay = options['delay']
         force = options['force']
+        incremental = options['incremental']
         min_length = options['min_length']
+        workers = max(1, options['workers'])
+        rate = options['rate'] or (1 / options['delay'] if options['delay'] > 0 else None)
 
         # Steam App ID가 있는 게임만 필터링
         games = Game.objects.filter(steam_appid__isnull=False)
-        
-        # 이미 리뷰가 있는 게임 제외 (force가 아닌 경우)
-        if not force:
-            games_with_reviews = SteamReview.objects.values_list('game_id', flat=True).distinct()
-            games = games.exclude(id__in=games_with_reviews)
-        
+
+        # 이미 리뷰가 있는 게임 제외 (force / incremental 이 아닌 경우)
+        if not force and not incremental:
+            games = games.exclude(id__in=SteamReview.objects.values('game_id'))
+
         if limit:
             games = games[:limit]
-        
-        total = games.count()
-        
+
+        targets = list(games.values_list('id', 'steam_appid', 'title'))
+
+        ledger = RunLedger.start('fetch_steam_reviews', options, resume=options['resume'])
+        if ledger.resumed:
+            targets = [t for t in targets if not ledger.is_done(t[0])]
+            self.stdout.write(f'♻️  CrawlRun #{ledger.run.resumed_from_id} 이어서 실행: {len(ledger.done)}개 게임 완료됨')
+        total = len(targets)
+
         if total == 0:
+            ledger.finish()
             self.stdout.write(self.style.WARNING('크롤링할 게임이 없습니다.'))
             if not force:
-                self.stdout.write('이미 모든 게임에 리뷰가 있습니다. --force 옵션으로 다시 수집할 수 있습니다.')
+                self.stdout.write('이미 모든 게임에 리뷰가 있습니다. --force 또는 --incremental 옵션으로 다시 수집할 수 있습니다.')
             return
-        
+
+        # 이미 저장된 리뷰 ID (게임당 상한을 새 리뷰 기준으로 세기 위해)
+        known_ids = {}
+        if force or incremental:
+            for game_id, review_id in SteamReview.objects.filter(
+                game_id__in=[t[0] for t in targets]
+            ).values_list('game_id', 'steam_review_id'):
+                known_ids.setdefault(game_id, set()).add(review_id)
+
+        # 증분 모드: 게임별 저장된 최신 수정 시각 (한 번의 GROUP BY)
+        stop_at = {}
+        if incremental:
+            stop_at = dict(
+                SteamReview.objects.filter(game_id__in=[t[0] for t in targets])
+                .values('game_id').annotate(latest=Max('timestamp_updated'))
+                .values_list('game_id', 'latest')
+            )
+
+        http_client.set_rate_limit(STEAM_REVIEWS_URL, rate, burst=workers)
+
         self.stdout.write(self.style.SUCCESS(f'\n{"="*70}'))
         self.stdout.write(self.style.SUCCESS(f'  Steam 리뷰 크롤링 시작'))
         self.stdout.write(self.style.SUCCESS(f'{"="*70}'))
         self.stdout.write(f'대상 게임: {total}개')
-        self.stdout.write(f'게임당 리뷰: {reviews_per_game}개')
+        self.stdout.write(f'게임당 최대 리뷰: {reviews_per_game}개')
         self.stdout.write(f'최소 리뷰 길이: {min_length}자')
-        self.stdout.write(f'예상 소요 시간: ~{int(total * delay / 60 + 1)}분')
+        self.stdout.write(f'워커: {workers}개, 요청 속도: {f"{rate:.1f}/s" if rate else "제한 없음"}')
+        if incremental:
+            self.stdout.write(f'증분 모드: {len(stop_at)}개 게임은 저장된 최신 리뷰에서 중단')
         self.stdout.write(self.style.SUCCESS(f'{"="*70}\n'))
 
         stats = {
             'success': 0,
             'no_reviews': 0,
             'error': 0,
-            'total_reviews': 0
+            'total_reviews': 0,
+            'pages': 0,
         }
+        pending = []
+        # 리뷰가 아직 DB 에 저장되지 않은 게임 결과 (저장 후 체크포인트에 기록)
+        pending_games = []
+        started = time.time()
 
-        for idx, game in enumerate(games, 1):
-            count = self.fetch_reviews_for_game(
-                game, 
-                reviews_per_game, 
-                min_length
-            )
-            
-            if count > 0:
-                stats['success'] += 1
-                stats['total_reviews'] += count
-                self.stdout.write(
-                    self.style.SUCCESS(f'[{idx}/{total}] ✅ {game.title}: {count}개 리뷰 저장')
-                )
-            elif count == 0:
-                stats['no_reviews'] += 1
-                self.stdout.write(
-                    self.style.WARNING(f'[{idx}/{total}] ⚠️  {game.title}: 한국어 리뷰 없음')
-                )
-            else:
-                stats['error'] += 1
-                self.stdout.write(
-                    self.style.ERROR(f'[{idx}/{total}] ❌ {game.title}: 크롤링 실패')
-                )
-            
-            # API 차단 방지 딜레이
-            time.sleep(delay)
+        with ledger, ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    self.crawl_game_reviews,
+                    game_id, app_id, reviews_per_game, min_length,
+                    stop_at.get(game_id), known_ids.get(game_id, set())
+                ): (game_id, title)
+                for game_id, app_id, title in targets
+            }
+            for idx, future in enumerate(as_completed(futures), 1):
+                game_id, title = futures[future]
+                reviews, pages, ok = future.result()
+                stats['pages'] += pages
+
+                pending_games.append((game_id, ok))
+                if not ok:
+                    stats['error'] += 1
+                    pending.extend(reviews)  # 실패 전까지 수집한 페이지는 저장
+                    self.stdout.write(
+                        self.style.ERROR(f'[{idx}/{total}] ❌ {title}: 크롤링 실패')
+                    )
+                elif reviews:
+                    stats['success'] += 1
+                    pending.extend(reviews)
+                    self.stdout.write(
+                        self.style.SUCCESS(f'[{idx}/{total}] ✅ {title}: {len(reviews)}개 리뷰 수집 ({pages}페이지)')
+                    )
+                else:
+                    stats['no_reviews'] += 1
+                    self.stdout.write(
+                        self.style.WARNING(f'[{idx}/{total}] ⚠️  {title}: 새 한국어 리뷰 없음')
+                    )
+
+                if len(pending) >= options['batch_size']:
+                    stats['total_reviews'] += self.save_reviews(pending)
+                    pending = []
+                    self._checkpoint(ledger, pending_games)
+
+            if pending:
+                stats['total_reviews'] += self.save_reviews(pending)
+            self._checkpoint(ledger, pending_games)
+            ledger.add_stats(pages=stats['pages'], reviews_saved=stats['total_reviews'])
+        elapsed = time.time() - started
 
         # 결과 요약
         self.stdout.write(self.style.SUCCESS(f'\n{"="*70}'))
@@ -132,112 +228,129 @@ class Command(BaseCommand):
         self.stdout.write(f'⚠️  리뷰 없음: {stats["no_reviews"]}개 게임')
         self.stdout.write(f'❌ 실패: {stats["error"]}개 게임')
         self.stdout.write(f'📝 총 저장된 리뷰: {stats["total_reviews"]}개')
+        self.stdout.write(
+            f'⏱️  {elapsed:.1f}초, {stats["pages"]}페이지 요청 '
+            f'({total / elapsed if elapsed else 0:.2f} games/s)'
+        )
+        self.stdout.write(f'📒 {ledger.summary_line()}')
         self.stdout.write(self.style.SUCCESS(f'{"="*70}\n'))
 
-    def fetch_reviews_for_game(self, game, num_reviews, min_length):
+    def _checkpoint(self, ledger, pending_games):
+        """저장이 끝난 게임들을 실행 기록에 반영 (실패한 게임은 --resume 에서 재시도)"""
+        for game_id, ok in pending_games:
+            ledger.record(game_id, ok=ok, error=None if ok else '크롤링 실패')
+        pending_games.clear()
+
+    def crawl_game_reviews(self, game_id, app_id, max_reviews, min_length, stop_at=None, known_ids=frozenset()):
         """
-        특정 게임의 Steam 리뷰를 가져와 저장
-        
+        특정 게임의 Steam 리뷰를 cursor 페이지네이션으로 수집 (DB 접근 없음, 워커 스레드용)
+
+        Args:
+            stop_at: 이 시각 이하로 수정된 리뷰에 도달하면 중단 (증분 모드)
+            known_ids: 이미 저장된 리뷰 ID (건너뛰고 상한에 포함하지 않음)
+
         Returns:
-            int: 저장된 리뷰 수 (-1 = 에러)
+            tuple: (SteamReview 인스턴스 리스트, 요청 페이지 수, 성공 여부)
         """
-        app_id = game.steam_appid
-        url = f"https://store.steampowered.com/appreviews/{app_id}"
-        
+        url = STEAM_REVIEWS_URL.format(app_id=app_id)
         params = {
             'json': 1,
-            'filter': 'updated',      # 최신 수정된 리뷰 순
+            'filter': 'updated',      # 최신 수정된 리뷰 순 (증분 중단 기준)
             'language': 'koreana',    # 한국어 리뷰만
-            'num_per_page': num_reviews * 2,  # 여유 있게 가져오기 (필터링 고려)
+            'num_per_page': min(MAX_PAGE_SIZE, max(20, max_reviews * 2)),  # 짧은 리뷰 필터링 고려
             'purchase_type': 'all',   # 스팀 구매 + 키 등록 모두
-            'review_type': 'all'      # 긍정/부정 모두
+            'review_type': 'all',     # 긍정/부정 모두
+            'cursor': '*',
         }
+        reviews = []
+        seen_ids = set()
+        pages = 0
 
         try:
-            response = requests.get(url, params=params, timeout=10)
-            
-            if response.status_code != 200:
-                return -1
-            
-            data = response.json()
-
-            if data.get('success') != 1:
-                return -1
-            
-            reviews_data = data.get('reviews', [])
-            
-            if not reviews_data:
-                return 0
-
-            saved_count = 0
-
-            for item in reviews_data:
-                if saved_count >= num_reviews:
+            while len(reviews) < max_reviews:
+                response = http_client.get(url, params=params)
+                pages += 1
+
+                if response.status_code != 200:
+                    return reviews, pages, False
+
+                data = response.json()
+                if data.get('success') != 1:
+                    return reviews, pages, False
+
+                items = data.get('reviews', [])
+                reached_known = False
+                for item in items:
+                    updated = item.get('timestamp_updated')
+                    if stop_at and updated and self._to_datetime(updated) <= stop_at:
+                        reached_known = True
+                        break
+                    review = self.parse_review(item, game_id, min_length)
+                    if review is None or review.steam_review_id in seen_ids or review.steam_review_id in known_ids:
+                        continue
+                    seen_ids.add(review.steam_review_id)
+                    reviews.append(review)
+                    if len(reviews) >= max_reviews:
+                        break
+
+                # 마지막 페이지 (빈 결과 / 같은 cursor 반복) 또는 이미 저장된 구간 도달
+                next_cursor = data.get('cursor')
+                if reached_known or not items or not next_cursor or next_cursor == params['cursor']:
                     break
-                
-                # 리뷰 ID (중복 체크용)
-                review_id = item.get('recommendationid', '')
-                if not review_id:
-                    continue
-                
-                # 이미 저장된 리뷰면 스킵
-                if SteamReview.objects.filter(steam_review_id=review_id).exists():
-                    continue
-                
-                # 리뷰 내용
-                content = item.get('review', '').strip()
-                
-                # 너무 짧은 리뷰 스킵
-                if len(content) < min_length:
-                    continue
-                
-                # 작성자 정보
-                author_data = item.get('author', {})
-                steam_author_id = author_data.get('steamid', 'unknown')
-                playtime_forever = author_data.get('playtime_forever', 0) // 60  # 분→시간
-                playtime_at_review = author_data.get('playtime_at_review', 0) // 60
-                
-                # 평가 정보
-                is_recommended = item.get('voted_up', True)
-                votes_up = item.get('votes_up', 0)
-                votes_funny = item.get('votes_funny', 0)
-                
-                # 시간 정보
-                timestamp_created = None
-                timestamp_updated = None
-                
-                if item.get('timestamp_created'):
-                    timestamp_created = timezone.make_aware(
-                        datetime.fromtimestamp(item['timestamp_created'])
-                    )
-                if item.get('timestamp_updated'):
-                    timestamp_updated = timezone.make_aware(
-                        datetime.fromtimestamp(item['timestamp_updated'])
-                    )
-                
-                # DB 저장
-                try:
-                    SteamReview.objects.create(
-                        game=game,
-                        steam_review_id=review_id,
-                        steam_author_id=steam_author_id,
-                        author_playtime_hours=playtime_forever,
-                        author_playtime_at_review=playtime_at_review,
-                        content=content,
-                        is_recommended=is_recommended,
-                        votes_up=votes_up,
-                        votes_funny=votes_funny,
-                        timestamp_created=timestamp_created,
-                        timestamp_updated=timestamp_updated,
-                    )
-                    saved_count += 1
-                except Exception as e:
-                    # 중복 등 에러는 무시
-                    pass
-            
-            return saved_count
-
-        except requests.Timeout:
-            return -1
-        except Exception as e:
-            return -1
+                params['cursor'] = next_cursor
+
+            return reviews, pages, True
+
+        except requests.RequestException:
+            return reviews, pages, False
+        except ValueError:
+            return reviews, pages, False
+
+    def parse_review(self, item, game_id, min_length):
+        """API 리뷰 항목 → SteamReview (저장 안 함), 조건 미달 시 None"""
+        # 리뷰 ID (중복 체크용)
+        review_id = item.get('recommendationid', '')
+        if not review_id:
+            return None
+
+        # 너무 짧은 리뷰 스킵
+        content = item.get('review', '').strip()
+        if len(content) < min_length:
+            return None
+
+        # 작성자 정보
+        author_data = item.get('author', {})
+
+        return SteamReview(
+            game_id=game_id,
+            steam_review_id=review_id,
+            steam_author_id=author_data.get('steamid', 'unknown'),
+            author_playtime_hours=author_data.get('playtime_forever', 0) // 60,  # 분→시간
+            author_playtime_at_review=author_data.get('playtime_at_review', 0) // 60,
+            content=content,
+            is_recommended=item.get('voted_up', True),
+            votes_up=item.get('votes_up', 0),
+            votes_funny=item.get('votes_funny', 0),
+            timestamp_created=self._to_datetime(item.get('timestamp_created')),
+            timestamp_updated=self._to_datetime(item.get('timestamp_updated')),
+        )
+
+    def save_reviews(self, reviews):
+        """
+        리뷰 일괄 저장 (이미 있는 steam_review_id 는 무시)
+
+        Returns:
+            int: 새로 저장된 리뷰 수
+        """
+        ids = [r.steam_review_id for r in reviews]
+        existing = set(
+            SteamReview.objects.filter(steam_review_id__in=ids).values_list('steam_review_id', flat=True)
+        )
+        SteamReview.objects.bulk_create(reviews, ignore_conflicts=True, batch_size=500)
+        return len(set(ids) - existing)
+
+    @staticmethod
+    def _to_datetime(timestamp):
+        if not timestamp:
+            return None
+        return timezone.make_aware(datetime.fromtimestamp(timestamp))
@@ -4,24 +4,85 @@ Steam 사용자 태그 크롤링 Management Command
 Steam 상점 페이지에서 유저들이 정의한 인기 태그를 크롤링하여 저장합니다.
 예: 소울라이크(Souls-like), 힐링(Relaxing), 심리적 공포(Psychological Horror) 등
 
+파이프라인:
+    1. fetch  - 워커 스레드가 상점 페이지 요청 (호스트 단위 토큰 버킷으로 속도 제한)
+    2. parse  - 프로세스 풀에서 HTML 파싱 (games/steam_tags.py, lxml 설치 시 lxml 파서)
+    3. write  - 메인 스레드에서 배치 단위로
+                Tag bulk_create(ignore_conflicts=True) + slug→id 조회 1회
+                + Game.tags through 모델 bulk_create
+    단계별 pages/s 를 마지막에 출력합니다.
+    태그가 저장된 게임은 실행 기록(CrawlRun)에 남아 --resume 으로 이어서 실행할 수 있습니다.
+
 사용법:
     python manage.py fetch_steam_tags              # 전체 게임 (한글 태그)
     python manage.py fetch_steam_tags --english    # 영어 태그 (추천 알고리즘용)
     python manage.py fetch_steam_tags --limit=100  # 100개 게임만
     python manage.py fetch_steam_tags --force      # 기존 태그 있어도 재수집
+    python manage.py fetch_steam_tags --workers=8 --parse-workers=4 --rate=4
+    python manage.py fetch_steam_tags --force --resume  # 중단된 실행을 이어서
 
-참고: beautifulsoup4 필요
-    pip install beautifulsoup4
+참고: beautifulsoup4 필요 (lxml 은 선택)
+    pip install beautifulsoup4 lxml
 """
 
-import requests
-from bs4 import BeautifulSoup
+import multiprocessing
 import time
-import re
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
 from django.core.management.base import BaseCommand
-from django.utils.text import slugify
-from django.db import models
+from django.db import models, transaction
+from games import http_client
 from games.models import Game, Tag
+from games.run_ledger import RunLedger
+from games.steam_tags import HTML_PARSER, parse_tag_page
+
+STEAM_STORE_URL = "https://store.steampowered.com/app/{app_id}/"
+
+
+class StageTimer:
+    """파이프라인 단계별 처리 수 / 구간 시간 (첫 시작 ~ 마지막 종료)"""
+
+    def __init__(self):
+        self.count = 0
+        self.busy = 0.0
+        self.first = None
+        self.last = None
+
+    def add(self, started, elapsed, count=1):
+        self.count += count
+        self.busy += elapsed
+        self.first = started if self.first is None else min(self.first, started)
+        self.last = max(self.last or 0, started + elapsed)
+
+    def pages_per_sec(self):
+        span = (self.last - self.first) if self.first is not None else 0
+        return self.count / span if span > 0 else 0.0
+
+
+def fetch_store_page(app_id, cookies, headers):
+    """
+    상점 페이지 요청 (워커 스레드용, DB 접근 없음)
+
+    Returns:
+        tuple: (HTML, 요청 시작 시각, 소요 초)
+    """
+    started = time.perf_counter()
+    response = http_client.get(
+        STEAM_STORE_URL.format(app_id=app_id),
+        cookies=cookies,
+        headers=headers,
+        timeout=15,
+        allow_redirects=True
+    )
+
+    if response.status_code != 200:
+        raise Exception(f"HTTP {response.status_code}")
+
+    # 나이 인증 페이지로 리다이렉트된 경우 체크
+    if 'agecheck' in response.url:
+        raise Exception("Age gate 우회 실패")
+
+    return response.text, started, time.perf_counter() - started
 
 
 class Command(BaseCommand):
@@ -38,7 +99,31 @@ class Command(BaseCommand):
             '--delay',
             type=float,
             default=1.0,
-            help='요청 간 딜레이 (초, 기본: 1.0 - 스팀 서버 부하 방지)'
+            help='Steam 상점 요청 최소 간격 (초, --rate 미지정 시 rate=1/delay, 기본: 1.0 - 스팀 서버 부하 방지)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=None,
+            help='store.steampowered.com 초당 요청 수 (모든 워커 합산)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='동시 페이지 요청 워커 수 (기본: 4)'
+        )
+        parser.add_argument(
+            '--parse-workers',
+            type=int,
+            default=2,
+            help='HTML 파싱 프로세스 수 (기본: 2, 0이면 메인 프로세스에서 파싱)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='태그 저장 배치 크기 (게임 수, 기본: 50)'
         )
         parser.add_argument(
             '--english',
@@ -56,41 +141,60 @@ class Command(BaseCommand):
             default=10,
             help='게임당 최대 태그 수 (기본: 10)'
         )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='마지막 실행이 완료되지 않았으면 체크포인트에서 이어서 실행'
+        )
 
     def handle(self, *args, **options):
         limit = options['limit']
-        delay = options['delay']
         use_english = options['english']
         force = options['force']
         max_tags = options['max_tags']
+        workers = max(1, options['workers'])
+        parse_workers = max(0, options['parse_workers'])
+        batch_size = max(1, options['batch_size'])
+        rate = options['rate'] or (1 / options['delay'] if options['delay'] > 0 else None)
 
         # Steam App ID가 있는 게임만 필터링
         games = Game.objects.filter(steam_appid__isnull=False)
-        
+
         # 이미 태그가 있는 게임 제외 (force가 아닌 경우)
         if not force:
-            # 태그가 3개 미만인 게임만 대상
+            # 태그가 10개 미만인 게임만 대상
             games = games.annotate(
                 tag_count=models.Count('tags')
             ).filter(tag_count__lt=10)
-        
+
         if limit:
             games = games[:limit]
-        
-        total = games.count()
-        
+
+        targets = list(games.values_list('id', 'steam_appid', 'title'))
+
+        ledger = RunLedger.start('fetch_steam_tags', options, resume=options['resume'])
+        if ledger.resumed:
+            targets = [t for t in targets if not ledger.is_done(t[0])]
+            self.stdout.write(f'♻️  CrawlRun #{ledger.run.resumed_from_id} 이어서 실행: {len(ledger.done)}개 게임 완료됨')
+        total = len(targets)
+
         if total == 0:
+            ledger.finish()
             self.stdout.write(self.style.WARNING('처리할 게임이 없습니다.'))
             return
-        
+
+        http_client.set_rate_limit(STEAM_STORE_URL, rate, burst=workers)
+
         self.stdout.write(self.style.SUCCESS(f'\n{"="*70}'))
         self.stdout.write(self.style.SUCCESS(f'  Steam 사용자 태그 크롤링'))
         self.stdout.write(self.style.SUCCESS(f'{"="*70}'))
         self.stdout.write(f'대상 게임: {total}개')
         self.stdout.write(f'언어: {"영어 (English)" if use_english else "한국어 (Korean)"}')
         self.stdout.write(f'게임당 최대 태그: {max_tags}개')
-        self.stdout.write(f'딜레이: {delay}초')
-        self.stdout.write(f'예상 소요 시간: ~{int(total * delay / 60 + 1)}분')
+        self.stdout.write(f'요청 워커: {workers}개, 요청 속도: {f"{rate:.1f}/s" if rate else "제한 없음"}')
+        self.stdout.write(f'파싱: {parse_workers or "메인"} 프로세스, 파서: {HTML_PARSER}')
+        if rate:
+            self.stdout.write(f'예상 소요 시간: ~{int(total / rate / 60 + 1)}분')
         self.stdout.write(self.style.SUCCESS(f'{"="*70}\n'))
 
         # 성인 인증(Age Gate) 우회 쿠키
@@ -100,13 +204,13 @@ class Command(BaseCommand):
             'wants_mature_content': '1',
             'mature_content': '1',
         }
-        
+
         # 언어 설정
         if use_english:
             cookies['Steam_Language'] = 'english'
         else:
             cookies['Steam_Language'] = 'koreana'
-        
+
         # 브라우저 헤더 (봇 차단 방지)
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -120,29 +224,69 @@ class Command(BaseCommand):
             'error': 0,
             'total_tags_added': 0
         }
+        timers = {'fetch': StageTimer(), 'parse': StageTimer(), 'write': StageTimer()}
+        self._done = 0
+        self._total = total
+        self._ledger = ledger
+        started = time.perf_counter()
+
+        # 요청 스레드가 도는 중에 fork 하지 않도록 spawn (steam_tags 는 모델을 import 하지 않음)
+        parse_pool = ProcessPoolExecutor(
+            max_workers=parse_workers, mp_context=multiprocessing.get_context('spawn')
+        ) if parse_workers else None
+        try:
+            with ledger, ThreadPoolExecutor(max_workers=workers) as fetch_pool:
+                # future → (단계, game_id, title)
+                jobs = {
+                    fetch_pool.submit(fetch_store_page, app_id, cookies, headers): ('fetch', game_id, title)
+                    for game_id, app_id, title in targets
+                }
+                pending = set(jobs)
+                batch = []
+
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        stage, game_id, title = jobs.pop(future)
+                        try:
+                            result = future.result()
+                        except Exception as e:
+                            stats['error'] += 1
+                            ledger.record(game_id, ok=False, error=e)
+                            self._report(self.style.ERROR, f'❌ {title}: {str(e)}')
+                            continue
+
+                        if stage == 'fetch':
+                            html, fetch_started, elapsed = result
+                            timers['fetch'].add(fetch_started, elapsed)
+                            if parse_pool is None:
+                                tags, parse_elapsed = parse_tag_page(html, max_tags)
+                                timers['parse'].add(time.perf_counter() - parse_elapsed, parse_elapsed)
+                                batch.append((game_id, title, tags))
+                            else:
+                                parse_future = parse_pool.submit(parse_tag_page, html, max_tags)
+                                jobs[parse_future] = ('parse', game_id, title)
+                                pending.add(parse_future)
+                        else:
+                            tags, parse_elapsed = result
+                            # 프로세스 간 시계가 달라 완료 시점 기준으로 구간 기록
+                            timers['parse'].add(time.perf_counter() - parse_elapsed, parse_elapsed)
+                            batch.append((game_id, title, tags))
+
+                    if len(batch) >= batch_size:
+                        self._flush(batch, stats, timers['write'])
+                        batch = []
 
-        for idx, game in enumerate(games, 1):
-            try:
-                count = self.update_game_tags(game, cookies, headers, max_tags)
-                
-                if count > 0:
-                    stats['success'] += 1
-                    stats['total_tags_added'] += count
-                    self.stdout.write(
-                        self.style.SUCCESS(f'[{idx}/{total}] ✅ {game.title}: {count}개 태그 추가')
-                    )
-                else:
-                    stats['no_tags'] += 1
-                    self.stdout.write(
-                        self.style.WARNING(f'[{idx}/{total}] ⚠️  {game.title}: 태그 없음')
-                    )
-            except Exception as e:
-                stats['error'] += 1
-                self.stdout.write(
-                    self.style.ERROR(f'[{idx}/{total}] ❌ {game.title}: {str(e)}')
-                )
-            
-            time.sleep(delay)
+                if batch:
+                    self._flush(batch, stats, timers['write'])
+                ledger.add_stats(**{
+                    f'{name}_pages_per_sec': round(timer.pages_per_sec(), 2) for name, timer in timers.items()
+                })
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown()
+
+        elapsed = time.perf_counter() - started
 
         # 결과 요약
         self.stdout.write(self.style.SUCCESS(f'\n{"="*70}'))
@@ -153,156 +297,84 @@ class Command(BaseCommand):
         self.stdout.write(f'❌ 실패: {stats["error"]}개 게임')
         self.stdout.write(f'🏷️  총 추가된 태그: {stats["total_tags_added"]}개')
         self.stdout.write(f'📊 DB 전체 태그 수: {Tag.objects.count()}개')
+        self.stdout.write(f'⏱️  {elapsed:.1f}초 ({total / elapsed if elapsed else 0:.2f} games/s)')
+        for name, timer in timers.items():
+            self.stdout.write(
+                f'   {name:<5} {timer.count:>5} pages  {timer.pages_per_sec():>7.2f} pages/s  '
+                f'(작업 합계 {timer.busy:.1f}초)'
+            )
+        self.stdout.write(f'📒 {ledger.summary_line()}')
         self.stdout.write(self.style.SUCCESS(f'{"="*70}\n'))
 
-    def update_game_tags(self, game, cookies, headers, max_tags):
+    def _report(self, style, message):
+        self._done += 1
+        self.stdout.write(style(f'[{self._done}/{self._total}] {message}'))
+
+    def _flush(self, batch, stats, timer):
+        """배치 저장 후 게임별 결과 출력"""
+        started = time.perf_counter()
+        added = self.save_tags(batch)
+        elapsed = time.perf_counter() - started
+        timer.add(started, elapsed, count=len(batch))
+
+        for game_id, title, tags in batch:
+            count = added.get(game_id, 0)
+            # 태그 없음도 완료로 기록 (--resume 에서 다시 요청하지 않음)
+            self._ledger.record(game_id, ok=bool(tags), done=True)
+            if count > 0:
+                stats['success'] += 1
+                stats['total_tags_added'] += count
+                self._report(self.style.SUCCESS, f'✅ {title}: {count}개 태그 추가')
+            elif not tags:
+                stats['no_tags'] += 1
+                self._report(self.style.WARNING, f'⚠️  {title}: 태그 없음')
+            else:
+                stats['success'] += 1
+                self._report(self.style.SUCCESS, f'✅ {title}: 새 태그 없음 ({len(tags)}개 이미 연결됨)')
+
+    def save_tags(self, batch):
         """
-        특정 게임의 Steam 태그를 크롤링하여 저장
-        
+        여러 게임의 태그를 한 번에 저장
+
+        Args:
+            batch: [(game_id, title, [(tag_name, slug, tag_type), ...]), ...]
+
         Returns:
-            int: 추가된 태그 수
+            dict: {game_id: 새로 연결된 태그 수}
         """
-        app_id = game.steam_appid
-        url = f"https://store.steampowered.com/app/{app_id}/"
-
-        response = requests.get(
-            url, 
-            cookies=cookies, 
-            headers=headers, 
-            timeout=15,
-            allow_redirects=True
-        )
-        
-        if response.status_code != 200:
-            raise Exception(f"HTTP {response.status_code}")
-        
-        # 나이 인증 페이지로 리다이렉트된 경우 체크
-        if 'agecheck' in response.url:
-            raise Exception("Age gate 우회 실패")
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-
-        # 스팀 상점 페이지의 '인기 태그' 영역
-        # 클래스: .app_tag (glance_tags popular_tags 내부)
-        tag_elements = soup.select('.app_tag')
-        
-        if not tag_elements:
-            # 대체 선택자 시도
-            tag_elements = soup.select('.popular_tags .app_tag')
-        
-        if not tag_elements:
-            return 0
-
-        new_tags = []
-        for tag_el in tag_elements:
-            tag_text = tag_el.get_text(strip=True)
-            
-            # 쓸모없는 태그 제외
-            if tag_text in ['+', '', ' ']:
-                continue
-            
-            # 너무 긴 태그 제외 (보통 버그)
-            if len(tag_text) > 50:
-                continue
-                
-            new_tags.append(tag_text)
-
-        # 상위 N개만 사용
-        top_tags = new_tags[:max_tags]
-        
-        if not top_tags:
-            return 0
-
-        added_count = 0
-        
-        for tag_name in top_tags:
-            # slug 생성 (영어가 아닌 경우 해싱)
-            slug = self.create_slug(tag_name)
-            
-            # 태그 유형 결정
-            tag_type = self.determine_tag_type(tag_name)
-            
-            # Tag 객체 가져오거나 생성
-            tag, created = Tag.objects.get_or_create(
-                slug=slug,
-                defaults={
-                    'name': tag_name,
-                    'tag_type': tag_type,
-                    'weight': 1.0
-                }
+        specs = {}
+        for _, _, tags in batch:
+            for name, slug, tag_type in tags:
+                specs.setdefault(slug, (name, tag_type))
+        if not specs:
+            return {}
+
+        Through = Game.tags.through
+        game_ids = [game_id for game_id, _, tags in batch if tags]
+
+        with transaction.atomic():
+            # 없는 태그만 생성 (slug 유니크), 이후 slug → id 한 번에 조회
+            Tag.objects.bulk_create(
+                [Tag(name=name, slug=slug, tag_type=tag_type, weight=1.0)
+                 for slug, (name, tag_type) in specs.items()],
+                ignore_conflicts=True,
+                batch_size=500,
             )
-            
-            # 게임에 태그 추가 (이미 있으면 무시됨)
-            if tag not in game.tags.all():
-                game.tags.add(tag)
-                added_count += 1
-        
-        return added_count
-
-    def create_slug(self, tag_name):
-        """
-        태그 이름으로 slug 생성
-        한글의 경우 영어 변환 시도, 안 되면 해시
-        """
-        # 먼저 기본 slugify 시도
-        slug = slugify(tag_name, allow_unicode=False)
-        
-        if slug:
-            return slug[:50]  # 최대 50자
-        
-        # 한글 등 특수 문자의 경우, 해시 기반 slug
-        import hashlib
-        hash_suffix = hashlib.md5(tag_name.encode()).hexdigest()[:8]
-        
-        # 영어 문자만 추출
-        english_part = re.sub(r'[^a-zA-Z0-9\s]', '', tag_name)
-        english_slug = slugify(english_part) if english_part else ''
-        
-        if english_slug:
-            return f"{english_slug[:40]}-{hash_suffix}"
-        else:
-            return f"tag-{hash_suffix}"
+            tag_ids = dict(Tag.objects.filter(slug__in=list(specs)).values_list('slug', 'id'))
 
-    def determine_tag_type(self, tag_name):
-        """
-        태그 이름으로 태그 유형 결정
-        """
-        tag_lower = tag_name.lower()
-        
-        # 장르 키워드
-        genre_keywords = [
-            'rpg', 'fps', 'action', 'adventure', 'shooter', 'platformer', 
-            'strategy', 'simulation', 'racing', 'sports', 'puzzle', 
-            'roguelike', 'roguelite', 'metroidvania', 'souls-like', 'soulslike',
-            'mmorpg', 'moba', 'rts', 'turn-based', '액션', '어드벤처', '롤플레잉',
-            '슈터', '전략', '시뮬레이션', '퍼즐', '플랫포머', '로그라이크'
-        ]
-        
-        # 테마 키워드
-        theme_keywords = [
-            'horror', 'fantasy', 'sci-fi', 'cyberpunk', 'medieval', 'space',
-            'zombie', 'post-apocalyptic', 'steampunk', 'anime', 'cartoon',
-            '공포', '판타지', '사이버펑크', '중세', '좀비', '종말'
-        ]
-        
-        # 분위기 키워드
-        mood_keywords = [
-            'relaxing', 'difficult', 'challenging', 'casual', 'hardcore',
-            'atmospheric', 'funny', 'cute', 'dark', 'emotional', 'colorful',
-            '힐링', '편안', '어려움', '캐주얼', '하드코어', '귀여운', '어두운'
-        ]
-        
-        for keyword in genre_keywords:
-            if keyword in tag_lower:
-                return 'genre'
-        
-        for keyword in theme_keywords:
-            if keyword in tag_lower:
-                return 'theme'
-        
-        for keyword in mood_keywords:
-            if keyword in tag_lower:
-                return 'mood'
-        
-        # 기본값: feature
-        return 'feature'
+            existing = set(
+                Through.objects.filter(game_id__in=game_ids).values_list('game_id', 'tag_id')
+            )
+            links = {}
+            for game_id, _, tags in batch:
+                for _, slug, _ in tags:
+                    key = (game_id, tag_ids[slug])
+                    if key not in existing:
+                        links[key] = Through(game_id=game_id, tag_id=tag_ids[slug])
+
+            Through.objects.bulk_create(links.values(), ignore_conflicts=True, batch_size=500)
+
+        added = {}
+        for game_id, _ in links:
+            added[game_id] = added.get(game_id, 0) + 1
+        return added
@@ -0,0 +1,119 @@
+"""
+HTTP cassette 저장소(games/http_cassette.py) 관리 / 로컬 stub 서버 management command
+
+사용법:
+    python manage.py http_cassettes                          # 호스트별 저장 건수 / 용량 (기본)
+    python manage.py http_cassettes --clear --host api.rawg.io
+    python manage.py http_cassettes --serve --port 8765 --latency-ms 80 --inject-429 0.05
+
+녹화 / 재생 자체는 환경변수로 켭니다. (모든 커맨드 공통, 호출 코드 변경 없음)
+    HTTP_CASSETTE=record python manage.py fetch_steam_reviews --limit=20 --force
+    HTTP_CASSETTE=replay HTTP_CASSETTE_LATENCY_MS=100 python manage.py fetch_steam_reviews --limit=20 --force
+
+stub 서버는 /<host>/<path> 요청을 https://<host>/<path> 의 저장된 응답으로 돌려주므로
+--base-url 을 받는 커맨드(fetch_rawg_data 등)를 별도 프로세스의 서버로 재생할 때 사용합니다.
+    python manage.py fetch_rawg_data --base-url=http://127.0.0.1:8765/api.rawg.io/api
+"""
+
+from django.core.management.base import BaseCommand
+from games.http_cassette import CassetteStore, CassetteStubServer, get_cassette_config, get_stats
+
+
+class Command(BaseCommand):
+    help = 'Show, clear or serve recorded HTTP cassettes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir',
+            type=str,
+            default=None,
+            help='Cassette directory (default: settings.HTTP_CLIENT["CASSETTE"]["DIR"])'
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete recorded cassettes'
+        )
+        parser.add_argument(
+            '--host',
+            type=str,
+            default=None,
+            help='Limit --clear to one upstream host'
+        )
+        parser.add_argument(
+            '--serve',
+            action='store_true',
+            help='Serve cassettes over a local HTTP stub server'
+        )
+        parser.add_argument(
+            '--port',
+            type=int,
+            default=8765,
+            help='Stub server port (default: 8765)'
+        )
+        parser.add_argument(
+            '--latency-ms',
+            type=float,
+            default=0,
+            help='Added latency per stub response (default: 0)'
+        )
+        parser.add_argument(
+            '--inject-429',
+            type=float,
+            default=0,
+            help='Fraction of stub responses replaced with 429 (default: 0)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Random seed for latency jitter and 429 injection (default: 0)'
+        )
+
+    def handle(self, *args, **options):
+        cassette_dir = options['dir'] or get_cassette_config()['DIR']
+        store = CassetteStore(cassette_dir)
+
+        if options['clear']:
+            store.clear(options['host'])
+            target = options['host'] or 'all hosts'
+            self.stdout.write(self.style.SUCCESS(f"🗑️ Cleared cassettes for {target} in {cassette_dir}"))
+
+        if options['serve']:
+            self._serve(cassette_dir, options)
+            return
+
+        hosts = store.stats()
+        self.stdout.write("\n" + "="*70)
+        self.stdout.write(f"📼 HTTP cassettes: {cassette_dir} (mode: {get_cassette_config()['MODE']})")
+        self.stdout.write("="*70)
+        if not hosts:
+            self.stdout.write("  (empty)")
+        for host, row in hosts.items():
+            self.stdout.write(f"  {host:<28} entries={row['entries']:<6} size={row['bytes'] / 1024:.1f}KB")
+        total = sum(row['entries'] for row in hosts.values())
+        size = sum(row['bytes'] for row in hosts.values())
+        self.stdout.write(f"  {'total':<28} entries={total:<6} size={size / 1024:.1f}KB")
+
+    def _serve(self, cassette_dir, options):
+        server = CassetteStubServer(
+            ('127.0.0.1', options['port']),
+            cassette_dir=cassette_dir,
+            latency_ms=options['latency_ms'],
+            inject_429=options['inject_429'],
+            seed=options['seed'],
+        )
+        port = server.server_address[1]
+        self.stdout.write(self.style.SUCCESS(f"📡 Serving {cassette_dir} on http://127.0.0.1:{port}/<host>/<path>"))
+        self.stdout.write(f"   latency {options['latency_ms']}ms, 429 rate {options['inject_429']:.0%} (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+            stats = get_stats()
+            self.stdout.write(
+                f"\n📊 hits={stats.get('hits', 0)} misses={stats.get('misses', 0)} "
+                f"injected_429={stats.get('injected_429', 0)}"
+            )
@@ -0,0 +1,68 @@
+"""
+RAWG 응답 캐시(RawgResponseCache) 관리 management command
+
+사용법:
+    python manage.py rawg_cache                      # 통계 (기본)
+    python manage.py rawg_cache --prune              # 만료 행 삭제 + LRU 상한 적용
+    python manage.py rawg_cache --prune --max-entries 5000
+    python manage.py rawg_cache --clear --endpoint search
+
+적중률(hit/miss)은 프로세스 메모리 통계라 이 커맨드에서는 행 수 위주로 보이고,
+웹 서버 프로세스의 적중률은 관리자 API(/users/api/admin/timing/)의 rawg_cache 항목에서 확인합니다.
+"""
+
+from django.core.management.base import BaseCommand
+from games.rawg_cache import ENDPOINT_TTLS, clear_cache, get_cache_stats, prune_cache
+
+
+class Command(BaseCommand):
+    help = 'Show stats, prune or clear the RAWG response cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Delete expired entries and evict least recently used entries over the limit'
+        )
+        parser.add_argument(
+            '--max-entries',
+            type=int,
+            default=None,
+            help='Entry limit for --prune (default: settings.RAWG_CACHE_MAX_ENTRIES)'
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete cached responses'
+        )
+        parser.add_argument(
+            '--endpoint',
+            type=str,
+            choices=sorted(ENDPOINT_TTLS),
+            default=None,
+            help='Limit --clear to one endpoint'
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted = clear_cache(options['endpoint'])
+            self.stdout.write(self.style.SUCCESS(f"🗑️ Deleted {deleted} cached responses"))
+
+        if options['prune']:
+            result = prune_cache(options['max_entries'])
+            self.stdout.write(self.style.SUCCESS(
+                f"🧹 Pruned: {result['expired']} expired, {result['evicted']} evicted (LRU)"
+            ))
+
+        stats = get_cache_stats()
+        self.stdout.write("\n" + "="*70)
+        self.stdout.write(f"📦 RAWG response cache: {stats['entries']} / {stats['max_entries']} entries")
+        self.stdout.write("="*70)
+        for endpoint, row in stats['endpoints'].items():
+            ttl = ENDPOINT_TTLS.get(endpoint)
+            ttl_label = f"{ttl.days}d" if ttl else '-'
+            self.stdout.write(
+                f"  {endpoint:<16} entries={row['entries']:<6} ttl={ttl_label:<4} "
+                f"hits={row['hits']} neg={row['negative_hits']} miss={row['misses']} "
+                f"hit_rate={row['hit_rate']:.1%}"
+            )
@@ -0,0 +1,145 @@
+"""
+백그라운드 작업 워커 Management Command (games/jobs.py, BackgroundJob)
+
+웹 요청에서 enqueue() 한 작업(RAWG 게임 생성, 게임 설명 번역, 스크린샷, AI 프로필 이미지)을 처리합니다.
+여러 프로세스/서버에서 동시에 띄워도 조건부 UPDATE 리스로 작업은 한 번만 실행됩니다.
+워커를 띄운 환경에서는 JOB_INPROCESS_WORKERS=0 으로 웹 프로세스 처리를 끄면 됩니다.
+
+사용법:
+    python manage.py run_workers                       # 스레드 4개로 계속 실행 (Ctrl+C 로 종료)
+    python manage.py run_workers --concurrency 8
+    python manage.py run_workers --kinds games.fetch_screenshots games.import_rawg_game
+    python manage.py run_workers --once                # 지금 실행 가능한 작업만 처리하고 종료
+    python manage.py run_workers --prune-days 7        # 시작 전에 7일 지난 완료/실패 작업 삭제
+"""
+
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from games.jobs import load_handlers, make_worker_id, prune_jobs, run_next
+from games.models import BackgroundJob
+
+
+class Command(BaseCommand):
+    help = 'DB 작업 큐(BackgroundJob)의 백그라운드 작업을 처리합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=getattr(settings, 'JOB_WORKER_CONCURRENCY', 4),
+            help='동시에 실행할 작업 수 (워커 스레드 수, 기본: JOB_WORKER_CONCURRENCY)'
+        )
+        parser.add_argument(
+            '--kinds',
+            nargs='*',
+            default=None,
+            help='처리할 작업 종류 (기본: 전체)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=1.0,
+            help='할 일이 없을 때 다시 확인하는 간격 (초, 기본: 1.0)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='지금 실행 가능한 작업이 없어지면 종료'
+        )
+        parser.add_argument(
+            '--prune-days',
+            type=int,
+            default=None,
+            help='시작 전에 N일 지난 완료/실패 작업 삭제'
+        )
+
+    def handle(self, *args, **options):
+        from datetime import timedelta
+
+        start_time = time.time()
+        concurrency = max(1, options['concurrency'])
+        kinds = options['kinds'] or None
+
+        self.stdout.write("="*70)
+        self.stdout.write("⚙️  백그라운드 작업 워커")
+        self.stdout.write("="*70)
+
+        handlers = load_handlers()
+        unknown = [kind for kind in (kinds or []) if kind not in handlers]
+        if unknown:
+            self.stdout.write(self.style.ERROR(f"❌ 등록되지 않은 작업 종류: {', '.join(unknown)}"))
+            self.stdout.write(f"   사용 가능: {', '.join(sorted(handlers))}")
+            return
+
+        if options['prune_days'] is not None:
+            deleted = prune_jobs(timedelta(days=options['prune_days']))
+            self.stdout.write(f"🧹 {options['prune_days']}일 지난 작업 {deleted}개 삭제")
+
+        queued = BackgroundJob.objects.filter(status='queued')
+        if kinds:
+            queued = queued.filter(kind__in=kinds)
+        self.stdout.write(f"📋 대기 중인 작업: {queued.count()}개")
+        self.stdout.write(f"🧵 워커 스레드: {concurrency}개, 작업 종류: {', '.join(kinds or sorted(handlers))}")
+        if not options['once']:
+            self.stdout.write("   (Ctrl+C 로 종료)")
+
+        stop = threading.Event()
+        totals = Counter()
+        totals_lock = threading.Lock()
+
+        def work(index):
+            worker = make_worker_id(f"w{index}")
+            try:
+                while not stop.is_set():
+                    try:
+                        status = run_next(worker, kinds)
+                    except Exception as e:
+                        # DB 잠금 등 큐 자체 오류: 잠시 쉬고 계속
+                        self.stderr.write(f"⚠️  [{worker}] {e}")
+                        status = None
+                    if status is None:
+                        if options['once']:
+                            return
+                        stop.wait(options['poll_interval'])
+                        continue
+                    with totals_lock:
+                        totals[status] += 1
+                    if status == 'done':
+                        self.stdout.write(self.style.SUCCESS(f"✅ [{worker}] 작업 완료"))
+                    elif status == 'lost':
+                        self.stdout.write(self.style.WARNING(f"⌛ [{worker}] 리스 만료, 다른 워커가 실행한 결과 사용"))
+                    elif status == 'queued':
+                        self.stdout.write(self.style.WARNING(f"🔁 [{worker}] 작업 실패, 재시도 예약"))
+                    else:
+                        self.stdout.write(self.style.ERROR(f"❌ [{worker}] 작업 실패"))
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=work, args=(i,), name=f"job-worker-{i}", daemon=True)
+            for i in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("\n⏹️  종료 중... (실행 중인 작업이 끝나기를 기다립니다)"))
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+        elapsed = time.time() - start_time
+        self.stdout.write("="*70)
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ 워커 종료 ({elapsed:.1f}초): 완료 {totals['done']}, 재시도 예약 {totals['queued']}, 실패 {totals['failed']}"
+        ))
@@ -0,0 +1,64 @@
+"""
+번역 캐시(games/translation_cache.py) 통계 / 정리 management command
+
+사용법:
+    python manage.py translation_cache                      # 통계 (기본)
+    python manage.py translation_cache --prune              # LRU 상한 적용
+    python manage.py translation_cache --prune --max-entries 10000
+    python manage.py translation_cache --clear --prompt-version game-desc-v1
+
+웹 서버 프로세스의 적중률은 관리자 API(/users/api/admin/timing/)의 translation_cache 항목에서 확인합니다.
+"""
+
+from django.core.management.base import BaseCommand
+from games.translation_cache import PROMPT_VERSIONS, clear_cache, get_cache_stats, prune_cache
+
+
+class Command(BaseCommand):
+    help = 'Show stats, prune or clear the shared translation cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Evict least recently used entries over the limit'
+        )
+        parser.add_argument(
+            '--max-entries',
+            type=int,
+            default=None,
+            help='Entry limit for --prune (default: settings.TRANSLATION_CACHE_MAX_ENTRIES)'
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Delete cached translations'
+        )
+        parser.add_argument(
+            '--prompt-version',
+            type=str,
+            default=None,
+            help=f"Limit --clear to one prompt version (current: {', '.join(PROMPT_VERSIONS)})"
+        )
+
+    def handle(self, *args, **options):
+        if options['clear']:
+            deleted = clear_cache(options['prompt_version'])
+            self.stdout.write(self.style.SUCCESS(f"🗑️ Deleted {deleted} cached translations"))
+
+        if options['prune']:
+            evicted = prune_cache(options['max_entries'])
+            self.stdout.write(self.style.SUCCESS(f"🧹 Pruned: {evicted} evicted (LRU)"))
+
+        stats = get_cache_stats()
+        self.stdout.write("\n" + "="*70)
+        self.stdout.write(f"🌐 Translation cache: {stats['entries']} / {stats['max_entries']} entries")
+        self.stdout.write("="*70)
+        for version, count in stats['versions'].items():
+            marker = ' (current)' if version in PROMPT_VERSIONS else ''
+            self.stdout.write(f"  {version:<16} entries={count}{marker}")
+        for origin, row in stats['origins'].items():
+            self.stdout.write(
+                f"  {origin:<16} hits={row['hits']} miss={row['misses']} "
+                f"coalesced={row['coalesced']} stores={row['stores']} hit_rate={row['hit_rate']:.1%}"
+            )
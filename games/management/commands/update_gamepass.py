@@ -9,7 +9,7 @@ PC 게임패스에 포함된 게임들을 조회하여 DB의 Game 모델에 is_o
 
 from django.core.management.base import BaseCommand
 from games.models import Game
-import requests
+from games import http_client
 import time
 import re
 
@@ -37,7 +37,7 @@ class Command(BaseCommand):
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
+            response = http_client.get(url, params=params, timeout=30)
             response.raise_for_status()
             data = response.json()
             
@@ -72,7 +72,7 @@ class Command(BaseCommand):
             }
             
             try:
-                res = requests.get(base_url, params=params, timeout=30)
+                res = http_client.get(base_url, params=params, timeout=30)
                 res.raise_for_status()
                 data = res.json()
                 
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0009_add_gamepass_field'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameGenre',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('slug', models.SlugField(allow_unicode=True, max_length=60, verbose_name='장르 슬러그')),
+                ('name', models.CharField(max_length=60, verbose_name='장르명')),
+                ('quality_score', models.FloatField(default=0.0, help_text='Game.quality_score 복사본 (정렬 인덱스용)', verbose_name='품질 점수')),
+            ],
+            options={
+                'verbose_name': '게임 장르 인덱스',
+                'verbose_name_plural': '게임 장르 인덱스',
+            },
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='quality_score',
+            field=models.FloatField(default=0.0, help_text='추천 정렬용 사전 계산 점수 (build_genre_index)', verbose_name='품질 점수'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['-quality_score'], name='games_game_quality_6d3a28_idx'),
+        ),
+        migrations.AddField(
+            model_name='gamegenre',
+            name='game',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='genre_index', to='games.game'),
+        ),
+        migrations.AddIndex(
+            model_name='gamegenre',
+            index=models.Index(fields=['slug', '-quality_score'], name='games_gameg_slug_3877d8_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='gamegenre',
+            unique_together={('game', 'slug')},
+        ),
+    ]
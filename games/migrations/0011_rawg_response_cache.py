@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0010_genre_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RawgResponseCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True, verbose_name='캐시 키')),
+                ('endpoint', models.CharField(db_index=True, max_length=30, verbose_name='엔드포인트')),
+                ('status_code', models.PositiveSmallIntegerField(default=200, verbose_name='응답 코드')),
+                ('payload', models.JSONField(blank=True, null=True, verbose_name='응답 JSON')),
+                ('expires_at', models.DateTimeField(db_index=True, verbose_name='만료 시각')),
+                ('last_accessed', models.DateTimeField(db_index=True, verbose_name='최근 조회')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'RAWG 응답 캐시',
+                'verbose_name_plural': 'RAWG 응답 캐시',
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0011_rawg_response_cache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrawlRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('command', models.CharField(db_index=True, max_length=50, verbose_name='커맨드')),
+                ('status', models.CharField(choices=[('running', '실행 중'), ('completed', '완료'), ('failed', '실패'), ('interrupted', '중단')], db_index=True, default='running', max_length=20, verbose_name='상태')),
+                ('options', models.JSONField(blank=True, default=dict, verbose_name='실행 옵션')),
+                ('checkpoint', models.JSONField(blank=True, default=dict, verbose_name='체크포인트')),
+                ('partial_results', models.JSONField(blank=True, null=True, verbose_name='중간 결과')),
+                ('processed', models.PositiveIntegerField(default=0, verbose_name='처리 수')),
+                ('succeeded', models.PositiveIntegerField(default=0, verbose_name='성공 수')),
+                ('failed', models.PositiveIntegerField(default=0, verbose_name='실패 수')),
+                ('stats', models.JSONField(blank=True, default=dict, help_text='오류 유형별 횟수, 처리량 등', verbose_name='통계')),
+                ('last_error', models.TextField(blank=True, verbose_name='마지막 오류')),
+                ('started_at', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='시작 시각')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='마지막 기록')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료 시각')),
+                ('resumed_from', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resumes', to='games.crawlrun', verbose_name='이어서 실행한 기록')),
+            ],
+            options={
+                'verbose_name': '크롤링 실행 기록',
+                'verbose_name_plural': '크롤링 실행 기록',
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
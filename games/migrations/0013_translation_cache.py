@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0012_crawl_run'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TranslationCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source_hash', models.CharField(max_length=64, verbose_name='원문 해시')),
+                ('lang', models.CharField(default='ko', max_length=10, verbose_name='대상 언어')),
+                ('prompt_version', models.CharField(max_length=20, verbose_name='프롬프트 버전')),
+                ('translated', models.TextField(verbose_name='번역문')),
+                ('source_chars', models.PositiveIntegerField(default=0, verbose_name='원문 길이')),
+                ('origin', models.CharField(blank=True, max_length=20, verbose_name='최초 요청 경로')),
+                ('hits', models.PositiveIntegerField(default=0, verbose_name='적중 수')),
+                ('last_accessed', models.DateTimeField(db_index=True, verbose_name='최근 조회')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': '번역 캐시',
+                'verbose_name_plural': '번역 캐시',
+                'unique_together': {('source_hash', 'lang', 'prompt_version')},
+            },
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:31
+
+import django.db.models.deletion
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0014_background_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(choices=[('steam', 'Steam AppID'), ('rawg', 'RAWG ID')], max_length=10, verbose_name='ID 종류')),
+                ('external_id', models.IntegerField(verbose_name='외부 ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': '게임 ID 별칭',
+                'verbose_name_plural': '게임 ID 별칭',
+            },
+        ),
+        migrations.AddField(
+            model_name='game',
+            name='public_id',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.comparison.Coalesce('rawg_id', 'steam_appid', 'id'), output_field=models.IntegerField(), verbose_name='대표 ID'),
+        ),
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['public_id'], name='games_game_public__bc45f3_idx'),
+        ),
+        migrations.AddField(
+            model_name='gamealias',
+            name='game',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='games.game', verbose_name='게임'),
+        ),
+        migrations.AddConstraint(
+            model_name='gamealias',
+            constraint=models.UniqueConstraint(fields=('source', 'external_id'), name='unique_game_alias'),
+        ),
+    ]
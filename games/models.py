@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Coalesce
 from django.conf import settings
 
 
@@ -69,6 +70,15 @@ class Game(models.Model):
     background_image = models.URLField(max_length=500, blank=True)
     metacritic_score = models.IntegerField(null=True, blank=True)
     is_on_gamepass = models.BooleanField("게임패스 포함", default=False, help_text='Xbox Game Pass에 포함된 게임')
+    quality_score = models.FloatField("품질 점수", default=0.0, help_text='추천 정렬용 사전 계산 점수 (build_genre_index)')
+    # 화면/URL 에 쓰는 대표 ID (rawg_id → steam_appid → id, DB 가 저장 시 계산)
+    # 프론트엔드의 "rawg_id || steam_appid || id" 규칙과 같음, games/resolver.py PUBLIC_SPACES 로 다시 해석
+    public_id = models.GeneratedField(
+        expression=Coalesce('rawg_id', 'steam_appid', 'id'),
+        output_field=models.IntegerField(),
+        db_persist=True,
+        verbose_name="대표 ID",
+    )
     
     class Meta:
         verbose_name = "게임"
@@ -76,7 +86,9 @@ class Game(models.Model):
         indexes = [
             models.Index(fields=['steam_appid']),
             models.Index(fields=['rawg_id']),
+            models.Index(fields=['public_id']),
             models.Index(fields=['metacritic_score']),
+            models.Index(fields=['-quality_score']),
         ]
     
     def __str__(self):
@@ -110,6 +122,72 @@ class Game(models.Model):
         
         return intersection / union if union > 0 else 0.0
 
+
+class GameAlias(models.Model):
+    """
+    외부 ID → Game 해석 테이블 (source + external_id 유일)
+
+    Game.rawg_id 는 unique 가 아니라 같은 RAWG ID 의 게임이 여러 행일 수 있다.
+    별칭은 ID 하나당 한 게임(가장 먼저 만들어진 게임, pk 최소)만 가리킨다.
+
+    - Game 저장 시 시그널이 자동 등록 (games/resolver.py register_aliases)
+    - 기존 데이터 채우기 / 중복 게임 병합: python manage.py build_game_aliases [--merge]
+    - 조회는 games/resolver.py 의 메모리 맵을 거친다.
+    """
+    SOURCE_STEAM = 'steam'
+    SOURCE_RAWG = 'rawg'
+    SOURCE_CHOICES = [
+        (SOURCE_STEAM, 'Steam AppID'),
+        (SOURCE_RAWG, 'RAWG ID'),
+    ]
+
+    source = models.CharField("ID 종류", max_length=10, choices=SOURCE_CHOICES)
+    external_id = models.IntegerField("외부 ID")
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='aliases', verbose_name="게임")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['source', 'external_id'], name='unique_game_alias'),
+        ]
+        verbose_name = "게임 ID 별칭"
+        verbose_name_plural = "게임 ID 별칭"
+
+    def __str__(self):
+        return f"{self.source}:{self.external_id} → {self.game_id}"
+
+
+class GameGenre(models.Model):
+    """
+    게임 ↔ 장르 정규화 인덱스
+    
+    레거시 Game.genre("Action, RPG") 문자열을 장르 단위 행으로 펼친 테이블.
+    genre__icontains LIKE 풀스캔 대신 (slug, -quality_score) 인덱스로
+    동등 조인 + 정렬을 한 번에 처리한다.
+    
+    - games/genre_index.py 에서 생성/갱신 (Game 저장 시 자동 동기화)
+    - 전체 재구축: python manage.py build_genre_index
+    
+    사용 예시:
+        GameGenre.objects.filter(slug='rpg').order_by('-quality_score')
+    """
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='genre_index')
+    slug = models.SlugField("장르 슬러그", max_length=60, allow_unicode=True)
+    name = models.CharField("장르명", max_length=60)
+    quality_score = models.FloatField("품질 점수", default=0.0, help_text='Game.quality_score 복사본 (정렬 인덱스용)')
+    
+    class Meta:
+        verbose_name = "게임 장르 인덱스"
+        verbose_name_plural = "게임 장르 인덱스"
+        unique_together = ('game', 'slug')
+        indexes = [
+            models.Index(fields=['slug', '-quality_score']),
+        ]
+    
+    def __str__(self):
+        return f"{self.game_id} - {self.name}"
+
+
 class GameScreenshot(models.Model):
     game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='screenshots')
     image_url = models.URLField(max_length=500)
@@ -173,6 +251,160 @@ class CachedGameList(models.Model):
         return cache
 
 
+class RawgResponseCache(models.Model):
+    """
+    RAWG API 응답 캐시 (엔드포인트 + 정규화된 파라미터 → sha256 키)
+
+    - games/rawg_cache.py 의 rawg_get() 에서만 읽고 쓴다.
+    - 엔드포인트별 TTL, 404 는 payload 없이 status_code=404 로 저장 (negative cache)
+    - 최대 행 수를 넘으면 last_accessed 가 오래된 순으로 삭제 (LRU)
+    - 통계/정리: python manage.py rawg_cache --stats / --prune / --clear
+    """
+    key = models.CharField("캐시 키", max_length=64, unique=True)
+    endpoint = models.CharField("엔드포인트", max_length=30, db_index=True)
+    status_code = models.PositiveSmallIntegerField("응답 코드", default=200)
+    payload = models.JSONField("응답 JSON", null=True, blank=True)
+    expires_at = models.DateTimeField("만료 시각", db_index=True)
+    last_accessed = models.DateTimeField("최근 조회", db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "RAWG 응답 캐시"
+        verbose_name_plural = "RAWG 응답 캐시"
+
+    def __str__(self):
+        return f"{self.endpoint} [{self.status_code}] {self.key[:12]}"
+
+
+class TranslationCache(models.Model):
+    """
+    번역 결과 캐시 (정규화된 원문 sha256 + 대상 언어 + 프롬프트 버전)
+
+    - games/translation_cache.py 에서만 읽고 쓴다.
+      (translate_text_api, api_translate_game, cache_translations 공용)
+    - 프롬프트를 바꾸면 그 프롬프트의 *_PROMPT_VERSION 을 올려서 이전 번역과 섞이지 않게 한다.
+    - 최대 행 수를 넘으면 last_accessed 가 오래된 순으로 삭제 (LRU)
+    - 통계/정리: python manage.py translation_cache --prune / --clear
+    """
+    source_hash = models.CharField("원문 해시", max_length=64)
+    lang = models.CharField("대상 언어", max_length=10, default='ko')
+    prompt_version = models.CharField("프롬프트 버전", max_length=20)
+    translated = models.TextField("번역문")
+    source_chars = models.PositiveIntegerField("원문 길이", default=0)
+    origin = models.CharField("최초 요청 경로", max_length=20, blank=True)
+    hits = models.PositiveIntegerField("적중 수", default=0)
+    last_accessed = models.DateTimeField("최근 조회", db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('source_hash', 'lang', 'prompt_version')
+        verbose_name = "번역 캐시"
+        verbose_name_plural = "번역 캐시"
+
+    def __str__(self):
+        return f"{self.lang}/{self.prompt_version} {self.source_hash[:12]}"
+
+
+class CrawlRun(models.Model):
+    """
+    장시간 크롤러 커맨드 실행 기록 (체크포인트 + 처리량/오류 통계)
+
+    - games/run_ledger.py 의 RunLedger 로만 기록한다. (N건 / N초마다 flush)
+    - checkpoint: {'done': [처리 완료 키...], 'cursor': {커맨드별 위치}}
+    - partial_results: 최종 저장 전까지 메모리에만 있던 결과 (update_steam_sales 등)
+    - --resume: 같은 커맨드의 마지막 실행이 완료되지 않았으면 그 체크포인트에서 이어서 실행
+    """
+    STATUS_CHOICES = [
+        ('running', '실행 중'),
+        ('completed', '완료'),
+        ('failed', '실패'),
+        ('interrupted', '중단'),
+    ]
+
+    command = models.CharField("커맨드", max_length=50, db_index=True)
+    status = models.CharField("상태", max_length=20, choices=STATUS_CHOICES, default='running', db_index=True)
+    options = models.JSONField("실행 옵션", default=dict, blank=True)
+    checkpoint = models.JSONField("체크포인트", default=dict, blank=True)
+    partial_results = models.JSONField("중간 결과", null=True, blank=True)
+    resumed_from = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='resumes', verbose_name="이어서 실행한 기록"
+    )
+    processed = models.PositiveIntegerField("처리 수", default=0)
+    succeeded = models.PositiveIntegerField("성공 수", default=0)
+    failed = models.PositiveIntegerField("실패 수", default=0)
+    stats = models.JSONField("통계", default=dict, blank=True, help_text='오류 유형별 횟수, 처리량 등')
+    last_error = models.TextField("마지막 오류", blank=True)
+    started_at = models.DateTimeField("시작 시각", auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField("마지막 기록", auto_now=True)
+    finished_at = models.DateTimeField("종료 시각", null=True, blank=True)
+
+    class Meta:
+        ordering = ['-started_at']
+        verbose_name = "크롤링 실행 기록"
+        verbose_name_plural = "크롤링 실행 기록"
+
+    def __str__(self):
+        return f"{self.command} #{self.pk} ({self.status}, {self.processed}건)"
+
+
+class BackgroundJob(models.Model):
+    """
+    DB 기반 백그라운드 작업 큐 (외부 브로커 없음)
+
+    - games/jobs.py 의 enqueue() 로만 넣고, python manage.py run_workers 가 처리한다.
+    - key: 같은 kind + key 의 대기/실행 중 작업은 하나만 (부분 unique 인덱스, 중복 요청은 기존 작업 반환)
+    - priority 가 높은 순 → run_after 가 이른 순으로 처리
+    - locked_until: 실행 리스 (워커가 죽으면 만료 뒤 다른 워커가 다시 가져감)
+    - 실패 시 max_attempts 까지 지수 백오프로 재시도
+    """
+    STATUS_CHOICES = [
+        ('queued', '대기'),
+        ('running', '실행 중'),
+        ('done', '완료'),
+        ('failed', '실패'),
+    ]
+
+    kind = models.CharField("작업 종류", max_length=50, db_index=True)
+    key = models.CharField("중복 제거 키", max_length=200, blank=True)
+    payload = models.JSONField("입력", default=dict, blank=True)
+    status = models.CharField("상태", max_length=10, choices=STATUS_CHOICES, default='queued')
+    priority = models.SmallIntegerField("우선순위", default=0, help_text='높을수록 먼저 처리')
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True,
+        related_name='background_jobs', verbose_name="요청 유저"
+    )
+    attempts = models.PositiveSmallIntegerField("시도 횟수", default=0)
+    max_attempts = models.PositiveSmallIntegerField("최대 시도 횟수", default=3)
+    run_after = models.DateTimeField("실행 가능 시각")
+    locked_by = models.CharField("워커", max_length=100, blank=True)
+    locked_until = models.DateTimeField("리스 만료", null=True, blank=True)
+    result = models.JSONField("결과", null=True, blank=True)
+    last_error = models.TextField("마지막 오류", blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField("종료 시각", null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', '-priority', 'run_after'], name='job_claim_idx'),
+            models.Index(fields=['kind', 'key'], name='job_key_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['kind', 'key'],
+                condition=models.Q(status__in=['queued', 'running']) & ~models.Q(key=''),
+                name='unique_active_job_key',
+            ),
+        ]
+        verbose_name = "백그라운드 작업"
+        verbose_name_plural = "백그라운드 작업"
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
 class Rating(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     game = models.ForeignKey(Game, on_delete=models.CASCADE)
@@ -0,0 +1,297 @@
+"""
+RAWG API 응답 캐시 (DB 저장, 엔드포인트별 TTL)
+
+기존 방식:
+    fetch_rawg_game_details / search_games / get_genres ... 가 호출마다 RAWG 요청
+    (game_detail, api_translate_game, update_game_with_rawg 가 같은 상세 정보를 반복 조회)
+
+캐시 방식:
+    - 키: sha256(엔드포인트 + URL 호스트/경로 + 정규화된 파라미터), API key 는 키에서 제외
+    - 엔드포인트별 TTL (장르/플랫폼 30일, 상세 7일, 검색 1일)
+    - 404 는 NEGATIVE_TTL 동안 '없음'으로 기억 (Steam ID 가 RAWG ID 로 들어오는 경우 등)
+    - RAWG_CACHE_MAX_ENTRIES 초과 시 최근 조회가 오래된 행부터 삭제 (LRU)
+    - 프로세스별 적중률 통계: get_cache_stats() / python manage.py rawg_cache --stats
+
+사용 예시:
+    from games.rawg_cache import rawg_get
+    data = rawg_get('game_details', f"{BASE_URL}/games/{game_id}", {'key': RAWG_API_KEY})
+    # → dict, 404 면 None, 그 외 오류는 requests.RequestException
+
+    # 웹 요청 경로: 캐시 미스일 때 백오프 대기를 짧게 제한
+    data = rawg_get('search', url, params, max_delay=http_client.INTERACTIVE_MAX_DELAY)
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import Counter, defaultdict
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import http_client
+
+logger = logging.getLogger(__name__)
+
+# 엔드포인트별 TTL
+ENDPOINT_TTLS = {
+    'game_details': timedelta(days=7),
+    'screenshots': timedelta(days=7),
+    'movies': timedelta(days=7),
+    'search': timedelta(days=1),
+    'games_by_genre': timedelta(days=1),
+    'genres': timedelta(days=30),
+    'platforms': timedelta(days=30),
+}
+DEFAULT_TTL = timedelta(days=1)
+# 404 응답 유지 시간
+NEGATIVE_TTL = timedelta(days=1)
+# last_accessed 갱신 최소 간격 (캐시 적중마다 UPDATE 하지 않도록)
+TOUCH_INTERVAL = timedelta(minutes=10)
+# N번 저장마다 크기 상한 검사
+EVICT_CHECK_EVERY = 100
+
+_stats = defaultdict(Counter)
+_stats_lock = threading.Lock()
+
+
+def get_max_entries():
+    return getattr(settings, 'RAWG_CACHE_MAX_ENTRIES', 20000)
+
+
+def make_cache_key(endpoint, url, params=None):
+    """
+    엔드포인트 + URL 호스트/경로 + 정규화 파라미터 → sha256 (API key / None 값 제외)
+
+    호스트를 포함해야 --base-url 로 띄운 스텁/녹화 서버 응답이 실제 RAWG 응답 자리에 저장되지 않음
+    """
+    normalized = sorted(
+        (str(k), str(v)) for k, v in (params or {}).items()
+        if k != 'key' and v is not None
+    )
+    parts = urlsplit(url)
+    raw = json.dumps([endpoint, parts.netloc.lower(), parts.path, normalized], ensure_ascii=False)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def _record(endpoint, event):
+    with _stats_lock:
+        _stats[endpoint][event] += 1
+
+
+def rawg_get(endpoint, url, params=None, ttl=None, retries=None, max_delay=None, refresh=False):
+    """
+    캐시를 거쳐 RAWG GET 요청
+
+    Args:
+        endpoint: 캐시 구분 이름 (ENDPOINT_TTLS 키)
+        url: 요청 URL
+        params: 쿼리 파라미터 (key 포함 가능)
+        ttl: TTL 덮어쓰기 (timedelta)
+        retries / max_delay: 캐시 미스 시 http_client.get 에 그대로 전달
+                             (웹 요청 경로는 max_delay=http_client.INTERACTIVE_MAX_DELAY)
+        refresh: True 면 캐시 조회 없이 새로 요청하고 결과로 캐시를 덮어씀 (강제 갱신)
+
+    Returns:
+        dict: 응답 JSON (캐시 또는 새 응답), 404 면 None
+
+    Raises:
+        requests.RequestException: 404 외 HTTP 오류 / 연결 오류 (캐시하지 않음)
+    """
+    from .models import RawgResponseCache
+
+    key = make_cache_key(endpoint, url, params)
+    now = timezone.now()
+
+    entry = None
+    if not refresh:
+        try:
+            entry = (
+                RawgResponseCache.objects.filter(key=key, expires_at__gt=now)
+                .only('id', 'status_code', 'payload', 'last_accessed')
+                .first()
+            )
+        except DatabaseError as e:
+            logger.warning(f"RAWG cache read failed ({endpoint}): {e}")
+
+    if entry is not None:
+        if entry.status_code == 404:
+            _record(endpoint, 'negative_hits')
+        else:
+            _record(endpoint, 'hits')
+        if now - entry.last_accessed > TOUCH_INTERVAL:
+            RawgResponseCache.objects.filter(pk=entry.pk).update(last_accessed=now)
+        return None if entry.status_code == 404 else entry.payload
+
+    _record(endpoint, 'misses')
+    response = http_client.get(url, params=params, retries=retries, max_delay=max_delay)
+    if response.status_code == 404:
+        logger.info(f"RAWG {endpoint} 404 → negative cache ({urlsplit(url).path})")
+        _store(key, endpoint, 404, None, NEGATIVE_TTL)
+        return None
+
+    response.raise_for_status()
+    data = response.json()
+    _store(key, endpoint, response.status_code, data, ttl or ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL))
+    return data
+
+
+def _store(key, endpoint, status_code, payload, ttl):
+    from .models import RawgResponseCache
+
+    now = timezone.now()
+    try:
+        RawgResponseCache.objects.update_or_create(
+            key=key,
+            defaults={
+                'endpoint': endpoint,
+                'status_code': status_code,
+                'payload': payload,
+                'expires_at': now + ttl,
+                'last_accessed': now,
+            }
+        )
+    except DatabaseError as e:
+        logger.warning(f"RAWG cache write failed ({endpoint}): {e}")
+        return
+
+    with _stats_lock:
+        _stats[endpoint]['stores'] += 1
+        stores = sum(c['stores'] for c in _stats.values())
+    if stores % EVICT_CHECK_EVERY == 0:
+        prune_cache()
+
+
+def store_responses(rows):
+    """
+    응답 여러 개를 한 번에 캐시에 저장 (배치 작업의 단일 writer 용)
+
+    Args:
+        rows: [(endpoint, url, params, status_code, payload), ...]
+              status_code 는 200 또는 404 만 저장
+    """
+    from .models import RawgResponseCache
+
+    now = timezone.now()
+    entries = {}
+    for endpoint, url, params, status_code, payload in rows:
+        if status_code not in (200, 404):
+            continue
+        ttl = NEGATIVE_TTL if status_code == 404 else ENDPOINT_TTLS.get(endpoint, DEFAULT_TTL)
+        key = make_cache_key(endpoint, url, params)
+        entries[key] = RawgResponseCache(
+            key=key,
+            endpoint=endpoint,
+            status_code=status_code,
+            payload=payload if status_code == 200 else None,
+            expires_at=now + ttl,
+            last_accessed=now,
+        )
+    if not entries:
+        return 0
+
+    RawgResponseCache.objects.bulk_create(
+        entries.values(),
+        update_conflicts=True,
+        unique_fields=['key'],
+        update_fields=['endpoint', 'status_code', 'payload', 'expires_at', 'last_accessed'],
+        batch_size=200,
+    )
+    return len(entries)
+
+
+def prune_cache(max_entries=None):
+    """
+    만료 행 삭제 후 상한 초과분을 LRU 로 삭제
+
+    Returns:
+        dict: {'expired': n, 'evicted': n}
+    """
+    from .models import RawgResponseCache
+
+    max_entries = get_max_entries() if max_entries is None else max_entries
+    expired, _ = RawgResponseCache.objects.filter(expires_at__lte=timezone.now()).delete()
+
+    evicted = 0
+    # max_entries 번째로 최근인 행의 last_accessed 보다 오래된 행 삭제
+    cutoff = (
+        RawgResponseCache.objects.order_by('-last_accessed', '-id')
+        .values_list('last_accessed', 'id')[max_entries:max_entries + 1]
+    )
+    cutoff = list(cutoff)
+    if cutoff:
+        last_accessed, cutoff_id = cutoff[0]
+        evicted, _ = RawgResponseCache.objects.filter(
+            Q(last_accessed__lt=last_accessed) | Q(last_accessed=last_accessed, id__lte=cutoff_id)
+        ).delete()
+        with _stats_lock:
+            _stats['_all']['evictions'] += evicted
+        logger.info(f"RAWG cache evicted {evicted} entries (max {max_entries})")
+
+    return {'expired': expired, 'evicted': evicted}
+
+
+def clear_cache(endpoint=None):
+    """캐시 행 삭제 (endpoint 지정 시 해당 엔드포인트만)"""
+    from .models import RawgResponseCache
+
+    qs = RawgResponseCache.objects.all()
+    if endpoint:
+        qs = qs.filter(endpoint=endpoint)
+    deleted, _ = qs.delete()
+    return deleted
+
+
+def get_cache_stats():
+    """
+    적중률 통계 (프로세스 메모리) + DB 행 수
+
+    Returns:
+        dict: {'endpoints': {endpoint: {hits, negative_hits, misses, stores, hit_rate, entries}},
+               'total': {...}, 'entries': n, 'max_entries': n}
+    """
+    from .models import RawgResponseCache
+
+    with _stats_lock:
+        snapshot = {name: Counter(c) for name, c in _stats.items()}
+    evictions = snapshot.pop('_all', Counter())['evictions']
+
+    entries = {
+        row['endpoint']: row['count']
+        for row in RawgResponseCache.objects.values('endpoint').annotate(count=Count('id'))
+    }
+
+    def summarize(counter):
+        served = counter['hits'] + counter['negative_hits']
+        lookups = served + counter['misses']
+        return {
+            'hits': counter['hits'],
+            'negative_hits': counter['negative_hits'],
+            'misses': counter['misses'],
+            'stores': counter['stores'],
+            'hit_rate': round(served / lookups, 4) if lookups else 0.0,
+        }
+
+    endpoints = {}
+    total = Counter()
+    for name in sorted(set(snapshot) | set(entries)):
+        counter = snapshot.get(name, Counter())
+        total.update(counter)
+        endpoints[name] = {**summarize(counter), 'entries': entries.get(name, 0)}
+
+    return {
+        'endpoints': endpoints,
+        'total': {**summarize(total), 'evictions': evictions},
+        'entries': sum(entries.values()),
+        'max_entries': get_max_entries(),
+    }
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
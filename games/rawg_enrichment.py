@@ -0,0 +1,463 @@
+"""
+RAWG 데이터 보강 비동기 파이프라인 (fetch_rawg_data 용)
+
+기존 방식 (update_game_with_rawg 순차 호출):
+    게임마다 상세 → 스크린샷 → 트레일러 (→ Steam 트레일러) 를 차례로 요청하고
+    delay 만큼 sleep → 5,000개 보강에 수 시간
+
+파이프라인:
+    1. 메인 스레드: 대상 게임을 dict 스냅샷으로 읽음 (이후 이벤트 루프에서는 ORM 사용 안 함)
+    2. 이벤트 루프: concurrency 개의 워커 코루틴이 게임을 하나씩 처리
+       - 상세 / 스크린샷 / 트레일러 요청을 동시에 발행 (asyncio.gather)
+       - 실제 HTTP 는 공용 풀링 클라이언트(http_client)를 asyncio.to_thread 로 호출
+       - RAWG / Steam 요청 속도는 http_client 의 호스트별 토큰 버킷(set_rate_limit)으로 제한
+         → 같은 프로세스의 다른 호출(재시도 포함)과도 한도를 공유해 RAWG 쿼터 준수
+    3. writer 스레드 1개: 결과를 batch_size 개씩 모아 한 트랜잭션으로 반영
+       (Game bulk_update, 태그/M2M/스크린샷/트레일러 bulk_create, RAWG 응답 캐시 적재)
+       → SQLite 쓰기 경합 없음
+
+사용 예시:
+    from games.rawg_enrichment import enrich_games
+    stats = enrich_games(snapshots, concurrency=8, rate=5)
+"""
+
+import asyncio
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import close_old_connections, transaction
+
+from . import http_client
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷으로 읽어둘 Game 필드
+SNAPSHOT_FIELDS = ['id', 'title', 'steam_appid', 'rawg_id', 'description', 'background_image', 'genre', 'metacritic_score']
+# update_game_with_rawg 와 같은 '장르 미정' 값
+PLACEHOLDER_GENRES = ['Unknown', '게임', '']
+STEAM_APPDETAILS_URL = 'https://store.steampowered.com/api/appdetails'
+# Steam Store appdetails 는 5분 200회 수준 제한
+STEAM_RATE = 0.6
+STEAM_BURST = 5
+
+
+class EnrichmentStats:
+    """처리량 집계 (이벤트 루프 / writer 스레드 공용)"""
+
+    def __init__(self, total):
+        self.total = total
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.fetched = 0
+        self.game_ms = []
+        self.counts = {'success': 0, 'skipped': 0, 'failed': 0}
+
+    def add(self, key, n=1):
+        with self.lock:
+            self.counts[key] += n
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        with self.lock:
+            game_ms = sorted(self.game_ms)
+            done = sum(self.counts.values())
+            return {
+                'total': self.total,
+                'fetched': self.fetched,    # HTTP 처리 완료
+                'done': done,               # DB 반영 완료 (writer)
+                **self.counts,
+                'requests': self.requests,
+                'elapsed': round(elapsed, 2),
+                'games_per_sec': round(self.fetched / elapsed, 2) if elapsed else 0.0,
+                'requests_per_sec': round(self.requests / elapsed, 2) if elapsed else 0.0,
+                'p50_game_ms': round(game_ms[len(game_ms) // 2], 1) if game_ms else 0.0,
+                'p95_game_ms': round(game_ms[min(len(game_ms) - 1, int(len(game_ms) * 0.95))], 1) if game_ms else 0.0,
+            }
+
+
+class RawgEnricher:
+    """게임 스냅샷 → RAWG 응답 묶음 (DB 접근 없음)"""
+
+    def __init__(self, api_key, base_url, stats, steam_fallback=True):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.stats = stats
+        self.steam_fallback = steam_fallback
+
+    async def _get(self, url, params):
+        # 속도 제한은 http_client 가 스레드 안에서 적용 (enrich_games 에서 set_rate_limit)
+        response = await asyncio.to_thread(http_client.get, url, params=params)
+        with self.stats.lock:
+            self.stats.requests += 1
+        if response.status_code == 404:
+            return 404, None
+        response.raise_for_status()
+        return response.status_code, response.json()
+
+    async def _rawg(self, result, endpoint, path, params=None):
+        """RAWG 요청 + 캐시 적재용 응답 기록"""
+        url = f"{self.base_url}{path}"
+        params = {'key': self.api_key, **(params or {})}
+        status, data = await self._get(url, params)
+        result['cache_rows'].append((endpoint, url, params, status, data))
+        return data
+
+    async def resolve_rawg_id(self, game, result):
+        """get_rawg_game_id 와 같은 순서: Steam 스토어 검색 + 상세 URL 매칭 → 정확 제목 검색"""
+        if game['steam_appid']:
+            data = await self._rawg(result, 'search', '/games', {
+                'stores': '1', 'search': game['title'], 'page_size': 5,
+            }) or {}
+            candidates = [r['id'] for r in data.get('results', [])]
+            details_list = await asyncio.gather(*[
+                self._rawg(result, 'game_details', f'/games/{rawg_id}') for rawg_id in candidates
+            ])
+            appid = game['steam_appid']
+            for rawg_id, details in zip(candidates, details_list):
+                for store in (details or {}).get('stores', []):
+                    store_url = store.get('url', '')
+                    if store.get('store', {}).get('id') == 1 and (f'/{appid}' in store_url or f'app/{appid}' in store_url):
+                        return rawg_id, details
+
+        data = await self._rawg(result, 'search', '/games', {
+            'search': game['title'], 'search_precise': True, 'page_size': 1,
+        }) or {}
+        if data.get('results'):
+            return data['results'][0]['id'], None
+        return None, None
+
+    async def enrich(self, game):
+        """
+        Returns:
+            dict: {'game_id', 'rawg_id', 'details', 'screenshots', 'movies', 'steam_movies', 'cache_rows'}
+        """
+        result = {
+            'game_id': game['id'],
+            'rawg_id': game['rawg_id'],
+            'details': None,
+            'screenshots': [],
+            'movies': [],
+            'steam_movies': [],
+            'cache_rows': [],
+        }
+        rawg_id = game['rawg_id']
+        details = None
+
+        if rawg_id:
+            # 기존 ID 검증과 스크린샷/트레일러를 동시에 요청 (대부분 유효한 ID)
+            details, screenshots, movies = await asyncio.gather(
+                self._rawg(result, 'game_details', f'/games/{rawg_id}'),
+                self._rawg(result, 'screenshots', f'/games/{rawg_id}/screenshots', {'page_size': 10}),
+                self._rawg(result, 'movies', f'/games/{rawg_id}/movies'),
+            )
+            if details is None:
+                # 404 → Steam ID 가 RAWG ID 로 저장된 경우, 다시 검색
+                logger.warning(f"Invalid RAWG ID {rawg_id} for '{game['title']}', re-searching")
+                rawg_id = None
+
+        if not rawg_id:
+            rawg_id, details = await self.resolve_rawg_id(game, result)
+            result['rawg_id'] = rawg_id
+            if not rawg_id:
+                return result
+            details, screenshots, movies = await asyncio.gather(
+                self._rawg(result, 'game_details', f'/games/{rawg_id}') if details is None else _done(details),
+                self._rawg(result, 'screenshots', f'/games/{rawg_id}/screenshots', {'page_size': 10}),
+                self._rawg(result, 'movies', f'/games/{rawg_id}/movies'),
+            )
+
+        result['details'] = details
+        result['screenshots'] = (screenshots or {}).get('results', [])
+        result['movies'] = [
+            tr for tr in (movies or {}).get('results', [])
+            if '480' in tr.get('data', {}) and 'max' in tr.get('data', {})
+        ]
+
+        if details and not result['movies'] and self.steam_fallback and game['steam_appid']:
+            result['steam_movies'] = await self._steam_movies(game['steam_appid'])
+        return result
+
+    async def _steam_movies(self, appid):
+        """fetch_steam_trailers 와 같은 RAWG 트레일러 대체 (Steam Store appdetails)"""
+        try:
+            status, data = await self._get(STEAM_APPDETAILS_URL, {'appids': appid})
+        except Exception as e:
+            logger.warning(f"Steam trailer fallback failed for {appid}: {e}")
+            return []
+        app = (data or {}).get(str(appid)) or {}
+        if not app.get('success'):
+            return []
+        return app.get('data', {}).get('movies', [])
+
+
+async def _done(value):
+    return value
+
+
+class EnrichmentWriter(threading.Thread):
+    """결과 큐를 배치 단위로 DB 에 반영하는 단일 writer 스레드"""
+
+    def __init__(self, stats, batch_size=50, flush_interval=2.0, on_saved=None):
+        super().__init__(daemon=True)
+        self.stats = stats
+        self.on_saved = on_saved
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=batch_size * 4)
+        self.error = None
+
+    def put(self, result):
+        self.queue.put(result)
+
+    def close(self):
+        self.queue.put(None)
+        self.join()
+
+    def run(self):
+        batch = []
+        last_flush = time.monotonic()
+        try:
+            while True:
+                try:
+                    item = self.queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = False
+                if item:
+                    batch.append(item)
+                if batch and (item is None or len(batch) >= self.batch_size
+                              or time.monotonic() - last_flush >= self.flush_interval):
+                    self._flush(batch)
+                    batch = []
+                    last_flush = time.monotonic()
+                if item is None:
+                    break
+        except Exception as e:
+            logger.exception("Enrichment writer failed")
+            self.error = e
+            # 이벤트 루프가 put() 에서 막히지 않도록 남은 결과를 비운다 (반영 못 한 게임은 실패 처리)
+            while self.queue.get() is not None:
+                self.stats.add('failed')
+        finally:
+            close_old_connections()
+
+    def _flush(self, batch):
+        try:
+            apply_results(batch, self.stats)
+        except Exception:
+            self.stats.add('failed', len(batch))
+            raise
+        if self.on_saved:
+            self.on_saved([r['game_id'] for r in batch])
+
+
+def apply_results(results, stats=None):
+    """
+    RAWG 응답 묶음을 한 트랜잭션으로 DB 반영 (update_game_with_rawg 와 같은 규칙)
+
+    Returns:
+        dict: {'success', 'skipped'}
+    """
+    from .genre_index import rebuild_genre_index
+    from .models import Game, GameScreenshot, GameTrailer, Tag
+    from .rawg_cache import store_responses
+    from .utils import get_tag_type
+
+    games = Game.objects.in_bulk([r['game_id'] for r in results])
+    changed = []
+    reindex_ids = []
+    tag_specs = {}      # slug → (name, tag_type)
+    game_tags = []      # (game_id, slug)
+    screenshot_rows = []
+    trailer_rows = []
+    steam_replaced = []
+    counts = {'success': 0, 'skipped': 0}
+
+    for r in results:
+        game = games.get(r['game_id'])
+        if game is None:
+            counts['skipped'] += 1
+            continue
+
+        fields = set()
+        if game.rawg_id != r['rawg_id']:
+            game.rawg_id = r['rawg_id']
+            fields.add('rawg_id')
+
+        details = r['details']
+        if not details:
+            counts['skipped'] += 1
+            if fields:
+                changed.append(game)
+            continue
+
+        description = details.get('description_raw', '') or details.get('description', '')
+        if description:
+            game.description = description
+        if details.get('background_image'):
+            game.background_image = details['background_image']
+        if details.get('metacritic'):
+            game.metacritic_score = details['metacritic']
+        if game.genre in PLACEHOLDER_GENRES and details.get('genres'):
+            game.genre = ', '.join(g['name'] for g in details['genres'][:3])
+        changed.append(game)
+        reindex_ids.append(game.id)
+
+        for genre_data in details.get('genres', []):
+            tag_specs.setdefault(genre_data['slug'][:50], (genre_data['name'][:50], 'genre'))
+            game_tags.append((game.id, genre_data['slug'][:50]))
+        for tag_data in details.get('tags', []):
+            if tag_data.get('language', 'eng') != 'eng':
+                continue
+            slug = tag_data['slug'][:50]
+            tag_specs.setdefault(slug, (tag_data['name'][:50], get_tag_type(tag_data['slug'])))
+            game_tags.append((game.id, slug))
+
+        for ss in r['screenshots']:
+            if ss.get('image'):
+                screenshot_rows.append((game.id, ss['image']))
+        for tr in r['movies']:
+            trailer_rows.append(GameTrailer(
+                game_id=game.id,
+                name=tr['name'],
+                preview_url=tr.get('preview', ''),
+                data_480=tr['data']['480'],
+                data_max=tr['data']['max'],
+            ))
+        steam_trailers = [
+            GameTrailer(
+                game_id=game.id,
+                name=movie.get('name', 'Steam Trailer'),
+                preview_url=movie.get('thumbnail', ''),
+                data_480=movie.get('mp4', {}).get('480', ''),
+                data_max=movie.get('mp4', {}).get('max', ''),
+            )
+            for movie in r['steam_movies']
+            if movie.get('mp4', {}).get('max') or movie.get('mp4', {}).get('480')
+        ]
+        if steam_trailers:
+            steam_replaced.append(game.id)
+            trailer_rows.extend(steam_trailers)
+        counts['success'] += 1
+
+    with transaction.atomic():
+        if changed:
+            Game.objects.bulk_update(
+                changed,
+                ['rawg_id', 'description', 'background_image', 'metacritic_score', 'genre'],
+                batch_size=200,
+            )
+
+        if tag_specs:
+            Tag.objects.bulk_create(
+                [Tag(slug=slug, name=name, tag_type=tag_type, weight=1.0) for slug, (name, tag_type) in tag_specs.items()],
+                ignore_conflicts=True,
+            )
+            tag_ids = dict(Tag.objects.filter(slug__in=tag_specs).values_list('slug', 'id'))
+            Through = Game.tags.through
+            Through.objects.bulk_create(
+                [Through(game_id=game_id, tag_id=tag_ids[slug]) for game_id, slug in set(game_tags) if slug in tag_ids],
+                ignore_conflicts=True,
+                batch_size=500,
+            )
+
+        # 스크린샷/트레일러 중복 방지 (get_or_create 와 같은 기준)
+        game_ids = [r['game_id'] for r in results]
+        existing_ss = set(GameScreenshot.objects.filter(game_id__in=game_ids).values_list('game_id', 'image_url'))
+        GameScreenshot.objects.bulk_create(
+            [GameScreenshot(game_id=gid, image_url=url) for gid, url in dict.fromkeys(screenshot_rows) if (gid, url) not in existing_ss],
+            batch_size=500,
+        )
+        if steam_replaced:
+            GameTrailer.objects.filter(game_id__in=steam_replaced).delete()
+        existing_tr = set(GameTrailer.objects.filter(game_id__in=game_ids).values_list('game_id', 'name'))
+        new_trailers = {}
+        for tr in trailer_rows:
+            if (tr.game_id, tr.name) not in existing_tr:
+                new_trailers.setdefault((tr.game_id, tr.name), tr)
+        GameTrailer.objects.bulk_create(new_trailers.values(), batch_size=500)
+
+        store_responses(row for r in results for row in r['cache_rows'])
+
+    # bulk_update 는 post_save 시그널이 없으므로 장르 인덱스/품질 점수를 직접 갱신
+    if reindex_ids:
+        rebuild_genre_index(Game.objects.filter(pk__in=reindex_ids))
+
+    if stats is not None:
+        stats.add('success', counts['success'])
+        stats.add('skipped', counts['skipped'])
+    return counts
+
+
+async def _run_pipeline(snapshots, enricher, writer, stats, concurrency, on_progress, progress_every):
+    games = asyncio.Queue()
+    for game in snapshots:
+        games.put_nowait(game)
+
+    async def worker():
+        while True:
+            try:
+                game = games.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            try:
+                result = await enricher.enrich(game)
+            except Exception as e:
+                logger.error(f"RAWG enrichment failed for '{game['title']}': {e}")
+                stats.add('failed')
+            else:
+                # 큐가 가득 차면 writer 가 따라올 때까지 이벤트 루프 밖에서 대기
+                await asyncio.to_thread(writer.put, result)
+            with stats.lock:
+                stats.game_ms.append((time.perf_counter() - started) * 1000)
+                stats.fetched += 1
+                fetched = stats.fetched
+            if on_progress and fetched % progress_every == 0:
+                on_progress(stats.summary())
+
+    await asyncio.gather(*[worker() for _ in range(concurrency)])
+
+
+def enrich_games(snapshots, api_key, base_url, concurrency=8, rate=5.0, burst=10, batch_size=50,
+                 steam_fallback=True, on_progress=None, progress_every=25, on_saved=None):
+    """
+    게임 스냅샷 목록을 비동기로 보강하고 DB 에 반영
+
+    Args:
+        snapshots: Game.objects.values(*SNAPSHOT_FIELDS) 결과 리스트
+        rate / burst: RAWG 호스트 속도 제한 (초당 요청 수 / 순간 최대, http_client.set_rate_limit)
+        on_progress: progress_every 게임마다 호출되는 콜백 (summary dict)
+        on_saved: 배치가 DB 에 반영될 때마다 writer 스레드에서 호출되는 콜백 (game_id 리스트)
+
+    Returns:
+        dict: EnrichmentStats.summary()
+    """
+    stats = EnrichmentStats(len(snapshots))
+    enricher = RawgEnricher(api_key, base_url, stats, steam_fallback=steam_fallback)
+    writer = EnrichmentWriter(stats, batch_size=batch_size, on_saved=on_saved)
+    writer.start()
+
+    # 게임당 동시 요청 3개 (+ Steam 대체) 만큼 커넥션 풀 확보, 호스트별 속도 제한 공유
+    http_client.get_session(base_url, pool_maxsize=concurrency * 3)
+    http_client.set_rate_limit(base_url, rate, burst=burst)
+    if steam_fallback:
+        http_client.get_session(STEAM_APPDETAILS_URL, pool_maxsize=concurrency)
+        http_client.set_rate_limit(STEAM_APPDETAILS_URL, STEAM_RATE, burst=STEAM_BURST)
+
+    async def main():
+        # 게임당 동시 요청 3개 + writer.put 대기 스레드
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=concurrency * 4))
+        await _run_pipeline(snapshots, enricher, writer, stats, concurrency, on_progress, progress_every)
+
+    try:
+        asyncio.run(main())
+    finally:
+        writer.close()
+
+    if writer.error:
+        raise writer.error
+    return stats.summary()
@@ -0,0 +1,297 @@
+"""
+게임 ID 해석 (Steam AppID / RAWG ID / DB pk → Game, GameAlias 메모리 맵 + TTL negative cache)
+
+기존 방식:
+    game_detail 이 steam_appid(2번) → rawg_id → pk 순으로 최대 4번 순차 조회,
+    못 찾으면 매번 RAWG 조회 (크롤러/잘못된 링크가 없는 ID 를 반복 요청하면 RAWG 호출도 반복)
+    api_reviews_by_rawg_id, api_wishlist_status_by_rawg_id, get_game_rating_api, save_user_rating 도
+    각자 다른 방식으로 조회 (save_user_rating 은 중복 rawg_id 가 있으면 MultipleObjectsReturned)
+
+해석 방식:
+    - GameAlias(source, external_id → game, 유일) 전체를 프로세스 메모리 맵으로 들고 있다가
+      (ALIAS_MAP_TTL 마다 다시 읽음) 허용한 ID 공간 순서대로 맵에서 찾음 → pk 로 Game 1행 조회
+    - 맵에 없으면 (별칭이 아직 없는 게임, 다른 프로세스가 방금 만든 게임 등)
+      허용한 ID 공간을 OR 조건 한 번으로 조회하고
+      우선순위(steam_appid > rawg_id > pk, 같은 공간 안에서는 pk 가 작은 행)로 1행 선택
+      → 찾으면 맵에 추가
+    - 맵은 캐시일 뿐이라 다른 프로세스의 변경은 ALIAS_MAP_TTL 안에 반영됨
+      (같은 숫자가 Steam/RAWG 양쪽에 있는 드문 경우에만 그동안 우선순위가 다를 수 있음)
+    - Game 저장 시 register_aliases() 가 별칭을 맞춤 (시그널, rawg_id / steam_appid 가 바뀐 경우만)
+    - negative cache: DB 에도 RAWG 에도 없다고 확인된 ID(remember_unknown)는
+      UNKNOWN_TTL 동안 조회 없이 None (프로세스 메모리, 최대 UNKNOWN_MAX_ENTRIES 개)
+      해당 ID 로 Game 이 저장되면 시그널에서 forget_game() 으로 바로 지움
+
+사용 예시:
+    from games.resolver import resolve_game, RAWG
+    game = resolve_game(rawg_id, spaces=(RAWG,))
+    game_pk = resolve_game_id(public_id, spaces=PUBLIC_SPACES)
+"""
+
+import re
+import threading
+import time
+
+from django.db.models import Case, IntegerField, Q, Value, When
+
+STEAM = 'steam'
+RAWG = 'rawg'
+PK = 'pk'
+# game_detail 의 조회 우선순위
+ALL_SPACES = (STEAM, RAWG, PK)
+# Game.public_id (rawg_id → steam_appid → id) 를 되돌리는 순서
+PUBLIC_SPACES = (RAWG, STEAM, PK)
+
+# 별칭 맵을 DB 에서 다시 읽는 간격 (초)
+ALIAS_MAP_TTL = 10 * 60
+# 별칭 맵에 넣을 Game 필드가 바뀌었을 때만 별칭 재등록
+ALIAS_FIELDS = {'rawg_id', 'steam_appid'}
+
+# DB + RAWG 에 없다고 확인된 ID 를 기억하는 시간 (초)
+UNKNOWN_TTL = 60 * 60
+UNKNOWN_MAX_ENTRIES = 10000
+
+_FIELDS = {STEAM: 'steam_appid', RAWG: 'rawg_id', PK: 'pk'}
+_DIGITS_RE = re.compile(r'\d+')
+
+_unknown = {}
+_unknown_lock = threading.Lock()
+_alias_map = None
+_alias_loaded_at = 0.0
+_alias_lock = threading.Lock()
+
+
+def parse_game_id(game_id):
+    """'app2576020', 'bundle5926', '1234', 1234 → 숫자 ID (숫자가 없으면 None)"""
+    if isinstance(game_id, int):
+        return game_id
+    match = _DIGITS_RE.search(str(game_id or ''))
+    return int(match.group()) if match else None
+
+
+def resolve_game(game_id, spaces=ALL_SPACES, queryset=None, use_unknown_cache=True):
+    """
+    ID → Game (없으면 None)
+
+    Args:
+        game_id: 숫자 또는 Steam 형식 문자열 ('app123')
+        spaces: 찾을 ID 공간과 우선순위 (STEAM / RAWG / PK)
+        queryset: select_related / only 등을 붙인 Game queryset (기본: Game.objects.all())
+        use_unknown_cache: False 면 negative cache 를 건너뜀 (없으면 생성하는 경로)
+
+    Returns:
+        Game or None
+    """
+    from .models import Game
+
+    numeric_id = parse_game_id(game_id)
+    if numeric_id is None:
+        return None
+    if use_unknown_cache and is_known_unknown(numeric_id):
+        return None
+
+    queryset = Game.objects.all() if queryset is None else queryset
+    hit = _alias_lookup(numeric_id, spaces)
+    if hit is not None:
+        game = queryset.filter(pk=hit[1]).first()
+        if game is not None:
+            return game
+        # 다른 프로세스에서 삭제된 게임
+        _drop_alias(hit[0], numeric_id)
+
+    game = _query(queryset, numeric_id, spaces).first()
+    if game is not None:
+        _learn_alias(spaces[game._id_rank], numeric_id, game.pk)
+    return game
+
+
+def resolve_game_id(game_id, spaces=ALL_SPACES, use_unknown_cache=True):
+    """
+    ID → Game pk (없으면 None), 별칭 맵에 있으면 쿼리 없음
+
+    게임 행이 필요 없는 경로(평가/찜 여부 조회 등)용. 다른 프로세스에서 방금 삭제된 게임의 pk 가
+    ALIAS_MAP_TTL 동안 나올 수 있으므로 그 pk 로 다시 조회해도 없을 수 있다.
+    """
+    from .models import Game
+
+    numeric_id = parse_game_id(game_id)
+    if numeric_id is None:
+        return None
+    if use_unknown_cache and is_known_unknown(numeric_id):
+        return None
+
+    hit = _alias_lookup(numeric_id, spaces)
+    if hit is not None:
+        return hit[1]
+
+    row = _query(Game.objects.all(), numeric_id, spaces).values_list('pk', '_id_rank').first()
+    if row is None:
+        return None
+    _learn_alias(spaces[row[1]], numeric_id, row[0])
+    return row[0]
+
+
+def _query(queryset, numeric_id, spaces):
+    condition = Q()
+    ranks = []
+    for rank, space in enumerate(spaces):
+        field = _FIELDS[space]
+        condition |= Q(**{field: numeric_id})
+        ranks.append(When(**{field: numeric_id}, then=Value(rank)))
+
+    return (
+        queryset.filter(condition)
+        .annotate(_id_rank=Case(*ranks, default=Value(len(ranks)), output_field=IntegerField()))
+        .order_by('_id_rank', 'pk')
+    )
+
+
+def _get_alias_map():
+    """{(source, external_id): game_id}, ALIAS_MAP_TTL 이 지나면 다시 읽음"""
+    global _alias_map, _alias_loaded_at
+    from .models import GameAlias
+
+    with _alias_lock:
+        if _alias_map is None or time.monotonic() - _alias_loaded_at > ALIAS_MAP_TTL:
+            _alias_map = {
+                (source, external_id): game_id
+                for source, external_id, game_id in GameAlias.objects.values_list('source', 'external_id', 'game_id')
+            }
+            _alias_loaded_at = time.monotonic()
+        return _alias_map
+
+
+def _alias_lookup(numeric_id, spaces):
+    """허용한 별칭 공간 순서대로 맵 조회 → (space, game_id) 또는 None"""
+    alias_map = None
+    for space in spaces:
+        if space == PK:
+            continue
+        if alias_map is None:
+            alias_map = _get_alias_map()
+        game_id = alias_map.get((space, numeric_id))
+        if game_id is not None:
+            return space, game_id
+    return None
+
+
+def _learn_alias(space, numeric_id, game_id):
+    if space == PK:
+        return
+    with _alias_lock:
+        if _alias_map is not None:
+            _alias_map[(space, numeric_id)] = game_id
+
+
+def _drop_alias(space, numeric_id):
+    with _alias_lock:
+        if _alias_map is not None:
+            _alias_map.pop((space, numeric_id), None)
+
+
+def reset_alias_map():
+    """다음 조회에서 별칭 맵을 DB 에서 다시 읽음 (build_game_aliases 후 등)"""
+    global _alias_map
+    with _alias_lock:
+        _alias_map = None
+
+
+def register_aliases(game):
+    """
+    Game 의 rawg_id / steam_appid 별칭을 맞춤 (시그널에서 호출)
+
+    - 이 게임을 가리키는 별칭 중 지금 ID 와 다른 것은 삭제
+    - 없는 별칭은 추가 (같은 ID 를 이미 다른 게임이 가지고 있으면 그 게임 유지 = 먼저 만든 게임)
+    """
+    from .models import GameAlias
+
+    wanted = {
+        (source, external_id)
+        for source, external_id in ((RAWG, game.rawg_id), (STEAM, game.steam_appid))
+        if external_id is not None
+    }
+    existing = set(GameAlias.objects.filter(game=game).values_list('source', 'external_id'))
+
+    stale = existing - wanted
+    if stale:
+        condition = Q()
+        for source, external_id in stale:
+            condition |= Q(source=source, external_id=external_id)
+        GameAlias.objects.filter(game=game).filter(condition).delete()
+    missing = wanted - existing
+    if missing:
+        GameAlias.objects.bulk_create(
+            [GameAlias(source=source, external_id=external_id, game=game) for source, external_id in missing],
+            ignore_conflicts=True,
+        )
+
+    with _alias_lock:
+        if _alias_map is not None:
+            for key in stale | missing:
+                _alias_map.pop(key, None)
+
+
+def forget_deleted_game(game):
+    """
+    Game 삭제 시 맵에서 그 게임을 가리키는 별칭 제거
+
+    별칭 행은 CASCADE 로 함께 지워지므로, 같은 ID 를 가진 다른 게임이 남아 있으면
+    그중 pk 가 가장 작은 게임(= 새 대표 게임)으로 별칭을 다시 등록합니다.
+    """
+    from .models import Game
+
+    with _alias_lock:
+        if _alias_map is not None:
+            for key in ((RAWG, game.rawg_id), (STEAM, game.steam_appid)):
+                if _alias_map.get(key) == game.pk:
+                    del _alias_map[key]
+
+    for field in ('rawg_id', 'steam_appid'):
+        external_id = getattr(game, field)
+        if external_id is None:
+            continue
+        survivor = Game.objects.filter(**{field: external_id}).exclude(pk=game.pk).order_by('pk').first()
+        if survivor is not None:
+            register_aliases(survivor)
+
+
+def is_known_unknown(numeric_id):
+    with _unknown_lock:
+        expires_at = _unknown.get(numeric_id)
+        if expires_at is None:
+            return False
+        if expires_at < time.monotonic():
+            del _unknown[numeric_id]
+            return False
+        return True
+
+
+def remember_unknown(game_id, ttl=UNKNOWN_TTL):
+    """DB + RAWG 에 없다고 확인된 ID 기록"""
+    numeric_id = parse_game_id(game_id)
+    if numeric_id is None:
+        return
+    with _unknown_lock:
+        if len(_unknown) >= UNKNOWN_MAX_ENTRIES:
+            now = time.monotonic()
+            for key in [key for key, expires_at in _unknown.items() if expires_at < now]:
+                del _unknown[key]
+            if len(_unknown) >= UNKNOWN_MAX_ENTRIES:
+                # 만료된 항목이 없으면 가장 먼저 넣은 항목부터 삭제 (dict 삽입 순서)
+                for key in list(_unknown)[:UNKNOWN_MAX_ENTRIES // 10]:
+                    del _unknown[key]
+        _unknown[numeric_id] = time.monotonic() + ttl
+
+
+def forget_game(game):
+    """Game 저장 시 그 게임의 ID 들을 negative cache 에서 제거"""
+    ids = {value for value in (game.pk, game.steam_appid, game.rawg_id) if value is not None}
+    if not ids:
+        return
+    with _unknown_lock:
+        for numeric_id in ids:
+            _unknown.pop(numeric_id, None)
+
+
+def clear_unknown():
+    with _unknown_lock:
+        _unknown.clear()
@@ -0,0 +1,223 @@
+"""
+크롤러 커맨드 실행 기록 / 체크포인트 (CrawlRun)
+
+기존 방식:
+    fetch_steam_reviews, cache_translations, update_steam_sales ... 가 중간에 죽거나
+    rate limit 에 걸리면 다음 실행은 처음부터 다시 시작
+    (update_steam_sales 는 마지막 JSON 저장 전까지 결과가 메모리에만 있음)
+
+실행 기록 방식:
+    - 커맨드 실행마다 CrawlRun 1행 (상태, 처리/성공/실패 수, 오류 유형별 횟수, 처리량)
+    - 처리 완료 키(게임 ID 등)와 커맨드별 cursor, 중간 결과를 FLUSH_EVERY 건 / FLUSH_INTERVAL 초마다 저장
+    - 예외로 끝나면 failed (Ctrl+C 는 interrupted) 로 기록하고 마지막 체크포인트를 남김
+      (예외 없이 끝나도 mark_incomplete() 를 호출했으면 failed)
+    - --resume: 같은 커맨드의 마지막 실행이 완료되지 않았으면 체크포인트를 이어받아 완료된 키는 건너뜀
+
+사용 예시:
+    from games.run_ledger import RunLedger
+
+    with RunLedger.start('fetch_steam_tags', options, resume=options['resume']) as ledger:
+        targets = [t for t in targets if not ledger.is_done(t[0])]
+        for game_id, ... in targets:
+            ...
+            ledger.record(game_id, ok=True)      # 실패(ok=False)한 키는 다음 --resume 에서 재시도
+        # with 블록이 정상 종료되면 completed
+"""
+
+import logging
+import threading
+import time
+
+from django.db import DatabaseError
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# N건 처리마다 체크포인트 저장
+FLUSH_EVERY = 50
+# 마지막 저장 후 N초가 지나면 저장
+FLUSH_INTERVAL = 30.0
+
+# 실행 옵션에서 기록하지 않을 Django 기본 옵션
+_BASE_OPTIONS = {'verbosity', 'settings', 'pythonpath', 'traceback', 'no_color', 'force_color', 'skip_checks'}
+
+
+def _json_options(options):
+    return {
+        key: value for key, value in (options or {}).items()
+        if key not in _BASE_OPTIONS and isinstance(value, (str, int, float, bool, type(None)))
+    }
+
+
+class RunLedger:
+    """CrawlRun 한 행에 대한 스레드 안전 기록기"""
+
+    def __init__(self, run, done=None, cursor=None, partial=None):
+        self.run = run
+        self.done = set(done or ())
+        self.cursor = dict(cursor or {})
+        self.partial = partial
+        self.errors = {}
+        self.incomplete = None
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    @classmethod
+    def start(cls, command, options=None, resume=False):
+        """
+        새 실행 기록 생성 (resume=True 면 마지막 미완료 실행의 체크포인트를 이어받음)
+
+        Returns:
+            RunLedger: resumed 속성으로 이어받았는지 확인
+        """
+        from .models import CrawlRun
+
+        previous = None
+        if resume:
+            last = CrawlRun.objects.filter(command=command).order_by('-started_at', '-id').first()
+            if last is not None and last.status != 'completed':
+                previous = last
+
+        checkpoint = previous.checkpoint if previous else {}
+        run = CrawlRun.objects.create(
+            command=command,
+            options=_json_options(options),
+            checkpoint=checkpoint,
+            partial_results=previous.partial_results if previous else None,
+            resumed_from=previous,
+        )
+        ledger = cls(
+            run,
+            done=checkpoint.get('done'),
+            cursor=checkpoint.get('cursor'),
+            partial=previous.partial_results if previous else None,
+        )
+        if previous:
+            logger.info(f"{command}: resuming run #{previous.pk} ({len(ledger.done)} done) as run #{run.pk}")
+        return ledger
+
+    @property
+    def resumed(self):
+        return self.run.resumed_from_id is not None
+
+    def is_done(self, key):
+        return str(key) in self.done
+
+    def record(self, key=None, ok=True, error=None, done=None):
+        """
+        한 건 처리 결과 기록
+
+        Args:
+            key: 처리 완료 키 (게임 ID 등, 문자열로 저장)
+            ok: 성공 여부 (성공/실패 수)
+            error: 오류 유형 (예: 'HTTP 429') - stats['errors'] 에 횟수 누적
+            done: 체크포인트에 완료로 남길지 (기본: ok 와 같음, '데이터 없음'처럼 재시도할 필요 없는 실패는 True)
+        """
+        with self.lock:
+            self.run.processed += 1
+            if ok:
+                self.run.succeeded += 1
+            else:
+                self.run.failed += 1
+            if error:
+                label = str(error)[:100]
+                self.errors[label] = self.errors.get(label, 0) + 1
+                self.run.last_error = str(error)[:1000]
+            if key is not None and (ok if done is None else done):
+                self.done.add(str(key))
+            self._pending += 1
+        self.maybe_flush()
+
+    def set_cursor(self, **values):
+        """커맨드별 위치 기록 (예: 정렬 기준별 다음 페이지)"""
+        with self.lock:
+            self.cursor.update(values)
+            self._pending += 1
+
+    def set_partial(self, data):
+        """최종 저장 전 중간 결과 (JSON 직렬화 가능한 값, flush 시점의 내용이 저장됨)"""
+        with self.lock:
+            self.partial = data
+
+    def maybe_flush(self):
+        if self._pending >= FLUSH_EVERY or time.monotonic() - self._last_flush >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self, status=None):
+        """체크포인트 / 통계를 DB 에 저장"""
+        from .models import CrawlRun
+
+        with self.lock:
+            elapsed = time.monotonic() - self.started
+            run = self.run
+            run.checkpoint = {'done': sorted(self.done), 'cursor': dict(self.cursor)}
+            run.partial_results = self.partial
+            run.stats = {
+                **run.stats,
+                'errors': dict(self.errors),
+                'elapsed_sec': round(elapsed, 1),
+                'items_per_sec': round(run.processed / elapsed, 3) if elapsed > 0 else 0.0,
+            }
+            fields = {
+                'checkpoint': run.checkpoint,
+                'partial_results': run.partial_results,
+                'processed': run.processed,
+                'succeeded': run.succeeded,
+                'failed': run.failed,
+                'stats': run.stats,
+                'last_error': run.last_error,
+                'updated_at': timezone.now(),
+            }
+            if status:
+                run.status = status
+                fields['status'] = status
+                if status != 'running':
+                    run.finished_at = timezone.now()
+                    fields['finished_at'] = run.finished_at
+            self._pending = 0
+            self._last_flush = time.monotonic()
+
+            try:
+                CrawlRun.objects.filter(pk=run.pk).update(**fields)
+            except DatabaseError as e:
+                logger.warning(f"{run.command}: checkpoint flush failed: {e}")
+
+    def add_stats(self, **values):
+        """커맨드별 추가 통계 (요청 수 등)"""
+        with self.lock:
+            self.run.stats = {**self.run.stats, **values}
+
+    def mark_incomplete(self, reason):
+        """
+        예외 없이 끝나도 완료로 기록하지 않음 (일부 작업 실패 → 다음 --resume 에서 이어서)
+        """
+        with self.lock:
+            self.incomplete = str(reason)
+            self.run.last_error = str(reason)[:1000]
+
+    def finish(self, status='completed'):
+        self.flush(status=status)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.finish('failed' if self.incomplete else 'completed')
+        else:
+            with self.lock:
+                self.run.last_error = f"{exc_type.__name__}: {exc}"[:1000]
+            self.finish('interrupted' if issubclass(exc_type, KeyboardInterrupt) else 'failed')
+        return False
+
+    def summary_line(self):
+        """커맨드 마지막 출력용 한 줄 요약"""
+        run = self.run
+        return (
+            f"CrawlRun #{run.pk} ({run.status}): {run.processed}건 처리, "
+            f"성공 {run.succeeded} / 실패 {run.failed}, "
+            f"{run.stats.get('items_per_sec', 0):.2f}건/s"
+            + (f", 이어서 실행: #{run.resumed_from_id}" if run.resumed_from_id else "")
+        )
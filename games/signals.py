@@ -0,0 +1,46 @@
+"""
+games 앱 시그널
+
+- Game 저장 시 장르 인덱스(GameGenre)/품질 점수 자동 동기화
+- Game 저장 시 ID 해석 negative cache(games/resolver.py)에서 그 게임의 ID 제거
+- Game 저장/삭제 시 GameAlias 별칭 + 메모리 맵 동기화
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Game
+from .genre_index import sync_game_genres
+from .resolver import ALIAS_FIELDS, forget_deleted_game, forget_game, register_aliases
+
+# 이 필드가 바뀔 때만 인덱스 재계산 (description_kr 저장 등은 무시)
+GENRE_INDEX_FIELDS = {'genre', 'metacritic_score'}
+
+
+@receiver(post_save, sender=Game)
+def update_genre_index(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not (set(update_fields) & GENRE_INDEX_FIELDS):
+        return
+    sync_game_genres(instance)
+
+
+@receiver(post_save, sender=Game)
+def forget_unknown_game_ids(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    forget_game(instance)
+
+
+@receiver(post_save, sender=Game)
+def sync_game_aliases(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if not created and update_fields is not None and not (set(update_fields) & ALIAS_FIELDS):
+        return
+    register_aliases(instance)
+
+
+@receiver(post_delete, sender=Game)
+def drop_game_aliases(sender, instance, **kwargs):
+    forget_deleted_game(instance)
@@ -0,0 +1,132 @@
+"""
+Steam 상점 페이지 태그 파싱 (fetch_steam_tags 용)
+
+ProcessPoolExecutor 워커에서 실행되므로 Django 모델을 import 하지 않는다.
+lxml 이 설치되어 있으면 BeautifulSoup 파서로 lxml 을 사용 (html.parser 보다 수 배 빠름).
+
+사용 예시:
+    from games.steam_tags import parse_tag_page
+    tags, elapsed = parse_tag_page(html, max_tags=10)
+    # → [(tag_name, slug, tag_type), ...]
+"""
+
+import hashlib
+import re
+import time
+
+from bs4 import BeautifulSoup
+from django.utils.text import slugify
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+
+# 장르 키워드
+GENRE_KEYWORDS = [
+    'rpg', 'fps', 'action', 'adventure', 'shooter', 'platformer',
+    'strategy', 'simulation', 'racing', 'sports', 'puzzle',
+    'roguelike', 'roguelite', 'metroidvania', 'souls-like', 'soulslike',
+    'mmorpg', 'moba', 'rts', 'turn-based', '액션', '어드벤처', '롤플레잉',
+    '슈터', '전략', '시뮬레이션', '퍼즐', '플랫포머', '로그라이크'
+]
+
+# 테마 키워드
+THEME_KEYWORDS = [
+    'horror', 'fantasy', 'sci-fi', 'cyberpunk', 'medieval', 'space',
+    'zombie', 'post-apocalyptic', 'steampunk', 'anime', 'cartoon',
+    '공포', '판타지', '사이버펑크', '중세', '좀비', '종말'
+]
+
+# 분위기 키워드
+MOOD_KEYWORDS = [
+    'relaxing', 'difficult', 'challenging', 'casual', 'hardcore',
+    'atmospheric', 'funny', 'cute', 'dark', 'emotional', 'colorful',
+    '힐링', '편안', '어려움', '캐주얼', '하드코어', '귀여운', '어두운'
+]
+
+
+def create_slug(tag_name):
+    """
+    태그 이름으로 slug 생성
+    한글의 경우 영어 변환 시도, 안 되면 해시
+    """
+    # 먼저 기본 slugify 시도
+    slug = slugify(tag_name, allow_unicode=False)
+
+    if slug:
+        return slug[:50]  # 최대 50자
+
+    # 한글 등 특수 문자의 경우, 해시 기반 slug
+    hash_suffix = hashlib.md5(tag_name.encode()).hexdigest()[:8]
+
+    # 영어 문자만 추출
+    english_part = re.sub(r'[^a-zA-Z0-9\s]', '', tag_name)
+    english_slug = slugify(english_part) if english_part else ''
+
+    if english_slug:
+        return f"{english_slug[:40]}-{hash_suffix}"
+    else:
+        return f"tag-{hash_suffix}"
+
+
+def determine_tag_type(tag_name):
+    """
+    태그 이름으로 태그 유형 결정
+    """
+    tag_lower = tag_name.lower()
+
+    for keyword in GENRE_KEYWORDS:
+        if keyword in tag_lower:
+            return 'genre'
+
+    for keyword in THEME_KEYWORDS:
+        if keyword in tag_lower:
+            return 'theme'
+
+    for keyword in MOOD_KEYWORDS:
+        if keyword in tag_lower:
+            return 'mood'
+
+    # 기본값: feature
+    return 'feature'
+
+
+def parse_tag_page(html, max_tags=10, parser=None):
+    """
+    상점 페이지 HTML → 상위 인기 태그
+
+    Returns:
+        tuple: ([(tag_name, slug, tag_type), ...], 파싱 소요 초)
+    """
+    started = time.perf_counter()
+    soup = BeautifulSoup(html, parser or HTML_PARSER)
+
+    # 스팀 상점 페이지의 '인기 태그' 영역
+    # 클래스: .app_tag (glance_tags popular_tags 내부)
+    tag_elements = soup.select('.app_tag')
+
+    if not tag_elements:
+        # 대체 선택자 시도
+        tag_elements = soup.select('.popular_tags .app_tag')
+
+    names = []
+    for tag_el in tag_elements:
+        tag_text = tag_el.get_text(strip=True)
+
+        # 쓸모없는 태그 제외
+        if tag_text in ['+', '', ' ']:
+            continue
+
+        # 너무 긴 태그 제외 (보통 버그)
+        if len(tag_text) > 50:
+            continue
+
+        if tag_text not in names:
+            names.append(tag_text)
+
+    # 상위 N개만 사용
+    tags = [(name, create_slug(name), determine_tag_type(name)) for name in names[:max_tags]]
+    return tags, time.perf_counter() - started
@@ -0,0 +1,143 @@
+"""
+games 앱 백그라운드 작업 (games/jobs.py 큐에서 run_workers 가 실행)
+
+    games.import_rawg_game   game_detail 에서 DB 에 없는 게임을 RAWG 로 생성 + 스크린샷
+    games.translate_game     api_translate_game 의 RAWG 설명 조회 + Gemini 번역
+    games.fetch_screenshots  스크린샷이 없는 게임의 RAWG 스크린샷 저장
+
+모두 여러 번 실행돼도 같은 결과가 되도록 작성 (재시도 / 리스 만료 후 재실행)
+"""
+
+import logging
+
+from .jobs import PermanentJobError, job_handler
+
+logger = logging.getLogger(__name__)
+
+DETAIL_SCREENSHOTS = 8
+PREVIEW_SCREENSHOTS = 4
+
+
+def _save_screenshots(game, rawg_id, limit):
+    from .models import GameScreenshot
+    from .utils import fetch_rawg_screenshots
+
+    urls = [ss.get('image', '') for ss in fetch_rawg_screenshots(rawg_id, limit=limit)[:limit]]
+    urls = [url for url in urls if url]
+    existing = set(GameScreenshot.objects.filter(game=game).values_list('image_url', flat=True))
+    GameScreenshot.objects.bulk_create([
+        GameScreenshot(game=game, image_url=url) for url in urls if url not in existing
+    ])
+    return urls
+
+
+@job_handler('games.import_rawg_game')
+def import_rawg_game(payload):
+    """
+    RAWG ID 로 Game 생성 (+ 스크린샷)
+
+    Returns:
+        {'found': True, 'game_id': pk} / {'found': False} (RAWG 에도 없음)
+    """
+    from .models import Game
+    from .rawg_cache import rawg_get
+    from .utils import BASE_URL, RAWG_API_KEY
+
+    rawg_id = int(payload['rawg_id'])
+    game = Game.objects.filter(rawg_id=rawg_id).first()
+    if game is not None:
+        return {'found': True, 'game_id': game.pk}
+
+    if not RAWG_API_KEY:
+        raise PermanentJobError("RAWG_API_KEY 가 설정되지 않았습니다.")
+
+    # fetch_rawg_game_details 와 달리 연결 오류는 그대로 올려서 재시도 (404 만 '없음')
+    rawg_data = rawg_get('game_details', f"{BASE_URL}/games/{rawg_id}", {'key': RAWG_API_KEY})
+    if not rawg_data:
+        return {'found': False}
+
+    game, created = Game.objects.get_or_create(
+        rawg_id=rawg_id,
+        defaults={
+            'title': rawg_data.get('name', f'Game {rawg_id}'),
+            'description': rawg_data.get('description_raw', ''),
+            'image_url': rawg_data.get('background_image', ''),
+            'background_image': rawg_data.get('background_image', ''),
+            'metacritic_score': rawg_data.get('metacritic'),
+            'genre': ', '.join([g['name'] for g in rawg_data.get('genres', [])[:3]]) or '게임',
+        }
+    )
+    if created:
+        _save_screenshots(game, rawg_id, DETAIL_SCREENSHOTS)
+        logger.info(f"Auto-created game from RAWG: {game.title} (ID: {rawg_id})")
+    return {'found': True, 'game_id': game.pk}
+
+
+@job_handler('games.translate_game')
+def translate_game(payload):
+    """
+    게임 설명 번역 후 Game.description_kr 저장
+
+    payload: {'game_pk': int 또는 None, 'text': 요청에서 받은 원문}
+
+    Returns:
+        {'translated': 번역문, 'cached': 번역 캐시 사용 여부}
+    """
+    from .models import Game
+    from .translation_cache import GAME_DESC_PROMPT_VERSION, get_or_translate
+    from .utils import fetch_rawg_game_details, translate_text_gemini
+
+    game = Game.objects.filter(pk=payload.get('game_pk')).first() if payload.get('game_pk') else None
+    if game is not None and game.description_kr:
+        return {'translated': game.description_kr, 'cached': True}
+
+    text = (payload.get('text') or '').strip()
+    if game is not None:
+        if not text:
+            text = game.description
+        if (not text or not game.description) and game.rawg_id:
+            details = fetch_rawg_game_details(game.rawg_id)
+            if details:
+                fetched = details.get('description_raw', '') or details.get('description', '')
+                text = text or fetched
+                updates = {'description': fetched}
+                if game.genre == 'Unknown' and details.get('genres'):
+                    updates['genre'] = ', '.join([g['name'] for g in details['genres'][:3]])
+                if not game.background_image and details.get('background_image'):
+                    updates['image_url'] = updates['background_image'] = details['background_image']
+                if game.title.startswith('Game ') and details.get('name'):
+                    updates['title'] = details['name']
+                # save() 로 저장해야 장르 인덱스 / 별칭 시그널이 실행됨
+                for field, value in updates.items():
+                    setattr(game, field, value)
+                game.save(update_fields=list(updates))
+
+    if not text:
+        raise PermanentJobError("번역할 텍스트가 없습니다.")
+
+    translated, from_cache = get_or_translate(text, translate_text_gemini, GAME_DESC_PROMPT_VERSION, origin='game')
+    if not translated:
+        # translate_text_gemini 는 오류를 None 으로 돌려주므로 재시도
+        raise RuntimeError("AI 번역 실패")
+
+    if game is not None:
+        game.description_kr = translated
+        update_fields = ['description_kr']
+        if not game.description:
+            game.description = text
+            update_fields.append('description')
+        game.save(update_fields=update_fields)
+    return {'translated': translated, 'cached': from_cache}
+
+
+@job_handler('games.fetch_screenshots', max_attempts=2)
+def fetch_screenshots(payload):
+    """스크린샷이 없는 게임의 RAWG 스크린샷 저장 (추천 카드용 4장)"""
+    from .models import Game, GameScreenshot
+
+    game = Game.objects.filter(pk=payload['game_id']).only('id', 'rawg_id').first()
+    if game is None or not game.rawg_id:
+        return {'saved': 0}
+    if GameScreenshot.objects.filter(game=game).exists():
+        return {'saved': 0}
+    return {'saved': len(_save_screenshots(game, game.rawg_id, PREVIEW_SCREENSHOTS))}
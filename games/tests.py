@@ -1,3 +1,591 @@
-from django.test import TestCase
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+from email.utils import format_datetime
+from unittest import mock
 
-# Create your tests here.
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from . import http_cassette, http_client, jobs, rawg_cache, resolver, translation_cache
+from .genre_index import count_genres, get_games_by_genres, parse_genres, rebuild_genre_index
+from .models import BackgroundJob, CrawlRun, Game, GameAlias, GameGenre, RawgResponseCache, TranslationCache
+from .run_ledger import RunLedger
+from .translation_batch import split_batch_response
+
+
+class GenreIndexTests(TestCase):
+    def _game(self, title, genre, metacritic=None):
+        return Game.objects.create(
+            title=title, image_url='https://img.test/g.jpg', genre=genre, metacritic_score=metacritic
+        )
+
+    def test_parse_genres_skips_placeholders_and_duplicates(self):
+        self.assertEqual(
+            parse_genres('Action, RPG, action, Unknown, , 게임'),
+            [('action', 'Action'), ('rpg', 'RPG')],
+        )
+
+    def test_save_syncs_index_and_quality_score(self):
+        game = self._game('A', 'Action, RPG', 80)
+        self.assertEqual(set(GameGenre.objects.filter(game=game).values_list('slug', flat=True)), {'action', 'rpg'})
+        game.refresh_from_db()
+        self.assertEqual(game.quality_score, 80)
+
+        game.genre = 'Puzzle'
+        game.save()
+        self.assertEqual(list(GameGenre.objects.filter(game=game).values_list('slug', flat=True)), ['puzzle'])
+
+    def test_get_games_by_genres_orders_by_quality_without_duplicates(self):
+        low = self._game('Low', 'RPG', 60)
+        high = self._game('High', 'Action, RPG', 90)
+        self._game('Other', 'Puzzle', 99)
+        self.assertEqual(get_games_by_genres(['RPG', 'Action']), [high, low])
+        self.assertEqual(get_games_by_genres(['rpg'], exclude_ids={high.pk}), [low])
+        self.assertEqual(get_games_by_genres(['rpg'], min_metacritic=70), [high])
+        self.assertEqual(get_games_by_genres([]), [])
+
+    def test_rebuild_indexes_bulk_created_games(self):
+        games = Game.objects.bulk_create([
+            Game(title='A', image_url='https://img.test/a.jpg', genre='Action, RPG'),
+            Game(title='B', image_url='https://img.test/b.jpg', genre='RPG'),
+        ])
+        self.assertFalse(GameGenre.objects.exists())
+        self.assertEqual(rebuild_genre_index(), {'games': 2, 'rows': 3})
+        self.assertEqual(count_genres([g.pk for g in games]), Counter({'RPG': 2, 'Action': 1}))
+
+
+class ParseRetryAfterTests(SimpleTestCase):
+    def test_seconds(self):
+        self.assertEqual(http_client.parse_retry_after('30'), 30.0)
+        self.assertEqual(http_client.parse_retry_after(' 5 '), 5.0)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(http_client.parse_retry_after(None))
+        self.assertIsNone(http_client.parse_retry_after(''))
+        self.assertIsNone(http_client.parse_retry_after('soon'))
+
+    def test_http_date(self):
+        future = format_datetime(timezone.now() + timedelta(seconds=120), usegmt=True)
+        self.assertAlmostEqual(http_client.parse_retry_after(future), 120, delta=2)
+
+    def test_past_http_date_is_zero(self):
+        past = format_datetime(timezone.now() - timedelta(seconds=120), usegmt=True)
+        self.assertEqual(http_client.parse_retry_after(past), 0.0)
+
+
+class BackoffDelayTests(SimpleTestCase):
+    config = {'BACKOFF_BASE': 0.5, 'BACKOFF_MAX': 30}
+
+    def test_exponential_upper_bound(self):
+        with mock.patch('games.http_client.random.uniform', side_effect=lambda low, high: high):
+            self.assertEqual(http_client.backoff_delay(0, self.config), 0.5)
+            self.assertEqual(http_client.backoff_delay(3, self.config), 4.0)
+            self.assertEqual(http_client.backoff_delay(10, self.config), 30)
+
+    def test_retry_after_wins_and_is_capped(self):
+        with mock.patch('games.http_client.random.uniform', return_value=0.0):
+            self.assertEqual(http_client.backoff_delay(0, self.config, retry_after=7), 7)
+            self.assertEqual(http_client.backoff_delay(0, self.config, retry_after=600), 30)
+
+
+class RawgCacheTests(TestCase):
+    url = 'https://api.rawg.io/api/games/3498'
+
+    def setUp(self):
+        rawg_cache.reset_cache_stats()
+
+    def _response(self, status, data=None):
+        return mock.Mock(status_code=status, json=mock.Mock(return_value=data))
+
+    def test_miss_then_hit_ignores_api_key(self):
+        with mock.patch.object(http_client, 'get', return_value=self._response(200, {'id': 3498})) as get:
+            self.assertEqual(rawg_cache.rawg_get('game_details', self.url, {'key': 'a'}), {'id': 3498})
+            self.assertEqual(rawg_cache.rawg_get('game_details', self.url, {'key': 'b'}), {'id': 3498})
+        get.assert_called_once()
+        stats = rawg_cache.get_cache_stats()['endpoints']['game_details']
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_404_is_negative_cached(self):
+        with mock.patch.object(http_client, 'get', return_value=self._response(404)) as get:
+            self.assertIsNone(rawg_cache.rawg_get('game_details', self.url))
+            self.assertIsNone(rawg_cache.rawg_get('game_details', self.url))
+        get.assert_called_once()
+        self.assertEqual(RawgResponseCache.objects.get().status_code, 404)
+
+    def test_errors_are_not_cached(self):
+        response = self._response(503)
+        response.raise_for_status.side_effect = requests.HTTPError('503')
+        with mock.patch.object(http_client, 'get', return_value=response):
+            with self.assertRaises(requests.HTTPError):
+                rawg_cache.rawg_get('game_details', self.url)
+        self.assertFalse(RawgResponseCache.objects.exists())
+
+    def test_retry_options_are_passed_to_http_client(self):
+        with mock.patch.object(http_client, 'get', return_value=self._response(200, {'id': 3498})) as get:
+            rawg_cache.rawg_get('game_details', self.url, {'key': 'a'}, retries=0, max_delay=2)
+        get.assert_called_once_with(self.url, params={'key': 'a'}, retries=0, max_delay=2)
+
+    def test_expired_entry_is_refetched(self):
+        with mock.patch.object(http_client, 'get', return_value=self._response(200, {'v': 1})):
+            rawg_cache.rawg_get('search', self.url, {'search': 'hades'})
+        RawgResponseCache.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        with mock.patch.object(http_client, 'get', return_value=self._response(200, {'v': 2})) as get:
+            self.assertEqual(rawg_cache.rawg_get('search', self.url, {'search': 'hades'}), {'v': 2})
+        get.assert_called_once()
+
+    def test_refresh_skips_lookup_and_overwrites_entry(self):
+        with mock.patch.object(http_client, 'get', return_value=self._response(200, {'v': 1})):
+            rawg_cache.rawg_get('game_details', self.url)
+        with mock.patch.object(http_client, 'get', return_value=self._response(200, {'v': 2})) as get:
+            self.assertEqual(rawg_cache.rawg_get('game_details', self.url, refresh=True), {'v': 2})
+            self.assertEqual(rawg_cache.rawg_get('game_details', self.url), {'v': 2})
+        get.assert_called_once()
+        self.assertEqual(RawgResponseCache.objects.get().payload, {'v': 2})
+
+    def test_prune_evicts_least_recently_used(self):
+        now = timezone.now()
+        for i in range(3):
+            RawgResponseCache.objects.create(
+                key=f'k{i}', endpoint='search', payload={},
+                expires_at=now + timedelta(days=1), last_accessed=now - timedelta(minutes=i),
+            )
+        self.assertEqual(rawg_cache.prune_cache(max_entries=2), {'expired': 0, 'evicted': 1})
+        self.assertEqual(set(RawgResponseCache.objects.values_list('key', flat=True)), {'k0', 'k1'})
+
+    def test_cache_key_includes_host(self):
+        params = {'key': 'a', 'page': 1}
+        self.assertNotEqual(
+            rawg_cache.make_cache_key('search', 'https://api.rawg.io/api/games', params),
+            rawg_cache.make_cache_key('search', 'http://127.0.0.1:8765/api/games', params),
+        )
+
+
+class RunLedgerTests(TestCase):
+    def test_completed_run_is_not_resumed(self):
+        with RunLedger.start('tests.crawl', {'limit': 5, 'verbosity': 1}) as ledger:
+            ledger.record('a')
+        run = CrawlRun.objects.get(pk=ledger.run.pk)
+        self.assertEqual(run.status, 'completed')
+        self.assertEqual(run.options, {'limit': 5})
+        self.assertFalse(RunLedger.start('tests.crawl', resume=True).resumed)
+
+    def test_failed_run_resumes_from_checkpoint(self):
+        with self.assertRaises(RuntimeError):
+            with RunLedger.start('tests.crawl') as ledger:
+                ledger.record('a')
+                ledger.record('b', ok=False, error='HTTP 429')
+                ledger.set_cursor(page=3)
+                raise RuntimeError('boom')
+        run = CrawlRun.objects.get(pk=ledger.run.pk)
+        self.assertEqual(run.status, 'failed')
+        self.assertEqual((run.processed, run.succeeded, run.failed), (2, 1, 1))
+        self.assertEqual(run.stats['errors'], {'HTTP 429': 1})
+
+        resumed = RunLedger.start('tests.crawl', resume=True)
+        self.assertEqual(resumed.run.resumed_from_id, run.pk)
+        self.assertTrue(resumed.is_done('a'))
+        self.assertFalse(resumed.is_done('b'))
+        self.assertEqual(resumed.cursor, {'page': 3})
+
+    def test_done_marks_permanent_failures_as_finished(self):
+        ledger = RunLedger.start('tests.crawl')
+        ledger.record(1, ok=False, done=True)
+        self.assertTrue(ledger.is_done('1'))
+
+    def test_mark_incomplete_fails_run_and_allows_resume(self):
+        with RunLedger.start('tests.crawl') as ledger:
+            ledger.record('a')
+            ledger.mark_incomplete('sort 1 failed')
+        run = CrawlRun.objects.get(pk=ledger.run.pk)
+        self.assertEqual(run.status, 'failed')
+        self.assertEqual(run.last_error, 'sort 1 failed')
+        self.assertTrue(RunLedger.start('tests.crawl', resume=True).is_done('a'))
+
+
+class HttpCassetteTests(SimpleTestCase):
+    url = 'https://api.test/items?b=2&a=1&key=secret'
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir, ignore_errors=True)
+
+    def _adapter(self, mode, **config):
+        return http_cassette.CassetteAdapter({**http_cassette.DEFAULT_CASSETTE, 'MODE': mode, 'DIR': self.dir, **config})
+
+    def _request(self, url=None, method='GET'):
+        return requests.Request(method, url or self.url).prepare()
+
+    def _live(self, request, status=200, **kwargs):
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json', 'Set-Cookie': 'session=1'})
+        response._content = b'{"ok": true}'
+        response.request = request
+        return response
+
+    def test_make_key_ignores_query_order_and_api_keys(self):
+        self.assertEqual(
+            http_cassette.make_key('GET', 'https://api.test/items?b=2&a=1&key=one'),
+            http_cassette.make_key('get', 'https://api.test/items?a=1&b=2&key=two'),
+        )
+        self.assertNotEqual(
+            http_cassette.make_key('POST', 'https://api.test/items', b'{"a": 1}'),
+            http_cassette.make_key('POST', 'https://api.test/items', b'{"a": 2}'),
+        )
+
+    def test_record_then_replay(self):
+        with mock.patch.object(HTTPAdapter, 'send', side_effect=self._live) as send:
+            self._adapter('record').send(self._request())
+        send.assert_called_once()
+        entry = http_cassette.CassetteStore(self.dir).lookup('GET', self.url)
+        self.assertNotIn('secret', entry['url'])
+
+        with mock.patch.object(HTTPAdapter, 'send') as send:
+            response = self._adapter('replay').send(self._request('https://api.test/items?a=1&b=2&key=other'))
+        send.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'ok': True})
+        self.assertNotIn('Set-Cookie', response.headers)
+
+    def test_only_successful_non_stream_non_auth_responses_are_recorded(self):
+        store = http_cassette.CassetteStore(self.dir)
+        cases = [
+            (self.url, 503, {}),
+            (self.url, 200, {'stream': True}),
+            ('https://oauth2.googleapis.com/token', 200, {}),
+        ]
+        for url, status, kwargs in cases:
+            with mock.patch.object(HTTPAdapter, 'send', side_effect=lambda request, **kw: self._live(request, status)):
+                response = self._adapter('record').send(self._request(url), **kwargs)
+            self.assertEqual(response.status_code, status)
+            self.assertIsNone(store.lookup('GET', url))
+
+        with mock.patch.object(HTTPAdapter, 'send', side_effect=lambda request, **kw: self._live(request, 404)):
+            self._adapter('record').send(self._request())
+        self.assertEqual(store.lookup('GET', self.url)['status'], 404)
+
+    def test_replay_miss_raises(self):
+        with self.assertRaises(http_cassette.CassetteMiss):
+            self._adapter('replay').send(self._request())
+
+    def test_replay_injects_429(self):
+        with mock.patch.object(HTTPAdapter, 'send', side_effect=self._live):
+            self._adapter('record').send(self._request())
+        response = self._adapter('replay', INJECT_429=1.0, RETRY_AFTER=3).send(self._request())
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['Retry-After'], '3')
+
+
+class SplitBatchResponseTests(SimpleTestCase):
+    def test_in_order(self):
+        text = "[[#1]] 첫 번째\n[[#2]] 두 번째"
+        self.assertEqual(split_batch_response(text, 2), ['첫 번째', '두 번째'])
+
+    def test_out_of_order_is_sorted(self):
+        text = "[[#2]] B\n[[#1]] A"
+        self.assertEqual(split_batch_response(text, 2), ['A', 'B'])
+
+    def test_missing_or_extra_item_is_rejected(self):
+        self.assertIsNone(split_batch_response("[[#1]] A", 2))
+        self.assertIsNone(split_batch_response("[[#1]] A\n[[#2]] B\n[[#3]] C", 2))
+        self.assertIsNone(split_batch_response("[[#1]] A\n[[#2]]   ", 2))
+        self.assertIsNone(split_batch_response(None, 1))
+
+
+class TranslationCacheTests(TestCase):
+    def test_source_hash_ignores_markup_whitespace_and_case(self):
+        self.assertEqual(
+            translation_cache.source_hash('<p>Hello&nbsp;  World</p>'),
+            translation_cache.source_hash('hello world'),
+        )
+
+    def test_get_or_translate_caches_per_prompt_version(self):
+        translate = mock.Mock(return_value='안녕')
+        version = translation_cache.GAME_DESC_PROMPT_VERSION
+        self.assertEqual(translation_cache.get_or_translate('Hello', translate, version), ('안녕', False))
+        self.assertEqual(translation_cache.get_or_translate(' hello ', translate, version), ('안녕', True))
+        translate.assert_called_once()
+
+        translation_cache.get_or_translate('Hello', translate, translation_cache.PERSONA_PROMPT_VERSION)
+        self.assertEqual(translate.call_count, 2)
+
+    def test_batch_lookup_ignores_other_prompt_versions(self):
+        translation_cache.store('Hello', '안녕', translation_cache.GAME_DESC_PROMPT_VERSION)
+        h = translation_cache.source_hash('Hello')
+        self.assertEqual(translation_cache.lookup_many([h], translation_cache.BATCH_PROMPT_VERSION), {})
+        self.assertEqual(translation_cache.lookup_many([h], translation_cache.GAME_DESC_PROMPT_VERSION), {h: '안녕'})
+
+    def test_failed_translation_is_not_stored(self):
+        self.assertEqual(translation_cache.get_or_translate('Hello', mock.Mock(return_value=None), 'test-v1'), (None, False))
+        self.assertFalse(TranslationCache.objects.exists())
+
+    def test_prune_evicts_least_recently_used(self):
+        translation_cache.store_many([('a', 'A'), ('b', 'B'), ('c', 'C')], 'test-v1')
+        now = timezone.now()
+        for minutes, text in enumerate('cba'):
+            TranslationCache.objects.filter(source_hash=translation_cache.source_hash(text)).update(
+                last_accessed=now - timedelta(minutes=minutes)
+            )
+        self.assertEqual(translation_cache.prune_cache(max_entries=2), 1)
+        self.assertEqual(set(TranslationCache.objects.values_list('translated', flat=True)), {'B', 'C'})
+
+
+class TranslationSingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        translation_cache.reset_cache_stats()
+
+    def test_concurrent_requests_share_one_translation(self):
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def translate(text):
+            calls.append(text)
+            started.set()
+            release.wait(5)
+            return '번역'
+
+        def request():
+            results.append(translation_cache.get_or_translate('Same text', translate, 'test-v1'))
+
+        with mock.patch.object(translation_cache, 'lookup', return_value=None), \
+                mock.patch.object(translation_cache, '_cached_translation', return_value=None), \
+                mock.patch.object(translation_cache, 'store'):
+            leader = threading.Thread(target=request)
+            leader.start()
+            started.wait(5)
+            follower = threading.Thread(target=request)
+            follower.start()
+            # 뒤에 온 요청이 앞선 번역을 기다리기 시작할 때까지
+            deadline = time.monotonic() + 5
+            while not translation_cache._stats['default']['coalesced'] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            release.set()
+            leader.join(5)
+            follower.join(5)
+
+        self.assertEqual(calls, ['Same text'])
+        self.assertCountEqual(results, [('번역', False), ('번역', True)])
+
+
+@jobs.job_handler('tests.ok')
+def _ok_handler(payload):
+    return {'echo': payload.get('value')}
+
+
+@jobs.job_handler('tests.flaky', max_attempts=2)
+def _flaky_handler(payload):
+    raise RuntimeError("temporary")
+
+
+@jobs.job_handler('tests.permanent', max_attempts=5)
+def _permanent_handler(payload):
+    raise jobs.PermanentJobError("bad input")
+
+
+@override_settings(JOB_INPROCESS_WORKERS=0)
+class JobQueueTests(TestCase):
+    def _job(self, kind='tests.ok', **fields):
+        defaults = {'payload': {'value': 1}, 'run_after': timezone.now(), 'max_attempts': 3}
+        defaults.update(fields)
+        return BackgroundJob.objects.create(kind=kind, **defaults)
+
+    def test_claim_prefers_priority_and_takes_lease(self):
+        low = self._job(priority=jobs.PRIORITY_LOW)
+        high = self._job(priority=jobs.PRIORITY_HIGH)
+        job = jobs.claim('w1')
+        self.assertEqual(job.pk, high.pk)
+        self.assertEqual(job.status, 'running')
+        self.assertEqual(job.locked_by, 'w1')
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(jobs.claim('w2').pk, low.pk)
+        self.assertIsNone(jobs.claim('w3'))
+
+    def test_claim_skips_future_and_filters_kinds(self):
+        self._job(run_after=timezone.now() + timedelta(minutes=5))
+        self.assertIsNone(jobs.claim('w1'))
+        self._job(kind='tests.flaky')
+        self.assertIsNone(jobs.claim('w1', kinds=['tests.ok']))
+        self.assertEqual(jobs.claim('w1', kinds=['tests.flaky']).kind, 'tests.flaky')
+
+    def test_expired_lease_is_taken_over(self):
+        job = self._job(status='running', locked_by='dead', locked_until=timezone.now() - timedelta(seconds=1), attempts=1)
+        claimed = jobs.claim('w2')
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.locked_by, 'w2')
+        self.assertEqual(claimed.attempts, 2)
+
+    def test_run_job_done(self):
+        self._job(payload={'value': 42})
+        self.assertEqual(jobs.run_next('w1'), 'done')
+        job = BackgroundJob.objects.get()
+        self.assertEqual(job.status, 'done')
+        self.assertEqual(job.result, {'echo': 42})
+        self.assertIsNotNone(job.finished_at)
+
+    def test_run_job_retries_with_backoff_then_fails(self):
+        self._job(kind='tests.flaky', max_attempts=2)
+        self.assertEqual(jobs.run_next('w1'), 'queued')
+        job = BackgroundJob.objects.get()
+        self.assertEqual(job.status, 'queued')
+        self.assertGreater(job.run_after, timezone.now() + jobs.RETRY_BASE - timedelta(seconds=1))
+        self.assertIn('temporary', job.last_error)
+
+        BackgroundJob.objects.update(run_after=timezone.now())
+        self.assertEqual(jobs.run_next('w1'), 'failed')
+        self.assertEqual(BackgroundJob.objects.get().status, 'failed')
+
+    def test_permanent_error_fails_immediately(self):
+        self._job(kind='tests.permanent', max_attempts=5)
+        self.assertEqual(jobs.run_next('w1'), 'failed')
+        job = BackgroundJob.objects.get()
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('bad input', job.last_error)
+
+    def test_lost_lease_discards_result(self):
+        self._job()
+        job = jobs.claim('w1')
+        # 리스가 만료돼 다른 워커가 가져감
+        BackgroundJob.objects.filter(pk=job.pk).update(locked_by='w2')
+        self.assertEqual(jobs.run_job(job), 'lost')
+        self.assertEqual(BackgroundJob.objects.get().status, 'running')
+
+    def test_enqueue_dedupes_active_and_recent_done_jobs_only(self):
+        first = jobs.enqueue('tests.ok', {'value': 1}, key='k')
+        self.assertEqual(jobs.enqueue('tests.ok', {'value': 1}, key='k').pk, first.pk)
+
+        BackgroundJob.objects.filter(pk=first.pk).update(status='failed', finished_at=timezone.now())
+        retried = jobs.enqueue('tests.ok', {'value': 1}, key='k', recent=timedelta(hours=1))
+        self.assertNotEqual(retried.pk, first.pk)
+
+        BackgroundJob.objects.filter(pk=retried.pk).update(status='done', finished_at=timezone.now())
+        self.assertEqual(jobs.enqueue('tests.ok', {'value': 1}, key='k', recent=timedelta(hours=1)).pk, retried.pk)
+
+    def test_failed_status_hides_exception_text(self):
+        self._job(kind='tests.permanent')
+        jobs.run_next('w1')
+        data = jobs.job_status(BackgroundJob.objects.get())
+        self.assertEqual((data['status'], data['error']), ('failed', jobs.FAILED_MESSAGE))
+
+    def test_next_wakeup_covers_retries_and_leases(self):
+        now = timezone.now()
+        self.assertIsNone(jobs._next_wakeup())
+        retry = self._job(run_after=now + timedelta(minutes=2))
+        self.assertEqual(jobs._next_wakeup(), retry.run_after)
+        running = self._job(status='running', locked_by='w1', locked_until=now + timedelta(minutes=1))
+        self.assertEqual(jobs._next_wakeup(), running.locked_until)
+
+    def test_schedule_kick_keeps_earliest_timer(self):
+        now = timezone.now()
+        with mock.patch.object(jobs, '_timer', None), mock.patch.object(jobs.threading, 'Timer') as timer:
+            timer.return_value.is_alive.return_value = True
+            jobs._schedule_kick(now + timedelta(minutes=1))
+            jobs._schedule_kick(now + timedelta(minutes=5))
+            self.assertEqual(timer.call_count, 1)
+            jobs._schedule_kick(now + timedelta(seconds=10))
+            self.assertEqual(timer.call_count, 2)
+            timer.return_value.cancel.assert_called_once()
+
+
+class ResolverTests(TestCase):
+    def setUp(self):
+        resolver.clear_unknown()
+        resolver.reset_alias_map()
+
+    def _game(self, title, **ids):
+        return Game.objects.create(title=title, image_url='https://img.test/g.jpg', **ids)
+
+    def test_priority_steam_then_rawg_then_pk(self):
+        by_steam = self._game('Steam', steam_appid=7001)
+        by_rawg = self._game('RAWG', rawg_id=7001)
+        self.assertEqual(resolver.resolve_game(7001), by_steam)
+        self.assertEqual(resolver.resolve_game('app7001'), by_steam)
+        self.assertEqual(resolver.resolve_game(7001, spaces=(resolver.RAWG, resolver.STEAM)), by_rawg)
+        self.assertEqual(resolver.resolve_game(by_rawg.pk, spaces=(resolver.PK,)), by_rawg)
+        self.assertIsNone(resolver.resolve_game('no-digits'))
+
+    def test_duplicate_rawg_ids_resolve_to_lowest_pk(self):
+        first = self._game('First', rawg_id=7002)
+        self._game('Second', rawg_id=7002)
+        self.assertEqual(resolver.resolve_game(7002, spaces=(resolver.RAWG,)), first)
+
+    def test_negative_cache_until_game_is_saved(self):
+        resolver.remember_unknown('app7003')
+        game = Game.objects.bulk_create([Game(title='Late', image_url='https://img.test/l.jpg', rawg_id=7003)])[0]
+        # bulk_create 는 시그널이 없어 negative cache 가 그대로 남음
+        self.assertIsNone(resolver.resolve_game(7003))
+        self.assertEqual(resolver.resolve_game(7003, use_unknown_cache=False), game)
+        game.save()
+        self.assertEqual(resolver.resolve_game(7003), game)
+
+    def test_alias_map_answers_without_query(self):
+        game = self._game('Aliased', rawg_id=7004, steam_appid=7005)
+        self.assertEqual(resolver.resolve_game_id(7004, spaces=(resolver.RAWG,)), game.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(resolver.resolve_game_id(7005, spaces=(resolver.STEAM,)), game.pk)
+        self.assertEqual(game.aliases.count(), 2)
+
+
+class RequestRetryTests(SimpleTestCase):
+    url = 'https://retry.test/api'
+
+    def _session(self, *responses):
+        session = mock.Mock()
+        session.request.side_effect = list(responses)
+        return session
+
+    def _response(self, status, retry_after=None):
+        response = mock.Mock(status_code=status, headers={'Retry-After': retry_after} if retry_after else {})
+        return response
+
+    def test_retries_retryable_status(self):
+        session = self._session(self._response(503), self._response(200))
+        with mock.patch.object(http_client, 'get_session', return_value=session), \
+                mock.patch.object(http_client, '_get_limiter', return_value=None), \
+                mock.patch('games.http_client.time.sleep') as sleep:
+            response = http_client.get(self.url, retries=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(session.request.call_count, 2)
+        sleep.assert_called_once()
+
+    def test_no_retry_when_retries_zero(self):
+        session = self._session(self._response(429, '1'))
+        with mock.patch.object(http_client, 'get_session', return_value=session), \
+                mock.patch.object(http_client, '_get_limiter', return_value=None), \
+                mock.patch('games.http_client.time.sleep') as sleep:
+            response = http_client.post(self.url, json={}, retries=0)
+        self.assertEqual(response.status_code, 429)
+        sleep.assert_not_called()
+
+    def test_max_delay_returns_long_retry_after_immediately(self):
+        session = self._session(self._response(429, '30'), self._response(200))
+        with mock.patch.object(http_client, 'get_session', return_value=session), \
+                mock.patch.object(http_client, '_get_limiter', return_value=None), \
+                mock.patch('games.http_client.time.sleep') as sleep:
+            response = http_client.get(self.url, retries=3, max_delay=2)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(session.request.call_count, 1)
+        sleep.assert_not_called()
+
+
+class GameAliasSignalTests(TestCase):
+    def setUp(self):
+        resolver.reset_alias_map()
+
+    def test_deleting_canonical_game_repoints_alias_to_duplicate(self):
+        first = Game.objects.create(title='A', image_url='https://img.test/a.jpg', rawg_id=123)
+        second = Game.objects.create(title='A (중복)', image_url='https://img.test/b.jpg', rawg_id=123)
+        self.assertEqual(GameAlias.objects.get(source=resolver.RAWG, external_id=123).game_id, first.pk)
+
+        first.delete()
+        self.assertEqual(GameAlias.objects.get(source=resolver.RAWG, external_id=123).game_id, second.pk)
+        self.assertEqual(resolver.resolve_game(123, spaces=(resolver.RAWG,)).pk, second.pk)
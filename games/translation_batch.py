@@ -0,0 +1,278 @@
+"""
+게임 설명 일괄 번역 파이프라인 (cache_translations 용)
+
+기존 방식 (translate_text_gemini 순차 호출):
+    게임마다 Gemini 요청 1회 + delay 만큼 sleep
+    → 에디션/DLC 처럼 설명이 같은 게임도 매번 다시 번역
+
+파이프라인:
+    1. 원문 정규화(HTML 제거, 공백/대소문자 통일) 후 sha256 해시 → 같은 해시는 한 번만 번역
+       이미 번역된 게임의 해시와 같거나 번역 캐시(translation_cache, BATCH_PROMPT_VERSION)에 있으면 재사용 (API 호출 없음)
+    2. 짧은 원문 여러 개를 [[#번호]] 구분자로 한 프롬프트에 묶고, 응답을 같은 구분자로 분리
+       (구분자 개수가 맞지 않으면 그 묶음만 단건 번역으로 재시도)
+    3. workers 개 스레드가 묶음을 동시에 요청, gms.ssafy.io 호스트 토큰 버킷(http_client.set_rate_limit) 공유
+    4. 결과는 메인 스레드에서 Game.bulk_update(['description_kr']) 로 write_batch 개씩 반영
+
+사용 예시:
+    from games.translation_batch import translate_descriptions
+    summary = translate_descriptions([(game.id, game.description), ...], workers=3, rate=0.5)
+"""
+
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from . import http_client, translation_cache
+from .translation_cache import BATCH_PROMPT_VERSION, source_hash
+
+logger = logging.getLogger(__name__)
+
+GEMINI_TRANSLATE_URL = (
+    "https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/"
+    "gemini-2.0-flash-lite:generateContent"
+)
+# 한 프롬프트에 묶을 원문 글자 수 / 개수 상한 (이보다 긴 원문은 단독 요청)
+BATCH_CHARS = 6000
+BATCH_ITEMS = 8
+WRITE_BATCH = 50
+
+_MARKER_RE = re.compile(r'\[\[#(\d+)\]\]')
+
+
+def build_batch_prompt(texts):
+    # 프롬프트를 바꾸면 translation_cache.BATCH_PROMPT_VERSION 을 올릴 것
+    items = "\n\n".join(f"[[#{i}]]\n{text.strip()}" for i, text in enumerate(texts, 1))
+    return f"""당신은 10년 경력의 전문 게임 로컬라이제이션 번역가입니다.
+아래 {len(texts)}개의 게임 설명을 각각 자연스러운 한국어로 번역해주세요.
+
+규칙:
+1. 고유명사(타이틀, 캐릭터 등)는 필요시 원어 병기 또는 통용되는 표기 사용
+2. 게임 용어(로그라이크, 오픈월드 등)는 한국 게이머들에게 익숙한 표현 사용
+3. 번역투를 피하고 자연스러운 한국어 문장으로 의역
+4. 각 번역 앞에 원문과 같은 구분자([[#1]], [[#2]] ...)를 그대로 붙이고, 그 외 설명이나 잡담은 출력하지 마세요.
+
+{items}
+
+한국어 번역:"""
+
+
+def split_batch_response(text, count):
+    """[[#번호]] 구분자로 응답 분리 → 번호 순 리스트, 개수가 맞지 않으면 None"""
+    parts = _MARKER_RE.split(text or '')
+    found = {}
+    for number, body in zip(parts[1::2], parts[2::2]):
+        body = body.strip()
+        if body:
+            found[int(number)] = body
+    if sorted(found) != list(range(1, count + 1)):
+        return None
+    return [found[i] for i in range(1, count + 1)]
+
+
+def pack_batches(sources, batch_chars=BATCH_CHARS, batch_items=BATCH_ITEMS):
+    """
+    [(hash, text)] → 묶음 리스트 (짧은 원문끼리 글자 수 / 개수 상한까지 채움)
+    """
+    batches = []
+    current, size = [], 0
+    for item in sorted(sources, key=lambda s: len(s[1])):
+        length = len(item[1])
+        if current and (size + length > batch_chars or len(current) >= batch_items):
+            batches.append(current)
+            current, size = [], 0
+        current.append(item)
+        size += length
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _generate(prompt, api_key):
+    response = http_client.post(
+        GEMINI_TRANSLATE_URL,
+        params={'key': api_key},
+        headers={"Content-Type": "application/json"},
+        json={"contents": [{"parts": [{"text": prompt}]}]},
+    )
+    if response.status_code != 200:
+        logger.error(f"Gemini batch translation failed: {response.status_code} {response.text[:200]}")
+        return None
+    candidates = response.json().get('candidates', [])
+    if not candidates:
+        return None
+    return candidates[0]['content']['parts'][0]['text'].strip()
+
+
+class TranslationStats:
+    """처리량 집계 (워커 스레드 / 메인 스레드 공용)"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.lock = threading.Lock()
+        self.counts = {
+            'games': 0, 'sources': 0, 'reused': 0, 'cached': 0, 'duplicates': 0, 'queued': 0,
+            'requests': 0, 'translated': 0, 'failed': 0, 'written': 0,
+        }
+
+    def add(self, key, n=1):
+        with self.lock:
+            self.counts[key] += n
+
+    def summary(self):
+        elapsed = time.perf_counter() - self.started
+        with self.lock:
+            counts = dict(self.counts)
+        minutes = elapsed / 60 if elapsed else 0
+        counts.update({
+            'elapsed': elapsed,
+            'descriptions_per_min': counts['written'] / minutes if minutes else 0.0,
+            'api_descriptions_per_min': counts['translated'] / minutes if minutes else 0.0,
+        })
+        return counts
+
+
+def translate_batch(batch, api_key, stats):
+    """
+    묶음 하나 번역 → {hash: 번역문}
+
+    여러 개를 묶은 요청의 응답을 분리하지 못하면 각 원문을 단건으로 다시 요청합니다.
+    """
+    stats.add('requests')
+    raw = _generate(build_batch_prompt([text for _, text in batch]), api_key)
+    if not raw:
+        return {}
+    if len(batch) == 1:
+        # 단건은 구분자를 빠뜨려도 응답 전체를 번역으로 사용
+        translated = [_MARKER_RE.sub('', raw).strip()]
+    else:
+        translated = split_batch_response(raw, len(batch))
+        if translated is None:
+            logger.warning(f"Could not split batch response ({len(batch)} items), retrying one by one")
+            results = {}
+            for item in batch:
+                results.update(translate_batch([item], api_key, stats))
+            return results
+    return {h: text for (h, _), text in zip(batch, translated) if text}
+
+
+def known_translations(exclude_ids=()):
+    """이미 번역된 게임의 {원문 해시: description_kr} (같은 설명이면 재사용)"""
+    from .models import Game
+
+    known = {}
+    rows = (
+        Game.objects.exclude(description='').exclude(description_kr='')
+        .exclude(description_kr__isnull=True).exclude(id__in=exclude_ids)
+        .values_list('description', 'description_kr')
+    )
+    for description, description_kr in rows.iterator(chunk_size=2000):
+        known.setdefault(source_hash(description), description_kr)
+    return known
+
+
+def translate_descriptions(items, api_key=None, workers=3, rate=0.5, batch_chars=BATCH_CHARS,
+                           batch_items=BATCH_ITEMS, write_batch=WRITE_BATCH, known=None, use_cache=True,
+                           on_saved=None, on_failed=None, on_progress=None):
+    """
+    게임 설명 일괄 번역 + bulk_update 반영
+
+    Args:
+        items: [(game_id, description)]
+        known: {원문 해시: 번역문} 재사용 맵 (None 이면 DB 에서 조회, --force 는 {})
+        use_cache: TranslationCache 를 먼저 조회할지 여부 (새 번역은 항상 저장)
+        on_saved: callable(game_ids) - DB 에 반영된 게임 id (체크포인트 기록용)
+        on_failed: callable(game_ids) - 번역하지 못한 게임 id
+        on_progress: callable(summary) - 묶음 하나가 끝날 때마다 호출
+    Returns:
+        dict: TranslationStats.summary()
+    """
+    from .models import Game
+
+    api_key = api_key or os.getenv('GMS_API_KEY')
+    stats = TranslationStats()
+    stats.add('games', len(items))
+
+    by_hash = {}
+    sources = {}
+    for game_id, description in items:
+        h = source_hash(description)
+        by_hash.setdefault(h, []).append(game_id)
+        sources.setdefault(h, description)
+    stats.add('sources', len(sources))
+    stats.add('duplicates', len(items) - len(sources))
+
+    if known is None:
+        known = known_translations(exclude_ids=[game_id for game_id, _ in items])
+
+    pending = []
+
+    def write(force=False):
+        if pending and (force or len(pending) >= write_batch):
+            Game.objects.bulk_update(pending, ['description_kr'], batch_size=write_batch)
+            stats.add('written', len(pending))
+            if on_saved:
+                on_saved([game.id for game in pending])
+            pending.clear()
+
+    def assign(h, translation):
+        for game_id in by_hash[h]:
+            pending.append(Game(id=game_id, description_kr=translation))
+        write()
+
+    todo = []
+    for h, description in sources.items():
+        if h in known:
+            stats.add('reused', len(by_hash[h]))
+            assign(h, known[h])
+        else:
+            todo.append((h, description))
+
+    # 번역 캐시 (이전 실행에서 같은 일괄 번역 프롬프트로 번역한 텍스트)
+    if todo and use_cache:
+        cached = translation_cache.lookup_many([h for h, _ in todo], BATCH_PROMPT_VERSION, origin='batch')
+        for h in cached:
+            stats.add('cached', len(by_hash[h]))
+            assign(h, cached[h])
+        todo = [(h, description) for h, description in todo if h not in cached]
+
+    if todo and not api_key:
+        logger.warning("GMS_API_KEY for translation not configured")
+        stats.add('failed', sum(len(by_hash[h]) for h, _ in todo))
+        if on_failed:
+            on_failed([game_id for h, _ in todo for game_id in by_hash[h]])
+        todo = []
+
+    stats.add('queued', len(todo))
+    batches = pack_batches(todo, batch_chars, batch_items)
+    if batches:
+        http_client.set_rate_limit(GEMINI_TRANSLATE_URL, rate, burst=workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(translate_batch, batch, api_key, stats): batch for batch in batches}
+            for future in as_completed(futures):
+                batch = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    logger.error(f"Error calling Gemini translation API: {e}")
+                    results = {}
+                translation_cache.store_many(
+                    [(sources[h], results[h]) for h, _ in batch if h in results], BATCH_PROMPT_VERSION, origin='batch'
+                )
+                missing = []
+                for h, _ in batch:
+                    if h in results:
+                        stats.add('translated')
+                        assign(h, results[h])
+                    else:
+                        stats.add('failed', len(by_hash[h]))
+                        missing.extend(by_hash[h])
+                if missing and on_failed:
+                    on_failed(missing)
+                if on_progress:
+                    on_progress(stats.summary())
+
+    write(force=True)
+    return stats.summary()
@@ -0,0 +1,334 @@
+"""
+번역 결과 캐시 (DB 저장, 원문 해시 + 대상 언어 + 프롬프트 버전)
+
+기존 방식:
+    translate_text_api(users) / api_translate_game(games) / cache_translations 가 각자 Gemini 호출
+    (api_translate_game 만 Game.description_kr 로 건너뜀, 임의 텍스트는 요청마다 다시 번역)
+
+캐시 방식:
+    - 키: (sha256(정규화된 원문), lang, prompt_version) → TranslationCache 한 행
+      prompt_version 은 프롬프트마다 따로 (*_PROMPT_VERSION) → 다른 프롬프트의 번역과 섞이지 않음
+      정규화: HTML 태그/엔티티, 공백, 대소문자 차이 무시 → 에디션별로 조금 다른 설명도 같은 키
+    - single-flight: 같은 키를 동시에 요청하면 한 요청만 Gemini 를 호출하고 나머지는 그 결과를 기다림
+      (프로세스 단위, 다른 워커 프로세스와는 DB 캐시로만 공유)
+    - TRANSLATION_CACHE_MAX_ENTRIES 초과 시 최근 조회가 오래된 행부터 삭제 (LRU)
+    - 프로세스별 적중률 통계: get_cache_stats() / python manage.py translation_cache
+
+사용 예시:
+    from games.translation_cache import get_or_translate
+    translated, cached = get_or_translate(text, translate_text_gemini, GAME_DESC_PROMPT_VERSION, origin='game')
+"""
+
+import hashlib
+import html
+import logging
+import re
+import threading
+from collections import Counter, defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# 프롬프트별 번역 버전 (프롬프트 규칙을 바꾸면 해당 버전만 올릴 것)
+GAME_DESC_PROMPT_VERSION = 'game-desc-v1'        # games.utils.translate_text_gemini
+BATCH_PROMPT_VERSION = 'game-desc-batch-v1'      # games.translation_batch.build_batch_prompt
+PERSONA_PROMPT_VERSION = 'persona-v1'            # users.views.translate_text_api
+PROMPT_VERSIONS = (GAME_DESC_PROMPT_VERSION, BATCH_PROMPT_VERSION, PERSONA_PROMPT_VERSION)
+DEFAULT_LANG = 'ko'
+# last_accessed 갱신 최소 간격 (캐시 적중마다 UPDATE 하지 않도록)
+TOUCH_INTERVAL = timedelta(minutes=10)
+# N번 저장마다 크기 상한 검사
+EVICT_CHECK_EVERY = 100
+# 다른 요청이 번역 중인 결과를 기다리는 최대 시간 (초)
+FLIGHT_TIMEOUT = 60
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_SPACE_RE = re.compile(r'\s+')
+
+_stats = defaultdict(Counter)
+_stats_lock = threading.Lock()
+_flights = {}
+_flights_lock = threading.Lock()
+
+
+def get_max_entries():
+    return getattr(settings, 'TRANSLATION_CACHE_MAX_ENTRIES', 50000)
+
+
+def normalize_source(text):
+    """해시용 원문 정규화 (HTML 태그/엔티티, 공백, 대소문자 차이 무시)"""
+    text = html.unescape(_TAG_RE.sub(' ', text or ''))
+    return _SPACE_RE.sub(' ', text).strip().casefold()
+
+
+def source_hash(text):
+    return hashlib.sha256(normalize_source(text).encode('utf-8')).hexdigest()
+
+
+def _record(origin, event, n=1):
+    with _stats_lock:
+        _stats[origin][event] += n
+
+
+class _Flight:
+    """진행 중인 번역 1건 (먼저 온 요청이 결과를 채우고 event 로 알림)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+
+
+def lookup(text, version, lang=DEFAULT_LANG, origin='default'):
+    """캐시된 번역 (없으면 None), 적중/미스 통계 기록"""
+    from .models import TranslationCache
+
+    now = timezone.now()
+    try:
+        entry = (
+            TranslationCache.objects.filter(source_hash=source_hash(text), lang=lang, prompt_version=version)
+            .only('id', 'translated', 'last_accessed')
+            .first()
+        )
+    except DatabaseError as e:
+        logger.warning(f"Translation cache read failed ({origin}): {e}")
+        entry = None
+
+    if entry is None:
+        _record(origin, 'misses')
+        return None
+
+    _record(origin, 'hits')
+    if now - entry.last_accessed > TOUCH_INTERVAL:
+        TranslationCache.objects.filter(pk=entry.pk).update(last_accessed=now, hits=F('hits') + 1)
+    return entry.translated
+
+
+def _cached_translation(h, lang, version):
+    from .models import TranslationCache
+
+    try:
+        return (
+            TranslationCache.objects.filter(source_hash=h, lang=lang, prompt_version=version)
+            .values_list('translated', flat=True).first()
+        )
+    except DatabaseError:
+        return None
+
+
+def get_or_translate(text, translate, version, lang=DEFAULT_LANG, origin='default'):
+    """
+    캐시를 거쳐 번역
+
+    Args:
+        text: 원문
+        translate: callable(text) → 번역문 또는 None (캐시 미스일 때만 호출)
+        version: translate 가 쓰는 프롬프트의 버전 (*_PROMPT_VERSION)
+        origin: 통계 구분 이름 ('api', 'game', 'batch' ...)
+
+    Returns:
+        tuple: (번역문 또는 None, 캐시/다른 요청 결과 사용 여부)
+
+    Raises:
+        translate 가 던진 예외 (먼저 온 요청에만 전달, 기다리던 요청은 None)
+    """
+    cached = lookup(text, version, lang, origin)
+    if cached is not None:
+        return cached, True
+
+    key = (source_hash(text), lang, version)
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        _record(origin, 'coalesced')
+        flight.event.wait(FLIGHT_TIMEOUT)
+        return flight.result, flight.result is not None
+
+    try:
+        # 조회와 flight 등록 사이에 앞선 요청이 저장을 끝냈을 수 있으므로 한 번 더 확인
+        recent = _cached_translation(*key)
+        if recent is not None:
+            flight.result = recent
+            return recent, True
+        flight.result = translate(text)
+        if flight.result:
+            store(text, flight.result, version, lang, origin)
+        return flight.result, False
+    finally:
+        flight.event.set()
+        with _flights_lock:
+            _flights.pop(key, None)
+
+
+def store(text, translated, version, lang=DEFAULT_LANG, origin='default'):
+    """번역 1건 저장"""
+    store_many([(text, translated)], version, lang, origin)
+
+
+def lookup_many(hashes, version, lang=DEFAULT_LANG, origin='batch'):
+    """
+    원문 해시 여러 개를 한 번에 조회 (배치 작업용)
+
+    Returns:
+        dict: {source_hash: 번역문} (적중한 것만)
+    """
+    from .models import TranslationCache
+
+    hashes = list(hashes)
+    found = {}
+    for i in range(0, len(hashes), 500):
+        rows = TranslationCache.objects.filter(
+            source_hash__in=hashes[i:i + 500], lang=lang, prompt_version=version
+        ).values_list('source_hash', 'translated')
+        found.update(rows)
+    if found:
+        TranslationCache.objects.filter(
+            source_hash__in=list(found), lang=lang, prompt_version=version
+        ).update(last_accessed=timezone.now(), hits=F('hits') + 1)
+    _record(origin, 'hits', len(found))
+    _record(origin, 'misses', len(hashes) - len(found))
+    return found
+
+
+def store_many(rows, version, lang=DEFAULT_LANG, origin='batch'):
+    """
+    번역 여러 건을 한 번에 저장 (같은 키는 덮어씀)
+
+    Args:
+        rows: [(원문, 번역문), ...]
+    """
+    from .models import TranslationCache
+
+    now = timezone.now()
+    entries = {}
+    for text, translated in rows:
+        if not translated:
+            continue
+        h = source_hash(text)
+        entries[h] = TranslationCache(
+            source_hash=h,
+            lang=lang,
+            prompt_version=version,
+            translated=translated,
+            source_chars=len(text or ''),
+            origin=origin,
+            last_accessed=now,
+        )
+    if not entries:
+        return 0
+
+    try:
+        TranslationCache.objects.bulk_create(
+            entries.values(),
+            update_conflicts=True,
+            unique_fields=['source_hash', 'lang', 'prompt_version'],
+            update_fields=['translated', 'source_chars', 'last_accessed'],
+            batch_size=200,
+        )
+    except DatabaseError as e:
+        logger.warning(f"Translation cache write failed ({origin}): {e}")
+        return 0
+
+    with _stats_lock:
+        before = sum(c['stores'] for c in _stats.values())
+        _stats[origin]['stores'] += len(entries)
+    if (before + len(entries)) // EVICT_CHECK_EVERY != before // EVICT_CHECK_EVERY:
+        prune_cache()
+    return len(entries)
+
+
+def prune_cache(max_entries=None):
+    """
+    상한 초과분을 LRU 로 삭제
+
+    Returns:
+        int: 삭제한 행 수
+    """
+    from .models import TranslationCache
+
+    max_entries = get_max_entries() if max_entries is None else max_entries
+    cutoff = list(
+        TranslationCache.objects.order_by('-last_accessed', '-id')
+        .values_list('last_accessed', 'id')[max_entries:max_entries + 1]
+    )
+    if not cutoff:
+        return 0
+
+    last_accessed, cutoff_id = cutoff[0]
+    evicted, _ = TranslationCache.objects.filter(
+        Q(last_accessed__lt=last_accessed) | Q(last_accessed=last_accessed, id__lte=cutoff_id)
+    ).delete()
+    with _stats_lock:
+        _stats['_all']['evictions'] += evicted
+    logger.info(f"Translation cache evicted {evicted} entries (max {max_entries})")
+    return evicted
+
+
+def clear_cache(version=None):
+    """캐시 행 삭제 (version 지정 시 해당 프롬프트 버전만)"""
+    from .models import TranslationCache
+
+    qs = TranslationCache.objects.all()
+    if version:
+        qs = qs.filter(prompt_version=version)
+    deleted, _ = qs.delete()
+    return deleted
+
+
+def get_cache_stats():
+    """
+    적중률 통계 (프로세스 메모리) + DB 행 수
+
+    Returns:
+        dict: {'origins': {origin: {hits, misses, coalesced, stores, hit_rate}},
+               'total': {...}, 'versions': {prompt_version: n}, 'entries': n, 'max_entries': n}
+    """
+    from .models import TranslationCache
+
+    with _stats_lock:
+        snapshot = {name: Counter(c) for name, c in _stats.items()}
+    evictions = snapshot.pop('_all', Counter())['evictions']
+
+    versions = {
+        row['prompt_version']: row['count']
+        for row in TranslationCache.objects.values('prompt_version').annotate(count=Count('id'))
+    }
+
+    def summarize(counter):
+        # 다른 요청의 결과를 기다려 받은 경우도 Gemini 호출을 아낀 것이므로 적중으로 계산
+        served = counter['hits'] + counter['coalesced']
+        lookups = counter['hits'] + counter['misses']
+        return {
+            'hits': counter['hits'],
+            'misses': counter['misses'],
+            'coalesced': counter['coalesced'],
+            'stores': counter['stores'],
+            'hit_rate': round(served / lookups, 4) if lookups else 0.0,
+        }
+
+    origins = {}
+    total = Counter()
+    for name in sorted(snapshot):
+        total.update(snapshot[name])
+        origins[name] = summarize(snapshot[name])
+
+    return {
+        'origins': origins,
+        'total': {**summarize(total), 'evictions': evictions},
+        'versions': versions,
+        'entries': sum(versions.values()),
+        'max_entries': get_max_entries(),
+    }
+
+
+def reset_cache_stats():
+    with _stats_lock:
+        _stats.clear()
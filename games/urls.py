@@ -27,6 +27,9 @@ urlpatterns = [
 
     # API Endpoints - Translate Game Description
     path('api/translate/', views.api_translate_game, name='api_translate_game'),
+
+    # API Endpoints - Background Job Status (games/jobs.py 작업 폴링)
+    path('api/jobs/<int:job_id>/', views.api_job_status, name='api_job_status'),
     
     # API Endpoints - Autocomplete
     path('api/autocomplete/', views.api_autocomplete_games, name='api_autocomplete_games'),
@@ -2,6 +2,8 @@ import os
 import requests
 import logging
 from django.conf import settings
+from . import http_client
+from .rawg_cache import rawg_get
 from .models import Game, GameScreenshot, GameTrailer, Tag
 
 # Configure logging
@@ -61,7 +63,7 @@ def get_tag_type(slug):
     else:
         return 'feature'  # 기본값
 
-def get_rawg_game_id(game_title, steam_appid=None):
+def get_rawg_game_id(game_title, steam_appid=None, max_delay=None):
     """
     Search for a game by title and optionally Steam AppID, return its RAWG ID.
     Tries to find the best match using Steam store link if available.
@@ -79,7 +81,7 @@ def get_rawg_game_id(game_title, steam_appid=None):
                 'search': game_title,
                 'page_size': 5
             }
-            response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
+            response = http_client.get(f"{BASE_URL}/games", params=params, max_delay=max_delay)
             response.raise_for_status()
             data = response.json()
             
@@ -87,7 +89,7 @@ def get_rawg_game_id(game_title, steam_appid=None):
             for result in data.get('results', []):
                 game_id = result['id']
                 # Fetch detailed info to check Steam store
-                details = fetch_rawg_game_details(game_id)
+                details = fetch_rawg_game_details(game_id, max_delay=max_delay)
                 if details and 'stores' in details:
                     for store in details.get('stores', []):
                         if store.get('store', {}).get('id') == 1:  # Steam store
@@ -106,7 +108,7 @@ def get_rawg_game_id(game_title, steam_appid=None):
         'page_size': 1
     }
     try:
-        response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
+        response = http_client.get(f"{BASE_URL}/games", params=params, max_delay=max_delay)
         response.raise_for_status()
         data = response.json()
         if data.get('results'):
@@ -120,26 +122,26 @@ def get_rawg_game_id(game_title, steam_appid=None):
     
     return None
 
-def fetch_rawg_game_details(game_id):
+def fetch_rawg_game_details(game_id, max_delay=None, refresh=False):
     """
     Fetch detailed game information from RAWG.
+
+    max_delay: 재시도 대기 상한 (웹 요청 경로는 http_client.INTERACTIVE_MAX_DELAY)
+    refresh: True 면 응답 캐시를 건너뛰고 새로 받아 캐시를 갱신
     """
     if not RAWG_API_KEY:
         return None
 
     try:
-        response = requests.get(
-            f"{BASE_URL}/games/{game_id}", 
-            params={'key': RAWG_API_KEY},
-            timeout=10
+        return rawg_get(
+            'game_details', f"{BASE_URL}/games/{game_id}", {'key': RAWG_API_KEY},
+            max_delay=max_delay, refresh=refresh,
         )
-        response.raise_for_status()
-        return response.json()
     except requests.RequestException as e:
         logger.error(f"Error fetching details for RAWG game {game_id}: {e}")
         return None
 
-def fetch_rawg_screenshots(game_id, limit=10):
+def fetch_rawg_screenshots(game_id, limit=10, max_delay=None, refresh=False):
     """
     Fetch screenshots from RAWG.
     """
@@ -151,20 +153,18 @@ def fetch_rawg_screenshots(game_id, limit=10):
             'key': RAWG_API_KEY,
             'page_size': limit
         }
-        response = requests.get(
-            f"{BASE_URL}/games/{game_id}/screenshots", 
-            params=params,
-            timeout=10
-        )
-        response.raise_for_status()
-        results = response.json().get('results', [])
+        data = rawg_get(
+            'screenshots', f"{BASE_URL}/games/{game_id}/screenshots", params,
+            max_delay=max_delay, refresh=refresh,
+        ) or {}
+        results = data.get('results', [])
         logger.info(f"Fetched {len(results)} screenshots for RAWG game {game_id}")
         return results
     except requests.RequestException as e:
         logger.error(f"Error fetching screenshots for RAWG game {game_id}: {e}")
         return []
 
-def fetch_rawg_trailers(game_id):
+def fetch_rawg_trailers(game_id, max_delay=None, refresh=False):
     """
     Fetch trailers/movies from RAWG.
     """
@@ -172,13 +172,11 @@ def fetch_rawg_trailers(game_id):
         return []
 
     try:
-        response = requests.get(
-            f"{BASE_URL}/games/{game_id}/movies", 
-            params={'key': RAWG_API_KEY},
-            timeout=10
-        )
-        response.raise_for_status()
-        results = response.json().get('results', [])
+        data = rawg_get(
+            'movies', f"{BASE_URL}/games/{game_id}/movies", {'key': RAWG_API_KEY},
+            max_delay=max_delay, refresh=refresh,
+        ) or {}
+        results = data.get('results', [])
         logger.info(f"Fetched {len(results)} trailers for RAWG game {game_id}")
         return results
     except requests.RequestException as e:
@@ -188,6 +186,8 @@ def fetch_rawg_trailers(game_id):
 def translate_text_gemini(text):
     """
     Translate text using Gemini API (or other available method).
+
+    프롬프트를 바꾸면 translation_cache.GAME_DESC_PROMPT_VERSION 을 올릴 것
     """
     api_key = os.getenv('GMS_API_KEY')
     if not api_key:
@@ -209,13 +209,12 @@ def translate_text_gemini(text):
 
 한국어 번역:"""
 
-        response = requests.post(
+        response = http_client.post(
             f"https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-lite:generateContent?key={api_key}",
             headers={"Content-Type": "application/json"},
             json={
                 "contents": [{"parts": [{"text": prompt}]}]
-            },
-            timeout=30
+            }
         )
         
         if response.status_code == 200:
@@ -232,13 +231,14 @@ def translate_text_gemini(text):
         
     return None
 
-def update_game_with_rawg(game, force_refresh=False):
+def update_game_with_rawg(game, force_refresh=False, max_delay=None):
     """
     Update a Game instance with enriched data from RAWG API.
     
     Args:
         game: Game instance to update
-        force_refresh: If True, fetch data even if already exists
+        force_refresh: If True, fetch data even if already exists (RAWG 응답 캐시도 건너뜀)
+        max_delay: 재시도 대기 상한 (웹 요청 경로는 http_client.INTERACTIVE_MAX_DELAY)
     
     Returns:
         bool: True if successfully updated, False otherwise
@@ -254,25 +254,24 @@ def update_game_with_rawg(game, force_refresh=False):
     
     # Get or find RAWG ID
     rawg_id = None
-    had_existing_rawg_id = bool(game.rawg_id)
+    details = None
     
     if game.rawg_id:
         rawg_id = game.rawg_id
         logger.info(f"Using existing RAWG ID {rawg_id} for '{game.title}'")
         
         # Validate existing RAWG ID by fetching details first
-        details = fetch_rawg_game_details(rawg_id)
+        details = fetch_rawg_game_details(rawg_id, max_delay=max_delay, refresh=force_refresh)
         if details is None:
             # 404 error - likely a Steam ID stored as RAWG ID
             logger.warning(f"Invalid RAWG ID {rawg_id} for '{game.title}' (possibly Steam ID). Clearing and re-searching...")
             game.rawg_id = None
             game.save(update_fields=['rawg_id'])
             rawg_id = None
-            had_existing_rawg_id = False
     
     # If no valid RAWG ID, search for it
     if not rawg_id:
-        rawg_id = get_rawg_game_id(game.title, steam_appid=game.steam_appid)
+        rawg_id = get_rawg_game_id(game.title, steam_appid=game.steam_appid, max_delay=max_delay)
         if not rawg_id:
             logger.warning(f"Could not find RAWG ID for '{game.title}'")
             return False
@@ -280,11 +279,10 @@ def update_game_with_rawg(game, force_refresh=False):
         game.save(update_fields=['rawg_id'])
         logger.info(f"Saved RAWG ID {rawg_id} for '{game.title}'")
 
-    # Fetch and update game details (if not already fetched during validation)
-    if not had_existing_rawg_id:
-        # Need to fetch details for newly found RAWG ID
-        details = fetch_rawg_game_details(rawg_id)
-    # else: details was already fetched during validation above
+    # Fetch details only for a newly found RAWG ID (validation above already fetched them,
+    # and the Steam AppID search in get_rawg_game_id leaves them in the response cache)
+    if details is None:
+        details = fetch_rawg_game_details(rawg_id, max_delay=max_delay, refresh=force_refresh)
     
     if details:
         # Update description (prefer raw text over HTML)
@@ -351,7 +349,7 @@ def update_game_with_rawg(game, force_refresh=False):
         return False
 
     # Fetch and save screenshots (avoid duplicates)
-    screenshots = fetch_rawg_screenshots(rawg_id, limit=10)
+    screenshots = fetch_rawg_screenshots(rawg_id, limit=10, max_delay=max_delay, refresh=force_refresh)
     screenshot_count = 0
     for ss in screenshots:
         _, created = GameScreenshot.objects.get_or_create(
@@ -365,7 +363,7 @@ def update_game_with_rawg(game, force_refresh=False):
         logger.info(f"Added {screenshot_count} new screenshots for '{game.title}'")
 
     # Fetch and save trailers (avoid duplicates)
-    trailers = fetch_rawg_trailers(rawg_id)
+    trailers = fetch_rawg_trailers(rawg_id, max_delay=max_delay, refresh=force_refresh)
     trailer_count = 0
     for tr in trailers:
         # Check if trailer data has required fields
@@ -401,7 +399,7 @@ def update_game_with_rawg(game, force_refresh=False):
 # B. 게임 검색 및 매핑
 # ============================================================================
 
-def search_games(query, platforms='4', page_size=20):
+def search_games(query, platforms='4', page_size=20, max_delay=None):
     """
     Search for games on RAWG by title.
     
@@ -409,6 +407,7 @@ def search_games(query, platforms='4', page_size=20):
         query: Game title to search for
         platforms: Platform ID (4 = PC, default)
         page_size: Number of results to return (default: 20)
+        max_delay: 재시도 대기 상한 (웹 요청 경로는 http_client.INTERACTIVE_MAX_DELAY)
     
     Returns:
         list: List of game dictionaries with basic info
@@ -424,9 +423,7 @@ def search_games(query, platforms='4', page_size=20):
             'platforms': platforms,
             'page_size': page_size
         }
-        response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = rawg_get('search', f"{BASE_URL}/games", params, max_delay=max_delay) or {}
         
         results = []
         for game in data.get('results', []):
@@ -452,7 +449,7 @@ def search_games(query, platforms='4', page_size=20):
 # C. 분류 및 태그 (UI 필터용)
 # ============================================================================
 
-def get_genres(page_size=50):
+def get_genres(page_size=50, max_delay=None):
     """
     Get list of all game genres from RAWG.
     
@@ -468,9 +465,7 @@ def get_genres(page_size=50):
             'key': RAWG_API_KEY,
             'page_size': page_size
         }
-        response = requests.get(f"{BASE_URL}/genres", params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = rawg_get('genres', f"{BASE_URL}/genres", params, max_delay=max_delay) or {}
         
         genres = []
         for genre in data.get('results', []):
@@ -490,7 +485,7 @@ def get_genres(page_size=50):
         return []
 
 
-def get_platforms(page_size=50):
+def get_platforms(page_size=50, max_delay=None):
     """
     Get list of all gaming platforms from RAWG.
     
@@ -506,9 +501,7 @@ def get_platforms(page_size=50):
             'key': RAWG_API_KEY,
             'page_size': page_size
         }
-        response = requests.get(f"{BASE_URL}/platforms", params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = rawg_get('platforms', f"{BASE_URL}/platforms", params, max_delay=max_delay) or {}
         
         platforms = []
         for platform in data.get('results', []):
@@ -528,13 +521,14 @@ def get_platforms(page_size=50):
         return []
 
 
-def get_games_by_genre(genre_slug, page_size=20):
+def get_games_by_genre(genre_slug, page_size=20, max_delay=None):
     """
     Get games filtered by genre.
     
     Args:
         genre_slug: Genre slug (e.g., 'action', 'rpg', 'strategy')
         page_size: Number of results to return
+        max_delay: 재시도 대기 상한 (웹 요청 경로는 http_client.INTERACTIVE_MAX_DELAY)
     
     Returns:
         list: List of games in that genre
@@ -550,9 +544,7 @@ def get_games_by_genre(genre_slug, page_size=20):
             'page_size': page_size,
             'platforms': '4'  # PC only
         }
-        response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = rawg_get('games_by_genre', f"{BASE_URL}/games", params, max_delay=max_delay) or {}
         
         results = []
         for game in data.get('results', []):
@@ -633,7 +625,7 @@ def get_games_by_ordering(ordering='-added', page_size=20, platforms='4',
         if exclude_additions:
             params['exclude_additions'] = 'true'
         
-        response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
+        response = http_client.get(f"{BASE_URL}/games", params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -708,7 +700,7 @@ def get_popular_games(page_size=20, all_time=False):
             two_years_ago = (datetime.now() - timedelta(days=730)).strftime('%Y-%m-%d')
             params['dates'] = f'{two_years_ago},{today}'  # Games from last 2 years
         
-        response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
+        response = http_client.get(f"{BASE_URL}/games", params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -772,7 +764,7 @@ def get_top_rated_games(page_size=20):
             'platforms': '4',
             'exclude_additions': 'true'
         }
-        response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
+        response = http_client.get(f"{BASE_URL}/games", params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -857,7 +849,7 @@ def get_trending_games(page_size=20):
             'exclude_additions': 'true'  # Exclude DLCs
         }
         
-        response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
+        response = http_client.get(f"{BASE_URL}/games", params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -927,7 +919,7 @@ def get_new_releases(page_size=20):
             'platforms': '4',  # PC only
             'exclude_additions': 'true'  # Exclude DLCs
         }
-        response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
+        response = http_client.get(f"{BASE_URL}/games", params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -1009,7 +1001,7 @@ def get_upcoming_games(page_size=20):
             'page_size': page_size,
             'platforms': '4'  # PC only
         }
-        response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
+        response = http_client.get(f"{BASE_URL}/games", params=params)
         response.raise_for_status()
         data = response.json()
         
@@ -1053,7 +1045,7 @@ def fetch_steam_trailers(game):
     try:
         # Steam Store API (공개)
         url = f"https://store.steampowered.com/api/appdetails?appids={game.steam_appid}"
-        response = requests.get(url, timeout=5)
+        response = http_client.get(url, timeout=5)
         
         if response.status_code != 200:
             return False
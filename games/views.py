@@ -2,6 +2,7 @@ from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse, Http404
 from .models import Game, Rating, CachedGameList, SteamReview
+from . import http_client
 from users.models import GameRating  # 실제 유저 평가 데이터
 from .utils import (
     update_game_with_rawg, 
@@ -16,9 +17,11 @@ from .utils import (
     get_upcoming_games,
     get_games_by_ordering,
     fetch_rawg_game_details,
-    fetch_rawg_screenshots,
     RAWG_API_KEY
 )
+from .jobs import PRIORITY_HIGH, enqueue, job_status
+from .resolver import RAWG, UNKNOWN_TTL, is_known_unknown, parse_game_id, remember_unknown, resolve_game, resolve_game_id
+from datetime import timedelta
 import re
 import os
 
@@ -63,7 +66,7 @@ def game_search_by_title(request):
     
     # RAWG에서 제목으로 검색
     print(f"[DEBUG] Searching RAWG for: '{title}'")
-    games = search_games(title, page_size=1)
+    games = search_games(title, page_size=1, max_delay=http_client.INTERACTIVE_MAX_DELAY)
     print(f"[DEBUG] RAWG search result: {len(games) if games else 0} games found")
     
     if games:
@@ -83,8 +86,9 @@ def game_detail(request, game_id):
     """
     통합된 게임 상세 페이지 뷰
     
-    1. DB에서 게임 조회 (Steam ID 또는 RAWG ID)
-    2. DB에 없으면 RAWG API에서 가져와 자동 생성
+    1. DB에서 게임 조회 (Steam ID 또는 RAWG ID 또는 DB ID, games/resolver.py 쿼리 1회)
+    2. DB에 없으면 RAWG 자동 생성 작업(games.import_rawg_game)을 큐에 넣고 대기 페이지(importing.html)
+       → 작업이 끝나면 페이지가 새로고침되어 3으로
     3. 모든 게임을 동일한 템플릿(detail.html)으로 렌더링
     """
     # Get RAWG API key from environment
@@ -92,64 +96,43 @@ def game_detail(request, game_id):
     
     print(f"[DEBUG] game_detail called with game_id: {game_id} (type: {type(game_id).__name__})")
     
-    numeric_id = extract_app_id(game_id)
+    numeric_id = parse_game_id(game_id)
     print(f"[DEBUG] Extracted numeric_id: {numeric_id}")
     
-    game = None
-    
-    # 1. Steam 형식 ID (app123, bundle456 등)
-    if is_steam_id(game_id):
-        game = Game.objects.filter(steam_appid=numeric_id).first()
-        print(f"[DEBUG] Steam ID search result: {game}")
-    
-    # 2. 순수 숫자 ID - Steam AppID로 먼저 검색
-    if not game:
-        game = Game.objects.filter(steam_appid=numeric_id).first()
-        print(f"[DEBUG] Steam AppID search result: {game}")
-    
-    # 3. 여전히 없으면 RAWG ID로 검색
-    if not game:
-        game = Game.objects.filter(rawg_id=numeric_id).first()
-    
-    # 4. If still missing, check local DB ID (for Korean games etc)
-    if not game:
-        game = Game.objects.filter(id=numeric_id).first()
-        print(f"[DEBUG] RAWG ID search result: {game}")
+    # 1. Steam AppID → RAWG ID → DB ID 우선순위로 한 번에 조회
+    #    (DB + RAWG 에 없다고 확인된 ID 는 UNKNOWN_TTL 동안 조회 없이 바로 '없음')
+    game = resolve_game(numeric_id) if numeric_id is not None else None
+    print(f"[DEBUG] Game resolve result: {game}")
+    
+    # 2. DB에 없으면 RAWG 조회 + 자동 생성을 작업 큐에 넣고 대기 페이지 반환
+    #    (같은 게임을 동시에 열어도 작업은 1개, 페이지가 작업 상태를 폴링하다 완료되면 새로고침)
+    if not game and numeric_id is not None and not is_known_unknown(numeric_id):
+        print(f"[DEBUG] Game not in DB, enqueueing RAWG import...")
+        job = enqueue(
+            'games.import_rawg_game', {'rawg_id': numeric_id},
+            key=f'rawg:{numeric_id}', priority=PRIORITY_HIGH,
+            recent=timedelta(seconds=UNKNOWN_TTL)
+        )
+        if job.status == 'done' and (job.result or {}).get('found'):
+            # 최근에 만든 게임이 그 사이 삭제됨 → 다시 가져옴
+            job = enqueue(
+                'games.import_rawg_game', {'rawg_id': numeric_id},
+                key=f'rawg:{numeric_id}', priority=PRIORITY_HIGH
+            )
+        if job.status != 'done':
+            return render(request, 'games/importing.html', {
+                'job': job,
+                'game_id': game_id,
+            }, status=202)
+        # 최근 작업에서 RAWG 에도 없다고 확인됨 (다른 프로세스에서 확인한 경우 포함)
+        remember_unknown(numeric_id)
     
-    # 4. DB에 없으면 RAWG API에서 가져와 자동 생성
     if not game:
-        print(f"[DEBUG] Game not in DB, fetching from RAWG API...")
-        rawg_data = fetch_rawg_game_details(numeric_id)
-        print(f"[DEBUG] RAWG API result: {rawg_data is not None}")
-        
-        if rawg_data:
-            # 게임 생성
-            game = Game.objects.create(
-                rawg_id=rawg_data.get('id'),
-                title=rawg_data.get('name', f'Game {numeric_id}'),
-                description=rawg_data.get('description_raw', ''),
-                image_url=rawg_data.get('background_image', ''),
-                background_image=rawg_data.get('background_image', ''),
-                metacritic_score=rawg_data.get('metacritic'),
-                genre=', '.join([g['name'] for g in rawg_data.get('genres', [])[:3]]) or '게임',
-            )
-            
-            # 스크린샷 저장
-            screenshots = fetch_rawg_screenshots(numeric_id)
-            from .models import GameScreenshot
-            for ss in screenshots[:8]:
-                GameScreenshot.objects.get_or_create(
-                    game=game,
-                    image_url=ss.get('image', '')
-                )
-            
-            print(f"✅ Auto-created game from RAWG: {game.title} (ID: {numeric_id})")
-        else:
-            # RAWG에서도 찾을 수 없음
-            print(f"[DEBUG] ❌ Game not found anywhere, redirecting to main. game_id={game_id}")
-            from django.contrib import messages
-            messages.error(request, f'게임을 찾을 수 없습니다 (ID: {game_id})')
-            return redirect('users:main')
+        # RAWG에서도 찾을 수 없음
+        print(f"[DEBUG] ❌ Game not found anywhere, redirecting to main. game_id={game_id}")
+        from django.contrib import messages
+        messages.error(request, f'게임을 찾을 수 없습니다 (ID: {game_id})')
+        return redirect('users:main')
     
     # 리뷰 POST 처리 (users.GameRating 사용)
     if request.method == 'POST':
@@ -159,12 +142,12 @@ def game_detail(request, game_id):
             GameRating.objects.update_or_create(
                 user=request.user,
                 game=game,
-                defaults={'score': float(score), 'comment': comment}
+                defaults={'score': float(score), 'comment': comment, 'is_implicit': False}
             )
             return redirect('games:detail', game_id=game_id)
     
-    # 유저 평가 데이터 (score=0 "안해봤어요"는 제외)
-    user_ratings = GameRating.objects.filter(game=game).exclude(score=0).select_related('user').order_by('-updated_at')
+    # 유저 평가 데이터 (score=0 "안해봤어요", Steam 플레이 시간 기반 평가는 제외)
+    user_ratings = GameRating.objects.filter(game=game, is_implicit=False).exclude(score=0).select_related('user').order_by('-updated_at')
     my_rating = GameRating.objects.filter(game=game, user=request.user).first()
     
     # Steam 크롤링 리뷰 (games.SteamReview - 한국어 리뷰)
@@ -241,7 +224,7 @@ def api_game_detail(request, game_id):
     
     # Fetch RAWG data if not already fetched
     if not game.rawg_id or not game.background_image:
-        update_game_with_rawg(game)
+        update_game_with_rawg(game, max_delay=http_client.INTERACTIVE_MAX_DELAY)
     
     screenshots = list(game.screenshots.all().values('image_url'))
     trailers = list(game.trailers.all().values('name', 'preview_url', 'data_480', 'data_max'))
@@ -288,7 +271,7 @@ def api_search_games(request):
     
     limit = int(request.GET.get('limit', 20))
     
-    results = search_games(query, page_size=limit)
+    results = search_games(query, page_size=limit, max_delay=http_client.INTERACTIVE_MAX_DELAY)
     
     return JsonResponse({
         'query': query,
@@ -303,7 +286,7 @@ def api_get_genres(request):
     
     Example: /api/games/genres/
     """
-    genres = get_genres()
+    genres = get_genres(max_delay=http_client.INTERACTIVE_MAX_DELAY)
     
     return JsonResponse({
         'count': len(genres),
@@ -317,7 +300,7 @@ def api_get_platforms(request):
     
     Example: /api/games/platforms/
     """
-    platforms = get_platforms()
+    platforms = get_platforms(max_delay=http_client.INTERACTIVE_MAX_DELAY)
     
     return JsonResponse({
         'count': len(platforms),
@@ -339,7 +322,7 @@ def api_games_by_genre(request, genre_slug):
     """
     limit = int(request.GET.get('limit', 20))
     
-    results = get_games_by_genre(genre_slug, page_size=limit)
+    results = get_games_by_genre(genre_slug, page_size=limit, max_delay=http_client.INTERACTIVE_MAX_DELAY)
     
     return JsonResponse({
         'genre': genre_slug,
@@ -567,13 +550,13 @@ def api_reviews_by_rawg_id(request, rawg_id):
         - game_exists: DB에 게임이 있는지 여부
     """
     try:
-        # 중복 rawg_id가 있을 수 있으므로 filter 사용
-        game = Game.objects.filter(rawg_id=rawg_id).first()
+        # 중복 rawg_id가 있으면 pk 가 가장 작은 게임
+        game = resolve_game(rawg_id, spaces=(RAWG,))
         if not game:
             raise Game.DoesNotExist
-        # users.GameRating 사용 (실제 데이터)
-        ratings = GameRating.objects.filter(game=game).select_related('user').order_by('-updated_at')
-        my_rating = ratings.filter(user=request.user).first()
+        # users.GameRating 사용 (실제 데이터, Steam 플레이 시간 기반 평가는 목록에서 제외)
+        ratings = GameRating.objects.filter(game=game, is_implicit=False).select_related('user').order_by('-updated_at')
+        my_rating = GameRating.objects.filter(game=game, user=request.user).first()
         
         reviews_data = [{
             'id': r.id,
@@ -673,20 +656,21 @@ def api_wishlist_status_by_rawg_id(request, rawg_id):
         })
     
     try:
-        # 중복 rawg_id가 있을 수 있으므로 filter 사용
-        game = Game.objects.filter(rawg_id=rawg_id).first()
-        if not game:
+        # 중복 rawg_id가 있으면 pk 가 가장 작은 게임
+        # (별칭 맵에 있으면 게임 조회 없이 pk 만)
+        game_pk = resolve_game_id(rawg_id, spaces=(RAWG,))
+        if game_pk is None:
             return JsonResponse({
                 'is_wishlisted': False,
                 'authenticated': True,
                 'game_exists': False
             })
-        is_wishlisted = request.user.wishlist.filter(pk=game.pk).exists()
+        is_wishlisted = request.user.wishlist.filter(pk=game_pk).exists()
         
         return JsonResponse({
             'is_wishlisted': is_wishlisted,
             'authenticated': True,
-            'game_id': game.rawg_id
+            'game_id': rawg_id
         })
     except Game.DoesNotExist:
         return JsonResponse({
@@ -738,6 +722,7 @@ def api_submit_review_by_rawg_id(request, rawg_id):
             game=game,
             defaults={
                 'score': score,
+                'is_implicit': False,
             }
         )
         
@@ -764,6 +749,9 @@ def api_translate_game(request):
     """
     Translate game description to Korean and save to DB.
     
+    이미 번역됐거나 번역 캐시에 있으면 바로 응답하고, 그 외(RAWG 설명 조회 + Gemini 번역)는
+    작업 큐(games.translate_game)에 넣고 202 + job_id 응답 → 클라이언트가 /games/api/jobs/<id>/ 폴링
+    
     Body:
         - game_pk: Game DB ID (optional)
         - rawg_id: RAWG ID (optional)
@@ -772,9 +760,8 @@ def api_translate_game(request):
     """
     import os
     import json
-    import requests
     from dotenv import load_dotenv
-    from .utils import translate_text_gemini
+    from .translation_cache import GAME_DESC_PROMPT_VERSION, lookup
     load_dotenv()
     
     api_key = os.getenv('GMS_API_KEY')
@@ -807,61 +794,41 @@ def api_translate_game(request):
             # Use game description if text not provided/empty
             if not text_to_translate:
                 text_to_translate = game.description
-                
-            # If description is empty also, try to fetch from RAWG (if rawg_id)
-            if not text_to_translate and game.rawg_id:
-                details = fetch_rawg_game_details(game.rawg_id)
-                if details:
-                    text_to_translate = details.get('description_raw', '') or details.get('description', '')
-                    game.description = text_to_translate
-                    game.save(update_fields=['description'])
-
-        # 3. Use text provided if game not found (for new games)
+
+        # 3. Create game shell to store translation (RAWG 상세는 작업에서 채움)
         if not game and rawg_id:
-             # Create game shell to store translation
-            game_title = data.get('game_title', f'Game {rawg_id}')
             game = Game.objects.create(
                 rawg_id=rawg_id,
-                title=game_title,
+                title=data.get('game_title', f'Game {rawg_id}'),
                 genre='Unknown'
             )
-            # Try to fetch full details
-            details = fetch_rawg_game_details(rawg_id)
-            if details:
-                game.title = details.get('name', game_title)
-                game.image_url = details.get('background_image', '')
-                game.background_image = details.get('background_image', '')
-                game.description = details.get('description_raw', '') or details.get('description', '')
-                text_to_translate = game.description
-                
-                # Genres
-                if details.get('genres'):
-                     game.genre = ', '.join([g['name'] for g in details['genres'][:3]])
-                
-                game.save()
             
-        if not text_to_translate:
+        if not text_to_translate and not (game and game.rawg_id):
              return JsonResponse({'error': '번역할 텍스트가 없습니다.', 'success': False}, status=400)
 
-        # 4. Call Gemini API
-        translated_text = translate_text_gemini(text_to_translate)
-        
-        if translated_text:
-            # Save to DB if game exists
-            if game:
-                game.description_kr = translated_text
-                # Also save original if it was empty
-                if not game.description:
-                    game.description = text_to_translate
-                game.save()
-                
-            return JsonResponse({
-                'success': True,
-                'translated': translated_text,
-                'cached': False
-            })
-                
-        return JsonResponse({'error': 'AI 번역 실패', 'success': False}, status=500)
+        # 4. 번역 캐시 적중이면 바로 응답 (Gemini 호출 없음)
+        if text_to_translate:
+            translated_text = lookup(text_to_translate, GAME_DESC_PROMPT_VERSION, origin='game')
+            if translated_text:
+                if game:
+                    game.description_kr = translated_text
+                    if not game.description:
+                        game.description = text_to_translate
+                    game.save(update_fields=['description_kr', 'description'])
+                return JsonResponse({
+                    'success': True,
+                    'translated': translated_text,
+                    'cached': True
+                })
+
+        # 5. RAWG 설명 조회 + Gemini 번역은 작업 큐로 (같은 게임 동시 요청은 작업 1개)
+        job = enqueue(
+            'games.translate_game',
+            {'game_pk': game.pk if game else None, 'text': text_to_translate},
+            key=f'translate:{game.pk}' if game else '',
+            priority=PRIORITY_HIGH,
+        )
+        return JsonResponse({'success': True, **job_status(job)}, status=202)
 
     except Exception as e:
         import traceback
@@ -869,6 +836,26 @@ def api_translate_game(request):
         return JsonResponse({'error': str(e), 'success': False}, status=500)
 
 
+@login_required
+def api_job_status(request, job_id):
+    """
+    백그라운드 작업 상태 폴링 API (games/jobs.py)
+    
+    Response:
+        - job_id, kind, status: queued / running / done / failed
+        - result: 완료 시 작업 결과
+        - error: 실패 시 오류 메시지
+    """
+    from django.db.models import Q
+    from .models import BackgroundJob
+    
+    job = get_object_or_404(
+        BackgroundJob.objects.filter(Q(owner__isnull=True) | Q(owner=request.user)),
+        pk=job_id
+    )
+    return JsonResponse(job_status(job))
+
+
 def api_autocomplete_games(request):
     """
     게임 자동완성 API - DB에서 제목으로 검색
@@ -1,6 +1,9 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, GameRating, GameSimilarity, UserSimilarity, OnboardingStatus, SteamLibraryCache
+from .models import (
+    User, GameRating, GameSimilarity, UserSimilarity, OnboardingStatus, SteamLibraryCache,
+    OnboardingDeck, OnboardingDeckEntry, ChatContext, ChatSession, ChatTurn, SteamOwnership,
+)
 
 # 커스텀 유저 모델을 관리자 페이지에 등록
 @admin.register(User)
@@ -16,8 +19,8 @@ class CustomUserAdmin(UserAdmin):
 
 @admin.register(GameRating)
 class GameRatingAdmin(admin.ModelAdmin):
-    list_display = ('user', 'game', 'score', 'is_onboarding', 'created_at')
-    list_filter = ('score', 'is_onboarding')
+    list_display = ('user', 'game', 'score', 'is_onboarding', 'is_implicit', 'created_at')
+    list_filter = ('score', 'is_onboarding', 'is_implicit')
     search_fields = ('user__username', 'game__title')
     ordering = ('-created_at',)
 
@@ -47,4 +50,48 @@ class OnboardingStatusAdmin(admin.ModelAdmin):
 @admin.register(SteamLibraryCache)
 class SteamLibraryCacheAdmin(admin.ModelAdmin):
     list_display = ('user', 'total_games', 'total_playtime_hours', 'last_updated')
-    search_fields = ('user__username',)
\ No newline at end of file
+    search_fields = ('user__username',)
+
+
+@admin.register(SteamOwnership)
+class SteamOwnershipAdmin(admin.ModelAdmin):
+    list_display = ('user', 'steam_appid', 'playtime_forever', 'playtime_2weeks', 'updated_at')
+    search_fields = ('user__username', 'steam_appid')
+    ordering = ('user', '-playtime_forever')
+
+
+@admin.register(ChatContext)
+class ChatContextAdmin(admin.ModelAdmin):
+    list_display = ('user', 'version', 'rated_count', 'owned_count', 'build_ms', 'steam_fetched_at', 'built_at')
+    search_fields = ('user__username',)
+    readonly_fields = ('built_at',)
+
+
+class ChatTurnInline(admin.TabularInline):
+    model = ChatTurn
+    fields = ('seq', 'role', 'content', 'tokens', 'created_at')
+    readonly_fields = fields
+    extra = 0
+
+
+@admin.register(ChatSession)
+class ChatSessionAdmin(admin.ModelAdmin):
+    list_display = ('user', 'next_seq', 'summarized_turns', 'created_at', 'updated_at')
+    search_fields = ('user__username',)
+    readonly_fields = ('created_at', 'updated_at')
+    inlines = [ChatTurnInline]
+
+
+@admin.register(OnboardingDeck)
+class OnboardingDeckAdmin(admin.ModelAdmin):
+    list_display = ('name', 'version', 'size', 'built_at')
+    readonly_fields = ('version', 'size', 'built_at')
+
+
+@admin.register(OnboardingDeckEntry)
+class OnboardingDeckEntryAdmin(admin.ModelAdmin):
+    list_display = ('deck', 'rank', 'rawg_id', 'game', 'score')
+    list_filter = ('deck',)
+    search_fields = ('game__title',)
+    raw_id_fields = ('game',)
+    ordering = ('deck', 'rank')
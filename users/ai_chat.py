@@ -0,0 +1,308 @@
+"""
+AI 챗봇 Gemini 호출 (일반 응답 / SSE 스트리밍)
+
+일반 (ai_chat_api):
+    generateContent → 답변 전체를 JsonResponse 로 반환 (생성이 끝날 때까지 sync 워커 점유)
+
+스트리밍 (ai_chat_stream_api):
+    streamGenerateContent?alt=sse → 토큰 조각이 도착하는 대로 SSE 이벤트로 전달
+        event: token  data: {"text": "..."}
+        event: done   data: {"message": "<전체 답변>", "ttft_ms": .., "total_ms": ..}
+        event: error  data: {"error": "..."}
+    - ASGI(ChuraiGame/asgi.py): relay_chat_stream (async), 이벤트 루프는 스트림마다 막히지 않음
+      비동기 HTTP 클라이언트 의존성이 없으므로 업스트림 읽기는 공용 풀링 클라이언트(http_client)를
+      전용 스레드 풀(CHAT_STREAM_MAX_STREAMS)에서 수행 → 동시 스트림 수 상한도 이 값
+    - WSGI(runserver, ChuraiGame/wsgi.py): relay_chat_stream_sync, 요청 스레드에서 읽으며 조각마다 전송
+    - 첫 토큰까지 시간(chat_stream_ttft)과 전체 시간(chat_stream_total)은 관리자 타이밍 API 에 누적
+"""
+
+import asyncio
+import json
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+
+from games import http_client
+
+from .timing import record_duration
+
+logger = logging.getLogger(__name__)
+
+# 주의: gms.ssafy.io 경로 사용, 모델명 gemini-2.5-flash-lite 적용
+CHAT_MODEL_URL = "https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-lite"
+CHAT_URL = f"{CHAT_MODEL_URL}:generateContent"
+CHAT_STREAM_URL = f"{CHAT_MODEL_URL}:streamGenerateContent"
+# 스트림: (연결 타임아웃, 토큰 사이 최대 대기)
+STREAM_TIMEOUT = (5, 60)
+
+_DONE = object()
+_executor = None
+
+
+class ChatStreamError(Exception):
+    """Gemini 스트림 요청 실패 (HTTP 오류 / 빈 응답)"""
+
+    def __init__(self, message, status=500):
+        super().__init__(message)
+        self.status = status
+
+
+def build_chat_payload(system_prompt_text, chat_history, user_message):
+    """
+    Gemini Native 형식 payload (시스템 프롬프트 + 최근 대화 + 현재 메시지)
+
+    chat_history 는 세션의 원문 턴 (users/chat_session.py 가 토큰 예산 안으로 유지)
+    """
+    # 1. 채팅 히스토리 변환 (role: assistant -> model)
+    gemini_contents = []
+    for msg in chat_history:
+        role = "model" if msg.get('role') == 'assistant' else "user"
+        gemini_contents.append({
+            "role": role,
+            "parts": [{"text": msg.get('content', '')}]
+        })
+
+    # 2. 현재 사용자 메시지 추가
+    gemini_contents.append({
+        "role": "user",
+        "parts": [{"text": user_message}]
+    })
+
+    # 3. Payload 구성
+    return {
+        "systemInstruction": {
+            "parts": [{"text": system_prompt_text}]
+        },
+        "contents": gemini_contents,
+        "generationConfig": {
+            "temperature": 0.7,
+            "maxOutputTokens": 2048,  # 채팅용으로 충분한 길이
+            "topP": 0.8,
+            "topK": 40
+        }
+    }
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def open_chat_stream(payload, api_key):
+    """
+    streamGenerateContent 요청 → 응답 헤더까지 받은 requests.Response (본문은 스트림)
+
+    Raises:
+        ChatStreamError: HTTP 오류
+        requests.RequestException: 연결 오류 / 타임아웃
+    """
+    response = http_client.post(
+        CHAT_STREAM_URL,
+        params={'key': api_key, 'alt': 'sse'},
+        headers={'Content-Type': 'application/json'},
+        json=payload,
+        stream=True,
+        timeout=STREAM_TIMEOUT,
+        retries=0,  # 스트림 요청은 웹 요청 경로라 백오프 대기 없이 바로 오류 이벤트
+    )
+    if response.status_code != 200:
+        response.close()
+        raise ChatStreamError(f"AI 서버 오류: {response.status_code}", status=response.status_code)
+    return response
+
+
+def iter_stream_text(response):
+    """SSE 응답 본문 → 텍스트 조각 (동기 제너레이터, 응답은 닫지 않음)"""
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith('data:'):
+            continue
+        try:
+            chunk = json.loads(line[5:].strip())
+        except json.JSONDecodeError:
+            logger.warning(f"Unparseable Gemini stream line: {line[:200]}")
+            continue
+        for candidate in chunk.get('candidates', [])[:1]:
+            for part in candidate.get('content', {}).get('parts', []):
+                if part.get('text'):
+                    yield part['text']
+
+
+def iter_chat_stream(payload, api_key):
+    """open_chat_stream + iter_stream_text (제너레이터를 닫으면 업스트림 연결도 닫힘)"""
+    response = open_chat_stream(payload, api_key)
+    try:
+        yield from iter_stream_text(response)
+    finally:
+        response.close()
+
+
+def abort_response(response):
+    """
+    다른 스레드에서 읽는 중인 스트림 응답을 끊음
+
+    response.close() 만으로는 소켓 read 에 막힌 스레드가 다음 조각이 올 때까지 깨어나지 않으므로
+    소켓을 먼저 shutdown 해서 읽기를 바로 실패시킨다.
+    """
+    connection = getattr(response.raw, '_connection', None)
+    sock = getattr(connection, 'sock', None)
+    if sock is not None:
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+    response.close()
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=getattr(settings, 'CHAT_STREAM_MAX_STREAMS', 64),
+            thread_name_prefix='chat-stream',
+        )
+    return _executor
+
+
+def _pump_chat_stream(payload, api_key, upstream, cancelled, emit):
+    """
+    업스트림 읽기 스레드: 텍스트 조각 / 예외 / _DONE 을 emit 으로 전달
+
+    upstream['response'] 에 응답을 걸어 두면 relay 쪽에서 abort_response() 로 끊을 수 있다.
+    """
+    response = None
+    try:
+        response = open_chat_stream(payload, api_key)
+        upstream['response'] = response
+        if cancelled.is_set():
+            return
+        for text in iter_stream_text(response):
+            if cancelled.is_set():
+                return
+            emit(text)
+    except Exception as e:
+        if not cancelled.is_set():
+            emit(e)
+    finally:
+        if response is not None:
+            response.close()
+        emit(_DONE)
+
+
+def _final_event(full_text, first_token_ms, total_ms):
+    if not full_text:
+        return sse_event('error', {'error': 'AI가 응답을 생성하지 못했습니다 (Blocked or Empty).'})
+    return sse_event('done', {
+        'message': full_text,
+        'ttft_ms': round(first_token_ms or 0, 1),
+        'total_ms': round(total_ms, 1),
+    })
+
+
+def _error_event(error):
+    if isinstance(error, ChatStreamError):
+        logger.error(f"Gemini stream error: {error}")
+        return sse_event('error', {'error': str(error), 'status': error.status})
+    logger.error(f"Gemini stream failed: {error}")
+    return sse_event('error', {'error': '응답 생성 중 오류가 발생했습니다.'})
+
+
+async def relay_chat_stream(payload, api_key, on_complete=None):
+    """
+    Gemini 스트림 → SSE 이벤트 문자열 (async 제너레이터, ASGI 의 StreamingHttpResponse 용)
+
+    업스트림은 전용 스레드 하나가 끝까지 읽어 asyncio.Queue 로 넘김.
+    클라이언트가 끊어 제너레이터가 닫히면 취소 플래그를 세우고 업스트림 응답을 끊어서
+    읽기 스레드가 바로 풀로 돌아가게 한다.
+
+    Args:
+        on_complete: async callable(full_text) - 답변이 끝까지 생성된 뒤 호출 (대화 저장 등)
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue()
+    cancelled = threading.Event()
+    upstream = {}
+    started = time.perf_counter()
+    first_token_ms = None
+    parts = []
+
+    def emit(item):
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, item)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫힘 (서버 종료 중)
+            pass
+
+    reader = loop.run_in_executor(_get_executor(), _pump_chat_stream, payload, api_key, upstream, cancelled, emit)
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                yield _error_event(item)
+                return
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000
+                record_duration('chat_stream_ttft', first_token_ms)
+            parts.append(item)
+            yield sse_event('token', {'text': item})
+    finally:
+        if not reader.done():
+            # 클라이언트 연결 끊김 / 오류: 읽기 스레드에 알리고 업스트림 연결을 끊음
+            cancelled.set()
+            response = upstream.get('response')
+            if response is not None:
+                abort_response(response)
+
+    full_text = ''.join(parts)
+    total_ms = (time.perf_counter() - started) * 1000
+    record_duration('chat_stream_total', total_ms)
+    if full_text and on_complete is not None:
+        try:
+            await on_complete(full_text)
+        except Exception as e:
+            # 저장 실패는 이미 전달한 답변에 영향 없음
+            logger.error(f"Chat stream on_complete failed: {e}")
+    yield _final_event(full_text, first_token_ms, total_ms)
+
+
+def relay_chat_stream_sync(payload, api_key, on_complete=None):
+    """
+    relay_chat_stream 의 동기 버전 (WSGI 의 StreamingHttpResponse 용)
+
+    WSGI 는 async 이터레이터를 전부 모은 뒤에 보내므로 스트리밍이 되지 않는다.
+    이 경로는 요청 스레드에서 업스트림을 직접 읽어 조각마다 내보내며, 클라이언트가 끊으면
+    서버가 제너레이터를 닫으면서 업스트림 연결도 닫힌다. (스트림 동안 WSGI 워커 하나를 점유)
+
+    Args:
+        on_complete: callable(full_text)
+    """
+    started = time.perf_counter()
+    first_token_ms = None
+    parts = []
+    chunks = iter_chat_stream(payload, api_key)
+    try:
+        for text in chunks:
+            if first_token_ms is None:
+                first_token_ms = (time.perf_counter() - started) * 1000
+                record_duration('chat_stream_ttft', first_token_ms)
+            parts.append(text)
+            yield sse_event('token', {'text': text})
+    except Exception as e:
+        yield _error_event(e)
+        return
+    finally:
+        chunks.close()
+
+    full_text = ''.join(parts)
+    total_ms = (time.perf_counter() - started) * 1000
+    record_duration('chat_stream_total', total_ms)
+    if full_text and on_complete is not None:
+        try:
+            on_complete(full_text)
+        except Exception as e:
+            logger.error(f"Chat stream on_complete failed: {e}")
+    yield _final_event(full_text, first_token_ms, total_ms)
@@ -0,0 +1,225 @@
+"""
+AI 챗봇(ai_chat_api) 유저별 컨텍스트 캐시
+
+기존 방식:
+    메시지마다 GameRating 전체 조회(select_related) + 장르 집계
+    + Steam Web API(GetOwnedGames) 실시간 호출 + 시스템 프롬프트 재구성
+    → LLM 호출 전에 수백 ms ~ 수 초
+
+캐시 방식:
+    - 취향 요약 / 최다 플레이 / 찍먹(2시간 미만) 게임 / 추천 제외 목록을 ChatContext 한 행에 저장
+    - Steam 라이브러리는 SteamLibraryCache(users/steam_library.py)에서 읽음 (Steam API 직접 호출 없음)
+    - 평가(GameRating) 저장/삭제, Steam 라이브러리 캐시(SteamLibraryCache) 갱신 시 시그널로 무효화
+      (users/signals.py), Steam 연동 계정이 바뀌었거나 Steam 데이터가 STEAM_TTL 보다 오래되면 재구성
+    - CONTEXT_VERSION: 저장 형식 / 프롬프트 블록을 바꾸면 올려서 기존 행을 모두 무효화
+    → 채팅 1턴은 ChatContext 조회 1회 + LLM 호출만 수행
+
+사용 예시:
+    from .chat_context import get_chat_context, render_system_prompt
+    context = get_chat_context(request.user)
+    system_prompt_text = render_system_prompt(context, user_nickname)
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_VERSION = 1
+# Steam 라이브러리 부분의 최대 사용 기간 (steam_library.STALE_AFTER 와 같음)
+STEAM_TTL = timedelta(hours=24)
+# 찍먹 게임 기준 (분)
+LOW_PLAYTIME_MINUTES = 120
+# 프롬프트에 넣는 목록 길이 상한
+MAX_LIKED = 7
+MAX_DISLIKED = 5
+MAX_TOP_PLAYED = 5
+MAX_LOW_PLAYTIME = 10
+MAX_EXCLUSIONS = 150
+
+
+def _steam_id(user):
+    return user.steam_id if user.is_steam_linked and user.steam_id else ''
+
+
+def is_fresh(context, user):
+    """저장된 컨텍스트를 그대로 써도 되는지 (DB 조회 없음)"""
+    if context.version != CONTEXT_VERSION or context.steam_id != _steam_id(user):
+        return False
+    if context.steam_id:
+        # Steam 조회가 실패했으면(steam_fetched_at=None) 다음 턴에 다시 시도, 빈 라이브러리는 STEAM_TTL 동안 유지
+        return bool(context.steam_fetched_at) and timezone.now() - context.steam_fetched_at <= STEAM_TTL
+    return True
+
+
+def get_chat_context(user):
+    """
+    유저 채팅 컨텍스트 (무효화됐거나 없으면 다시 구성)
+
+    Returns:
+        ChatContext
+    """
+    from .models import ChatContext
+
+    context = ChatContext.objects.filter(user=user).first()
+    if context is not None and is_fresh(context, user):
+        return context
+    return build_chat_context(user)
+
+
+def build_chat_context(user):
+    """평가 + Steam 라이브러리에서 채팅 컨텍스트를 새로 구성해 저장"""
+    from games.genre_index import count_genres
+    from .models import ChatContext, GameRating
+    from .steam_library import get_library
+
+    started = time.perf_counter()
+
+    # 1. 온보딩 및 평가 데이터
+    liked_games = []
+    disliked_games = []
+    liked_game_ids = []
+    rated_titles = []
+    rows = (
+        GameRating.objects.filter(user=user)
+        .order_by('-score', '-created_at')
+        .values_list('game_id', 'game__title', 'score')
+    )
+    for game_id, title, score in rows:
+        rated_titles.append(title)
+        # 선호도 분류
+        if score >= 3.5:
+            liked_games.append(f"- {title} (⭐{score})")
+            liked_game_ids.append(game_id)
+        elif score <= 0:
+            disliked_games.append(f"- {title}")
+
+    top_genres = []
+    taste_summary = ''
+    if rated_titles:
+        # 장르 집계 (정규화 장르 인덱스 GROUP BY)
+        top_genres = [name for name, _ in count_genres(liked_game_ids).most_common(3)]
+        taste_summary = f"""
+[평가 데이터]
+- 선호 장르: {', '.join(top_genres)}
+- 좋아한 게임: {', '.join(liked_games[:MAX_LIKED])}
+- 싫어한 게임: {', '.join(disliked_games[:MAX_DISLIKED])}
+"""
+
+    # 2. Steam 라이브러리 데이터
+    steam_id = _steam_id(user)
+    owned_titles = []
+    top_played = []
+    low_playtime = []
+    steam_fetched_at = None
+    if steam_id:
+        try:
+            library = get_library(user)
+            steam_library = library.games
+            # 빈/비공개 라이브러리도 캐시 시각을 남겨 STEAM_TTL 동안은 다시 구성하지 않음
+            steam_fetched_at = library.updated_at
+            # 플레이 시간순 정렬
+            sorted_games = sorted(steam_library, key=lambda x: x.get('playtime_forever', 0), reverse=True)
+            owned_titles = [g.get('name') for g in sorted_games if g.get('name')]
+            # 상위 플레이 게임
+            top_played = [
+                f"{g['name']}({round(g['playtime_forever'] / 60, 1)}시간)"
+                for g in sorted_games[:MAX_TOP_PLAYED] if g.get('name')
+            ]
+            # 찍먹 게임 (2시간 미만)
+            low_playtime = [
+                g['name'] for g in sorted_games
+                if g.get('name') and 0 < g.get('playtime_forever', 0) < LOW_PLAYTIME_MINUTES
+            ]
+        except Exception as e:
+            logger.warning(f"Steam fetch error for chat context ({user.pk}): {e}")
+
+    exclusions = list(dict.fromkeys(rated_titles + owned_titles))
+    build_ms = (time.perf_counter() - started) * 1000
+
+    context, _ = ChatContext.objects.update_or_create(
+        user=user,
+        defaults={
+            'version': CONTEXT_VERSION,
+            'steam_id': steam_id,
+            'taste_summary': taste_summary,
+            'top_genres': top_genres,
+            'top_played': top_played,
+            'low_playtime': low_playtime[:MAX_LOW_PLAYTIME],
+            'exclusions': exclusions,
+            'owned_count': len(owned_titles),
+            'rated_count': len(rated_titles),
+            'steam_fetched_at': steam_fetched_at,
+            'build_ms': round(build_ms, 1),
+        }
+    )
+    logger.info(f"Built chat context for user {user.pk} in {build_ms:.0f}ms ({len(exclusions)} exclusions)")
+    return context
+
+
+def invalidate_chat_context(user_id):
+    """평가 / Steam 라이브러리 변경 시 호출 (다음 채팅에서 다시 구성)"""
+    from .models import ChatContext
+
+    ChatContext.objects.filter(user_id=user_id).delete()
+
+
+def render_context_blocks(context):
+    """시스템 프롬프트에 붙는 유저 데이터 블록 ([평가 데이터] + [Steam 라이브러리] + 제외 목록)"""
+    blocks = [context.taste_summary]
+    if context.steam_id and context.owned_count:
+        blocks.append(f"""
+[Steam 라이브러리]
+- 최다 플레이: {', '.join(context.top_played)}
+- 보유 게임 수: {context.owned_count}개
+""")
+        if context.low_playtime:
+            blocks.append(f"- 보유했지만 플레이타임이 짧은 게임: {', '.join(context.low_playtime)}\n")
+    if context.exclusions:
+        shown = context.exclusions[:MAX_EXCLUSIONS]
+        more = len(context.exclusions) - len(shown)
+        blocks.append(
+            f"\n[추천 제외 (이미 평가/보유)]\n- {', '.join(shown)}"
+            + (f" 외 {more}개" if more > 0 else '') + "\n"
+        )
+    return ''.join(blocks)
+
+
+def render_system_prompt(context, user_nickname):
+    """게임 큐레이터 시스템 프롬프트 (유저 데이터 블록 포함)"""
+    user_context = render_context_blocks(context)
+    return f"""당신은 '게임 큐레이터 AI'입니다. 게임 추천 전문가로서 다음 역할을 수행합니다:
+
+🎮 **전문 분야**
+- 모든 플랫폼(PC, 콘솔, 모바일)의 게임에 대한 깊은 지식
+- 장르별 특성과 대표 게임들을 잘 알고 있음
+- 최신 인기 게임과 숨겨진 명작까지 폭넓게 추천 가능
+- Steam, Epic Games, PlayStation, Xbox, Nintendo 등 모든 플랫폼 게임 추천
+
+📊 **추천 스타일**
+- 유저의 취향과 플레이 스타일을 파악하여 맞춤 추천
+- 게임의 장점, 특징, 플레이 시간, 난이도 등을 설명
+- 이모지를 활용하여 친근하고 재미있게 대화
+
+🚫 **중요: 추천 규칙**
+1. 유저가 이미 평가하거나 보유한 게임은 새 게임 추천에서 **반드시 제외**합니다
+2. 추천할 때 반드시 유저가 플레이/평가한 게임과 비교하며 설명해주세요:
+   - "'{user_nickname}님이 좋아하신 OO 게임처럼 △△한 요소가 있어서..."
+   - "OO 게임과 장르가 비슷하고, 스토리 전개 방식도 닮아있어요"
+   - "OO를 즐기셨다면 이 게임의 ◇◇ 시스템도 마음에 드실 거예요"
+3. 유저의 선호 장르와 좋아하는 게임의 공통점을 분석해서 추천 이유를 구체적으로 설명해주세요
+4. 유저가 싫어한 게임과 비슷한 장르/스타일은 피해주세요 (있다면)
+5. 보유했지만 플레이타임이 짧은 게임이 있다면 마지막에 "💡 참고로, 이미 가지고 계신 'OO'도 한번 플레이해보세요! 숨겨진 명작일 수 있어요" 추가
+
+💡 **응답 규칙**
+- 항상 한국어로 답변
+- 게임 이름은 정확하게 표기 (원제 + 한글명 병기 권장)
+- 1-5개 정도의 게임을 추천할 때는 번호 리스트로 정리
+- 각 게임마다 장르, 특징, **왜 유저 취향에 맞는지** 구체적으로 설명
+- 마지막에 추가 질문을 유도하는 문구 추가
+{user_context}
+
+사용자가 게임 외의 질문을 하면, 친절하게 게임 추천 관련 질문으로 유도해주세요."""
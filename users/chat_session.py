@@ -0,0 +1,278 @@
+"""
+AI 챗봇 대화 세션 (서버 저장 + 롤링 요약)
+
+기존 방식:
+    클라이언트가 메시지마다 최근 10개 메시지(history)를 요청 본문에 담아 보내고,
+    서버는 그것을 그대로 Gemini contents 로 다시 직렬화
+    → 대화가 길수록 요청 크기와 프롬프트 토큰이 늘어남
+
+세션 방식:
+    - 클라이언트는 session_id 만 보낸다 (첫 메시지에는 없음 → 새 세션, 응답으로 session_id 전달)
+    - 턴은 ChatTurn 에 추정 토큰 수(estimate_tokens)와 함께 저장
+    - 원문 턴의 토큰 합이 TOKEN_BUDGET(CHAT_HISTORY_TOKEN_BUDGET)을 넘으면 예산의 절반이 될 때까지
+      오래된 턴을 요약(ChatSession.summary)에 접고 삭제
+      (최근 MIN_RECENT_TURNS 개는 항상 원문 유지, 요약은 Gemini 로 만들고 실패하면 발췌 요약)
+    - 프롬프트 = 시스템 프롬프트 + [이전 대화 요약] + 최근 턴 원문
+    → 프롬프트 토큰은 대화 길이와 무관하게 TOKEN_BUDGET + 요약 길이 이내
+    - 요약은 예산을 넘을 때만 (절반까지 접으므로 여러 턴에 한 번) 답변 저장 후 작업 큐에서 수행
+      (users.compact_chat_session, 답변 응답은 요약을 기다리지 않음)
+
+사용 예시:
+    from .chat_session import get_session, prompt_history, record_exchange, render_summary_block
+    session = get_session(user, data.get('session_id'), seed_history=data.get('history'))
+    system_prompt_text += render_summary_block(session)
+    payload = build_chat_payload(system_prompt_text, prompt_history(session), user_message)
+    ...
+    record_exchange(session, user_message, ai_text)
+"""
+
+import logging
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from games import http_client
+
+from .timing import stage
+
+logger = logging.getLogger(__name__)
+
+# 요약에 접지 않고 항상 원문으로 보내는 최근 턴 수
+MIN_RECENT_TURNS = 4
+# 요약 최대 길이 (문자)
+SUMMARY_MAX_CHARS = 1200
+# 발췌 요약에서 턴 1개당 남기는 길이 (문자)
+EXCERPT_CHARS = 150
+# session_id 없이 history 를 보내는 이전 클라이언트: 새 세션에 옮겨 담는 메시지 수
+LEGACY_HISTORY_MESSAGES = 10
+
+SUMMARY_PROMPT = """다음은 게임 추천 챗봇과 사용자의 대화입니다.
+기존 요약과 새 대화를 합쳐 하나의 요약으로 다시 써주세요.
+
+규칙:
+- 사용자의 취향, 요청 조건(플랫폼, 장르, 가격, 분위기 등), 이미 추천한 게임 제목, 사용자의 반응을 빠짐없이 포함
+- 인사말이나 추천 이유 같은 세부 설명은 생략
+- 한국어, {max_chars}자 이내, 불릿(-) 목록
+
+[기존 요약]
+{previous}
+
+[새 대화]
+{transcript}"""
+
+
+def _token_budget():
+    return getattr(settings, 'CHAT_HISTORY_TOKEN_BUDGET', 2000)
+
+
+def estimate_tokens(text):
+    """대략적인 토큰 수 (영문 약 4자당 1토큰, 한글 등 비ASCII 문자는 1자당 1토큰으로 넉넉하게)"""
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return max(1, ascii_chars // 4 + (len(text) - ascii_chars))
+
+
+def get_session(user, session_id=None, seed_history=None):
+    """
+    유저의 대화 세션 (session_id 가 없거나 남의 세션이면 새로 만듦)
+
+    Args:
+        seed_history: 새 세션일 때 옮겨 담을 이전 방식 history ([{role, content}, ...])
+
+    Returns:
+        ChatSession
+    """
+    from .models import ChatSession
+
+    session = None
+    if session_id:
+        try:
+            session = ChatSession.objects.filter(pk=int(session_id), user=user).first()
+        except (TypeError, ValueError):
+            session = None
+    if session is not None:
+        return session
+
+    session = ChatSession.objects.create(user=user)
+    if seed_history:
+        _append_turns(session, [
+            (msg.get('role'), msg.get('content', ''))
+            for msg in seed_history[-LEGACY_HISTORY_MESSAGES:] if isinstance(msg, dict)
+        ])
+    _prune_sessions(user)
+    return session
+
+
+def _prune_sessions(user):
+    """유저당 최근 CHAT_SESSIONS_PER_USER 개 세션만 보관"""
+    from .models import ChatSession
+
+    keep = getattr(settings, 'CHAT_SESSIONS_PER_USER', 20)
+    stale = list(
+        ChatSession.objects.filter(user=user).order_by('-updated_at')
+        .values_list('id', flat=True)[keep:]
+    )
+    if stale:
+        ChatSession.objects.filter(id__in=stale).delete()
+
+
+def _append_turns(session, messages):
+    """
+    턴 저장 (순번은 DB 에서 next_seq 를 조건 없이 더해 할당)
+
+    같은 세션에 메시지가 동시에 들어와도 UPDATE 가 행을 잠그므로 순번 구간이 겹치지 않음
+    """
+    from .models import ChatSession, ChatTurn
+
+    messages = [
+        ('assistant' if role == 'assistant' else 'user', (content or '').strip())
+        for role, content in messages
+    ]
+    messages = [(role, content) for role, content in messages if content]
+    if not messages:
+        return
+
+    with transaction.atomic():
+        ChatSession.objects.filter(pk=session.pk).update(
+            next_seq=F('next_seq') + len(messages), updated_at=timezone.now()
+        )
+        session.next_seq = ChatSession.objects.filter(pk=session.pk).values_list('next_seq', flat=True).get()
+        start = session.next_seq - len(messages)
+        ChatTurn.objects.bulk_create([
+            ChatTurn(session=session, seq=start + i, role=role, content=content, tokens=estimate_tokens(content))
+            for i, (role, content) in enumerate(messages)
+        ])
+
+
+def prompt_history(session):
+    """Gemini contents 로 보낼 원문 턴 ([{role, content}, ...], 요약에 접힌 턴 제외)"""
+    return [
+        {'role': role, 'content': content}
+        for role, content in session.turns.order_by('seq').values_list('role', 'content')
+    ]
+
+
+def render_summary_block(session):
+    """시스템 프롬프트 뒤에 붙는 이전 대화 요약 블록 (요약이 없으면 빈 문자열)"""
+    if not session.summary:
+        return ''
+    return f"\n\n[이전 대화 요약]\n{session.summary}"
+
+
+def record_exchange(session, user_message, reply):
+    """
+    사용자 메시지 + AI 답변을 저장하고, 예산을 넘었으면 요약 작업을 큐에 넣음
+
+    요약(Gemini 호출)은 응답 지연에 들어가지 않도록 작업 큐(users.compact_chat_session)에서 수행
+    """
+    from games.jobs import PRIORITY_LOW, enqueue
+
+    _append_turns(session, [('user', user_message), ('assistant', reply)])
+    if needs_compaction(session):
+        enqueue(
+            'users.compact_chat_session', {'session_id': session.pk},
+            key=f'chat-compact:{session.pk}', priority=PRIORITY_LOW
+        )
+
+
+def needs_compaction(session, budget=None):
+    """원문 턴의 추정 토큰 합이 예산을 넘었는지"""
+    total = session.turns.aggregate(total=Sum('tokens'))['total'] or 0
+    return total > (budget or _token_budget())
+
+
+def compact_session(session, api_key=None, budget=None):
+    """
+    원문 턴의 토큰 합이 예산을 넘으면 예산의 절반이 남을 때까지 오래된 턴을 요약에 접음
+
+    Returns:
+        int: 요약에 접은 턴 수
+    """
+    from .models import ChatTurn
+
+    budget = budget or _token_budget()
+    turns = list(session.turns.order_by('seq').only('id', 'role', 'content', 'tokens'))
+    if sum(t.tokens for t in turns) <= budget:
+        return 0
+
+    # 최신 턴부터 예산의 절반까지 남김 (최소 MIN_RECENT_TURNS 개)
+    kept = 0
+    kept_tokens = 0
+    for turn in reversed(turns):
+        if kept >= MIN_RECENT_TURNS and kept_tokens + turn.tokens > budget // 2:
+            break
+        kept += 1
+        kept_tokens += turn.tokens
+    split = len(turns) - kept
+    # 남기는 첫 턴이 사용자 메시지가 되도록 (user / model 교대 유지)
+    while split < len(turns) and turns[split].role != 'user':
+        split += 1
+    folded = turns[:split]
+    if not folded:
+        return 0
+
+    with stage('chat_summary'):
+        summary = summarize_turns(session.summary, folded, api_key)
+
+    with transaction.atomic():
+        ChatTurn.objects.filter(id__in=[t.id for t in folded]).delete()
+        session.summary = summary
+        session.summarized_turns += len(folded)
+        session.save(update_fields=['summary', 'summarized_turns', 'updated_at'])
+    logger.info(f"Compacted chat session {session.pk}: {len(folded)} turns folded into summary")
+    return len(folded)
+
+
+def summarize_turns(previous, turns, api_key=None):
+    """기존 요약 + 접을 턴 → 새 요약 (Gemini 실패 시 발췌 요약)"""
+    if api_key:
+        transcript = '\n'.join(
+            f"{'사용자' if t.role == 'user' else 'AI'}: {t.content}" for t in turns
+        )
+        try:
+            summary = _summarize_with_gemini(previous, transcript, api_key)
+            if summary:
+                return summary[:SUMMARY_MAX_CHARS]
+        except Exception as e:
+            logger.warning(f"Chat summary failed, using excerpt summary: {e}")
+    return _excerpt_summary(previous, turns)
+
+
+def _summarize_with_gemini(previous, transcript, api_key):
+    from .ai_chat import CHAT_URL
+
+    prompt = SUMMARY_PROMPT.format(
+        max_chars=SUMMARY_MAX_CHARS,
+        previous=previous or '(없음)',
+        transcript=transcript,
+    )
+    response = http_client.post(
+        CHAT_URL,
+        params={'key': api_key},
+        headers={'Content-Type': 'application/json'},
+        json={
+            "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+            "generationConfig": {"temperature": 0.2, "maxOutputTokens": 512},
+        },
+        timeout=20
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Gemini API error {response.status_code}")
+    candidates = response.json().get('candidates', [])
+    if not candidates or not candidates[0].get('content'):
+        return ''
+    return ''.join(part.get('text', '') for part in candidates[0]['content'].get('parts', [])).strip()
+
+
+def _excerpt_summary(previous, turns):
+    lines = [previous] if previous else []
+    for turn in turns:
+        speaker = '사용자' if turn.role == 'user' else 'AI'
+        excerpt = ' '.join(turn.content.split())[:EXCERPT_CHARS]
+        lines.append(f"- {speaker}: {excerpt}")
+    summary = '\n'.join(lines)
+    # 너무 길면 오래된 쪽부터 버림
+    return summary[-SUMMARY_MAX_CHARS:]
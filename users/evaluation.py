@@ -0,0 +1,399 @@
+"""
+추천 시스템 오프라인 평가 모듈
+
+보류(held-out) GameRating 데이터를 각 추천기에 재생(replay)하여
+품질/지연시간을 측정한다.
+
+평가 대상 (method):
+    - onboarding : users.onboarding.get_recommendations_for_user
+    - hybrid     : users.hybrid_similarity.get_hybrid_recommendations
+    - steam      : users.recommendation.get_personalized_recommendations
+                   (학습 평가로 만든 가상 Steam 라이브러리 사용, RAWG API 호출 발생)
+
+지표:
+    - precision@k / recall@k / NDCG@k (보류한 '좋아요' 게임 = 정답)
+    - coverage (추천된 고유 게임 수 / 전체 게임 수)
+    - latency p50 / p95 / p99 (ms)
+
+평가 방식:
+    1. 유저별 좋아요(score >= 3.5) 평가 중 일부를 보류
+    2. 트랜잭션 안에서 보류 평가 삭제 → (필요 시) GameSimilarity 재계산
+    3. 추천기 실행 후 보류 게임과 비교
+    4. 트랜잭션 롤백 (DB는 원상태 유지)
+
+사용 예시:
+    python manage.py evaluate_recommendations --k 10
+    python manage.py evaluate_recommendations --param top_k=20,50 --param weight_genre=0.1,0.2 --workers 4
+"""
+
+import itertools
+import logging
+import math
+import os
+import random
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+
+logger = logging.getLogger(__name__)
+
+AVAILABLE_METHODS = ['onboarding', 'hybrid', 'steam']
+DEFAULT_METHODS = ['onboarding', 'hybrid']
+
+# 스윕 가능한 파라미터 (배치 재계산용 / 하이브리드 가중치용)
+SIMILARITY_PARAMS = {'min_ratings': int, 'top_k': int, 'min_similarity': float}
+WEIGHT_PARAMS = {'weight_collaborative': 'collaborative', 'weight_genre': 'genre', 'weight_metacritic': 'metacritic'}
+
+LIKED_SCORE = 3.5
+
+
+# ============================================================================
+# 지표 계산
+# ============================================================================
+
+def precision_at_k(recommended, relevant, k):
+    if k <= 0:
+        return 0.0
+    hits = sum(1 for game_id in recommended[:k] if game_id in relevant)
+    return hits / k
+
+
+def recall_at_k(recommended, relevant, k):
+    if not relevant:
+        return 0.0
+    hits = sum(1 for game_id in recommended[:k] if game_id in relevant)
+    return hits / len(relevant)
+
+
+def ndcg_at_k(recommended, relevant, k):
+    """이진 관련도 NDCG@k"""
+    dcg = sum(
+        1.0 / math.log2(rank + 2)
+        for rank, game_id in enumerate(recommended[:k])
+        if game_id in relevant
+    )
+    ideal = sum(1.0 / math.log2(rank + 2) for rank in range(min(len(relevant), k)))
+    return dcg / ideal if ideal > 0 else 0.0
+
+
+def percentile(values, pct):
+    """선형 보간 백분위수 (numpy 없이)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * pct / 100
+    lower = int(math.floor(pos))
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (pos - lower)
+
+
+# ============================================================================
+# 데이터 분할 / 파라미터 그리드
+# ============================================================================
+
+def build_holdout(holdout_ratio=0.2, min_liked=5, max_users=None, user_prefix=None, seed=42):
+    """
+    유저별 좋아요 평가 일부를 보류
+
+    Returns:
+        list: [{'user_id', 'holdout_rating_ids', 'relevant_game_ids'}, ...]
+    """
+    from .models import GameRating
+
+    qs = GameRating.objects.filter(score__gte=LIKED_SCORE)
+    if user_prefix:
+        qs = qs.filter(user__username__startswith=user_prefix)
+
+    liked_by_user = defaultdict(list)
+    for rating_id, user_id, game_id in qs.order_by('user_id', 'id').values_list('id', 'user_id', 'game_id'):
+        liked_by_user[user_id].append((rating_id, game_id))
+
+    rng = random.Random(seed)
+    cases = []
+    for user_id in sorted(liked_by_user):
+        liked = liked_by_user[user_id]
+        if len(liked) < min_liked:
+            continue
+        n_holdout = max(1, int(len(liked) * holdout_ratio))
+        held = rng.sample(liked, n_holdout)
+        cases.append({
+            'user_id': user_id,
+            'holdout_rating_ids': [r for r, _ in held],
+            'relevant_game_ids': [g for _, g in held],
+        })
+        if max_users and len(cases) >= max_users:
+            break
+    return cases
+
+
+def parse_param_grid(param_args):
+    """
+    ['top_k=20,50', 'weight_genre=0.1,0.2'] → [{'top_k': 20, 'weight_genre': 0.1}, ...]
+    """
+    axes = []
+    for arg in param_args or []:
+        if '=' not in arg:
+            raise ValueError(f"Invalid --param '{arg}' (expected name=v1,v2)")
+        name, raw_values = arg.split('=', 1)
+        name = name.strip()
+        if name in SIMILARITY_PARAMS:
+            cast = SIMILARITY_PARAMS[name]
+        elif name in WEIGHT_PARAMS:
+            cast = float
+        else:
+            raise ValueError(
+                f"Unknown parameter '{name}' "
+                f"(available: {', '.join(list(SIMILARITY_PARAMS) + list(WEIGHT_PARAMS))})"
+            )
+        axes.append([(name, cast(v)) for v in raw_values.split(',') if v.strip()])
+
+    if not axes:
+        return [{}]
+    return [dict(combo) for combo in itertools.product(*axes)]
+
+
+# ============================================================================
+# 추천기 실행 (결과 → Game.id 리스트)
+# ============================================================================
+
+def _build_id_lookup():
+    """JSON/RAWG 추천 결과를 Game.id 로 매핑하기 위한 조회 테이블"""
+    from games.models import Game
+
+    by_rawg, by_steam, by_title = {}, {}, {}
+    for game_id, rawg_id, steam_appid, title in Game.objects.values_list('id', 'rawg_id', 'steam_appid', 'title'):
+        if rawg_id:
+            by_rawg.setdefault(rawg_id, game_id)
+        if steam_appid:
+            by_steam.setdefault(steam_appid, game_id)
+        by_title.setdefault(title.lower(), game_id)
+    return by_rawg, by_steam, by_title
+
+
+def _resolve_ids(items, lookup):
+    by_rawg, by_steam, by_title = lookup
+    resolved = []
+    for item in items:
+        game_id = item.get('id')
+        if not game_id and item.get('rawg_id'):
+            game_id = by_rawg.get(item['rawg_id'])
+        if not game_id and item.get('steam_app_id'):
+            game_id = by_steam.get(int(item['steam_app_id'] or 0))
+        if not game_id and item.get('title'):
+            game_id = by_title.get(item['title'].lower())
+        if game_id and game_id not in resolved:
+            resolved.append(game_id)
+    return resolved
+
+
+def _run_method(method, user, k, weights, lookup, sale_games):
+    from .models import GameRating
+
+    if method == 'onboarding':
+        from .onboarding import get_recommendations_for_user
+        result = get_recommendations_for_user(user, limit=k)
+        return _resolve_ids(result.get('recommendations', []), lookup)
+
+    ratings = GameRating.objects.filter(user=user)
+    rated_ids = list(ratings.values_list('game_id', flat=True))
+
+    if method == 'hybrid':
+        from .hybrid_similarity import get_hybrid_recommendations
+        liked_ids = list(ratings.filter(score__gte=LIKED_SCORE).values_list('game_id', flat=True))
+        result = get_hybrid_recommendations(user, liked_ids, rated_ids, limit=k, weights=weights)
+        return [item['game'].id for item in result]
+
+    if method == 'steam':
+        from .recommendation import get_personalized_recommendations
+        # 학습 평가로 가상 Steam 라이브러리 구성 (점수 → 플레이타임)
+        library = [
+            {
+                'appid': r.game.steam_appid or 0,
+                'name': r.game.title,
+                'playtime_forever': int(r.score * 600) if r.score > 0 else 30,
+            }
+            for r in ratings.filter(score__gt=0).select_related('game')
+        ]
+        library.sort(key=lambda g: g['playtime_forever'], reverse=True)
+        result = get_personalized_recommendations(library, sale_games, limit=k)
+        return _resolve_ids(result.get('recommendations', []), lookup)
+
+    raise ValueError(f"Unknown method: {method}")
+
+
+# ============================================================================
+# 평가 실행
+# ============================================================================
+
+def evaluate_config(cases, params, methods, k, recompute_similarity=True):
+    """
+    단일 파라미터 조합 평가 (트랜잭션 롤백으로 DB 변경 없음)
+
+    Returns:
+        dict: {'params': {...}, 'methods': {method: {metrics...}}}
+    """
+    from django.db import transaction
+    from games.models import Game
+    from .models import GameRating, User
+    from .hybrid_similarity import SIMILARITY_WEIGHTS
+    from .onboarding import calculate_game_similarity_batch
+
+    weights = dict(SIMILARITY_WEIGHTS)
+    for name, key in WEIGHT_PARAMS.items():
+        if name in params:
+            weights[key] = params[name]
+
+    similarity_kwargs = {
+        'min_ratings': params.get('min_ratings', 3),
+        'top_k': params.get('top_k', 50),
+        'min_similarity': params.get('min_similarity', 0.1),
+    }
+
+    sale_games = []
+    if 'steam' in methods:
+        from .onboarding import load_onboarding_games_from_json
+        sale_games = load_onboarding_games_from_json().get('popular', [])
+
+    per_method = {m: {'precision': [], 'recall': [], 'ndcg': [], 'latency_ms': [], 'items': set(), 'errors': 0}
+                  for m in methods}
+
+    with transaction.atomic():
+        # 1. 보류 평가 숨기기 (롤백되므로 실제 삭제 아님)
+        holdout_ids = [rid for case in cases for rid in case['holdout_rating_ids']]
+        GameRating.objects.filter(id__in=holdout_ids).delete()
+
+        # 2. 학습 데이터만으로 유사도 재계산 (정답 누수 방지)
+        if recompute_similarity:
+            calculate_game_similarity_batch(**similarity_kwargs)
+
+        lookup = _build_id_lookup()
+        catalog_size = Game.objects.count()
+        users = User.objects.in_bulk([case['user_id'] for case in cases])
+
+        # 3. 유저별 추천 실행
+        for case in cases:
+            user = users.get(case['user_id'])
+            if user is None:
+                continue
+            relevant = set(case['relevant_game_ids'])
+            for method in methods:
+                stats = per_method[method]
+                started = time.perf_counter()
+                try:
+                    recommended = _run_method(method, user, k, weights, lookup, sale_games)
+                except Exception as e:
+                    logger.error(f"Evaluation failed ({method}, user={user.pk}): {e}")
+                    stats['errors'] += 1
+                    continue
+                stats['latency_ms'].append((time.perf_counter() - started) * 1000)
+                stats['precision'].append(precision_at_k(recommended, relevant, k))
+                stats['recall'].append(recall_at_k(recommended, relevant, k))
+                stats['ndcg'].append(ndcg_at_k(recommended, relevant, k))
+                stats['items'].update(recommended[:k])
+
+        transaction.set_rollback(True)
+
+    summary = {}
+    for method, stats in per_method.items():
+        n = len(stats['precision'])
+        summary[method] = {
+            'users': n,
+            'errors': stats['errors'],
+            f'precision@{k}': sum(stats['precision']) / n if n else 0.0,
+            f'recall@{k}': sum(stats['recall']) / n if n else 0.0,
+            f'ndcg@{k}': sum(stats['ndcg']) / n if n else 0.0,
+            'coverage': len(stats['items']) / catalog_size if catalog_size else 0.0,
+            'p50_ms': percentile(stats['latency_ms'], 50),
+            'p95_ms': percentile(stats['latency_ms'], 95),
+            'p99_ms': percentile(stats['latency_ms'], 99),
+        }
+    return {'params': params, 'methods': summary}
+
+
+def _init_worker(db_source, work_dir):
+    """
+    스윕 워커 프로세스 초기화 (spawn)
+
+    SQLite 는 동시 쓰기 트랜잭션이 잠기므로 워커마다 DB 파일 복사본을 사용한다.
+    """
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'ChuraiGame.settings')
+    import django
+    django.setup()
+
+    if db_source:
+        from django.db import connections
+        worker_db = os.path.join(work_dir, f'eval_{os.getpid()}.sqlite3')
+        shutil.copyfile(db_source, worker_db)
+        connections['default'].close()
+        connections['default'].settings_dict['NAME'] = worker_db
+
+
+def _evaluate_worker(args):
+    cases, params, methods, k, recompute_similarity = args
+    return evaluate_config(cases, params, methods, k, recompute_similarity)
+
+
+def run_sweep(cases, grid, methods, k, workers=1, recompute_similarity=True):
+    """
+    파라미터 그리드 전체 평가
+
+    workers > 1 이면 프로세스 풀로 병렬 실행 (SQLite 는 워커별 DB 복사본 사용)
+
+    Returns:
+        list: evaluate_config 결과 리스트 (grid 순서 유지)
+    """
+    from django.db import connections
+
+    jobs = [(cases, params, methods, k, recompute_similarity) for params in grid]
+    if workers <= 1 or len(jobs) <= 1:
+        return [_evaluate_worker(job) for job in jobs]
+
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    # 다른 백엔드는 각 워커가 자체 롤백 트랜잭션을 사용
+    # (GameSimilarity 재계산 구간은 서로 잠금 대기할 수 있음)
+    db_source = None
+    if connections['default'].vendor == 'sqlite':
+        db_source = str(connections['default'].settings_dict['NAME'])
+        if db_source == ':memory:' or 'mode=memory' in db_source:
+            logger.warning("In-memory SQLite cannot be shared with workers; running sequentially")
+            return [_evaluate_worker(job) for job in jobs]
+
+    ctx = multiprocessing.get_context('spawn')
+    work_dir = tempfile.mkdtemp(prefix='reco_eval_')
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                 initializer=_init_worker, initargs=(db_source, work_dir)) as pool:
+            return list(pool.map(_evaluate_worker, jobs))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def format_report(results, k):
+    """비교 리포트 (Markdown 표)"""
+    headers = ['params', 'method', 'users', f'precision@{k}', f'recall@{k}', f'ndcg@{k}',
+               'coverage', 'p50_ms', 'p95_ms', 'p99_ms']
+    lines = [
+        f"# Recommendation evaluation (k={k})",
+        "",
+        '| ' + ' | '.join(headers) + ' |',
+        '|' + '---|' * len(headers),
+    ]
+    for result in results:
+        params = ', '.join(f"{key}={value}" for key, value in result['params'].items()) or 'default'
+        for method, m in result['methods'].items():
+            lines.append('| ' + ' | '.join([
+                params,
+                method,
+                str(m['users']),
+                f"{m[f'precision@{k}']:.4f}",
+                f"{m[f'recall@{k}']:.4f}",
+                f"{m[f'ndcg@{k}']:.4f}",
+                f"{m['coverage']:.4f}",
+                f"{m['p50_ms']:.1f}",
+                f"{m['p95_ms']:.1f}",
+                f"{m['p99_ms']:.1f}",
+            ]) + ' |')
+    return '\n'.join(lines) + '\n'
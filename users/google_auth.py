@@ -14,11 +14,12 @@ Google Cloud Console 설정:
 """
 
 import os
-import requests
 import secrets
 from urllib.parse import urlencode
 from django.conf import settings
 
+from games import http_client
+
 # Google OAuth2 Endpoints
 GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
 GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
@@ -88,7 +89,7 @@ def exchange_code_for_tokens(code, redirect_uri):
         'grant_type': 'authorization_code',
     }
     
-    response = requests.post(GOOGLE_TOKEN_URL, data=data, timeout=10)
+    response = http_client.post(GOOGLE_TOKEN_URL, data=data, retries=0)
     
     if response.status_code != 200:
         raise Exception(f"Token 교환 실패: {response.text}")
@@ -113,7 +114,7 @@ def get_google_user_info(access_token):
         }
     """
     headers = {'Authorization': f'Bearer {access_token}'}
-    response = requests.get(GOOGLE_USERINFO_URL, headers=headers, timeout=10)
+    response = http_client.get(GOOGLE_USERINFO_URL, headers=headers)
     
     if response.status_code != 200:
         raise Exception(f"사용자 정보 조회 실패: {response.text}")
@@ -18,6 +18,8 @@ import logging
 from django.db.models import Q
 from typing import List, Dict, Tuple, Optional
 
+from .timing import stage
+
 logger = logging.getLogger(__name__)
 
 
@@ -206,70 +208,72 @@ def get_hybrid_recommendations(
     
     weights = weights or SIMILARITY_WEIGHTS
     
-    # 1. 협업 필터링 기반 후보 수집 (정규화된 스키마 사용)
-    candidate_ids = set()
-    
-    # game_a 위치에 있는 경우
-    sims_a = GameSimilarity.objects.filter(
-        game_a_id__in=liked_game_ids,
-        similarity_rank__lte=30
-    ).exclude(game_b_id__in=rated_game_ids)
-    
-    for sim in sims_a:
-        candidate_ids.add(sim.game_b_id)
-    
-    # game_b 위치에 있는 경우
-    sims_b = GameSimilarity.objects.filter(
-        game_b_id__in=liked_game_ids,
-        similarity_rank__lte=30
-    ).exclude(game_a_id__in=rated_game_ids)
-    
-    for sim in sims_b:
-        candidate_ids.add(sim.game_a_id)
+    with stage('hybrid_candidates'):
+        # 1. 협업 필터링 기반 후보 수집 (정규화된 스키마 사용)
+        candidate_ids = set()
+        
+        # game_a 위치에 있는 경우
+        sims_a = GameSimilarity.objects.filter(
+            game_a_id__in=liked_game_ids,
+            similarity_rank__lte=30
+        ).exclude(game_b_id__in=rated_game_ids)
+        
+        for sim in sims_a:
+            candidate_ids.add(sim.game_b_id)
+        
+        # game_b 위치에 있는 경우
+        sims_b = GameSimilarity.objects.filter(
+            game_b_id__in=liked_game_ids,
+            similarity_rank__lte=30
+        ).exclude(game_a_id__in=rated_game_ids)
+        
+        for sim in sims_b:
+            candidate_ids.add(sim.game_a_id)
     
     if not candidate_ids:
         logger.info("No candidates from collaborative filtering")
         return []
     
-    # 2. 후보 게임 로드 (태그 prefetch)
-    candidates = Game.objects.filter(
-        id__in=candidate_ids
-    ).prefetch_related('tags')
-    
-    liked_games = Game.objects.filter(
-        id__in=liked_game_ids
-    ).prefetch_related('tags')
-    
-    # 3. 각 후보에 대해 하이브리드 유사도 계산
-    candidate_scores = []
-    
-    for candidate in candidates:
-        total_score = 0
-        total_weight = 0
-        best_components = None
+    with stage('hybrid_scoring'):
+        # 2. 후보 게임 로드 (태그 prefetch)
+        candidates = Game.objects.filter(
+            id__in=candidate_ids
+        ).prefetch_related('tags')
         
-        for liked_game in liked_games:
-            sim, components = calculate_hybrid_similarity(
-                liked_game, candidate, weights
-            )
+        liked_games = Game.objects.filter(
+            id__in=liked_game_ids
+        ).prefetch_related('tags')
+        
+        # 3. 각 후보에 대해 하이브리드 유사도 계산
+        candidate_scores = []
+        
+        for candidate in candidates:
+            total_score = 0
+            total_weight = 0
+            best_components = None
             
-            # 유저 평점을 가중치로 사용할 수도 있음 (여기선 단순 평균)
-            total_score += sim
-            total_weight += 1
+            for liked_game in liked_games:
+                sim, components = calculate_hybrid_similarity(
+                    liked_game, candidate, weights
+                )
+                
+                # 유저 평점을 가중치로 사용할 수도 있음 (여기선 단순 평균)
+                total_score += sim
+                total_weight += 1
+                
+                if best_components is None or sim > best_components.get('final', 0):
+                    best_components = components
             
-            if best_components is None or sim > best_components.get('final', 0):
-                best_components = components
+            if total_weight > 0:
+                avg_score = total_score / total_weight
+                candidate_scores.append({
+                    'game': candidate,
+                    'score': avg_score,
+                    'components': best_components
+                })
         
-        if total_weight > 0:
-            avg_score = total_score / total_weight
-            candidate_scores.append({
-                'game': candidate,
-                'score': avg_score,
-                'components': best_components
-            })
-    
-    # 4. 점수 기준 정렬
-    candidate_scores.sort(key=lambda x: x['score'], reverse=True)
+        # 4. 점수 기준 정렬
+        candidate_scores.sort(key=lambda x: x['score'], reverse=True)
     
     logger.info(f"Hybrid recommendations: {len(candidate_scores)} candidates, returning top {limit}")
     
@@ -933,10 +933,14 @@ class Command(BaseCommand):
             action='store_true',
             help='기존 게임의 이미지만 RAWG에서 업데이트',
         )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='마지막 실행이 완료되지 않았으면 이미 처리한 게임은 건너뛰고 이어서 실행',
+        )
     
     def handle(self, *args, **options):
         import time
-        import requests
         import os
         from dotenv import load_dotenv
         load_dotenv()
@@ -952,8 +956,16 @@ class Command(BaseCommand):
         updated_count = 0
         rawg_fetched = 0
         
+        # 실행 기록 (처리한 게임 제목을 체크포인트로, 중간에 죽으면 running 으로 남아 --resume 대상)
+        from games.run_ledger import RunLedger
+        ledger = RunLedger.start('add_korean_games', options, resume=options.get('resume'))
+        if ledger.resumed:
+            self.stdout.write(f"♻️ CrawlRun #{ledger.run.resumed_from_id} 이어서 실행: {len(ledger.done)}개 처리됨")
+        
         for idx, game_data in enumerate(KOREAN_POPULAR_GAMES):
             title = game_data['title']
+            if ledger.is_done(title):
+                continue
             
             # 기존 게임 찾기 (제목 또는 steam_appid로)
             # 한글 부분만 또는 영문 부분만으로도 검색
@@ -1049,6 +1061,7 @@ class Command(BaseCommand):
                             existing.tags.add(tag)
                     
                     updated_count += 1
+                    ledger.record(title)
                     self.stdout.write(f"  업데이트: {title}")
                     continue
             
@@ -1096,23 +1109,28 @@ class Command(BaseCommand):
                     game.tags.add(tag)
             
             created_count += 1
+            ledger.record(title)
             self.stdout.write(self.style.SUCCESS(f"  추가: {title}"))
         
-        # 온보딩 캐시 무효화 (변경사항 즉시 반영)
+        ledger.add_stats(created=created_count, updated=updated_count, rawg_matched=rawg_fetched)
+        ledger.finish()
+        
+        # 한국 인기 게임 덱 재생성 (버전 증가 → 모든 워커 캐시 무효화)
         try:
-            from users.onboarding import clear_korean_games_cache
-            clear_korean_games_cache()
-            self.stdout.write(self.style.SUCCESS("📝 온보딩 캐시 무효화 완료"))
+            from users.onboarding_decks import build_korean_deck
+            deck = build_korean_deck()
+            self.stdout.write(self.style.SUCCESS(f"📝 한국 게임 덱 갱신 완료 (v{deck.version}, {deck.size}개)"))
         except Exception as e:
-            self.stdout.write(self.style.WARNING(f"⚠️ 캐시 무효화 실패: {e}"))
+            self.stdout.write(self.style.WARNING(f"⚠️ 한국 게임 덱 갱신 실패: {e}"))
         
         self.stdout.write(self.style.SUCCESS(
             f"\n완료! 생성: {created_count}개, 업데이트: {updated_count}개, RAWG 매칭: {rawg_fetched}개"
         ))
+        self.stdout.write(f"📒 {ledger.summary_line()}")
     
     def _fetch_from_rawg(self, search_term, api_key):
         """RAWG API에서 게임 검색하여 상세 정보 반환"""
-        import requests
+        from games import http_client
         
         try:
             # 1. 검색
@@ -1122,7 +1140,7 @@ class Command(BaseCommand):
                 'search': search_term,
                 'page_size': 1,
             }
-            response = requests.get(search_url, params=params, timeout=10)
+            response = http_client.get(search_url, params=params)
             if response.status_code != 200:
                 return None
             
@@ -1135,7 +1153,7 @@ class Command(BaseCommand):
             
             # 2. 상세 정보 가져오기
             detail_url = f"https://api.rawg.io/api/games/{game_id}"
-            detail_response = requests.get(detail_url, params={'key': api_key}, timeout=10)
+            detail_response = http_client.get(detail_url, params={'key': api_key})
             if detail_response.status_code == 200:
                 return detail_response.json()
             
@@ -0,0 +1,82 @@
+"""
+AI 챗봇 컨텍스트 캐시 벤치마크 Management Command
+
+ai_chat_api 가 LLM 을 호출하기 전까지 걸리는 시간(첫 바이트 전 구간)을 유저별로 비교합니다.
+    before: 매 메시지마다 평가 조회 + 장르 집계 + Steam 라이브러리 조회 + 프롬프트 구성 (build_chat_context)
+    after:  캐시된 ChatContext 조회 + 프롬프트 구성 (get_chat_context)
+
+운영 트래픽에서는 응답의 Server-Timing 헤더(chat_context / chat_llm)와
+관리자 API(/users/api/admin/timing/)의 p50/p95 로 같은 구간을 확인할 수 있습니다.
+
+사용법:
+    python manage.py benchmark_chat_context
+    python manage.py benchmark_chat_context --users 20 --turns 5
+    HTTP_CASSETTE=replay python manage.py benchmark_chat_context   # 녹화된 Steam 응답으로 오프라인 측정
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+
+from users.chat_context import build_chat_context, get_chat_context, render_system_prompt
+from users.models import User
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100)))]
+
+
+class Command(BaseCommand):
+    help = 'AI 챗봇 컨텍스트를 매번 구성할 때와 캐시를 쓸 때의 LLM 호출 전 지연시간을 비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=10,
+            help='측정할 유저 수 (평가가 많은 순, default: 10)'
+        )
+        parser.add_argument(
+            '--turns',
+            type=int,
+            default=3,
+            help='유저당 채팅 턴 수 (default: 3)'
+        )
+
+    def handle(self, *args, **options):
+        users = list(
+            User.objects.annotate(n=Count('game_ratings')).filter(n__gt=0)
+            .order_by('-n')[:options['users']]
+        )
+        if not users:
+            self.stdout.write(self.style.WARNING('⚠️ 평가가 있는 유저가 없습니다.'))
+            return
+
+        turns = max(1, options['turns'])
+        before, after = [], []
+        for user in users:
+            nickname = user.nickname or user.username
+            for _ in range(turns):
+                started = time.perf_counter()
+                render_system_prompt(build_chat_context(user), nickname)
+                before.append((time.perf_counter() - started) * 1000)
+            for _ in range(turns):
+                started = time.perf_counter()
+                render_system_prompt(get_chat_context(user), nickname)
+                after.append((time.perf_counter() - started) * 1000)
+
+        self.stdout.write("\n" + "="*70)
+        self.stdout.write(f"💬 Chat context (LLM 호출 전 구간): {len(users)}명 x {turns}턴")
+        self.stdout.write("="*70)
+        for label, samples in (('before (매번 구성)', before), ('after (캐시)', after)):
+            self.stdout.write(
+                f"  {label:<18} p50={_percentile(samples, 50):8.2f}ms  "
+                f"p95={_percentile(samples, 95):8.2f}ms  max={max(samples):8.2f}ms"
+            )
+        p50_after = _percentile(after, 50)
+        if p50_after:
+            self.stdout.write(self.style.SUCCESS(f"\n⚡ p50 {_percentile(before, 50) / p50_after:.1f}x faster"))
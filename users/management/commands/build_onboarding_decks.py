@@ -0,0 +1,82 @@
+"""
+온보딩 게임 덱 사전 계산 Management Command
+
+사용법:
+    python manage.py build_onboarding_decks
+    python manage.py build_onboarding_decks --size 300 --min-reviews 1000
+    python manage.py build_onboarding_decks --deck korean   # 한국 인기 게임 덱만 재생성
+
+배치 스케줄링 (cron):
+    # 매일 새벽 4시 (calculate_game_similarity 이후)
+    0 4 * * * cd /path/to/project && python manage.py build_onboarding_decks
+
+점수:
+    Steam review_count / 평점 + 우리 유저 GameRating 수 / 좋아요 비율
+    (users/onboarding_decks.py calculate_deck_score 참고)
+"""
+
+import time
+from django.core.management.base import BaseCommand
+
+from users.onboarding_decks import build_popular_deck, build_korean_deck, DECK_SIZE
+
+
+class Command(BaseCommand):
+    help = '온보딩 인기 게임 덱을 계산하여 OnboardingDeck 테이블에 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--deck',
+            choices=['popular', 'korean', 'all'],
+            default='popular',
+            help='생성할 덱 (기본값: popular, korean 은 add_korean_games 실행 시 자동 갱신)'
+        )
+        parser.add_argument(
+            '--size',
+            type=int,
+            default=DECK_SIZE,
+            help=f'덱 크기 (기본값: {DECK_SIZE})'
+        )
+        parser.add_argument(
+            '--min-steam-rating',
+            type=int,
+            default=75,
+            help='Steam 평점 하한 (기본값: 75)'
+        )
+        parser.add_argument(
+            '--min-reviews',
+            type=int,
+            default=500,
+            help='Steam 리뷰 수 하한 (기본값: 500)'
+        )
+        parser.add_argument(
+            '--min-local-ratings',
+            type=int,
+            default=3,
+            help='세일 데이터에 없는 게임을 포함할 최소 유저 평가 수 (기본값: 3)'
+        )
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+
+        self.stdout.write("="*70)
+        self.stdout.write("🃏 온보딩 덱 계산")
+        self.stdout.write("="*70)
+
+        decks = []
+        if options['deck'] in ('popular', 'all'):
+            decks.append(build_popular_deck(
+                size=options['size'],
+                min_steam_rating=options['min_steam_rating'],
+                min_reviews=options['min_reviews'],
+                min_local_ratings=options['min_local_ratings'],
+            ))
+        if options['deck'] in ('korean', 'all'):
+            decks.append(build_korean_deck())
+
+        elapsed = time.time() - start_time
+        for deck in decks:
+            self.stdout.write(self.style.SUCCESS(
+                f"✅ '{deck.name}' 덱 v{deck.version}: {deck.size}개 게임"
+            ))
+        self.stdout.write(f"⏱️  소요시간: {elapsed:.2f}초")
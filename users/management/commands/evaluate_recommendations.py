@@ -0,0 +1,159 @@
+"""
+추천 시스템 오프라인 평가 Management Command
+
+보류(held-out) GameRating 을 각 추천기에 재생하여 precision/recall/NDCG@k,
+coverage, p50/p95/p99 지연시간을 비교합니다. (DB 변경은 모두 롤백)
+
+사용법:
+    python manage.py evaluate_recommendations
+    python manage.py evaluate_recommendations --k 20 --users test_ --methods onboarding hybrid
+    python manage.py evaluate_recommendations --param top_k=20,50 --param min_similarity=0.05,0.1 --workers 4
+    python manage.py evaluate_recommendations --param weight_collaborative=0.6,0.7,0.8 --no-recompute --output report.md
+
+권장 데이터:
+    python manage.py create_test_users   # 67명 페르소나 유저 (각 ~600개 평가)
+
+스윕 파라미터:
+    - min_ratings / top_k / min_similarity : GameSimilarity 배치 재계산 파라미터
+    - weight_collaborative / weight_genre / weight_metacritic : SIMILARITY_WEIGHTS (hybrid)
+"""
+
+import json
+import time
+from django.core.management.base import BaseCommand, CommandError
+
+from users.evaluation import (
+    AVAILABLE_METHODS,
+    DEFAULT_METHODS,
+    build_holdout,
+    parse_param_grid,
+    run_sweep,
+    format_report,
+)
+
+
+class Command(BaseCommand):
+    help = '보류 평가 데이터로 추천기 품질/지연시간을 오프라인 평가합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--k',
+            type=int,
+            default=10,
+            help='평가 컷오프 k (기본값: 10)'
+        )
+        parser.add_argument(
+            '--methods',
+            nargs='+',
+            choices=AVAILABLE_METHODS,
+            default=DEFAULT_METHODS,
+            help='평가할 추천기 (steam 은 RAWG API 호출 발생, 기본값: onboarding hybrid)'
+        )
+        parser.add_argument(
+            '--holdout',
+            type=float,
+            default=0.2,
+            help='유저별 보류할 좋아요 평가 비율 (기본값: 0.2)'
+        )
+        parser.add_argument(
+            '--min-liked',
+            type=int,
+            default=5,
+            help='평가 대상 유저의 최소 좋아요 수 (기본값: 5)'
+        )
+        parser.add_argument(
+            '--users',
+            type=str,
+            default=None,
+            help='username 접두사로 대상 유저 제한 (예: test_)'
+        )
+        parser.add_argument(
+            '--max-users',
+            type=int,
+            default=None,
+            help='최대 평가 유저 수'
+        )
+        parser.add_argument(
+            '--param',
+            action='append',
+            default=[],
+            help='스윕 파라미터 (예: top_k=20,50). 여러 번 지정하면 조합(grid)으로 평가'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='그리드 병렬 평가 프로세스 수 (기본값: 1)'
+        )
+        parser.add_argument(
+            '--no-recompute',
+            action='store_true',
+            help='GameSimilarity 재계산 생략 (빠르지만 보류 데이터가 유사도에 누수됨)'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=42,
+            help='보류 샘플링 시드 (기본값: 42)'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=None,
+            help='비교 리포트 저장 경로 (.json 이면 JSON, 그 외 Markdown)'
+        )
+
+    def handle(self, *args, **options):
+        k = options['k']
+        methods = options['methods']
+
+        try:
+            grid = parse_param_grid(options['param'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write("="*70)
+        self.stdout.write("📊 추천 시스템 오프라인 평가")
+        self.stdout.write("="*70)
+        self.stdout.write(f"설정: k={k}, methods={methods}, holdout={options['holdout']}, grid={len(grid)}개, workers={options['workers']}")
+
+        # 1. 보류 데이터 분할
+        cases = build_holdout(
+            holdout_ratio=options['holdout'],
+            min_liked=options['min_liked'],
+            max_users=options['max_users'],
+            user_prefix=options['users'],
+            seed=options['seed'],
+        )
+        if not cases:
+            self.stdout.write(self.style.WARNING(
+                '평가할 유저가 없습니다. (create_test_users 로 테스트 데이터를 먼저 생성하세요)'
+            ))
+            return
+
+        holdout_count = sum(len(c['relevant_game_ids']) for c in cases)
+        self.stdout.write(f"👥 평가 유저: {len(cases)}명, 보류 평가: {holdout_count}개")
+
+        # 2. 그리드 평가
+        start_time = time.time()
+        results = run_sweep(
+            cases, grid, methods, k,
+            workers=options['workers'],
+            recompute_similarity=not options['no_recompute'],
+        )
+        elapsed = time.time() - start_time
+
+        # 3. 리포트
+        report = format_report(results, k)
+        self.stdout.write("\n" + report)
+
+        output = options['output']
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                if output.endswith('.json'):
+                    json.dump({'k': k, 'users': len(cases), 'results': results}, f, ensure_ascii=False, indent=2)
+                else:
+                    f.write(report)
+            self.stdout.write(f"📝 리포트 저장: {output}")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ 평가 완료! (소요시간: {elapsed:.2f}초)"))
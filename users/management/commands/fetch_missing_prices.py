@@ -8,15 +8,19 @@ Or run as management command:
     python manage.py fetch_missing_prices
     python manage.py fetch_missing_prices --limit=100  # 최대 100개만
     python manage.py fetch_missing_prices --apply      # 데이터셋에 저장
+    python manage.py fetch_missing_prices --apply --resume  # 중단된 실행의 결과에 이어서
+
+조회한 게임과 가져온 가격 엔트리는 실행 기록(CrawlRun)에 주기적으로 저장됩니다.
 """
 
 from django.core.management.base import BaseCommand
 import json
 import os
 import time
-import requests
+from games import http_client
 from django.conf import settings
 from games.models import Game
+from games.run_ledger import RunLedger
 
 
 class Command(BaseCommand):
@@ -39,6 +43,11 @@ class Command(BaseCommand):
             action='store_true',
             help='Steam AppID가 있는 게임만 처리'
         )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='마지막 실행이 완료되지 않았으면 체크포인트(조회한 게임, 가져온 엔트리)에서 이어서 실행'
+        )
 
     def handle(self, *args, **options):
         limit = options['limit']
@@ -83,53 +92,67 @@ class Command(BaseCommand):
         # Steam AppID가 있는 게임 우선
         db_only_games.sort(key=lambda g: (0 if g.steam_appid else 1, g.id))
         
+        # 이전 실행에서 이미 조회한 게임은 건너뛰고, 가져온 엔트리는 이어받음
+        ledger = RunLedger.start('fetch_missing_prices', options, resume=options['resume'])
+        new_entries = list(ledger.partial or []) if ledger.resumed else []
+        if ledger.resumed:
+            db_only_games = [g for g in db_only_games if not ledger.is_done(g.id)]
+            self.stdout.write(
+                f"♻️ CrawlRun #{ledger.run.resumed_from_id} 이어서 실행: "
+                f"{len(ledger.done)}개 조회됨, 엔트리 {len(new_entries)}개"
+            )
+        ledger.set_partial(new_entries)
+        
         # 처리할 게임 선택
         games_to_process = db_only_games[:limit]
         self.stdout.write(f"처리할 게임: {len(games_to_process)}개")
         self.stdout.write("-" * 60)
         
         # 3. CheapShark API로 가격 정보 가져오기
-        new_entries = []
         failed = []
         
-        for i, game in enumerate(games_to_process):
-            self.stdout.write(f"[{i+1}/{len(games_to_process)}] {game.title}...", ending='')
-            
-            price_info = self.fetch_cheapshark_price(game)
-            
-            if price_info:
-                new_entries.append(price_info)
-                self.stdout.write(self.style.SUCCESS(
-                    f" ✓ ${price_info['current_price']/100:.2f} (할인 {price_info['discount_rate']*100:.0f}%)"
-                ))
-            else:
-                failed.append(game.title)
-                self.stdout.write(self.style.WARNING(" ✗ 가격 정보 없음"))
-            
-            # Rate limiting (CheapShark는 초당 1회 권장)
-            time.sleep(1.0)
+        with ledger:
+            for i, game in enumerate(games_to_process):
+                self.stdout.write(f"[{i+1}/{len(games_to_process)}] {game.title}...", ending='')
+                
+                price_info = self.fetch_cheapshark_price(game)
+                
+                if price_info:
+                    new_entries.append(price_info)
+                    self.stdout.write(self.style.SUCCESS(
+                        f" ✓ ${price_info['current_price']/100:.2f} (할인 {price_info['discount_rate']*100:.0f}%)"
+                    ))
+                else:
+                    failed.append(game.title)
+                    self.stdout.write(self.style.WARNING(" ✗ 가격 정보 없음"))
+                ledger.record(game.id, ok=bool(price_info), done=True)
+                
+                # Rate limiting (CheapShark는 초당 1회 권장)
+                time.sleep(1.0)
         
-        self.stdout.write("-" * 60)
-        self.stdout.write(f"성공: {len(new_entries)}개, 실패: {len(failed)}개")
+            self.stdout.write("-" * 60)
+            self.stdout.write(f"성공: {len(new_entries)}개, 실패: {len(failed)}개")
         
-        # 4. 데이터셋에 저장
-        if apply and new_entries:
-            # 기존 데이터셋에 추가
-            dataset.extend(new_entries)
+            # 4. 데이터셋에 저장
+            if apply and new_entries:
+                # 기존 데이터셋에 추가
+                dataset.extend(new_entries)
             
-            # 저장
-            with open(dataset_path, 'w', encoding='utf-8') as f:
-                json.dump(dataset, f, ensure_ascii=False, indent=2)
+                # 저장
+                with open(dataset_path, 'w', encoding='utf-8') as f:
+                    json.dump(dataset, f, ensure_ascii=False, indent=2)
             
-            self.stdout.write(self.style.SUCCESS(f"✅ {len(new_entries)}개 게임이 데이터셋에 추가되었습니다!"))
-            self.stdout.write(f"새 데이터셋 크기: {len(dataset)}개")
-        elif new_entries:
-            self.stdout.write(self.style.WARNING("⚠️ Dry-run 모드. 실제 저장하려면 --apply 옵션을 추가하세요."))
+                self.stdout.write(self.style.SUCCESS(f"✅ {len(new_entries)}개 게임이 데이터셋에 추가되었습니다!"))
+                self.stdout.write(f"새 데이터셋 크기: {len(dataset)}개")
+            elif new_entries:
+                self.stdout.write(self.style.WARNING("⚠️ Dry-run 모드. 실제 저장하려면 --apply 옵션을 추가하세요."))
             
-            # 미리보기
-            self.stdout.write("\n추가될 게임 미리보기 (상위 10개):")
-            for entry in new_entries[:10]:
-                self.stdout.write(f"  - {entry['title']}: ₩{entry['current_price']:,} (할인 {entry['discount_rate']*100:.0f}%)")
+                # 미리보기
+                self.stdout.write("\n추가될 게임 미리보기 (상위 10개):")
+                for entry in new_entries[:10]:
+                    self.stdout.write(f"  - {entry['title']}: ₩{entry['current_price']:,} (할인 {entry['discount_rate']*100:.0f}%)")
+        
+        self.stdout.write(f"📒 {ledger.summary_line()}")
 
     def fetch_cheapshark_price(self, game):
         """CheapShark API로 게임 가격 정보 가져오기"""
@@ -138,7 +161,7 @@ class Command(BaseCommand):
         if game.steam_appid:
             try:
                 # Steam AppID로 직접 조회
-                response = requests.get(
+                response = http_client.get(
                     f"https://www.cheapshark.com/api/1.0/games",
                     params={'steamAppID': game.steam_appid},
                     timeout=10
@@ -167,7 +190,7 @@ class Command(BaseCommand):
         
         # 제목으로 검색 (fallback)
         try:
-            response = requests.get(
+            response = http_client.get(
                 "https://www.cheapshark.com/api/1.0/games",
                 params={'title': game.title, 'limit': 5},
                 timeout=10
@@ -182,7 +205,7 @@ class Command(BaseCommand):
                         # 상세 정보 가져오기
                         game_id = result.get('gameID')
                         if game_id:
-                            detail_resp = requests.get(
+                            detail_resp = http_client.get(
                                 f"https://www.cheapshark.com/api/1.0/games",
                                 params={'id': game_id},
                                 timeout=10
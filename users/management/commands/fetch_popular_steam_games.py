@@ -14,7 +14,7 @@ Usage:
     python manage.py fetch_popular_steam_games --top-rated
 """
 
-import requests
+from games import http_client
 import time
 from django.core.management.base import BaseCommand
 
@@ -62,7 +62,7 @@ class Command(BaseCommand):
         # Top 100 in 2 weeks (가장 인기 있는 게임)
         self.stdout.write("📥 SteamSpy Top 100 (2주간 인기) 가져오는 중...")
         try:
-            response = requests.get(self.STEAMSPY_TOP_URL, timeout=30)
+            response = http_client.get(self.STEAMSPY_TOP_URL, timeout=30)
             if response.status_code == 200:
                 data = response.json()
                 all_games.update(data)
@@ -78,7 +78,7 @@ class Command(BaseCommand):
             for page in range(pages_needed):
                 self.stdout.write(f"📥 SteamSpy 전체 목록 페이지 {page}...")
                 try:
-                    response = requests.get(
+                    response = http_client.get(
                         self.STEAMSPY_ALL_URL.format(page), 
                         timeout=60
                     )
@@ -96,7 +96,7 @@ class Command(BaseCommand):
     def fetch_steam_app_details(self, app_id):
         """Steam Store API에서 게임 상세 정보 가져오기"""
         try:
-            response = requests.get(
+            response = http_client.get(
                 self.STEAM_APP_DETAILS_URL.format(app_id),
                 timeout=15
             )
@@ -0,0 +1,55 @@
+"""
+Steam 플레이 시간 기반 암묵적 평가 일괄 생성 Management Command
+
+SteamOwnership(보유 게임 + 플레이 시간)으로 GameRating(is_implicit=True)을 다시 계산합니다 (Steam API 호출 없음).
+라이브러리가 갱신될 때는 users/steam_library.py 가 자동으로 실행하므로,
+기능 도입 전에 연동한 유저를 처리하거나 점수 기준(users/steam_ratings.py)을 바꾼 뒤에만 실행하면 됩니다.
+
+사용법:
+    python manage.py sync_steam_ownership     # (먼저) 보유 게임 테이블 채우기
+    python manage.py import_steam_ratings
+    python manage.py import_steam_ratings --user 42
+"""
+
+import time
+from django.core.management.base import BaseCommand
+
+from users.models import User
+from users.steam_ratings import import_steam_ratings
+
+
+class Command(BaseCommand):
+    help = 'Steam 플레이 시간으로 암묵적 게임 평가(GameRating.is_implicit)를 생성합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            default=None,
+            help='특정 유저 ID만 처리'
+        )
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+
+        self.stdout.write("="*70)
+        self.stdout.write("🎯 Steam 플레이 시간 → 암묵적 평가")
+        self.stdout.write("="*70)
+
+        users = User.objects.filter(steam_ownerships__isnull=False).distinct()
+        if options['user']:
+            users = users.filter(pk=options['user'])
+
+        totals = {'users': 0, 'mapped': 0, 'loved': 0, 'liked': 0, 'kept_explicit': 0, 'removed': 0}
+        for user in users.iterator():
+            result = import_steam_ratings(user)
+            totals['users'] += 1
+            for key, value in result.items():
+                totals[key] += value
+
+        elapsed = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {totals['users']}명 처리 완료 ({elapsed:.1f}초): "
+            f"평가 {totals['mapped']}개 (쌍따봉 {totals['loved']}, 따봉 {totals['liked']}), "
+            f"직접 평가 유지 {totals['kept_explicit']}, 삭제 {totals['removed']}"
+        ))
@@ -41,3 +41,8 @@ class Command(BaseCommand):
                  self.stdout.write(self.style.ERROR(f" -> DELETED"))
 
         self.stdout.write(self.style.SUCCESS(f"Sync complete. Deleted {deleted_count} ghost games."))
+
+        # 4. Rebuild the Korean featured deck (version bump invalidates every worker's cache)
+        from users.onboarding_decks import build_korean_deck
+        deck = build_korean_deck()
+        self.stdout.write(self.style.SUCCESS(f"Korean featured deck rebuilt: v{deck.version} ({deck.size} games)"))
@@ -0,0 +1,67 @@
+"""
+Steam 보유 게임 정규화 테이블(SteamOwnership) 동기화 Management Command
+
+SteamLibraryCache.library_data 를 기준으로 SteamOwnership 을 채웁니다 (Steam API 호출 없음).
+라이브러리가 갱신될 때는 users/steam_library.py 가 자동으로 동기화하므로,
+테이블 도입 전에 쌓인 캐시를 옮기거나 수동으로 맞출 때만 실행하면 됩니다.
+(도입 전 캐시는 상위 50개 게임만 담고 있으므로 나머지는 다음 라이브러리 갱신 때 채워집니다.)
+
+사용법:
+    python manage.py sync_steam_ownership
+    python manage.py sync_steam_ownership --user 42
+    python manage.py sync_steam_ownership --popular 10   # 동기화 후 보유 유저 수 상위 게임 출력
+"""
+
+import time
+from django.core.management.base import BaseCommand
+
+from users.models import SteamLibraryCache
+from users.steam_ownership import popular_among_users, sync_ownership
+
+
+class Command(BaseCommand):
+    help = 'SteamLibraryCache 의 라이브러리로 SteamOwnership 테이블을 동기화합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user',
+            type=int,
+            default=None,
+            help='특정 유저 ID만 동기화'
+        )
+        parser.add_argument(
+            '--popular',
+            type=int,
+            default=0,
+            help='동기화 후 우리 유저가 많이 보유한 게임 N개 출력 (기본값: 0)'
+        )
+
+    def handle(self, *args, **options):
+        start_time = time.time()
+
+        self.stdout.write("="*70)
+        self.stdout.write("🎮 Steam 보유 게임 동기화")
+        self.stdout.write("="*70)
+
+        caches = SteamLibraryCache.objects.select_related('user')
+        if options['user']:
+            caches = caches.filter(user_id=options['user'])
+
+        totals = {'users': 0, 'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+        for cache in caches.iterator():
+            result = sync_ownership(cache.user, cache.library_data or [])
+            totals['users'] += 1
+            for key, value in result.items():
+                totals[key] += value
+
+        elapsed = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ {totals['users']}명 동기화 완료 ({elapsed:.1f}초): "
+            f"추가 {totals['created']}, 갱신 {totals['updated']}, 삭제 {totals['deleted']}, 변경 없음 {totals['unchanged']}"
+        ))
+
+        if options['popular']:
+            self.stdout.write("\n📊 우리 유저가 많이 보유한 게임")
+            for rank, row in enumerate(popular_among_users(limit=options['popular'], min_owners=1), 1):
+                title = row['title'] or f"app {row['steam_appid']}"
+                self.stdout.write(f"  {rank:>3}. {title} - {row['owners']}명, {row['total_hours']}시간")
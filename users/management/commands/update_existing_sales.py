@@ -9,7 +9,7 @@ Usage:
     python manage.py update_existing_sales --limit 500
 """
 
-import requests
+from games import http_client
 import json
 import time
 import os
@@ -42,7 +42,7 @@ class Command(BaseCommand):
         """Steam AppID로 CheapShark에서 현재 세일 가격 조회"""
         try:
             # CheapShark의 games API로 Steam AppID 검색
-            response = requests.get(
+            response = http_client.get(
                 f"{self.CHEAPSHARK_API}/games",
                 params={"steamAppID": str(steam_appid)},
                 timeout=10
@@ -62,7 +62,7 @@ class Command(BaseCommand):
             # 상세 정보 조회로 현재 세일 가격 가져오기
             if cheapshark_id:
                 time.sleep(0.5)  # 상세 조회 전 딜레이
-                detail_response = requests.get(
+                detail_response = http_client.get(
                     f"{self.CHEAPSHARK_API}/games",
                     params={"id": cheapshark_id},
                     timeout=10
@@ -6,21 +6,29 @@ CheapShark API를 사용하여 DB에 있는 게임들의 스팀 세일 데이터
 주요 특징:
 - DB에 있는 게임들만 수집 (새 게임 추가 없음)
 - 무료 API, API 키 불필요
-- Rate limiting 방지를 위한 적절한 딜레이
-- 역대 최저가 정보 포함
+- 정렬 기준 4개를 동시에 수집하되 요청 속도는 호스트 단위 토큰 버킷 하나로 공유
+  (steamAppID 기준 맵으로 즉시 중복 제거, 새 DB 게임이 없는 페이지가 나오면 해당 정렬 중단)
+- 수집 중인 결과와 정렬별 다음 페이지를 실행 기록(CrawlRun)에 주기적으로 저장 → --resume
+- 역대 최저가 정보 포함 (games?ids= 로 최대 25개씩 묶어서, 속도 제한된 워커로 병렬 조회)
 
 Usage:
     python manage.py update_steam_sales
     python manage.py update_steam_sales --no-history
+    python manage.py update_steam_sales --history-workers 4 --history-rate 2
+    python manage.py update_steam_sales --resume   # 중단된 실행의 수집 결과/페이지에서 이어서
 """
 
 import requests
+from games import http_client
 import json
 import time
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
+from games.run_ledger import RunLedger
 
 
 class Command(BaseCommand):
@@ -31,9 +39,11 @@ class Command(BaseCommand):
     GAMES_API_URL = "https://www.cheapshark.com/api/1.0/games"
     PAGE_SIZE = 60  # CheapShark 최대값
     
+    # games?ids= 한 번에 조회 가능한 최대 ID 수
+    HISTORY_BATCH_SIZE = 25
+
     # Rate limiting 방지
     REQUEST_DELAY = 1.0  # 1초 딜레이 (안전하게)
-    HISTORY_DELAY = 0.5  # 역대 최저가 조회는 더 빠르게
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -41,12 +51,30 @@ class Command(BaseCommand):
             action='store_true',
             help='Skip fetching historical low prices'
         )
+        parser.add_argument(
+            '--history-workers',
+            type=int,
+            default=4,
+            help='Concurrent workers for historical low lookups (default: 4)'
+        )
+        parser.add_argument(
+            '--history-rate',
+            type=float,
+            default=2.0,
+            help='CheapShark requests per second during historical low lookups, all workers combined (default: 2.0)'
+        )
         parser.add_argument(
             '--delay',
             type=float,
             default=1.0,
             help='Delay between API requests in seconds (default: 1.0)'
         )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=None,
+            help='CheapShark deals requests per second shared by all sort criteria (default: 1/--delay)'
+        )
         parser.add_argument(
             '--add-new',
             type=int,
@@ -66,51 +94,89 @@ class Command(BaseCommand):
             default=500,
             help='Minimum Steam review count to include (default: 500). Filters out obscure games.'
         )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue from the last checkpoint (collected deals, next page per sort) if the previous run did not complete'
+        )
 
-    def fetch_deals_with_retry(self, params, max_retries=3):
-        """CheapShark API 호출 (429 에러 시 Retry-After 대기)"""
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(self.DEALS_API_URL, params=params, timeout=30)
-                
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    self.stdout.write(self.style.WARNING(
-                        f"⏳ Rate limited! {retry_after}초 대기 후 재시도..."
-                    ))
-                    time.sleep(retry_after)
-                    continue
-                
-                response.raise_for_status()
-                return response.json()
-                
-            except requests.RequestException as e:
-                if attempt < max_retries - 1:
-                    self.stdout.write(self.style.WARNING(f"⚠️ 요청 실패, 재시도 중... ({e})"))
-                    time.sleep(5)
-                else:
-                    self.stdout.write(self.style.ERROR(f"❌ API 요청 실패: {e}"))
-                    return []
-        return []
+    def fetch_deals(self, params):
+        """
+        CheapShark deals API 호출
+        (429 / 5xx / 연결 오류 재시도는 http_client 가 Retry-After 와 호스트 토큰 버킷을 지켜 처리)
 
-    def fetch_historical_low_with_retry(self, game_id, max_retries=2):
-        """CheapShark Games API로 역대 최저가 정보 조회 (429 처리 포함)"""
-        for attempt in range(max_retries):
-            try:
-                response = requests.get(f"{self.GAMES_API_URL}?id={game_id}", timeout=10)
-                
-                if response.status_code == 429:
-                    retry_after = int(response.headers.get('Retry-After', 30))
-                    self.stdout.write(self.style.WARNING(f"⏳ Rate limited! {retry_after}초 대기..."))
-                    time.sleep(retry_after)
-                    continue
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    return data.get('cheapestPriceEver', None)
-            except Exception:
-                pass
-        return None
+        Returns:
+            list: 딜 목록 (빈 리스트 = 더 이상 데이터 없음), 재시도 후에도 실패하면 None
+        """
+        try:
+            response = http_client.get(self.DEALS_API_URL, params=params, timeout=30)
+            response.raise_for_status()
+            return response.json()
+        except (requests.RequestException, ValueError) as e:
+            self.stdout.write(self.style.ERROR(f"❌ API 요청 실패: {e}"))
+            return None
+
+    def fetch_historical_low_batch(self, cheapshark_ids):
+        """
+        CheapShark Games API(ids=) 로 여러 게임의 역대 최저가를 한 번에 조회
+        (429 / 5xx 재시도는 http_client 가 Retry-After 를 지켜 처리)
+
+        Returns:
+            tuple: ({cheapshark_id: cheapestPriceEver dict}, 오류 메시지 또는 None)
+        """
+        try:
+            response = http_client.get(
+                self.GAMES_API_URL,
+                params={'ids': ','.join(cheapshark_ids)},
+                timeout=10
+            )
+            if response.status_code != 200:
+                return {}, f"HTTP {response.status_code}"
+            data = response.json()
+        except (requests.RequestException, ValueError) as e:
+            return {}, str(e)
+
+        lows = {}
+        for cheapshark_id, entry in (data.items() if isinstance(data, dict) else []):
+            # 존재하지 않는 ID 는 빈 리스트로 내려옴
+            if isinstance(entry, dict) and entry.get('cheapestPriceEver'):
+                lows[str(cheapshark_id)] = entry['cheapestPriceEver']
+        return lows, None
+
+    def fetch_historical_lows(self, cheapshark_ids, workers, rate):
+        """
+        역대 최저가 일괄 조회 (ID 중복 제거 → 25개씩 배치 → 워커 병렬, 호스트 속도 제한 공유)
+
+        Returns:
+            tuple: ({cheapshark_id: cheapestPriceEver dict}, 실패한 배치 수)
+        """
+        ids = list(dict.fromkeys(str(i) for i in cheapshark_ids if i))
+        batches = [ids[i:i + self.HISTORY_BATCH_SIZE] for i in range(0, len(ids), self.HISTORY_BATCH_SIZE)]
+        if not batches:
+            return {}, 0
+
+        http_client.set_rate_limit(self.GAMES_API_URL, rate, burst=workers)
+        self.stdout.write(
+            f"   📦 {len(ids)}개 ID → {len(batches)}회 요청 "
+            f"(워커 {workers}개, {f'{rate:.1f}/s' if rate else '제한 없음'})"
+        )
+
+        lows = {}
+        failed = 0
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.fetch_historical_low_batch, batch) for batch in batches]
+            for i, future in enumerate(as_completed(futures), 1):
+                batch_lows, error = future.result()
+                lows.update(batch_lows)
+                if error:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f"   ⚠️ 역대 최저가 배치 실패: {error}"))
+                if i % 10 == 0 or i == len(batches):
+                    self.stdout.write(f"   ✅ {i}/{len(batches)} 배치 완료 (조회: {len(lows)}개)")
+
+        if failed:
+            self.stdout.write(self.style.WARNING(f"   ⚠️ 실패한 배치: {failed}/{len(batches)}"))
+        return lows, failed
 
     def handle(self, *args, **options):
         fetch_history = not options['no_history']
@@ -128,7 +194,8 @@ class Command(BaseCommand):
             f"🚀 CheapShark API로 DB 게임들의 세일 데이터 업데이트 시작"
         ))
         self.stdout.write(f"   📌 모드: DB에 있는 게임만 수집 (새 게임 추가 안함)")
-        self.stdout.write(f"   ⏱️ 요청 딜레이: {self.REQUEST_DELAY}초")
+        rate = options['rate'] or (1 / self.REQUEST_DELAY if self.REQUEST_DELAY > 0 else None)
+        self.stdout.write(f"   ⏱️ 요청 속도: {f'{rate:.1f}/s' if rate else '제한 없음'} (모든 정렬 기준 합산)")
         self.stdout.write("")
         
         # DB에서 게임 정보 먼저 로드
@@ -148,12 +215,24 @@ class Command(BaseCommand):
         self.stdout.write(f"   📊 DB에 있는 Steam 게임: {len(db_steam_ids)}개")
         self.stdout.write("")
         
-        # 중복 체크용 set
-        seen_app_ids = set()
-        collected_data = []
+        # steamAppID → 게임 정보 (중복 체크 겸용, 정렬 기준 워커들이 공유)
+        collected = {}
+        collected_lock = threading.Lock()
+        
+        # 실행 기록: 수집 결과(partial) + 정렬별 다음 페이지 / 완료된 정렬 / 역대 최저가 완료 여부(cursor)
+        ledger = RunLedger.start('update_steam_sales', options, resume=options['resume'])
+        next_pages = dict(ledger.cursor.get('pages', {}))
+        finished_sorts = set(ledger.cursor.get('finished', []))
+        if ledger.resumed:
+            collected.update(ledger.partial or {})
+            self.stdout.write(
+                f"   ♻️ CrawlRun #{ledger.run.resumed_from_id} 이어서 실행: "
+                f"{len(collected)}개 수집됨, 완료된 정렬 {len(finished_sorts)}개"
+            )
+        ledger.set_partial(collected)
         
         def process_deals(deals):
-            """딜 데이터를 처리하여 collected_data에 추가 (DB 게임만, 중복 제거)"""
+            """딜 데이터를 처리하여 collected 에 추가 (DB 게임만, 중복 제거, collected_lock 안에서 호출)"""
             added = 0
             for deal in deals:
                 steam_app_id = deal.get('steamAppID')
@@ -165,9 +244,8 @@ class Command(BaseCommand):
                     continue
                 
                 # 중복 체크
-                if steam_app_id in seen_app_ids:
+                if str(steam_app_id) in collected:
                     continue
-                seen_app_ids.add(steam_app_id)
                 
                 # 할인율 계산
                 savings = float(deal.get('savings') or 0)
@@ -208,7 +286,7 @@ class Command(BaseCommand):
                     'rawg_id': steam_to_rawg.get(str(steam_app_id))  # 미리 매핑
                 }
                 
-                collected_data.append(game_info)
+                collected[str(steam_app_id)] = game_info
                 added += 1
             return added
         
@@ -222,10 +300,15 @@ class Command(BaseCommand):
             ("Savings", 20),       # 할인율로 20페이지
         ]
         
-        for sort_by, max_pages in sort_criteria:
-            self.stdout.write(f"📥 {sort_by} 기준 수집 중...")
-            
-            for page in range(max_pages):
+        def harvest(sort_by, max_pages):
+            """
+            한 정렬 기준의 페이지를 순서대로 수집 (새 DB 게임이 없는 페이지에서 중단)
+
+            Returns:
+                tuple: (요청 수, 완료 여부) - 요청이 실패하면 완료로 기록하지 않아 --resume 때 그 페이지부터 다시
+            """
+            requests_made = 0
+            for page in range(next_pages.get(sort_by, 0), max_pages):
                 params = {
                     "storeID": "1",
                     "onSale": "1",
@@ -234,88 +317,148 @@ class Command(BaseCommand):
                     "sortBy": sort_by
                 }
                 
-                deals = self.fetch_deals_with_retry(params)
-                
-                if not deals:
-                    self.stdout.write(f"   ⚠️ 페이지 {page + 1}에서 데이터 없음, 다음으로 넘어감")
-                    break
-                
-                added = process_deals(deals)
+                deals = self.fetch_deals(params)
+                requests_made += 1
                 
-                if (page + 1) % 10 == 0:
-                    self.stdout.write(f"   ✅ 페이지 {page + 1}/{max_pages} (수집: {len(collected_data)}개, +{added} 신규)")
+                if deals is None:
+                    self.stdout.write(self.style.ERROR(f"   ❌ {sort_by} 페이지 {page + 1} 요청 실패, 이 정렬 기준 중단 (--resume 으로 이어서)"))
+                    ledger.record(ok=False, error='deals 요청 실패')
+                    return requests_made, False
                 
-                time.sleep(self.REQUEST_DELAY)
-            
-            self.stdout.write(f"   ✅ {sort_by}: 완료 (누적: {len(collected_data)}개)")
+                with collected_lock:
+                    if not deals:
+                        self.stdout.write(f"   ⚠️ {sort_by} 페이지 {page + 1}에서 데이터 없음, 중단")
+                        ledger.record()
+                        break
+                    
+                    added = process_deals(deals)
+                    # 체크포인트 flush 도 collected_lock 안에서 (저장 중 collected 변경 방지)
+                    next_pages[sort_by] = page + 1
+                    ledger.set_cursor(pages=dict(next_pages))
+                    ledger.record()
+                    
+                    if added == 0:
+                        self.stdout.write(f"   ⏹️ {sort_by} 페이지 {page + 1}: 새 DB 게임 없음, 중단")
+                        break
+                    
+                    if (page + 1) % 10 == 0:
+                        self.stdout.write(f"   ✅ {sort_by} 페이지 {page + 1}/{max_pages} (수집: {len(collected)}개, +{added} 신규)")
+            with collected_lock:
+                finished_sorts.add(sort_by)
+                ledger.set_cursor(finished=sorted(finished_sorts))
+            return requests_made, True
+        
+        with ledger:
+            # 요청 간격은 sleep 대신 CheapShark 호스트 토큰 버킷으로 (모든 정렬 기준 공유)
+            http_client.set_rate_limit(self.DEALS_API_URL, rate)
+            harvest_started = time.time()
+            self.stdout.write(f"📥 {', '.join(name for name, _ in sort_criteria)} 기준 동시 수집 중...")
+        
+            with ThreadPoolExecutor(max_workers=len(sort_criteria)) as executor:
+                futures = {
+                    executor.submit(harvest, sort_by, max_pages): (sort_by, max_pages)
+                    for sort_by, max_pages in sort_criteria
+                    if sort_by not in finished_sorts
+                }
+                total_requests = 0
+                failed_sorts = []
+                for future in as_completed(futures):
+                    sort_by, max_pages = futures[future]
+                    requests_made, finished = future.result()
+                    total_requests += requests_made
+                    if finished:
+                        self.stdout.write(f"   ✅ {sort_by}: 완료 ({requests_made}/{max_pages}페이지, 누적: {len(collected)}개)")
+                    else:
+                        failed_sorts.append(sort_by)
+                        self.stdout.write(self.style.WARNING(f"   ⚠️ {sort_by}: 요청 실패로 중단 ({requests_made}페이지 요청)"))
+        
+            collected_data = list(collected.values())
+            self.stdout.write(
+                f"   ⏱️ 딜 수집: {total_requests}회 요청, {time.time() - harvest_started:.1f}초"
+            )
+            ledger.add_stats(deal_requests=total_requests, collected=len(collected_data), failed_sorts=failed_sorts)
+            if failed_sorts:
+                # 실행 기록을 완료로 남기지 않아야 --resume 이 실패한 정렬을 다시 수집
+                ledger.mark_incomplete(f"deals 요청 실패: {', '.join(failed_sorts)}")
+            ledger.flush()
         
-        self.stdout.write(f"\n📊 1차 수집 완료: {len(collected_data)}개 (DB 게임 중 세일 중인 것)")
+            self.stdout.write(f"\n📊 1차 수집 완료: {len(collected_data)}개 (DB 게임 중 세일 중인 것)")
         
-        # 역대 최저가 정보 조회
-        if fetch_history and len(collected_data) > 0:
-            history_count = min(len(collected_data), 300)  # 최대 300개만
-            self.stdout.write(f"\n📊 역대 최저가 정보 조회 중... (상위 {history_count}개)")
+            # 역대 최저가 정보 조회 (전체 수집분, 이어서 실행 시 이미 조회했으면 건너뜀)
+            if fetch_history and len(collected_data) > 0 and not ledger.cursor.get('history_done'):
+                self.stdout.write(f"\n📊 역대 최저가 정보 조회 중... ({len(collected_data)}개)")
+                history_started = time.time()
+                lows, failed_batches = self.fetch_historical_lows(
+                    [game.get('cheapshark_id') for game in collected_data],
+                    workers=max(1, options['history_workers']),
+                    rate=options['history_rate'],
+                )
             
-            for i, game in enumerate(collected_data[:history_count]):
-                cheapshark_id = game.get('cheapshark_id')
-                if cheapshark_id:
-                    historical = self.fetch_historical_low_with_retry(cheapshark_id)
+                for game in collected_data:
+                    historical = lows.get(str(game.get('cheapshark_id')))
                     if historical:
                         game['cheapest_price_ever'] = float(historical.get('price', 0))
                         game['cheapest_price_ever_krw'] = int(float(historical.get('price', 0)) * 1300)
                         game['cheapest_date'] = historical.get('date', '')
-                        
+                    
                         if game['current_price_usd'] <= float(historical.get('price', 999)):
                             game['is_historical_low'] = True
                         else:
                             game['is_historical_low'] = False
-                
-                if (i + 1) % 50 == 0:
-                    self.stdout.write(f"   ✅ {i + 1}/{history_count} 완료")
-                
-                time.sleep(self.HISTORY_DELAY)
-        
-        # 데이터 분류
-        categorized = self._categorize_data(collected_data)
-        
-        # 결과 저장
-        result = {
-            'updated_at': datetime.now().isoformat(),
-            'source': 'CheapShark API (DB games only)',
-            'db_game_count': len(db_steam_ids),
-            'stats': {
-                'total_count': len(collected_data),
-                'popular_count': len(categorized['popular_sales']),
-                'top_discount_count': len(categorized['top_discounts']),
-                'historical_low_count': len(categorized.get('historical_lows', [])),
-                'highly_rated_count': len(categorized['highly_rated'])
-            },
-            **categorized
-        }
+            
+                self.stdout.write(
+                    f"   ⏱️ 역대 최저가 {len(lows)}개 조회 ({time.time() - history_started:.1f}초)"
+                )
+                if failed_batches:
+                    # 실패한 배치가 있으면 --resume 에서 역대 최저가를 다시 조회
+                    ledger.mark_incomplete(f"역대 최저가 배치 실패: {failed_batches}개")
+                else:
+                    ledger.set_cursor(history_done=True)
+                ledger.flush()
         
-        # 파일 저장
-        structured_path = os.path.join(settings.BASE_DIR, 'users', 'steam_sale_data.json')
-        legacy_path = os.path.join(settings.BASE_DIR, 'users', 'steam_sale_dataset_fast.json')
+            # 데이터 분류
+            categorized = self._categorize_data(collected_data)
         
-        try:
-            with open(structured_path, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            # 결과 저장
+            result = {
+                'updated_at': datetime.now().isoformat(),
+                'source': 'CheapShark API (DB games only)',
+                'db_game_count': len(db_steam_ids),
+                'stats': {
+                    'total_count': len(collected_data),
+                    'popular_count': len(categorized['popular_sales']),
+                    'top_discount_count': len(categorized['top_discounts']),
+                    'historical_low_count': len(categorized.get('historical_lows', [])),
+                    'highly_rated_count': len(categorized['highly_rated'])
+                },
+                **categorized
+            }
+        
+            # 파일 저장
+            structured_path = os.path.join(settings.BASE_DIR, 'users', 'steam_sale_data.json')
+            legacy_path = os.path.join(settings.BASE_DIR, 'users', 'steam_sale_dataset_fast.json')
+        
+            try:
+                with open(structured_path, 'w', encoding='utf-8') as f:
+                    json.dump(result, f, ensure_ascii=False, indent=2)
             
-            with open(legacy_path, 'w', encoding='utf-8') as f:
-                json.dump(collected_data, f, ensure_ascii=False, indent=2)
+                with open(legacy_path, 'w', encoding='utf-8') as f:
+                    json.dump(collected_data, f, ensure_ascii=False, indent=2)
             
-            self.stdout.write(self.style.SUCCESS("\n🎉 완료!"))
-            self.stdout.write(f"   📊 DB 게임 총: {len(db_steam_ids)}개")
-            self.stdout.write(f"   📊 세일 중인 게임: {len(collected_data)}개")
-            self.stdout.write(f"   🔥 인기 세일: {len(categorized['popular_sales'])}개")
-            self.stdout.write(f"   💰 역대 최대 할인: {len(categorized['top_discounts'])}개")
-            self.stdout.write(f"   ⭐ 역대 최저가: {len(categorized.get('historical_lows', []))}개")
-            self.stdout.write(f"   🌟 높은 평가: {len(categorized['highly_rated'])}개")
-            self.stdout.write(f"   📁 저장 위치: {structured_path}")
-            self.stdout.write(f"   📁 레거시 파일: {legacy_path}")
+                self.stdout.write(self.style.SUCCESS("\n🎉 완료!"))
+                self.stdout.write(f"   📊 DB 게임 총: {len(db_steam_ids)}개")
+                self.stdout.write(f"   📊 세일 중인 게임: {len(collected_data)}개")
+                self.stdout.write(f"   🔥 인기 세일: {len(categorized['popular_sales'])}개")
+                self.stdout.write(f"   💰 역대 최대 할인: {len(categorized['top_discounts'])}개")
+                self.stdout.write(f"   ⭐ 역대 최저가: {len(categorized.get('historical_lows', []))}개")
+                self.stdout.write(f"   🌟 높은 평가: {len(categorized['highly_rated'])}개")
+                self.stdout.write(f"   📁 저장 위치: {structured_path}")
+                self.stdout.write(f"   📁 레거시 파일: {legacy_path}")
             
-        except IOError as e:
-            raise CommandError(f"파일 저장 실패: {e}")
+            except IOError as e:
+                raise CommandError(f"파일 저장 실패: {e}")
+        
+        self.stdout.write(f"   📒 {ledger.summary_line()}")
 
     def _categorize_data(self, collected_data):
         """수집된 데이터를 카테고리별로 분류"""
@@ -409,8 +552,11 @@ class Command(BaseCommand):
                 "sortBy": sort_by
             }
             
-            deals = self.fetch_deals_with_retry(params)
+            deals = self.fetch_deals(params)
             
+            if deals is None:
+                self.stdout.write(self.style.ERROR(f"   ❌ 페이지 {page + 1} 요청 실패, 중단"))
+                break
             if not deals:
                 self.stdout.write(f"   ⚠️ 페이지 {page + 1}에서 데이터 없음")
                 break
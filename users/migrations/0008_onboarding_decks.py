@@ -0,0 +1,64 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('games', '0010_genre_index'),
+        ('users', '0007_gamerating_comment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OnboardingDeck',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=30, unique=True, verbose_name='덱 이름')),
+                ('version', models.PositiveIntegerField(default=0, verbose_name='버전')),
+                ('size', models.PositiveIntegerField(default=0, verbose_name='게임 수')),
+                ('built_at', models.DateTimeField(auto_now=True, verbose_name='생성 시점')),
+            ],
+            options={
+                'verbose_name': '온보딩 덱',
+                'verbose_name_plural': '온보딩 덱',
+            },
+        ),
+        migrations.CreateModel(
+            name='OnboardingDeckEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rank', models.PositiveIntegerField(verbose_name='순위')),
+                ('rawg_id', models.IntegerField(help_text='평가 제외 판단용 (payload의 rawg_id)', verbose_name='RAWG ID')),
+                ('score', models.FloatField(default=0, verbose_name='덱 점수')),
+                ('payload', models.JSONField(default=dict, verbose_name='응답 데이터')),
+                ('deck', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='users.onboardingdeck')),
+                ('game', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='onboarding_deck_entries', to='games.game')),
+            ],
+            options={
+                'verbose_name': '온보딩 덱 게임',
+                'verbose_name_plural': '온보딩 덱 게임',
+                'indexes': [models.Index(fields=['deck', 'rawg_id'], name='users_onboa_deck_id_a6eebb_idx'), models.Index(fields=['deck', 'game'], name='users_onboa_deck_id_9fdac8_idx')],
+                'unique_together': {('deck', 'rank')},
+            },
+        ),
+        migrations.CreateModel(
+            name='OnboardingDeckProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('deck_version', models.PositiveIntegerField(default=0, verbose_name='덱 버전')),
+                ('ratings_stamp', models.CharField(blank=True, help_text='평가 수:최근 수정 시각', max_length=50, verbose_name='평가 스탬프')),
+                ('rated_bitmap', models.BinaryField(default=bytes, verbose_name='평가 비트맵')),
+                ('deck', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='progress', to='users.onboardingdeck')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='onboarding_deck_progress', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': '온보딩 덱 진행',
+                'verbose_name_plural': '온보딩 덱 진행',
+                'unique_together': {('user', 'deck')},
+            },
+        ),
+    ]
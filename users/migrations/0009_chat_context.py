@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_onboarding_decks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatContext',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveSmallIntegerField(default=0, verbose_name='형식 버전')),
+                ('steam_id', models.CharField(blank=True, max_length=50, verbose_name='구성 당시 스팀 ID')),
+                ('taste_summary', models.TextField(blank=True, help_text='[평가 데이터] 프롬프트 블록', verbose_name='취향 요약')),
+                ('top_genres', models.JSONField(blank=True, default=list, verbose_name='선호 장르')),
+                ('top_played', models.JSONField(blank=True, default=list, verbose_name='최다 플레이')),
+                ('low_playtime', models.JSONField(blank=True, default=list, help_text='보유했지만 2시간 미만 플레이', verbose_name='찍먹 게임')),
+                ('exclusions', models.JSONField(blank=True, default=list, help_text='평가했거나 보유한 게임 제목', verbose_name='추천 제외')),
+                ('owned_count', models.PositiveIntegerField(default=0, verbose_name='보유 게임 수')),
+                ('rated_count', models.PositiveIntegerField(default=0, verbose_name='평가 수')),
+                ('steam_fetched_at', models.DateTimeField(blank=True, null=True, verbose_name='Steam 조회 시각')),
+                ('build_ms', models.FloatField(default=0, verbose_name='구성 시간(ms)')),
+                ('built_at', models.DateTimeField(auto_now=True, verbose_name='구성 시각')),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='chat_context', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'AI 챗봇 컨텍스트',
+                'verbose_name_plural': 'AI 챗봇 컨텍스트',
+            },
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_chat_context'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChatSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('summary', models.TextField(blank=True, verbose_name='이전 대화 요약')),
+                ('summarized_turns', models.PositiveIntegerField(default=0, verbose_name='요약된 턴 수')),
+                ('next_seq', models.PositiveIntegerField(default=0, verbose_name='다음 턴 순번')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성 시각')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='마지막 대화')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chat_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'AI 챗봇 세션',
+                'verbose_name_plural': 'AI 챗봇 세션',
+            },
+        ),
+        migrations.CreateModel(
+            name='ChatTurn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seq', models.PositiveIntegerField(verbose_name='순번')),
+                ('role', models.CharField(choices=[('user', '사용자'), ('assistant', 'AI')], max_length=10, verbose_name='역할')),
+                ('content', models.TextField(verbose_name='내용')),
+                ('tokens', models.PositiveIntegerField(default=0, verbose_name='추정 토큰 수')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='작성 시각')),
+                ('session', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='turns', to='users.chatsession')),
+            ],
+            options={
+                'verbose_name': 'AI 챗봇 메시지',
+                'verbose_name_plural': 'AI 챗봇 메시지',
+                'ordering': ['session', 'seq'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='chatsession',
+            index=models.Index(fields=['user', '-updated_at'], name='users_chats_user_id_c5a2e5_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='chatturn',
+            unique_together={('session', 'seq')},
+        ),
+    ]
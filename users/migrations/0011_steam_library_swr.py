@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_chat_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='steamlibrarycache',
+            name='recently_played',
+            field=models.JSONField(blank=True, default=list, help_text='최근 2주 플레이 게임 목록 JSON'),
+        ),
+        migrations.AddField(
+            model_name='steamlibrarycache',
+            name='refreshing_until',
+            field=models.DateTimeField(blank=True, help_text='백그라운드 갱신 잠금 만료 시각 (프로세스 간 single-flight)', null=True),
+        ),
+        migrations.AddField(
+            model_name='steamlibrarycache',
+            name='steam_id',
+            field=models.CharField(blank=True, help_text='조회 당시 스팀 ID (연동 계정이 바뀌면 캐시 미스)', max_length=50),
+        ),
+        migrations.AlterField(
+            model_name='steamlibrarycache',
+            name='library_data',
+            field=models.JSONField(default=list, help_text='Steam 라이브러리 게임 목록 JSON (전체, 플레이 시간순)'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_steam_library_swr'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SteamOwnership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('steam_appid', models.PositiveIntegerField(verbose_name='Steam 앱 ID')),
+                ('playtime_forever', models.PositiveIntegerField(default=0, verbose_name='총 플레이 시간(분)')),
+                ('playtime_2weeks', models.PositiveIntegerField(default=0, verbose_name='최근 2주 플레이 시간(분)')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='갱신 시각')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='steam_ownerships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Steam 보유 게임',
+                'verbose_name_plural': 'Steam 보유 게임',
+                'indexes': [models.Index(fields=['steam_appid'], name='users_steam_steam_a_941612_idx'), models.Index(fields=['user', '-playtime_forever'], name='users_steam_user_id_d29946_idx')],
+                'unique_together': {('user', 'steam_appid')},
+            },
+        ),
+    ]
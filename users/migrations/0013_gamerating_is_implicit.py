@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 10:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_steam_ownership'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='gamerating',
+            name='is_implicit',
+            field=models.BooleanField(default=False, verbose_name='플레이 시간 기반 평가'),
+        ),
+    ]
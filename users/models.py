@@ -57,6 +57,7 @@ class SteamLibraryCache(models.Model):
     - 첫 로딩 시 Steam API 호출 후 DB에 저장
     - 이후 요청은 DB에서 즉시 반환 (0.01초)
     - 24시간마다 백그라운드 업데이트
+    - 읽기/갱신은 users/steam_library.py(get_library)에서만 (오래되면 캐시를 먼저 주고 백그라운드 갱신)
     """
     user = models.OneToOneField(
         User, 
@@ -64,8 +65,11 @@ class SteamLibraryCache(models.Model):
         related_name='steam_library_cache'
     )
     
+    steam_id = models.CharField(max_length=50, blank=True, help_text="조회 당시 스팀 ID (연동 계정이 바뀌면 캐시 미스)")
+    
     # Steam 라이브러리 데이터 (JSON)
-    library_data = models.JSONField(default=list, help_text="Steam 라이브러리 게임 목록 JSON")
+    library_data = models.JSONField(default=list, help_text="Steam 라이브러리 게임 목록 JSON (전체, 플레이 시간순)")
+    recently_played = models.JSONField(default=list, blank=True, help_text="최근 2주 플레이 게임 목록 JSON")
     
     # 통계
     total_games = models.IntegerField(default=0)
@@ -74,6 +78,7 @@ class SteamLibraryCache(models.Model):
     # 캐시 관리
     last_updated = models.DateTimeField(auto_now=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    refreshing_until = models.DateTimeField(null=True, blank=True, help_text="백그라운드 갱신 잠금 만료 시각 (프로세스 간 single-flight)")
     
     class Meta:
         verbose_name = "Steam 라이브러리 캐시"
@@ -113,6 +118,8 @@ class GameRating(models.Model):
     
     # 평가 소스 (온보딩 vs 일반)
     is_onboarding = models.BooleanField("온보딩 평가 여부", default=False)
+    # Steam 플레이 시간에서 추정한 평가 (users/steam_ratings.py, 유저가 직접 평가하면 False 로 바뀜)
+    is_implicit = models.BooleanField("플레이 시간 기반 평가", default=False)
     
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -300,3 +307,185 @@ class UserSimilarity(models.Model):
     def __str__(self):
         return f"{self.from_user.username} → {self.to_user.username}: {self.similarity_score:.2f}"
 
+
+
+class OnboardingDeck(models.Model):
+    """
+    온보딩 게임 덱 (배치로 미리 계산된 랭킹 목록)
+    
+    - build_onboarding_decks 커맨드가 로컬 신호(GameRating 수, 좋아요 비율,
+      Steam review_count)로 순위를 계산하여 저장
+    - version: 재구축마다 1씩 증가 (워커/유저별 캐시 무효화 기준)
+    """
+    name = models.CharField("덱 이름", max_length=30, unique=True)
+    version = models.PositiveIntegerField("버전", default=0)
+    size = models.PositiveIntegerField("게임 수", default=0)
+    built_at = models.DateTimeField("생성 시점", auto_now=True)
+    
+    class Meta:
+        verbose_name = "온보딩 덱"
+        verbose_name_plural = "온보딩 덱"
+    
+    def __str__(self):
+        return f"{self.name} v{self.version} ({self.size} games)"
+
+
+class OnboardingDeckEntry(models.Model):
+    """
+    온보딩 덱의 순위별 게임
+    
+    rank(0부터) 인덱스 범위로 페이지를 바로 조회한다.
+    payload 는 온보딩 API 응답 형식 그대로 저장 (title, rawg_id, image ...)
+    """
+    deck = models.ForeignKey(OnboardingDeck, on_delete=models.CASCADE, related_name='entries')
+    rank = models.PositiveIntegerField("순위")
+    game = models.ForeignKey(
+        'games.Game',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='onboarding_deck_entries'
+    )
+    rawg_id = models.IntegerField("RAWG ID", help_text='평가 제외 판단용 (payload의 rawg_id)')
+    score = models.FloatField("덱 점수", default=0)
+    payload = models.JSONField("응답 데이터", default=dict)
+    
+    class Meta:
+        verbose_name = "온보딩 덱 게임"
+        verbose_name_plural = "온보딩 덱 게임"
+        unique_together = ['deck', 'rank']
+        indexes = [
+            models.Index(fields=['deck', 'rawg_id']),
+            models.Index(fields=['deck', 'game']),
+        ]
+    
+    def __str__(self):
+        return f"{self.deck.name}#{self.rank} {self.payload.get('title', '')}"
+
+
+class OnboardingDeckProgress(models.Model):
+    """
+    유저별 덱 평가 비트맵
+    
+    rated_bitmap 의 i번째 비트 = 덱 rank i 게임을 이미 평가했는지.
+    덱 버전/유저 평가 스탬프가 바뀌면 다시 계산한다.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='onboarding_deck_progress')
+    deck = models.ForeignKey(OnboardingDeck, on_delete=models.CASCADE, related_name='progress')
+    deck_version = models.PositiveIntegerField("덱 버전", default=0)
+    ratings_stamp = models.CharField("평가 스탬프", max_length=50, blank=True, help_text='평가 수:최근 수정 시각')
+    rated_bitmap = models.BinaryField("평가 비트맵", default=bytes)
+    
+    class Meta:
+        verbose_name = "온보딩 덱 진행"
+        verbose_name_plural = "온보딩 덱 진행"
+        unique_together = ['user', 'deck']
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.deck.name} v{self.deck_version}"
+
+
+class ChatContext(models.Model):
+    """
+    AI 챗봇 유저별 컨텍스트 (미리 계산된 취향 요약 / Steam 라이브러리 요약 / 제외 목록)
+
+    - users/chat_context.py 에서만 읽고 쓴다. 채팅 1턴은 이 행 조회 1회로 프롬프트를 구성
+    - GameRating 저장/삭제, SteamLibraryCache 갱신 시 행 삭제로 무효화 (users/signals.py)
+    - version: 저장 형식 버전 (CONTEXT_VERSION 과 다르면 재구성)
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='chat_context')
+    version = models.PositiveSmallIntegerField("형식 버전", default=0)
+    steam_id = models.CharField("구성 당시 스팀 ID", max_length=50, blank=True)
+    taste_summary = models.TextField("취향 요약", blank=True, help_text='[평가 데이터] 프롬프트 블록')
+    top_genres = models.JSONField("선호 장르", default=list, blank=True)
+    top_played = models.JSONField("최다 플레이", default=list, blank=True)
+    low_playtime = models.JSONField("찍먹 게임", default=list, blank=True, help_text='보유했지만 2시간 미만 플레이')
+    exclusions = models.JSONField("추천 제외", default=list, blank=True, help_text='평가했거나 보유한 게임 제목')
+    owned_count = models.PositiveIntegerField("보유 게임 수", default=0)
+    rated_count = models.PositiveIntegerField("평가 수", default=0)
+    steam_fetched_at = models.DateTimeField("Steam 조회 시각", null=True, blank=True)
+    build_ms = models.FloatField("구성 시간(ms)", default=0)
+    built_at = models.DateTimeField("구성 시각", auto_now=True)
+
+    class Meta:
+        verbose_name = "AI 챗봇 컨텍스트"
+        verbose_name_plural = "AI 챗봇 컨텍스트"
+
+    def __str__(self):
+        return f"{self.user.username} v{self.version} (평가 {self.rated_count}, 보유 {self.owned_count})"
+
+
+class ChatSession(models.Model):
+    """
+    AI 챗봇 대화 세션 (서버 저장)
+
+    - users/chat_session.py 에서만 읽고 쓴다. 클라이언트는 session_id 만 보내고 대화 기록은 서버가 보관
+    - 최근 턴(ChatTurn)의 추정 토큰 합이 예산(CHAT_HISTORY_TOKEN_BUDGET)을 넘으면
+      오래된 턴을 summary 에 접어 넣고 삭제 (롤링 요약)
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='chat_sessions')
+    summary = models.TextField("이전 대화 요약", blank=True)
+    summarized_turns = models.PositiveIntegerField("요약된 턴 수", default=0)
+    next_seq = models.PositiveIntegerField("다음 턴 순번", default=0)
+    created_at = models.DateTimeField("생성 시각", auto_now_add=True)
+    updated_at = models.DateTimeField("마지막 대화", auto_now=True)
+
+    class Meta:
+        verbose_name = "AI 챗봇 세션"
+        verbose_name_plural = "AI 챗봇 세션"
+        indexes = [
+            models.Index(fields=['user', '-updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} #{self.pk} ({self.next_seq}턴, 요약 {self.summarized_turns}턴)"
+
+
+class ChatTurn(models.Model):
+    """AI 챗봇 세션의 메시지 1개 (요약에 접힌 턴은 삭제됨)"""
+    ROLE_CHOICES = [
+        ('user', '사용자'),
+        ('assistant', 'AI'),
+    ]
+
+    session = models.ForeignKey(ChatSession, on_delete=models.CASCADE, related_name='turns')
+    seq = models.PositiveIntegerField("순번")
+    role = models.CharField("역할", max_length=10, choices=ROLE_CHOICES)
+    content = models.TextField("내용")
+    tokens = models.PositiveIntegerField("추정 토큰 수", default=0)
+    created_at = models.DateTimeField("작성 시각", auto_now_add=True)
+
+    class Meta:
+        verbose_name = "AI 챗봇 메시지"
+        verbose_name_plural = "AI 챗봇 메시지"
+        unique_together = ('session', 'seq')
+        ordering = ['session', 'seq']
+
+    def __str__(self):
+        return f"#{self.session_id}-{self.seq} {self.role}: {self.content[:30]}"
+
+
+class SteamOwnership(models.Model):
+    """
+    유저별 Steam 보유 게임 (정규화, 앱 ID 기준)
+
+    - SteamLibraryCache 갱신 시 이전 조회와 비교해 bulk insert/update/delete (users/steam_ownership.py)
+    - 보유 게임 제외는 앱 ID 조인/집합 연산, "우리 유저가 많이 가진 게임"은 steam_appid GROUP BY 한 번
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='steam_ownerships')
+    steam_appid = models.PositiveIntegerField("Steam 앱 ID")
+    playtime_forever = models.PositiveIntegerField("총 플레이 시간(분)", default=0)
+    playtime_2weeks = models.PositiveIntegerField("최근 2주 플레이 시간(분)", default=0)
+    updated_at = models.DateTimeField("갱신 시각", auto_now=True)
+
+    class Meta:
+        verbose_name = "Steam 보유 게임"
+        verbose_name_plural = "Steam 보유 게임"
+        unique_together = ('user', 'steam_appid')
+        indexes = [
+            models.Index(fields=['steam_appid']),
+            models.Index(fields=['user', '-playtime_forever']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - app {self.steam_appid} ({self.playtime_forever}분)"
@@ -14,11 +14,12 @@ Naver Developers 설정:
 """
 
 import os
-import requests
 import secrets
 from urllib.parse import urlencode
 from django.conf import settings
 
+from games import http_client
+
 # Naver OAuth2 Endpoints
 NAVER_AUTH_URL = "https://nid.naver.com/oauth2.0/authorize"
 NAVER_TOKEN_URL = "https://nid.naver.com/oauth2.0/token"
@@ -87,7 +88,7 @@ def exchange_code_for_tokens(code, state):
         'grant_type': 'authorization_code',
     }
     
-    response = requests.get(NAVER_TOKEN_URL, params=params, timeout=10)
+    response = http_client.get(NAVER_TOKEN_URL, params=params, retries=0)
     
     if response.status_code != 200:
         raise Exception(f"Token 교환 실패: {response.text}")
@@ -117,7 +118,7 @@ def get_naver_user_info(access_token):
         }
     """
     headers = {'Authorization': f'Bearer {access_token}'}
-    response = requests.get(NAVER_USERINFO_URL, headers=headers, timeout=10)
+    response = http_client.get(NAVER_USERINFO_URL, headers=headers)
     
     if response.status_code != 200:
         raise Exception(f"사용자 정보 조회 실패: {response.text}")
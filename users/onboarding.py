@@ -19,6 +19,8 @@ from scipy.sparse import csr_matrix
 from sklearn.metrics.pairwise import cosine_similarity
 import logging
 
+from .timing import stage
+
 logger = logging.getLogger(__name__)
 
 # JSON에서 온보딩 게임 로드 (캐시)
@@ -27,7 +29,12 @@ _korean_games_cache = None
 
 
 def clear_korean_games_cache():
-    """한국 게임 캐시 무효화 (데이터 업데이트 후 호출)"""
+    """
+    현재 프로세스의 한국 게임 캐시 무효화
+    
+    ※ 다른 워커까지 무효화하려면 onboarding_decks.build_korean_deck() 로
+      덱을 재생성 (버전 증가) 하세요.
+    """
     global _korean_games_cache
     _korean_games_cache = None
     logger.info("Korean games cache cleared")
@@ -35,7 +42,34 @@ def clear_korean_games_cache():
 
 def load_korean_games_from_db():
     """
-    DB에서 한국 유명 게임 목록 로드 (온보딩 '아니요' 선택 시 사용)
+    한국 유명 게임 목록 로드 (온보딩 '아니요' 선택 시 사용)
+    
+    add_korean_games / sync_korean_games 가 저장한 'korean' 덱을 순서대로 반환.
+    워커별 캐시는 덱 버전과 함께 보관하므로, 덱이 재생성되면 모든 워커가
+    다음 요청에서 함께 갱신된다. 덱이 아직 없으면 직접 계산 (레거시).
+    """
+    global _korean_games_cache
+    from .onboarding_decks import DECK_KOREAN, get_deck
+    
+    deck = get_deck(DECK_KOREAN)
+    version = deck.version if deck else None
+    
+    if _korean_games_cache is not None and _korean_games_cache[0] == version:
+        return _korean_games_cache[1]
+    
+    if deck:
+        games = list(deck.entries.order_by('rank').values_list('payload', flat=True))
+    else:
+        games = [payload for _, payload in select_korean_featured_games()]
+    
+    _korean_games_cache = (version, games)
+    logger.info(f"Loaded {len(games)} Korean games for onboarding (deck v{version})")
+    return games
+
+
+def select_korean_featured_games():
+    """
+    DB에서 한국 유명 게임 선별 (배치용 - 덱 생성 시 호출)
     korean 태그가 있거나 한국어 제목이 포함된 게임
     
     개선사항:
@@ -43,12 +77,10 @@ def load_korean_games_from_db():
     - 정확한 제목 매칭 (스핀오프 게임 제외)
     - RAWG 데이터가 있는 게임 우선
     - 태그 정보도 함께 반환
-    """
-    global _korean_games_cache
-    
-    if _korean_games_cache is not None:
-        return _korean_games_cache
     
+    Returns:
+        list: [(game_id, 온보딩 응답 dict), ...] (노출 순서)
+    """
     from games.models import Game
     
     # 제외할 게임 제목 패턴 (스핀오프, 잘못 매칭되는 게임들)
@@ -166,7 +198,7 @@ def load_korean_games_from_db():
                 if genre_tags:
                     genre = ', '.join(genre_tags[:3])
             
-            formatted_games.append({
+            formatted_games.append((game.id, {
                 'title': game.title,
                 'rawg_id': game.rawg_id or game.id,  # rawg_id 없으면 DB id 사용
                 'steam_app_id': game.steam_appid,
@@ -176,11 +208,10 @@ def load_korean_games_from_db():
                 'tag_slugs': tag_slugs,  # 태그 slug 리스트 추가
                 'description': game.description[:100] if game.description else '',
                 'metacritic': game.metacritic_score,
-            })
+            }))
         
-        _korean_games_cache = formatted_games
-        logger.info(f"Loaded {len(formatted_games)} Korean games from DB for onboarding")
-        return _korean_games_cache
+        logger.info(f"Selected {len(formatted_games)} Korean featured games from DB")
+        return formatted_games
         
     except Exception as e:
         logger.error(f"Error loading Korean games from DB: {e}")
@@ -256,29 +287,64 @@ ONBOARDING_STEPS = [
     {'name': '인기 게임', 'genre': 'popular', 'description': '평가가 많은 인기 게임들이에요. 아는 게임을 평가해주세요!'},
 ]
 
+# 한국 게임 모드 (Steam 미경험자용)
+KOREAN_STEP_INFO = {
+    'name': '한국 인기 게임',
+    'genre': 'korean',
+    'description': '국내에서 유행했던 게임들이에요. 플레이해본 적 있는 게임을 평가해주세요!'
+}
 
-def get_onboarding_games(step=0, exclude_rated=None, page=1, per_page=8, korean_mode=False):
+
+def get_onboarding_games(step=0, exclude_rated=None, page=1, per_page=8, korean_mode=False, user=None):
     """
     온보딩 단계별 게임 목록 반환 (페이지네이션 지원)
     
     Args:
         step: 현재 단계 (0만 사용)
-        exclude_rated: 이미 평가한 게임 ID 리스트
+        exclude_rated: 이미 평가한 게임 ID 리스트 (user 미지정 시 사용)
         page: 현재 페이지 (1부터 시작)
         per_page: 페이지당 게임 수 (기본값: 8 - 2행x4열)
         korean_mode: True면 한국 유명 게임 목록 사용 (Steam 미경험자용)
+        user: 지정하면 사전 계산된 덱 + 평가 비트맵으로 페이지 조회
     
     Returns:
         dict: {games: [...], step_info: {...}, pagination: {...}}
     """
+    from .onboarding_decks import DECK_POPULAR, DECK_KOREAN, get_deck, get_rated_bitmap, get_deck_page
+    
+    # 사전 계산된 덱이 있으면 rank 범위 조회
+    # (popular: build_onboarding_decks, korean: add_korean_games / sync_korean_games)
+    if user is not None and (korean_mode or step < len(ONBOARDING_STEPS)):
+        deck = get_deck(DECK_KOREAN if korean_mode else DECK_POPULAR)
+        if deck:
+            bitmap = get_rated_bitmap(user, deck)
+            games, page, total_pages, total_games = get_deck_page(deck, bitmap, page, per_page)
+            return {
+                'games': games,
+                'step_info': KOREAN_STEP_INFO if korean_mode else ONBOARDING_STEPS[step],
+                'current_step': step,
+                'total_steps': len(ONBOARDING_STEPS),
+                'is_complete': False,
+                'korean_mode': korean_mode,
+                'pagination': {
+                    'current_page': page,
+                    'total_pages': total_pages,
+                    'per_page': per_page,
+                    'total_games': total_games,
+                    'has_prev': page > 1,
+                    'has_next': page < total_pages
+                }
+            }
+    
+    # 덱이 없으면 기존 방식 (평가한 게임 rawg_id 목록으로 제외)
+    if exclude_rated is None and user is not None:
+        from .models import GameRating
+        exclude_rated = list(GameRating.objects.filter(user=user).values_list('game__rawg_id', flat=True))
+    
     # 한국 게임 모드면 DB에서 로드
     if korean_mode:
         games = load_korean_games_from_db()
-        step_info = {
-            'name': '한국 인기 게임',
-            'genre': 'korean',
-            'description': '국내에서 유행했던 게임들이에요. 플레이해본 적 있는 게임을 평가해주세요!'
-        }
+        step_info = KOREAN_STEP_INFO
     else:
         # JSON에서 게임 로드 (기존 Steam 게임)
         onboarding_games = load_onboarding_games_from_json()
@@ -561,13 +627,15 @@ def get_recommendations_for_user(user, limit=50):
         return result
     
     # JSON 인기 게임 로드 (폴백용)
-    json_data = load_onboarding_games_from_json()
-    popular_from_json = json_data.get('popular', [])
+    with stage('popular_json'):
+        json_data = load_onboarding_games_from_json()
+        popular_from_json = json_data.get('popular', [])
     
     # 사용자의 평가 데이터 가져오기
-    user_ratings = GameRating.objects.filter(user=user, score__gt=0)
-    rated_game_ids = list(user_ratings.values_list('game_id', flat=True))
-    rated_steam_ids = list(user_ratings.values_list('game__rawg_id', flat=True))
+    with stage('user_ratings'):
+        user_ratings = GameRating.objects.filter(user=user, score__gt=0)
+        rated_game_ids = list(user_ratings.values_list('game_id', flat=True))
+        rated_steam_ids = list(user_ratings.values_list('game__rawg_id', flat=True))
     
     # 1. 평가 데이터가 없으면 -> JSON 인기 게임 반환 (빠름!)
     if len(rated_game_ids) == 0:
@@ -593,111 +661,113 @@ def get_recommendations_for_user(user, limit=50):
     # 3. Item-Based CF 시도 (DB 기반) - 정규화된 스키마 사용
     # ※ 새 스키마: game_a_id < game_b_id 로 정규화되어 저장됨
     try:
-        # 유저가 좋아한 게임의 평점을 가중치로 사용
-        liked_ratings = {r.game_id: r.score for r in user_ratings.filter(score__gte=3.5)}
-        liked_game_ids = list(liked_ratings.keys())
-        
-        # 각 후보 게임에 대해 가중 점수 계산
-        # weighted_score = Σ(similarity * normalized_rating) / Σ(normalized_rating)
-        from collections import defaultdict
-        candidate_scores = defaultdict(lambda: {'weighted_sum': 0, 'weight_sum': 0})
-        
-        # 평점 정규화 함수 (비선형 → 선형)
-        def normalize_rating(score):
-            """3.5 → 0.7, 5 → 1.0"""
-            return {3.5: 0.7, 5: 1.0}.get(score, score / 5.0)
-        
-        # 정규화된 스키마에서는 양방향 쿼리 필요:
-        # 1) liked_game이 game_a에 있는 경우 → game_b가 추천 후보
-        # 2) liked_game이 game_b에 있는 경우 → game_a가 추천 후보
-        
-        # 쿼리 1: liked_game이 game_a 위치
-        similarities_a = GameSimilarity.objects.filter(
-            game_a_id__in=liked_game_ids,
-            similarity_rank__lte=30  # Top-K 최적화
-        ).exclude(
-            game_b_id__in=rated_game_ids
-        ).values('game_a_id', 'game_b_id', 'similarity_score')
-        
-        for sim in similarities_a:
-            liked_game_id = sim['game_a_id']
-            candidate_game_id = sim['game_b_id']
-            similarity = sim['similarity_score']
-            user_rating = normalize_rating(liked_ratings.get(liked_game_id, 3.5))
-            
-            candidate_scores[candidate_game_id]['weighted_sum'] += similarity * user_rating
-            candidate_scores[candidate_game_id]['weight_sum'] += user_rating
-        
-        # 쿼리 2: liked_game이 game_b 위치
-        similarities_b = GameSimilarity.objects.filter(
-            game_b_id__in=liked_game_ids,
-            similarity_rank__lte=30
-        ).exclude(
-            game_a_id__in=rated_game_ids
-        ).values('game_a_id', 'game_b_id', 'similarity_score')
-        
-        for sim in similarities_b:
-            liked_game_id = sim['game_b_id']
-            candidate_game_id = sim['game_a_id']
-            similarity = sim['similarity_score']
-            user_rating = normalize_rating(liked_ratings.get(liked_game_id, 3.5))
-            
-            candidate_scores[candidate_game_id]['weighted_sum'] += similarity * user_rating
-            candidate_scores[candidate_game_id]['weight_sum'] += user_rating
-        
-        # 가중 평균 계산 및 정렬
-        scored_games = []
-        for game_id, scores in candidate_scores.items():
-            if scores['weight_sum'] > 0:
-                weighted_avg = scores['weighted_sum'] / scores['weight_sum']
-                scored_games.append((game_id, weighted_avg))
-        
-        scored_games.sort(key=lambda x: x[1], reverse=True)
-        top_game_ids = [g[0] for g in scored_games[:limit]]
-        
-        if top_game_ids:
-            games = Game.objects.filter(id__in=top_game_ids)
-            # 정렬 순서 유지
-            game_dict = {g.id: g for g in games}
-            ordered_games = [game_dict[gid] for gid in top_game_ids if gid in game_dict]
-            db_recommendations = format_db_games(ordered_games, 85)
-            
-            if len(db_recommendations) >= limit // 2:
-                return {
-                    'needs_onboarding': False,
-                    'recommendations': db_recommendations,
-                    'method': 'item_based_cf',
-                    'message': f'좋아하신 게임과 비슷한 게임을 추천해드려요!'
-                }
+        with stage('item_cf'):
+            # 유저가 좋아한 게임의 평점을 가중치로 사용
+            liked_ratings = {r.game_id: r.score for r in user_ratings.filter(score__gte=3.5)}
+            liked_game_ids = list(liked_ratings.keys())
+            
+            # 각 후보 게임에 대해 가중 점수 계산
+            # weighted_score = Σ(similarity * normalized_rating) / Σ(normalized_rating)
+            from collections import defaultdict
+            candidate_scores = defaultdict(lambda: {'weighted_sum': 0, 'weight_sum': 0})
+            
+            # 평점 정규화 함수 (비선형 → 선형)
+            def normalize_rating(score):
+                """3.5 → 0.7, 5 → 1.0"""
+                return {3.5: 0.7, 5: 1.0}.get(score, score / 5.0)
+            
+            # 정규화된 스키마에서는 양방향 쿼리 필요:
+            # 1) liked_game이 game_a에 있는 경우 → game_b가 추천 후보
+            # 2) liked_game이 game_b에 있는 경우 → game_a가 추천 후보
+            
+            # 쿼리 1: liked_game이 game_a 위치
+            similarities_a = GameSimilarity.objects.filter(
+                game_a_id__in=liked_game_ids,
+                similarity_rank__lte=30  # Top-K 최적화
+            ).exclude(
+                game_b_id__in=rated_game_ids
+            ).values('game_a_id', 'game_b_id', 'similarity_score')
+            
+            for sim in similarities_a:
+                liked_game_id = sim['game_a_id']
+                candidate_game_id = sim['game_b_id']
+                similarity = sim['similarity_score']
+                user_rating = normalize_rating(liked_ratings.get(liked_game_id, 3.5))
+                
+                candidate_scores[candidate_game_id]['weighted_sum'] += similarity * user_rating
+                candidate_scores[candidate_game_id]['weight_sum'] += user_rating
+            
+            # 쿼리 2: liked_game이 game_b 위치
+            similarities_b = GameSimilarity.objects.filter(
+                game_b_id__in=liked_game_ids,
+                similarity_rank__lte=30
+            ).exclude(
+                game_a_id__in=rated_game_ids
+            ).values('game_a_id', 'game_b_id', 'similarity_score')
+            
+            for sim in similarities_b:
+                liked_game_id = sim['game_b_id']
+                candidate_game_id = sim['game_a_id']
+                similarity = sim['similarity_score']
+                user_rating = normalize_rating(liked_ratings.get(liked_game_id, 3.5))
+                
+                candidate_scores[candidate_game_id]['weighted_sum'] += similarity * user_rating
+                candidate_scores[candidate_game_id]['weight_sum'] += user_rating
+            
+            # 가중 평균 계산 및 정렬
+            scored_games = []
+            for game_id, scores in candidate_scores.items():
+                if scores['weight_sum'] > 0:
+                    weighted_avg = scores['weighted_sum'] / scores['weight_sum']
+                    scored_games.append((game_id, weighted_avg))
+            
+            scored_games.sort(key=lambda x: x[1], reverse=True)
+            top_game_ids = [g[0] for g in scored_games[:limit]]
+            
+            if top_game_ids:
+                games = Game.objects.filter(id__in=top_game_ids)
+                # 정렬 순서 유지
+                game_dict = {g.id: g for g in games}
+                ordered_games = [game_dict[gid] for gid in top_game_ids if gid in game_dict]
+                db_recommendations = format_db_games(ordered_games, 85)
+                
+                if len(db_recommendations) >= limit // 2:
+                    return {
+                        'needs_onboarding': False,
+                        'recommendations': db_recommendations,
+                        'method': 'item_based_cf',
+                        'message': f'좋아하신 게임과 비슷한 게임을 추천해드려요!'
+                    }
     except Exception as e:
         logger.error(f"Item-based CF failed: {e}")
     
     # 4. 장르 기반 추천 시도 (Content-Based)
     try:
-        liked_game_objs = Game.objects.filter(id__in=liked_games)
-        liked_genres = set()
-        for game in liked_game_objs:
-            if game.genre:
-                liked_genres.update(game.genre.split(','))
-        
-        if liked_genres:
-            genre_filter = Q()
-            for genre in liked_genres:
-                genre_filter |= Q(genre__icontains=genre.strip())
-            
-            similar_by_genre = Game.objects.filter(genre_filter).exclude(
-                id__in=rated_game_ids
-            ).order_by('-metacritic_score')[:limit]
-            
-            db_recommendations = format_db_games(similar_by_genre, 75)
-            
-            if len(db_recommendations) >= limit // 2:
-                return {
-                    'needs_onboarding': False,
-                    'recommendations': db_recommendations,
-                    'method': 'content_based',
-                    'message': f'좋아하시는 장르({", ".join(list(liked_genres)[:3])})의 게임을 추천해드려요!'
-                }
+        with stage('content_based'):
+            from games.models import GameGenre
+            from games.genre_index import get_games_by_genres
+            
+            # 정규화 장르 인덱스 사용 (genre__icontains OR 풀스캔 대신 slug 동등 조인)
+            liked_genres = set(
+                GameGenre.objects.filter(game_id__in=liked_games).values_list('name', flat=True)
+            )
+            
+            if liked_genres:
+                similar_by_genre = get_games_by_genres(
+                    liked_genres,
+                    exclude_ids=rated_game_ids,
+                    limit=limit
+                )
+                
+                db_recommendations = format_db_games(similar_by_genre, 75)
+                
+                if len(db_recommendations) >= limit // 2:
+                    return {
+                        'needs_onboarding': False,
+                        'recommendations': db_recommendations,
+                        'method': 'content_based',
+                        'message': f'좋아하시는 장르({", ".join(list(liked_genres)[:3])})의 게임을 추천해드려요!'
+                    }
     except Exception as e:
         logger.error(f"Content-based failed: {e}")
     
@@ -710,7 +780,7 @@ def get_recommendations_for_user(user, limit=50):
     }
 
 
-def save_user_rating(user, game_id, score, is_onboarding=False):
+def save_user_rating(user, game_id, score, is_onboarding=False, game=None):
     """
     사용자 평가 저장
     
@@ -719,26 +789,26 @@ def save_user_rating(user, game_id, score, is_onboarding=False):
         game_id: 게임 ID (RAWG ID 또는 DB ID)
         score: 점수 (-1, 0, 3.5, 5)
         is_onboarding: 온보딩 평가 여부
+        game: 이미 찾은 Game 객체 (주면 game_id 해석을 건너뜀)
     
     Returns:
         GameRating 객체
     """
     from .models import GameRating, OnboardingStatus
     from games.models import Game
-    
-    # 게임 찾기 (RAWG ID로 먼저 시도)
-    try:
-        game = Game.objects.get(rawg_id=game_id)
-    except Game.DoesNotExist:
-        try:
-            game = Game.objects.get(id=game_id)
-        except Game.DoesNotExist:
-            # 게임이 DB에 없으면 생성 (최소 정보만)
-            game = Game.objects.create(
-                rawg_id=game_id,
-                title=f"Game {game_id}",
-                genre="Unknown"
-            )
+    from games.resolver import PK, RAWG, resolve_game
+    
+    # 게임 찾기 (RAWG ID → DB ID 우선순위로 한 번에, 중복 rawg_id 면 pk 가 가장 작은 게임)
+    # 없으면 만드는 경로라 negative cache 는 쓰지 않음
+    if game is None:
+        game = resolve_game(game_id, spaces=(RAWG, PK), use_unknown_cache=False)
+    if game is None:
+        # 게임이 DB에 없으면 생성 (최소 정보만)
+        game = Game.objects.create(
+            rawg_id=game_id,
+            title=f"Game {game_id}",
+            genre="Unknown"
+        )
     
     # 평가 생성 또는 업데이트
     rating, created = GameRating.objects.update_or_create(
@@ -746,7 +816,8 @@ def save_user_rating(user, game_id, score, is_onboarding=False):
         game=game,
         defaults={
             'score': score,
-            'is_onboarding': is_onboarding
+            'is_onboarding': is_onboarding,
+            'is_implicit': False
         }
     )
     
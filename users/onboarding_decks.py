@@ -0,0 +1,322 @@
+"""
+온보딩 게임 덱 (사전 계산 랭킹 + 유저별 평가 비트맵)
+
+기존 방식:
+    요청마다 JSON 500개 목록을 복사 → 평가한 게임 제외 → 슬라이싱
+
+덱 방식:
+    1. build_onboarding_decks 커맨드가 로컬 신호로 순위를 계산해
+       OnboardingDeckEntry(rank 0..N-1) 에 저장
+    2. 유저가 평가한 덱 게임은 rated_bitmap 비트로 표시 (평가 변경 시에만 재계산)
+    3. 페이지 요청 시 비트맵에서 '평가 안 한' rank 만 골라 rank__in 으로 조회
+       → 덱 크기와 상관없이 페이지당 쿼리 수 일정
+
+점수 (calculate_deck_score):
+    popularity = log(1 + Steam review_count) + 2 * log(1 + 우리 유저 평가 수)
+    quality    = Steam 평점 비율 / 우리 유저 좋아요 비율 (베이지안 평활) 평균
+    score      = popularity * quality
+"""
+
+import json
+import logging
+import math
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+logger = logging.getLogger(__name__)
+
+DECK_POPULAR = 'popular'
+DECK_KOREAN = 'korean'
+DECK_SIZE = 500
+
+
+# ============================================================================
+# 덱 생성 (배치)
+# ============================================================================
+
+def calculate_deck_score(review_count=0, steam_rating=0, local_ratings=0, local_likes=0, local_dislikes=0):
+    """덱 정렬 점수 (클수록 앞 순위)"""
+    like_ratio = (local_likes + 1) / (local_likes + local_dislikes + 2)
+    steam_ratio = steam_rating / 100 if steam_rating else like_ratio
+    quality = (steam_ratio + like_ratio) / 2 if local_ratings else steam_ratio
+    popularity = math.log1p(review_count or 0) + 2 * math.log1p(local_ratings or 0)
+    return round(popularity * quality, 4)
+
+
+def get_game_image(game):
+    """DB 게임 이미지 (우선순위: static /img/ > Steam CDN > background_image > image_url)"""
+    if game.image_url and game.image_url.startswith('/img/'):
+        return '/static' + game.image_url
+    if game.background_image and game.background_image.startswith('/img/'):
+        return '/static' + game.background_image
+    if game.steam_appid:
+        return f'https://cdn.akamai.steamstatic.com/steam/apps/{game.steam_appid}/header.jpg'
+    return game.background_image or game.image_url or ''
+
+
+def save_deck(name, rows):
+    """
+    덱 전체 교체 저장 (버전 +1)
+
+    Args:
+        rows: 순위 순서의 [{'game_id', 'rawg_id', 'score', 'payload'}, ...]
+    """
+    from .models import OnboardingDeck, OnboardingDeckEntry
+
+    with transaction.atomic():
+        deck, _ = OnboardingDeck.objects.select_for_update().get_or_create(name=name)
+        OnboardingDeckEntry.objects.filter(deck=deck).delete()
+        OnboardingDeckEntry.objects.bulk_create([
+            OnboardingDeckEntry(
+                deck=deck,
+                rank=rank,
+                game_id=row.get('game_id'),
+                rawg_id=row['rawg_id'],
+                score=row.get('score', 0),
+                payload=row['payload'],
+            )
+            for rank, row in enumerate(rows)
+        ], batch_size=500)
+        deck.version += 1
+        deck.size = len(rows)
+        deck.save()
+
+    logger.info(f"Saved onboarding deck '{name}' v{deck.version} ({deck.size} games)")
+    return deck
+
+
+def build_popular_deck(size=DECK_SIZE, min_steam_rating=75, min_reviews=500, min_local_ratings=3):
+    """
+    인기 게임 덱 계산 (Steam 세일 JSON + 우리 유저 GameRating)
+
+    Returns:
+        OnboardingDeck
+    """
+    from games.models import Game
+    from .models import GameRating
+
+    json_path = os.path.join(settings.BASE_DIR, 'users', 'steam_sale_dataset_fast.json')
+    try:
+        with open(json_path, 'r', encoding='utf-8') as f:
+            sale_data = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.error(f"Error loading sale dataset for onboarding deck: {e}")
+        sale_data = []
+
+    # 1. 로컬 평가 신호 (게임별 평가 수 / 좋아요 / 싫어요)
+    local_stats = {
+        row['game_id']: row
+        for row in GameRating.objects.values('game_id').annotate(
+            total=Count('id'),
+            likes=Count('id', filter=Q(score__gte=3.5)),
+            dislikes=Count('id', filter=Q(score__lt=0)),
+        )
+    }
+
+    # 2. JSON 게임 ↔ DB 게임 매칭 (steam_appid 우선, 그 다음 rawg_id)
+    quality_json = [
+        g for g in sale_data
+        if g.get('steam_rating', 0) >= min_steam_rating and g.get('review_count', 0) >= min_reviews
+    ]
+    app_ids = {int(g['steam_app_id']) for g in quality_json if str(g.get('steam_app_id', '')).isdigit()}
+    rawg_ids = {g['rawg_id'] for g in quality_json if g.get('rawg_id')}
+    db_by_appid, db_by_rawg = {}, {}
+    for game_id, steam_appid, rawg_id in Game.objects.filter(
+        Q(steam_appid__in=app_ids) | Q(rawg_id__in=rawg_ids)
+    ).values_list('id', 'steam_appid', 'rawg_id'):
+        if steam_appid:
+            db_by_appid[steam_appid] = game_id
+        if rawg_id:
+            db_by_rawg.setdefault(rawg_id, game_id)
+
+    candidates = {}  # rawg_id → row
+    for g in quality_json:
+        steam_app_id = g.get('steam_app_id')
+        if not str(steam_app_id or '').isdigit():
+            continue
+        rawg_id = g.get('rawg_id') or int(steam_app_id)
+        if rawg_id in candidates:
+            continue
+        game_id = db_by_appid.get(int(steam_app_id)) or (db_by_rawg.get(g['rawg_id']) if g.get('rawg_id') else None)
+        stats = local_stats.get(game_id, {})
+        candidates[rawg_id] = {
+            'game_id': game_id,
+            'rawg_id': rawg_id,
+            'score': calculate_deck_score(
+                review_count=g.get('review_count', 0),
+                steam_rating=g.get('steam_rating', 0),
+                local_ratings=stats.get('total', 0),
+                local_likes=stats.get('likes', 0),
+                local_dislikes=stats.get('dislikes', 0),
+            ),
+            'payload': {
+                'title': g['title'],
+                'rawg_id': rawg_id,
+                'rawg_slug': g.get('rawg_slug', ''),
+                'steam_app_id': steam_app_id,
+                'image': g.get('thumbnail', ''),
+                'steam_rating': g.get('steam_rating', 0),
+                'review_count': g.get('review_count', 0),
+            },
+        }
+
+    # 3. JSON 에 없지만 우리 유저가 많이 평가한 DB 게임
+    matched_game_ids = {row['game_id'] for row in candidates.values() if row['game_id']}
+    local_ids = [
+        game_id for game_id, stats in local_stats.items()
+        if stats['total'] >= min_local_ratings and game_id not in matched_game_ids
+    ]
+    for game in Game.objects.filter(id__in=local_ids):
+        rawg_id = game.rawg_id or game.id
+        image = get_game_image(game)
+        if rawg_id in candidates or not image:
+            continue
+        stats = local_stats[game.id]
+        candidates[rawg_id] = {
+            'game_id': game.id,
+            'rawg_id': rawg_id,
+            'score': calculate_deck_score(
+                local_ratings=stats['total'],
+                local_likes=stats['likes'],
+                local_dislikes=stats['dislikes'],
+            ),
+            'payload': {
+                'title': game.title,
+                'rawg_id': rawg_id,
+                'rawg_slug': '',
+                'steam_app_id': str(game.steam_appid) if game.steam_appid else None,
+                'image': image,
+                'steam_rating': 0,
+                'review_count': 0,
+            },
+        }
+
+    ranked = sorted(candidates.values(), key=lambda row: row['score'], reverse=True)[:size]
+    return save_deck(DECK_POPULAR, ranked)
+
+
+def build_korean_deck():
+    """
+    한국 인기 게임 덱 생성 (add_korean_games / sync_korean_games 마지막 단계)
+
+    태그/한글 제목 정규식/제목 매칭 쿼리는 여기서만 실행되고,
+    API 는 저장된 순서를 그대로 읽는다. 버전이 올라가므로 모든 워커의
+    load_korean_games_from_db 캐시가 함께 무효화된다.
+    """
+    from .models import OnboardingDeck
+    from .onboarding import select_korean_featured_games, clear_korean_games_cache
+
+    selected = select_korean_featured_games()
+    if not selected:
+        # 선정 결과가 비면 (DB 정리 중 / 매칭 실패) 기존 덱을 빈 덱으로 덮어쓰지 않음
+        existing = OnboardingDeck.objects.filter(name=DECK_KOREAN).first()
+        if existing is not None:
+            logger.warning(f"No Korean featured games selected, keeping onboarding deck v{existing.version}")
+            return existing
+    rows = [
+        {
+            'game_id': game_id,
+            'rawg_id': payload['rawg_id'],
+            'score': float(len(selected) - rank),
+            'payload': payload,
+        }
+        for rank, (game_id, payload) in enumerate(selected)
+    ]
+    deck = save_deck(DECK_KOREAN, rows)
+    clear_korean_games_cache()
+    return deck
+
+
+# ============================================================================
+# 덱 조회 (API)
+# ============================================================================
+
+def get_deck(name):
+    """크기가 0보다 큰 덱만 반환 (없으면 None → 레거시 경로 사용)"""
+    from .models import OnboardingDeck
+
+    return OnboardingDeck.objects.filter(name=name, size__gt=0).first()
+
+
+def get_rated_bitmap(user, deck):
+    """
+    유저의 덱 평가 비트맵 (bit i = rank i 평가 여부)
+
+    덱 버전과 유저 평가 스탬프(평가 수 + 최근 수정 시각)가 그대로면 저장된 비트맵 재사용
+    """
+    from .models import GameRating, OnboardingDeckEntry, OnboardingDeckProgress
+
+    ratings = GameRating.objects.filter(user=user)
+    agg = ratings.aggregate(total=Count('id'), last=Max('updated_at'))
+    stamp = f"{agg['total']}:{agg['last'].timestamp() if agg['last'] else 0}"
+
+    progress = OnboardingDeckProgress.objects.filter(user=user, deck=deck).first()
+    if progress and progress.deck_version == deck.version and progress.ratings_stamp == stamp:
+        return bytes(progress.rated_bitmap)
+
+    bitmap = bytearray((deck.size + 7) // 8)
+    if agg['total']:
+        ranks = OnboardingDeckEntry.objects.filter(deck=deck).filter(
+            Q(game_id__in=ratings.values('game_id')) |
+            Q(rawg_id__in=ratings.exclude(game__rawg_id=None).values('game__rawg_id'))
+        ).values_list('rank', flat=True)
+        for rank in ranks:
+            bitmap[rank // 8] |= 1 << (rank % 8)
+
+    OnboardingDeckProgress.objects.update_or_create(
+        user=user,
+        deck=deck,
+        defaults={
+            'deck_version': deck.version,
+            'ratings_stamp': stamp,
+            'rated_bitmap': bytes(bitmap),
+        }
+    )
+    return bytes(bitmap)
+
+
+def _unrated_ranks(bitmap, size, skip, count):
+    """비트맵에서 skip 개의 미평가 rank 를 건너뛴 뒤 count 개 반환"""
+    ranks = []
+    for byte_idx in range((size + 7) // 8):
+        byte = bitmap[byte_idx] if byte_idx < len(bitmap) else 0
+        valid = min(8, size - byte_idx * 8)
+        free = valid - (byte & ((1 << valid) - 1)).bit_count()
+        if skip >= free:
+            skip -= free
+            continue
+        for bit in range(valid):
+            if byte >> bit & 1:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            ranks.append(byte_idx * 8 + bit)
+            if len(ranks) >= count:
+                return ranks
+    return ranks
+
+
+def get_deck_page(deck, bitmap, page=1, per_page=8):
+    """
+    평가한 게임을 제외한 덱 페이지
+
+    Returns:
+        tuple: (games, page, total_pages, total_games)
+    """
+    from .models import OnboardingDeckEntry
+
+    rated_count = int.from_bytes(bitmap, 'little').bit_count()
+    total_games = max(0, deck.size - rated_count)
+    total_pages = (total_games + per_page - 1) // per_page
+    page = max(1, min(page, total_pages)) if total_pages > 0 else 1
+
+    ranks = _unrated_ranks(bitmap, deck.size, (page - 1) * per_page, per_page)
+    payloads = dict(
+        OnboardingDeckEntry.objects.filter(deck=deck, rank__in=ranks).values_list('rank', 'payload')
+    )
+    games = [payloads[rank] for rank in ranks if rank in payloads]
+    return games, page, total_pages, total_games
@@ -9,6 +9,10 @@ from collections import Counter
 from pathlib import Path
 from django.conf import settings as django_settings
 
+from games import http_client
+
+from .timing import stage
+
 logger = logging.getLogger(__name__)
 
 def get_rawg_api_key():
@@ -149,6 +153,7 @@ def analyze_library_genres_fast(steam_library, limit=5):
     return genre_counter
 
 
+@stage('rawg_genre_fetch')
 def get_recommendations_by_genres(genres, limit=250, max_pages=1):
     """
     Get game recommendations based on genre list - ULTRA FAST VERSION
@@ -200,7 +205,7 @@ def get_recommendations_by_genres(genres, limit=250, max_pages=1):
             }
             
             print(f"[DEBUG] Fetching: genres={genre_string}, ordering={ordering}")
-            response = requests.get(f"{BASE_URL}/games", params=params, timeout=10)
+            response = http_client.get(f"{BASE_URL}/games", params=params)
             
             if response.status_code == 200:
                 data = response.json()
@@ -279,7 +284,7 @@ def calculate_recommendation_score(game, user_genres, is_on_sale=False, sale_dis
     return round(score, 1)
 
 
-def get_personalized_recommendations(steam_library, sale_games=None, limit=50):
+def get_personalized_recommendations(steam_library, sale_games=None, limit=50, owned=None):
     """
     Generate personalized recommendations - FAST VERSION
     
@@ -288,6 +293,7 @@ def get_personalized_recommendations(steam_library, sale_games=None, limit=50):
     2. Extract genres from game names (instant - no API)
     3. Single RAWG API call for recommendations
     4. Filter out already owned games
+       (owned: steam_ownership.OwnedGames → RAWG id 집합 연산, DB에 없는 게임만 제목 비교)
     5. Calculate scores and sort
     
     Total: 3 API calls only!
@@ -321,7 +327,8 @@ def get_personalized_recommendations(steam_library, sale_games=None, limit=50):
     print(f"[DEBUG] Owned games count: {len(owned_games)}, sample: {list(owned_games)[:5]}")
     
     # Step 1: Fast genre analysis (NO API CALLS)
-    user_genres = analyze_library_genres_fast(steam_library, limit=5)
+    with stage('genre_analysis'):
+        user_genres = analyze_library_genres_fast(steam_library, limit=5)
     
     if not user_genres:
         return {
@@ -349,7 +356,10 @@ def get_personalized_recommendations(steam_library, sale_games=None, limit=50):
         }
     
     # Step 3: Filter out already owned games
-    def is_owned(game_title):
+    def is_owned(game_title, rawg_id=None):
+        if owned and rawg_id in owned.rawg_ids:
+            return True
+        
         title_lower = game_title.lower()
         normalized = title_lower.replace(':', '').replace('-', ' ').replace('®', '').replace('™', '')
         normalized = ' '.join(normalized.split())
@@ -375,48 +385,50 @@ def get_personalized_recommendations(steam_library, sale_games=None, limit=50):
     
     filtered_games = []
     excluded_count = 0
-    for game in recommended_games:
-        if is_owned(game['title']):
-            excluded_count += 1
-            print(f"[DEBUG] Excluding owned game: {game['title']}")
-        else:
-            filtered_games.append(game)
+    with stage('owned_filter'):
+        for game in recommended_games:
+            if is_owned(game['title'], game.get('rawg_id')):
+                excluded_count += 1
+                print(f"[DEBUG] Excluding owned game: {game['title']}")
+            else:
+                filtered_games.append(game)
     
     print(f"[DEBUG] Filtered {excluded_count} owned games, {len(filtered_games)} remaining")
     
-    # Step 4: Create sale lookup
-    sale_lookup = {}
-    for sale_game in sale_games:
-        title_lower = sale_game.get('title', '').lower()
-        # Handle None values safely
-        discount_rate = sale_game.get('discount_rate') or 0
-        current_price = sale_game.get('current_price') or 0
-        original_price = sale_game.get('original_price') or 0
+    with stage('scoring'):
+        # Step 4: Create sale lookup
+        sale_lookup = {}
+        for sale_game in sale_games:
+            title_lower = sale_game.get('title', '').lower()
+            # Handle None values safely
+            discount_rate = sale_game.get('discount_rate') or 0
+            current_price = sale_game.get('current_price') or 0
+            original_price = sale_game.get('original_price') or 0
+            
+            sale_lookup[title_lower] = {
+                'discount': discount_rate * 100,
+                'current_price': current_price,
+                'original_price': original_price,
+            }
         
-        sale_lookup[title_lower] = {
-            'discount': discount_rate * 100,
-            'current_price': current_price,
-            'original_price': original_price,
-        }
-    
-    # Step 5: Calculate scores for filtered games (not owned)
-    for game in filtered_games:
-        title_lower = game['title'].lower()
-        sale_info = sale_lookup.get(title_lower, {})
-        is_on_sale = bool(sale_info)
-        discount = sale_info.get('discount', 0)
+        # Step 5: Calculate scores for filtered games (not owned)
+        for game in filtered_games:
+            title_lower = game['title'].lower()
+            sale_info = sale_lookup.get(title_lower, {})
+            is_on_sale = bool(sale_info)
+            discount = sale_info.get('discount', 0)
+            
+            game['recommendation_score'] = calculate_recommendation_score(
+                game, user_genres, is_on_sale, discount
+            )
+            game['is_on_sale'] = is_on_sale
+            if is_on_sale:
+                game['discount_rate'] = discount
+                game['current_price'] = sale_info.get('current_price')
+                game['original_price'] = sale_info.get('original_price')
         
-        game['recommendation_score'] = calculate_recommendation_score(
-            game, user_genres, is_on_sale, discount
-        )
-        game['is_on_sale'] = is_on_sale
-        if is_on_sale:
-            game['discount_rate'] = discount
-            game['current_price'] = sale_info.get('current_price')
-            game['original_price'] = sale_info.get('original_price')
-    
-    # Sort by score
-    filtered_games.sort(key=lambda x: x.get('recommendation_score', 0), reverse=True)
+        # Sort by score
+        filtered_games.sort(key=lambda x: x.get('recommendation_score', 0), reverse=True)
     
     # Get genre for display
     top_genre_display = top_genres[0].replace('-', ' ').title()
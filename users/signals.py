@@ -0,0 +1,27 @@
+"""
+users 앱 시그널
+
+- GameRating 저장/삭제, SteamLibraryCache 갱신 시 AI 챗봇 컨텍스트(ChatContext) 무효화
+  (Steam 플레이 시간 기반 암묵적 평가는 제외)
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .chat_context import invalidate_chat_context
+from .models import GameRating, SteamLibraryCache
+
+
+@receiver(post_save, sender=GameRating)
+@receiver(post_delete, sender=GameRating)
+def invalidate_chat_context_on_rating(sender, instance, raw=False, **kwargs):
+    # 암묵적 평가는 bulk 로 쓰고 지우며 users/steam_ratings.py 가 한 번에 무효화
+    if raw or instance.is_implicit:
+        return
+    invalidate_chat_context(instance.user_id)
+
+
+@receiver(post_save, sender=SteamLibraryCache)
+def invalidate_chat_context_on_library(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate_chat_context(instance.user_id)
@@ -9,6 +9,8 @@ import logging
 from urllib.parse import urlencode
 from django.conf import settings
 
+from games import http_client
+
 logger = logging.getLogger(__name__)
 
 STEAM_API_KEY = os.getenv('STEAM_API_KEY')
@@ -68,7 +70,8 @@ def validate_steam_login(params):
             validation_params[key] = params[key]
     
     try:
-        response = requests.post(STEAM_OPENID_URL, data=validation_params, timeout=10)
+        # 로그인 콜백 요청 경로: 재시도 대기 없이 (OpenID 검증은 재전송하지 않음)
+        response = http_client.post(STEAM_OPENID_URL, data=validation_params, retries=0)
         if 'is_valid:true' in response.text:
             # Extract Steam ID from claimed_id
             claimed_id = params.get('openid.claimed_id', '')
@@ -103,7 +106,7 @@ def get_steam_user_info(steam_id):
             'key': STEAM_API_KEY,
             'steamids': steam_id
         }
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params, max_delay=http_client.INTERACTIVE_MAX_DELAY)
         response.raise_for_status()
         data = response.json()
         
@@ -150,7 +153,7 @@ def get_steam_owned_games(steam_id, include_appinfo=True, include_played_free_ga
             'include_played_free_games': 1 if include_played_free_games else 0,
             'format': 'json'
         }
-        response = requests.get(url, params=params, timeout=15)
+        response = http_client.get(url, params=params, timeout=15)
         response.raise_for_status()
         data = response.json()
         
@@ -202,7 +205,7 @@ def get_steam_recently_played(steam_id, count=10):
             'count': count,
             'format': 'json'
         }
-        response = requests.get(url, params=params, timeout=10)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         data = response.json()
         
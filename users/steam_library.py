@@ -0,0 +1,220 @@
+"""
+Steam 라이브러리 접근 (SteamLibraryCache + stale-while-revalidate)
+
+기존 방식:
+    personalized_recommendations_api, AI 챗봇 컨텍스트, steam_recently_played_api 가
+    요청마다 Steam Web API 를 직접 호출 (GetOwnedGames 타임아웃 15초)
+    → steam_library_api 만 SteamLibraryCache 를 사용
+
+get_library(user):
+    - 캐시가 STALE_AFTER 이내면 그대로 반환 (DB 조회 1회)
+    - 오래됐으면 캐시를 즉시 반환하고 백그라운드 갱신 1회 예약
+    - 캐시가 없거나(연동 계정이 바뀐 경우 포함) force=True 면 동기로 조회
+    - single-flight: 프로세스 안에서는 유저별 flight (같은 유저 동시 요청은 한 번만 조회하고 결과 공유),
+      프로세스 사이에서는 refreshing_until 리스 (조건부 UPDATE 로 한 워커만 백그라운드 갱신)
+    - Steam 조회가 실패해 빈 결과가 오면 기존 캐시를 유지 (리스가 끝난 뒤 다음 요청에서 재시도)
+    - 빈 라이브러리(비공개 프로필 등)는 EMPTY_STALE_AFTER 뒤에 다시 확인
+    - 갱신할 때 정규화 테이블 SteamOwnership 동기화 (users/steam_ownership.py)
+      + 플레이 시간 기반 암묵적 평가 갱신 (users/steam_ratings.py)
+
+사용 예시:
+    from .steam_library import get_library
+    library = get_library(request.user)
+    library.games            # 전체 보유 게임 (플레이 시간순)
+    library.recently_played  # 최근 2주 플레이
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Optional
+
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+STALE_AFTER = timedelta(hours=24)
+EMPTY_STALE_AFTER = timedelta(hours=1)
+# 백그라운드 갱신 리스 (이 시간 안에는 다른 워커가 같은 유저를 갱신하지 않음, 실패 시 재시도 간격)
+REFRESH_LEASE = timedelta(seconds=60)
+# 동기 조회를 기다리는 최대 시간 (Steam 타임아웃 15초 x 2회 호출)
+FLIGHT_TIMEOUT = 35
+# steam_library_api / 프로필 응답에 담는 게임 수
+LIBRARY_PREVIEW = 50
+RECENT_COUNT = 20
+REFRESH_WORKERS = 2
+
+_flights = {}
+_flights_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+@dataclass
+class SteamLibrary:
+    """get_library() 결과"""
+    games: list = field(default_factory=list)
+    recently_played: list = field(default_factory=list)
+    total_games: int = 0
+    total_playtime_hours: float = 0.0
+    updated_at: Optional[datetime] = None
+    cached: bool = False
+    stale: bool = False
+
+    @property
+    def preview(self):
+        return self.games[:LIBRARY_PREVIEW]
+
+    @property
+    def age_hours(self):
+        if self.updated_at is None:
+            return None
+        return round((timezone.now() - self.updated_at).total_seconds() / 3600, 1)
+
+
+class _Flight:
+    """진행 중인 Steam 조회 1건 (먼저 온 요청이 결과를 채우고 event 로 알림)"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+
+
+def _snapshot(cache, cached, stale=False):
+    return SteamLibrary(
+        games=cache.library_data or [],
+        recently_played=cache.recently_played or [],
+        total_games=cache.total_games,
+        total_playtime_hours=cache.total_playtime_hours,
+        updated_at=cache.last_updated,
+        cached=cached,
+        stale=stale,
+    )
+
+
+def is_stale(cache):
+    max_age = STALE_AFTER if cache.library_data else EMPTY_STALE_AFTER
+    return timezone.now() - cache.last_updated > max_age
+
+
+def get_library(user, force=False):
+    """
+    유저의 Steam 라이브러리 (Steam 미연동이면 빈 SteamLibrary)
+
+    Args:
+        force: True 면 캐시와 관계없이 Steam 에서 다시 조회 (동기)
+    """
+    from .models import SteamLibraryCache
+
+    if not user.is_steam_linked or not user.steam_id:
+        return SteamLibrary()
+
+    cache = SteamLibraryCache.objects.filter(user=user).first()
+    if cache is None or force or cache.steam_id != user.steam_id:
+        fresh = refresh_library(user)
+        return _snapshot(fresh, cached=False) if fresh is not None else SteamLibrary()
+
+    stale = is_stale(cache)
+    if stale and _claim_lease(cache):
+        _schedule_refresh(user)
+    return _snapshot(cache, cached=True, stale=stale)
+
+
+def refresh_library(user):
+    """
+    Steam 에서 라이브러리를 다시 조회해 캐시에 저장 (동기, 유저별 single-flight)
+
+    Returns:
+        SteamLibraryCache or None (조회 실패 + 기존 캐시 없음)
+    """
+    with _flights_lock:
+        flight = _flights.get(user.pk)
+        leader = flight is None
+        if leader:
+            flight = _flights[user.pk] = _Flight()
+
+    if not leader:
+        flight.event.wait(FLIGHT_TIMEOUT)
+        return flight.result
+
+    try:
+        flight.result = _refresh(user)
+        return flight.result
+    finally:
+        with _flights_lock:
+            _flights.pop(user.pk, None)
+        flight.event.set()
+
+
+def _refresh(user):
+    from .models import SteamLibraryCache
+    from .steam_auth import get_steam_owned_games, get_steam_recently_played
+    from .steam_ownership import sync_ownership
+    from .steam_ratings import import_steam_ratings
+
+    steam_id = user.steam_id
+    owned = get_steam_owned_games(steam_id)
+    recent = get_steam_recently_played(steam_id, count=RECENT_COUNT) if owned else []
+
+    cache = SteamLibraryCache.objects.filter(user=user).first()
+    if not owned and cache is not None and cache.library_data and cache.steam_id == steam_id:
+        # 조회 실패로 보고 기존 데이터 유지 (리스가 만료되면 다시 시도)
+        logger.warning(f"Steam library refresh returned no games for {steam_id}, keeping cached data")
+        return cache
+
+    total_hours = round(sum(g.get('playtime_forever', 0) for g in owned) / 60, 1)
+    cache, _ = SteamLibraryCache.objects.update_or_create(
+        user=user,
+        defaults={
+            'steam_id': steam_id,
+            'library_data': owned,
+            'recently_played': recent,
+            'total_games': len(owned),
+            'total_playtime_hours': total_hours,
+            'refreshing_until': None,
+        }
+    )
+    sync_ownership(user, owned)
+    import_steam_ratings(user)
+    logger.info(f"Refreshed Steam library for user {user.pk}: {len(owned)} games")
+    return cache
+
+
+def _claim_lease(cache):
+    """백그라운드 갱신 권한 획득 (조건부 UPDATE, 프로세스 간 single-flight)"""
+    from .models import SteamLibraryCache
+
+    now = timezone.now()
+    return SteamLibraryCache.objects.filter(pk=cache.pk).filter(
+        Q(refreshing_until__isnull=True) | Q(refreshing_until__lt=now)
+    ).update(refreshing_until=now + REFRESH_LEASE) == 1
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=REFRESH_WORKERS, thread_name_prefix='steam-refresh')
+        return _executor
+
+
+def prefetch_library(user):
+    """Steam 연동 직후 라이브러리 + 암묵적 평가를 백그라운드로 미리 준비"""
+    if user.is_steam_linked and user.steam_id:
+        _schedule_refresh(user)
+
+
+def _schedule_refresh(user):
+    def run():
+        try:
+            refresh_library(user)
+        except Exception as e:
+            logger.error(f"Background Steam library refresh failed for user {user.pk}: {e}")
+        finally:
+            connections.close_all()
+
+    _get_executor().submit(run)
@@ -0,0 +1,183 @@
+"""
+Steam 보유 게임 정규화 테이블 (SteamOwnership)
+
+기존 방식:
+    SteamLibraryCache.library_data JSON 을 펼쳐 게임 제목을 소문자로 비교해 보유 게임 제외
+    → 제목 표기가 다르면 놓치고, 유저 간 집계는 불가능
+
+정규화 방식:
+    - Steam 라이브러리를 새로 받을 때마다 sync_ownership() 으로 이전 조회와 비교
+      (새 게임 bulk_create / 플레이 시간이 바뀐 게임 bulk_update / 사라진 게임 delete)
+    - get_owned(user): 보유 앱 ID + 그에 해당하는 Game id / rawg_id 집합 → 추천 결과를 집합 연산으로 제외
+    - popular_among_users(): steam_appid GROUP BY 한 번으로 "우리 유저가 많이 가진 게임"
+
+사용 예시:
+    from .steam_ownership import get_owned
+    owned = get_owned(user)
+    recommendations = [rec for rec in recommendations if not owned.contains(rec)]
+"""
+
+import logging
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class OwnedGames:
+    """유저 보유 게임 키 집합 (Steam 앱 ID / Game id / RAWG id)"""
+    appids: set = field(default_factory=set)
+    game_ids: set = field(default_factory=set)
+    rawg_ids: set = field(default_factory=set)
+
+    def __bool__(self):
+        return bool(self.appids)
+
+    def __len__(self):
+        return len(self.appids)
+
+    def contains(self, rec):
+        """추천 항목(dict: id / rawg_id / steam_app_id)이 보유 게임인지"""
+        if rec.get('id') in self.game_ids or rec.get('rawg_id') in self.rawg_ids:
+            return True
+        try:
+            return int(rec.get('steam_app_id') or rec.get('steam_appid') or 0) in self.appids
+        except (TypeError, ValueError):
+            return False
+
+
+def sync_ownership(user, games):
+    """
+    Steam 조회 결과로 SteamOwnership 을 맞춤 (이전 조회와 비교해 바뀐 행만 쓰기)
+
+    Args:
+        games: get_steam_owned_games() 결과 [{appid, playtime_forever, playtime_2weeks, ...}]
+
+    Returns:
+        dict: {created, updated, deleted, unchanged}
+    """
+    from .models import SteamOwnership
+
+    incoming = {}
+    for game in games:
+        try:
+            appid = int(game.get('appid') or 0)
+        except (TypeError, ValueError):
+            continue
+        if appid > 0:
+            incoming[appid] = (int(game.get('playtime_forever') or 0), int(game.get('playtime_2weeks') or 0))
+
+    existing = {
+        row.steam_appid: row
+        for row in SteamOwnership.objects.filter(user=user).only('id', 'steam_appid', 'playtime_forever', 'playtime_2weeks')
+    }
+
+    now = timezone.now()
+    to_create = []
+    to_update = []
+    for appid, (forever, two_weeks) in incoming.items():
+        row = existing.get(appid)
+        if row is None:
+            to_create.append(SteamOwnership(
+                user=user, steam_appid=appid, playtime_forever=forever, playtime_2weeks=two_weeks,
+            ))
+        elif (row.playtime_forever, row.playtime_2weeks) != (forever, two_weeks):
+            row.playtime_forever = forever
+            row.playtime_2weeks = two_weeks
+            row.updated_at = now
+            to_update.append(row)
+    to_delete = [row.id for appid, row in existing.items() if appid not in incoming]
+
+    with transaction.atomic():
+        if to_create:
+            # 같은 유저를 동시에 동기화한 경우 먼저 들어간 행 유지
+            SteamOwnership.objects.bulk_create(to_create, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        if to_update:
+            SteamOwnership.objects.bulk_update(
+                to_update, ['playtime_forever', 'playtime_2weeks', 'updated_at'], batch_size=BATCH_SIZE
+            )
+        if to_delete:
+            SteamOwnership.objects.filter(id__in=to_delete).delete()
+
+    result = {
+        'created': len(to_create),
+        'updated': len(to_update),
+        'deleted': len(to_delete),
+        'unchanged': len(incoming) - len(to_create) - len(to_update),
+    }
+    logger.info(f"Synced Steam ownership for user {user.pk}: {result}")
+    return result
+
+
+def get_owned(user):
+    """유저 보유 게임 키 집합 (쿼리 2회: 앱 ID 목록 + Game 조인)"""
+    from games.models import Game
+    from .models import SteamOwnership
+
+    owned_rows = SteamOwnership.objects.filter(user=user)
+    appids = set(owned_rows.values_list('steam_appid', flat=True))
+    if not appids:
+        return OwnedGames()
+
+    game_ids = set()
+    rawg_ids = set()
+    for game_id, rawg_id in Game.objects.filter(
+        steam_appid__in=owned_rows.values('steam_appid')
+    ).values_list('id', 'rawg_id'):
+        game_ids.add(game_id)
+        if rawg_id:
+            rawg_ids.add(rawg_id)
+    return OwnedGames(appids=appids, game_ids=game_ids, rawg_ids=rawg_ids)
+
+
+def popular_among_users(limit=20, min_owners=2, exclude_user=None):
+    """
+    우리 유저가 많이 보유한 Steam 게임 (보유 유저 수 → 총 플레이 시간 순)
+
+    Args:
+        exclude_user: 이 유저가 이미 가진 게임은 제외
+
+    Returns:
+        list: [{steam_appid, owners, total_hours, recent_hours, game_id, rawg_id, title, image_url}]
+    """
+    from games.models import Game
+    from .models import SteamOwnership
+
+    rows = SteamOwnership.objects.all()
+    if exclude_user is not None:
+        rows = rows.exclude(
+            steam_appid__in=SteamOwnership.objects.filter(user=exclude_user).values('steam_appid')
+        )
+    rows = list(
+        rows.values('steam_appid')
+        .annotate(owners=Count('id'), total_minutes=Sum('playtime_forever'), recent_minutes=Sum('playtime_2weeks'))
+        .filter(owners__gte=min_owners)
+        .order_by('-owners', '-total_minutes')[:limit]
+    )
+
+    games = {
+        game.steam_appid: game
+        for game in Game.objects.filter(steam_appid__in=[row['steam_appid'] for row in rows])
+        .only('id', 'rawg_id', 'title', 'steam_appid')
+    }
+    result = []
+    for row in rows:
+        appid = row['steam_appid']
+        game = games.get(appid)
+        result.append({
+            'steam_appid': appid,
+            'owners': row['owners'],
+            'total_hours': round((row['total_minutes'] or 0) / 60, 1),
+            'recent_hours': round((row['recent_minutes'] or 0) / 60, 1),
+            'game_id': game.id if game else None,
+            'rawg_id': game.rawg_id if game else None,
+            'title': game.title if game else None,
+            'image_url': f"https://cdn.akamai.steamstatic.com/steam/apps/{appid}/header.jpg",
+        })
+    return result
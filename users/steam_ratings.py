@@ -0,0 +1,141 @@
+"""
+Steam 플레이 시간 → 암묵적 게임 평가 (GameRating.is_implicit)
+
+문제:
+    Steam 을 연동해도 직접 3개 이상 평가하기 전까지는 평가 기반 추천(Item-Based CF)을 쓰지 못함
+    (GetOwnedGames 가 전체 플레이 기록을 주는데도)
+
+방식:
+    - SteamOwnership(앱 ID, 플레이 시간)을 Game.steam_appid 인덱스로 Game 에 매핑
+    - 유저 안에서의 플레이 시간 백분위로 점수 추정
+        상위 LOVE_PERCENTILE 이상 + LOVE_MIN_MINUTES 이상 → 쌍따봉(5)
+        상위 LIKE_PERCENTILE 이상                        → 따봉(3.5)
+        MIN_PLAYTIME_MINUTES 미만(찍먹) / 하위 게임       → 평가하지 않음
+    - 직접 평가한 게임(is_implicit=False)은 건드리지 않음
+    - 새 평가는 GameRating bulk_create(ignore_conflicts=True), 점수가 바뀐 암묵적 평가는 점수별 조건부 UPDATE,
+      더 이상 해당하지 않는 암묵적 평가는 삭제 (행마다 update_or_create 하지 않음)
+      → 가져오는 도중에 유저가 직접 평가해도 그 점수를 덮어쓰지 않음
+    - bulk_create 는 시그널을 보내지 않으므로 AI 챗봇 컨텍스트는 직접 무효화
+
+실행 시점:
+    Steam 라이브러리 갱신(users/steam_library.py) 때마다 자동 실행,
+    Steam 연동 직후에는 라이브러리를 백그라운드로 미리 가져오면서 실행
+    기존 유저 일괄 처리: python manage.py import_steam_ratings
+"""
+
+import bisect
+import logging
+
+from django.db import transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+LOVE_PERCENTILE = 90
+LIKE_PERCENTILE = 50
+LOVE_MIN_MINUTES = 20 * 60
+# 찍먹 기준 (chat_context.LOW_PLAYTIME_MINUTES 와 같음)
+MIN_PLAYTIME_MINUTES = 120
+# 플레이한 게임이 이보다 적으면 백분위 대신 기준 시간 이상을 모두 따봉으로
+MIN_GAMES_FOR_PERCENTILE = 4
+BATCH_SIZE = 500
+
+
+def implicit_scores(playtimes):
+    """
+    플레이 시간 → 암묵적 점수
+
+    Args:
+        playtimes: {steam_appid: playtime_forever(분)}
+
+    Returns:
+        dict: {steam_appid: 5 | 3.5} (평가하지 않는 게임은 빠짐)
+    """
+    played = sorted(minutes for minutes in playtimes.values() if minutes > 0)
+    if not played:
+        return {}
+
+    scores = {}
+    use_percentile = len(played) >= MIN_GAMES_FOR_PERCENTILE
+    for appid, minutes in playtimes.items():
+        if minutes < MIN_PLAYTIME_MINUTES:
+            continue
+        if not use_percentile:
+            scores[appid] = 3.5
+            continue
+        # 이 게임보다 플레이 시간이 짧은 게임의 비율
+        below = bisect.bisect_left(played, minutes)
+        percentile = below / len(played) * 100
+        if percentile >= LOVE_PERCENTILE and minutes >= LOVE_MIN_MINUTES:
+            scores[appid] = 5
+        elif percentile >= LIKE_PERCENTILE:
+            scores[appid] = 3.5
+    return scores
+
+
+def import_steam_ratings(user):
+    """
+    유저의 SteamOwnership 으로 암묵적 평가를 다시 계산해 저장
+
+    Returns:
+        dict: {mapped, loved, liked, kept_explicit, removed}
+    """
+    from games.models import Game
+    from .chat_context import invalidate_chat_context
+    from .models import GameRating, SteamOwnership
+
+    playtimes = dict(
+        SteamOwnership.objects.filter(user=user, playtime_forever__gt=0)
+        .values_list('steam_appid', 'playtime_forever')
+    )
+    scores = implicit_scores(playtimes)
+
+    # 앱 ID → Game (steam_appid unique 인덱스)
+    game_by_appid = dict(
+        Game.objects.filter(steam_appid__in=list(scores)).values_list('steam_appid', 'id')
+    ) if scores else {}
+    explicit_ids = set(
+        GameRating.objects.filter(user=user, is_implicit=False).values_list('game_id', flat=True)
+    )
+
+    ratings = []
+    kept_explicit = 0
+    for appid, score in scores.items():
+        game_id = game_by_appid.get(appid)
+        if game_id is None:
+            continue
+        if game_id in explicit_ids:
+            kept_explicit += 1
+            continue
+        ratings.append(GameRating(user=user, game_id=game_id, score=score, is_implicit=True))
+
+    # 위에서 읽은 뒤에 유저가 직접 평가했을 수 있으므로 upsert 하지 않음:
+    # 새 행만 넣고(충돌 무시) 점수 갱신은 아직 암묵적 평가인 행에만 조건부 UPDATE
+    game_ids_by_score = {}
+    for rating in ratings:
+        game_ids_by_score.setdefault(rating.score, []).append(rating.game_id)
+
+    with transaction.atomic():
+        if ratings:
+            GameRating.objects.bulk_create(ratings, batch_size=BATCH_SIZE, ignore_conflicts=True)
+        now = timezone.now()
+        for score, game_ids in game_ids_by_score.items():
+            for i in range(0, len(game_ids), BATCH_SIZE):
+                GameRating.objects.filter(
+                    user=user, is_implicit=True, game_id__in=game_ids[i:i + BATCH_SIZE]
+                ).exclude(score=score).update(score=score, updated_at=now)
+        removed, _ = GameRating.objects.filter(user=user, is_implicit=True).exclude(
+            game_id__in=[rating.game_id for rating in ratings]
+        ).delete()
+
+    invalidate_chat_context(user.pk)
+
+    result = {
+        'mapped': len(ratings),
+        'loved': sum(1 for rating in ratings if rating.score == 5),
+        'liked': sum(1 for rating in ratings if rating.score == 3.5),
+        'kept_explicit': kept_explicit,
+        'removed': removed,
+    }
+    logger.info(f"Imported implicit Steam ratings for user {user.pk}: {result}")
+    return result
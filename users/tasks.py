@@ -0,0 +1,88 @@
+"""
+users 앱 백그라운드 작업 (games/jobs.py 큐에서 run_workers 가 실행)
+
+    users.generate_ai_profile    AI 프로필 이미지 생성 (Gemini 이미지 생성, 최대 60초)
+    users.compact_chat_session   AI 챗봇 세션의 오래된 턴을 요약에 접기 (users/chat_session.py)
+"""
+
+import logging
+import os
+
+import requests
+
+from games import http_client
+from games.jobs import PermanentJobError, job_handler
+
+logger = logging.getLogger(__name__)
+
+IMAGE_MODEL_URL = "https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp-image-generation:generateContent"
+IMAGE_TIMEOUT = 60
+
+
+@job_handler('users.generate_ai_profile', max_attempts=2)
+def generate_ai_profile(payload):
+    """
+    Gemini 형식 요청 본문을 그대로 전달해 이미지 생성
+
+    payload: {'request': {contents, generationConfig}}
+
+    Returns:
+        {'image_base64': ..., 'text': ...}
+    """
+    api_key = os.getenv('GMS_API_KEY')
+    if not api_key:
+        raise PermanentJobError("API 키가 설정되지 않았습니다.")
+
+    try:
+        response = http_client.post(
+            IMAGE_MODEL_URL,
+            params={'key': api_key},
+            headers={'Content-Type': 'application/json'},
+            json=payload.get('request') or {},
+            timeout=IMAGE_TIMEOUT,
+            retries=0  # 재시도는 작업 큐가 백오프로 처리
+        )
+    except requests.Timeout:
+        raise RuntimeError("AI 서버 응답 시간이 초과되었습니다.")
+
+    if response.status_code != 200:
+        logger.warning(f"Gemini image generation failed: {response.status_code} {response.text[:500]}")
+        error = f"AI 서버 오류 (Status: {response.status_code})"
+        if 400 <= response.status_code < 500 and response.status_code != 429:
+            raise PermanentJobError(error)
+        raise RuntimeError(error)
+
+    candidates = response.json().get('candidates', [])
+    if not candidates:
+        raise PermanentJobError("AI가 응답을 생성하지 못했습니다.")
+
+    image_base64 = None
+    text_response = None
+    for part in candidates[0].get('content', {}).get('parts', []):
+        if 'inlineData' in part:
+            image_base64 = part['inlineData'].get('data')
+        if 'text' in part:
+            text_response = part['text']
+
+    if not image_base64:
+        raise PermanentJobError("이미지가 생성되지 않았습니다.")
+    return {'image_base64': image_base64, 'text': text_response}
+
+
+@job_handler('users.compact_chat_session', max_attempts=2)
+def compact_chat_session(payload):
+    """
+    예산을 넘은 챗봇 세션의 오래된 턴을 요약 (Gemini 실패 시 발췌 요약이므로 보통 한 번에 끝남)
+
+    payload: {'session_id': int}
+
+    Returns:
+        {'folded': 요약에 접은 턴 수}
+    """
+    from .chat_session import compact_session
+    from .models import ChatSession
+
+    session = ChatSession.objects.filter(pk=payload['session_id']).first()
+    if session is None:
+        return {'folded': 0}
+    return {'folded': compact_session(session, os.getenv('GMS_API_KEY'))}
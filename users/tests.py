@@ -1,3 +1,310 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from games.models import BackgroundJob, Game
+
+from .chat_context import get_chat_context, is_fresh
+from .chat_session import compact_session, get_session, prompt_history, record_exchange, render_summary_block
+from .management.commands.update_steam_sales import Command as UpdateSteamSalesCommand
+from .models import ChatContext, GameRating, OnboardingDeckEntry, SteamLibraryCache, SteamOwnership, User
+from .onboarding_decks import (
+    DECK_KOREAN,
+    DECK_POPULAR,
+    _unrated_ranks,
+    build_korean_deck,
+    get_deck_page,
+    get_rated_bitmap,
+    save_deck,
+)
+from .steam_library import EMPTY_STALE_AFTER, STALE_AFTER, get_library, is_stale
+from .steam_ownership import get_owned, sync_ownership
+from .steam_ratings import LOVE_MIN_MINUTES, MIN_PLAYTIME_MINUTES, implicit_scores
+from .timing import ServerTimingMiddleware, stage
+
+
+class OnboardingDeckTests(TestCase):
+    def _rows(self, count):
+        return [
+            {'game_id': None, 'rawg_id': 100 + i, 'score': count - i, 'payload': {'rawg_id': 100 + i, 'title': f'G{i}'}}
+            for i in range(count)
+        ]
+
+    def test_save_deck_replaces_entries_and_bumps_version(self):
+        first = save_deck(DECK_POPULAR, self._rows(3))
+        second = save_deck(DECK_POPULAR, self._rows(2))
+        self.assertEqual((second.version, second.size), (first.version + 1, 2))
+        self.assertEqual(OnboardingDeckEntry.objects.filter(deck=second).count(), 2)
+
+    def test_unrated_ranks_skip_rated_bits(self):
+        bitmap = bytes([0b00000101, 0b00000001])  # rank 0, 2, 8 평가
+        self.assertEqual(_unrated_ranks(bitmap, 10, 0, 3), [1, 3, 4])
+        self.assertEqual(_unrated_ranks(bitmap, 10, 5, 3), [7, 9])
+
+    def test_deck_page_excludes_rated_games(self):
+        user = User.objects.create_user(username='deck', password='pw')
+        game = Game.objects.create(title='Rated', image_url='https://img.test/r.jpg', rawg_id=101)
+        deck = save_deck(DECK_POPULAR, self._rows(10))
+        GameRating.objects.create(user=user, game=game, score=5)
+
+        bitmap = get_rated_bitmap(user, deck)
+        games, page, total_pages, total_games = get_deck_page(deck, bitmap, page=1, per_page=4)
+        self.assertEqual((page, total_pages, total_games), (1, 3, 9))
+        self.assertEqual([g['rawg_id'] for g in games], [100, 102, 103, 104])
+        # 평가가 그대로면 저장된 비트맵 재사용 (평가 집계 + 진행 상황 조회만)
+        with self.assertNumQueries(2):
+            self.assertEqual(get_rated_bitmap(user, deck), bitmap)
+
+    def test_build_korean_deck_keeps_selection_order(self):
+        selected = [(None, {'rawg_id': 1, 'title': 'A'}), (None, {'rawg_id': 2, 'title': 'B'})]
+        with mock.patch('users.onboarding.select_korean_featured_games', return_value=selected):
+            deck = build_korean_deck()
+        self.assertEqual((deck.name, deck.size), (DECK_KOREAN, 2))
+        self.assertEqual(
+            list(OnboardingDeckEntry.objects.filter(deck=deck).order_by('rank').values_list('rawg_id', flat=True)),
+            [1, 2],
+        )
+
+    def test_build_korean_deck_keeps_existing_deck_when_selection_is_empty(self):
+        existing = save_deck(DECK_KOREAN, self._rows(3))
+        with mock.patch('users.onboarding.select_korean_featured_games', return_value=[]):
+            deck = build_korean_deck()
+        self.assertEqual((deck.pk, deck.version, deck.size), (existing.pk, existing.version, 3))
+        self.assertEqual(OnboardingDeckEntry.objects.filter(deck=deck).count(), 3)
+
+
+class SteamLibraryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='steam', password='pw', steam_id='76561190000000001', is_steam_linked=True
+        )
+
+    def _cache(self, age, games=None):
+        cache = SteamLibraryCache.objects.create(
+            user=self.user,
+            steam_id=self.user.steam_id,
+            library_data=[{'appid': 10, 'name': 'A', 'playtime_forever': 60}] if games is None else games,
+        )
+        SteamLibraryCache.objects.filter(pk=cache.pk).update(last_updated=timezone.now() - age)
+        cache.refresh_from_db()
+        return cache
+
+    def test_fresh_cache_is_served_without_refresh(self):
+        self._cache(timedelta(hours=1))
+        with mock.patch('users.steam_library._schedule_refresh') as schedule:
+            library = get_library(self.user)
+        self.assertTrue(library.cached)
+        self.assertFalse(library.stale)
+        schedule.assert_not_called()
+
+    def test_stale_cache_is_served_and_refreshed_once_per_lease(self):
+        self._cache(STALE_AFTER + timedelta(hours=1))
+        with mock.patch('users.steam_library._schedule_refresh') as schedule:
+            first = get_library(self.user)
+            second = get_library(self.user)
+        self.assertTrue(first.stale and second.stale)
+        self.assertEqual(first.games[0]['appid'], 10)
+        schedule.assert_called_once()
+
+        # 리스가 만료되면 다음 요청이 다시 예약
+        SteamLibraryCache.objects.update(refreshing_until=timezone.now() - timedelta(seconds=1))
+        with mock.patch('users.steam_library._schedule_refresh') as schedule:
+            get_library(self.user)
+        schedule.assert_called_once()
+
+    def test_empty_library_goes_stale_sooner(self):
+        self.assertTrue(is_stale(self._cache(EMPTY_STALE_AFTER + timedelta(minutes=1), games=[])))
+
+    def test_missing_cache_is_fetched_synchronously(self):
+        owned = [{'appid': 20, 'name': 'B', 'playtime_forever': 30}]
+        with mock.patch('users.steam_auth.get_steam_owned_games', return_value=owned), \
+                mock.patch('users.steam_auth.get_steam_recently_played', return_value=[]):
+            library = get_library(self.user)
+        self.assertFalse(library.cached)
+        self.assertEqual(library.games, owned)
+        self.assertEqual(SteamLibraryCache.objects.get(user=self.user).total_games, 1)
+
+
+class SteamOwnershipTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='owner', password='pw')
+
+    def test_sync_only_writes_changes(self):
+        games = [{'appid': 10, 'playtime_forever': 60}, {'appid': 20, 'playtime_forever': 5}, {'appid': 'bad'}]
+        self.assertEqual(sync_ownership(self.user, games), {'created': 2, 'updated': 0, 'deleted': 0, 'unchanged': 0})
+
+        games = [{'appid': 10, 'playtime_forever': 90, 'playtime_2weeks': 30}, {'appid': 30}]
+        self.assertEqual(sync_ownership(self.user, games), {'created': 1, 'updated': 1, 'deleted': 1, 'unchanged': 0})
+        self.assertEqual(
+            dict(SteamOwnership.objects.filter(user=self.user).values_list('steam_appid', 'playtime_forever')),
+            {10: 90, 30: 0},
+        )
+        self.assertEqual(sync_ownership(self.user, games)['unchanged'], 2)
+
+    def test_get_owned_maps_app_ids_to_games(self):
+        game = Game.objects.create(title='Owned', image_url='https://img.test/o.jpg', steam_appid=10, rawg_id=500)
+        sync_ownership(self.user, [{'appid': 10}, {'appid': 11}])
+        owned = get_owned(self.user)
+        self.assertEqual(owned.appids, {10, 11})
+        self.assertTrue(owned.contains({'id': game.pk}))
+        self.assertTrue(owned.contains({'rawg_id': 500}))
+        self.assertTrue(owned.contains({'steam_app_id': '11'}))
+        self.assertFalse(owned.contains({'steam_app_id': 'x'}))
+
+
+class ImplicitScoresTests(SimpleTestCase):
+    def test_empty_or_unplayed(self):
+        self.assertEqual(implicit_scores({}), {})
+        self.assertEqual(implicit_scores({1: 0, 2: 0}), {})
+
+    def test_few_games_use_minimum_playtime_only(self):
+        scores = implicit_scores({1: MIN_PLAYTIME_MINUTES, 2: MIN_PLAYTIME_MINUTES - 1, 3: 5000})
+        self.assertEqual(scores, {1: 3.5, 3: 3.5})
+
+    def test_percentiles(self):
+        # 10개 중 상위 10% + LOVE_MIN_MINUTES 이상 → 5, 상위 절반 → 3.5, 나머지 → 없음
+        playtimes = {appid: MIN_PLAYTIME_MINUTES + appid * 60 for appid in range(9)}
+        playtimes[9] = LOVE_MIN_MINUTES * 2
+        scores = implicit_scores(playtimes)
+        self.assertEqual(scores[9], 5)
+        self.assertEqual({appid for appid, score in scores.items() if score == 3.5}, {5, 6, 7, 8})
+        self.assertNotIn(4, scores)
+
+    def test_top_game_below_love_minimum_is_only_liked(self):
+        playtimes = {appid: MIN_PLAYTIME_MINUTES + appid for appid in range(10)}
+        scores = implicit_scores(playtimes)
+        self.assertEqual(scores[9], 3.5)
+        self.assertNotIn(5, scores.values())
+
+    def test_short_sessions_never_rated(self):
+        playtimes = {appid: 10 + appid for appid in range(10)}
+        self.assertEqual(implicit_scores(playtimes), {})
+
+
+@override_settings(JOB_INPROCESS_WORKERS=0)
+class ChatSessionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='chat', password='pw')
+
+    def test_get_session_only_returns_own_session(self):
+        other = User.objects.create_user(username='other', password='pw')
+        session = get_session(self.user)
+        self.assertEqual(get_session(self.user, str(session.pk)).pk, session.pk)
+        self.assertNotEqual(get_session(other, session.pk).pk, session.pk)
+        self.assertNotEqual(get_session(self.user, 'abc').pk, session.pk)
+
+    def test_seed_history_and_turn_order(self):
+        session = get_session(self.user, seed_history=[
+            {'role': 'user', 'content': '안녕'},
+            {'role': 'assistant', 'content': '반가워요'},
+            {'role': 'user', 'content': '   '},
+        ])
+        record_exchange(session, '추천해줘', '이 게임 어때요?')
+        self.assertEqual(
+            [turn['content'] for turn in prompt_history(session)],
+            ['안녕', '반가워요', '추천해줘', '이 게임 어때요?'],
+        )
+        seqs = list(session.turns.order_by('seq').values_list('seq', flat=True))
+        self.assertEqual(seqs, list(range(seqs[0], seqs[0] + 4)))
+
+    def test_record_exchange_queues_compaction_over_budget(self):
+        session = get_session(self.user)
+        with self.settings(CHAT_HISTORY_TOKEN_BUDGET=10):
+            record_exchange(session, 'a' * 40, 'b' * 40)
+        job = BackgroundJob.objects.get(kind='users.compact_chat_session')
+        self.assertEqual(job.payload, {'session_id': session.pk})
+
+    def test_compact_session_folds_old_turns_into_summary(self):
+        session = get_session(self.user)
+        for i in range(6):
+            # 턴당 12토큰 (ASCII 43자 / 4 + 한글 2자)
+            record_exchange(session, f'질문 {i} ' + 'x' * 40, f'답변 {i} ' + 'y' * 40)
+
+        self.assertEqual(compact_session(session, budget=100), 8)
+        session.refresh_from_db()
+        self.assertEqual(session.summarized_turns, 8)
+        self.assertIn('질문 0', session.summary)
+        self.assertIn('[이전 대화 요약]', render_summary_block(session))
+
+        history = prompt_history(session)
+        self.assertEqual(len(history), 4)
+        self.assertEqual(history[0]['role'], 'user')
+        self.assertEqual(compact_session(session, budget=100), 0)
+
+
+class ChatContextTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='ctx', password='pw')
+        self.game = Game.objects.create(title='Hades', image_url='https://img.test/h.jpg', genre='Action, Roguelike')
+
+    def test_context_is_reused_until_a_rating_changes(self):
+        rating = GameRating.objects.create(user=self.user, game=self.game, score=5)
+        context = get_chat_context(self.user)
+        self.assertEqual(context.exclusions, ['Hades'])
+        self.assertCountEqual(context.top_genres, ['Action', 'Roguelike'])
+        with self.assertNumQueries(1):
+            self.assertEqual(get_chat_context(self.user).pk, context.pk)
+
+        rating.score = -1
+        rating.save()
+        self.assertFalse(ChatContext.objects.filter(user=self.user).exists())
+        self.assertEqual(get_chat_context(self.user).top_genres, [])
+
+    def test_implicit_ratings_do_not_invalidate(self):
+        get_chat_context(self.user)
+        GameRating.objects.create(user=self.user, game=self.game, score=3.5, is_implicit=True)
+        self.assertTrue(ChatContext.objects.filter(user=self.user).exists())
+
+    def test_empty_steam_library_is_fresh_until_ttl(self):
+        self.user.steam_id = '76561190000000002'
+        self.user.is_steam_linked = True
+        self.user.save()
+        SteamLibraryCache.objects.create(user=self.user, steam_id=self.user.steam_id, library_data=[])
+
+        context = get_chat_context(self.user)
+        self.assertIsNotNone(context.steam_fetched_at)
+        self.assertTrue(is_fresh(context, self.user))
+
+        self.user.steam_id = '76561190000000003'
+        self.assertFalse(is_fresh(context, self.user))
+
+
+class HistoricalLowsTests(SimpleTestCase):
+    def test_failed_batches_are_counted(self):
+        command = UpdateSteamSalesCommand(stdout=StringIO())
+        command.HISTORY_BATCH_SIZE = 2
+
+        def fetch(batch):
+            if '3' in batch:
+                return {}, 'HTTP 502'
+            return {i: {'price': '1.99'} for i in batch}, None
+
+        with mock.patch.object(command, 'fetch_historical_low_batch', side_effect=fetch):
+            lows, failed = command.fetch_historical_lows(['1', '2', '2', '3', None], workers=1, rate=None)
+        self.assertEqual(set(lows), {'1', '2'})
+        self.assertEqual(failed, 1)
+
+
+class ServerTimingMiddlewareTests(SimpleTestCase):
+    def _get(self, user):
+        def view(request):
+            with stage('item_cf'):
+                pass
+            return HttpResponse()
+
+        request = RequestFactory().get('/')
+        request.user = user
+        return ServerTimingMiddleware(view)(request)
+
+    @override_settings(DEBUG=False)
+    def test_header_only_for_staff_outside_debug(self):
+        self.assertNotIn('Server-Timing', self._get(mock.Mock(is_staff=False)))
+        self.assertIn('item_cf;dur=', self._get(mock.Mock(is_staff=True))['Server-Timing'])
+
+    @override_settings(DEBUG=True)
+    def test_header_for_everyone_in_debug(self):
+        self.assertIn('Server-Timing', self._get(mock.Mock(is_staff=False)))
@@ -0,0 +1,250 @@
+"""
+추천 파이프라인 단계별 시간 측정 (Server-Timing)
+
+사용 예시:
+    from .timing import stage, http_timer
+
+    with stage('item_cf'):
+        ...                       # 벽시계 시간 + DB 쿼리 수 기록
+
+    @stage('rawg_fetch')
+    def fetch(...):
+        with http_timer():        # 외부 HTTP 대기 시간 기록
+            ...                   # (games.http_client 호출은 자동으로 측정됨)
+
+동작:
+    - ServerTimingMiddleware 가 요청마다 기록기(TimingRecorder)를 만들고
+      DB execute_wrapper 로 쿼리 수를 센다.
+    - 응답에 `Server-Timing: item_cf;dur=12.3;desc="db=4 http=0.0", ...` 헤더 추가
+      (DEBUG 이거나 관리자 요청에만 - 내부 구조 / 쿼리 수 노출 방지, timing_stats_api 와 같은 기준)
+    - 단계별 최근 샘플을 프로세스 메모리의 롤링 히스토그램에 누적
+      (관리자 전용 /users/api/admin/timing/ 에서 조회)
+    - 요청 밖(management command 등)에서는 stage()/http_timer() 가 아무것도 하지 않는다.
+    - 응답 이후에 끝나는 구간(스트리밍 응답의 첫 토큰 시간 등)은 record_duration() 으로 히스토그램에만 기록
+    - ASGI 에서는 미들웨어가 async 로 동작 (async view 가 스레드를 점유하지 않도록).
+      이때 DB 쿼리는 sync_to_async 스레드에서 실행되므로 쿼리 수는 세지 않는다 (db=0).
+"""
+
+import contextvars
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+
+# 단계별 롤링 윈도우 크기 (프로세스당)
+HISTOGRAM_WINDOW = 1000
+# 히스토그램 버킷 경계 (ms)
+HISTOGRAM_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+_current_recorder = contextvars.ContextVar('server_timing_recorder', default=None)
+
+_histograms = {}
+_histograms_lock = threading.Lock()
+
+
+class TimingRecorder:
+    """요청 1건의 단계별 측정값"""
+
+    def __init__(self):
+        self.stages = []        # [{'name', 'dur_ms', 'db', 'http_ms'}, ...] (완료 순서)
+        self._active = []       # 진행 중인 단계 (중첩 가능)
+        self.db_queries = 0
+        self.http_ms = 0.0
+
+    def db_wrapper(self, execute, sql, params, many, context):
+        """connection.execute_wrapper 훅: 진행 중인 모든 단계에 쿼리 수 누적"""
+        self.db_queries += 1
+        for active in self._active:
+            active['db'] += 1
+        return execute(sql, params, many, context)
+
+    def add_http(self, elapsed_ms):
+        self.http_ms += elapsed_ms
+        for active in self._active:
+            active['http_ms'] += elapsed_ms
+
+    def header_value(self, total_ms=None):
+        parts = []
+        for s in self.stages:
+            parts.append(
+                f'{_metric_name(s["name"])};dur={s["dur_ms"]:.1f};'
+                f'desc="db={s["db"]} http={s["http_ms"]:.1f}"'
+            )
+        if total_ms is not None:
+            parts.append(f'total;dur={total_ms:.1f};desc="db={self.db_queries} http={self.http_ms:.1f}"')
+        return ', '.join(parts)
+
+
+def _metric_name(name):
+    """Server-Timing 메트릭 이름은 토큰 문자만 허용"""
+    return re.sub(r'[^A-Za-z0-9_\-.]', '_', name) or 'stage'
+
+
+def _observe(name, dur_ms, db, http_ms):
+    with _histograms_lock:
+        hist = _histograms.get(name)
+        if hist is None:
+            hist = _histograms[name] = {
+                'count': 0,
+                'samples': deque(maxlen=HISTOGRAM_WINDOW),
+            }
+        hist['count'] += 1
+        hist['samples'].append((dur_ms, db, http_ms))
+
+
+def record_duration(name, dur_ms, db=0, http_ms=0.0):
+    """요청 기록기 없이 히스토그램에 샘플 1개 추가 (Server-Timing 헤더에는 나오지 않음)"""
+    _observe(name, dur_ms, db, http_ms)
+
+
+@contextmanager
+def stage(name):
+    """
+    단계 시간 측정 (context manager / decorator 겸용)
+
+    요청 기록기가 없으면 측정 없이 통과
+    """
+    recorder = _current_recorder.get()
+    if recorder is None:
+        yield
+        return
+
+    entry = {'name': name, 'dur_ms': 0.0, 'db': 0, 'http_ms': 0.0}
+    recorder._active.append(entry)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        entry['dur_ms'] = (time.perf_counter() - started) * 1000
+        recorder._active.remove(entry)
+        recorder.stages.append(entry)
+        _observe(name, entry['dur_ms'], entry['db'], entry['http_ms'])
+
+
+@contextmanager
+def http_timer():
+    """외부 HTTP 호출 대기 시간 측정 (진행 중인 단계에 합산)"""
+    recorder = _current_recorder.get()
+    if recorder is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add_http((time.perf_counter() - started) * 1000)
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return 0.0
+    idx = min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100)))
+    return ordered[idx]
+
+
+def get_timing_stats():
+    """
+    롤링 히스토그램 요약 (관리자 엔드포인트용)
+
+    Returns:
+        dict: {stage_name: {count, window, p50_ms, p95_ms, p99_ms, max_ms,
+                            avg_db_queries, avg_http_ms, buckets}}
+    """
+    with _histograms_lock:
+        snapshot = {name: (hist['count'], list(hist['samples'])) for name, hist in _histograms.items()}
+
+    stats = {}
+    for name, (count, samples) in sorted(snapshot.items()):
+        durations = sorted(s[0] for s in samples)
+        buckets = {f'le_{edge}': 0 for edge in HISTOGRAM_BUCKETS_MS}
+        buckets['le_inf'] = 0
+        for dur in durations:
+            for edge in HISTOGRAM_BUCKETS_MS:
+                if dur <= edge:
+                    buckets[f'le_{edge}'] += 1
+                    break
+            else:
+                buckets['le_inf'] += 1
+
+        n = len(samples)
+        stats[name] = {
+            'count': count,
+            'window': n,
+            'p50_ms': round(_percentile(durations, 50), 2),
+            'p95_ms': round(_percentile(durations, 95), 2),
+            'p99_ms': round(_percentile(durations, 99), 2),
+            'max_ms': round(durations[-1], 2) if durations else 0.0,
+            'avg_db_queries': round(sum(s[1] for s in samples) / n, 2) if n else 0.0,
+            'avg_http_ms': round(sum(s[2] for s in samples) / n, 2) if n else 0.0,
+            'buckets': buckets,
+        }
+    return stats
+
+
+def reset_timing_stats():
+    with _histograms_lock:
+        _histograms.clear()
+
+
+def _is_staff(user):
+    return bool(user is not None and user.is_staff)
+
+
+class ServerTimingMiddleware:
+    """
+    요청마다 TimingRecorder 를 활성화하고 Server-Timing 헤더를 붙이는 미들웨어
+
+    stage() 가 한 번도 호출되지 않은 요청과 DEBUG 가 아닐 때 관리자가 아닌 요청에는
+    헤더를 붙이지 않는다. (히스토그램 기록은 항상)
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        recorder = TimingRecorder()
+        token = _current_recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(recorder.db_wrapper):
+                response = self.get_response(request)
+        finally:
+            _current_recorder.reset(token)
+        if recorder.stages and not settings.DEBUG and not _is_staff(getattr(request, 'user', None)):
+            return response
+        return self._add_header(response, recorder, started)
+
+    async def __acall__(self, request):
+        recorder = TimingRecorder()
+        token = _current_recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_recorder.reset(token)
+        if recorder.stages and not settings.DEBUG:
+            auser = getattr(request, 'auser', None)
+            if not _is_staff(await auser() if auser else None):
+                return response
+        return self._add_header(response, recorder, started)
+
+    def _add_header(self, response, recorder, started):
+        if recorder.stages:
+            total_ms = (time.perf_counter() - started) * 1000
+            response['Server-Timing'] = recorder.header_value(total_ms)
+        return response
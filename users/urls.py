@@ -19,12 +19,14 @@ urlpatterns = [
     # Steam API
     path('api/steam/library/', views.steam_library_api, name='steam_library'),
     path('api/steam/recently-played/', views.steam_recently_played_api, name='steam_recently_played'),
+    path('api/steam/popular/', views.steam_popular_api, name='steam_popular'),
     
     # Recommendation API
     path('api/recommendations/', views.personalized_recommendations_api, name='recommendations'),
     
     # AI Chatbot API
     path('api/ai-chat/', views.ai_chat_api, name='ai_chat'),
+    path('api/ai-chat/stream/', views.ai_chat_stream_api, name='ai_chat_stream'),
     
     # Translation API
     path('api/translate/', views.translate_text_api, name='translate'),
@@ -71,5 +73,8 @@ urlpatterns = [
     path('api/verify-password/', views.verify_password_api, name='verify_password'),
     path('settings/', views.settings_view, name='settings'),
     path('api/update-profile/', views.update_profile_api, name='update_profile'),
+    
+    # Server-Timing 통계 (관리자 전용)
+    path('api/admin/timing/', views.timing_stats_api, name='timing_stats'),
 ]
 
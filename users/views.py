@@ -17,10 +17,8 @@ from .steam_auth import (
     get_steam_login_url,
     validate_steam_login,
     get_steam_user_info,
-    get_steam_owned_games,
-    get_steam_recently_played,
-    get_game_recommendations_from_library
 )
+from .steam_library import prefetch_library
 # Game 모델이 users/models.py에 정의되어 있다고 가정합니다.
 # 만약 games/models.py에 있다면 'from games.models import Game'으로 변경하세요.
 from games.models import Game
@@ -81,6 +79,53 @@ def delete_account_view(request):
         logout(request)
         return redirect('users:login')
 
+
+def _wishlist_display(user):
+    """
+    찜 목록 → ([public_id, ...], {str(public_id): 게임 정보})
+
+    화면에서 쓰는 게임 ID 는 Game.public_id (rawg_id → steam_appid → id, DB 생성 컬럼)
+    """
+    wishlist_ids = []
+    wishlisted_games_info = {}
+    for row in user.wishlist.values('public_id', 'title', 'image_url', 'genre'):
+        wishlist_ids.append(row['public_id'])
+        wishlisted_games_info[str(row['public_id'])] = {
+            'title': row['title'],
+            'image_url': row['image_url'] or '',
+            'genre': row['genre'] or '',
+        }
+    return wishlist_ids, wishlisted_games_info
+
+
+def _ratings_display(user):
+    """
+    평가 목록 → ({str(game_id): score}, {str(game_id): 게임 정보})
+
+    평가 ID 는 save_user_rating 이 받는 rawg_id (없으면 DB id, 한국 게임 등)
+    Steam 플레이 시간 기반 평가(is_implicit)는 유저가 직접 매긴 점수가 아니므로 제외
+    """
+    from django.db.models.functions import Coalesce
+    from .models import GameRating
+
+    ratings_map = {}
+    rated_games_info = {}
+    rows = (
+        GameRating.objects.filter(user=user, is_implicit=False)
+        .annotate(display_id=Coalesce('game__rawg_id', 'game_id', output_field=models.IntegerField()))
+        .values('display_id', 'score', 'game__title', 'game__image_url', 'game__genre')
+    )
+    for row in rows:
+        game_id = str(row['display_id'])
+        ratings_map[game_id] = row['score']
+        rated_games_info[game_id] = {
+            'title': row['game__title'],
+            'image_url': row['game__image_url'] or '',
+            'genre': row['game__genre'] or '',
+        }
+    return ratings_map, rated_games_info
+
+
 # --- 6. 메인 페이지 (Main View) ---
 @login_required(login_url='users:login')
 def main_view(request):
@@ -112,7 +157,7 @@ def main_view(request):
                 continue
             
             # 태그에서 특수 속성 확인
-            tag_slugs = list(db_game.tags.values_list('slug', flat=True))
+            tag_slugs = [tag.slug for tag in db_game.tags.all()]
             
             is_free = 'free-to-play' in tag_slugs
             is_nintendo = 'nintendo' in tag_slugs
@@ -186,24 +231,7 @@ def main_view(request):
         best_prices_json = "[]"
 
     # Wishlist IDs 및 상세 정보 (RAWG ID를 우선으로 사용, 없으면 steam_appid)
-    wishlist_ids = []
-    wishlisted_games_info = {}
-    
-    for game in request.user.wishlist.all():
-        if game.rawg_id:
-            game_id = game.rawg_id
-        elif game.steam_appid:
-            game_id = game.steam_appid
-        else:
-            game_id = game.id
-        wishlist_ids.append(game_id)
-        
-        # 게임 상세 정보 추가
-        wishlisted_games_info[str(game_id)] = {
-            'title': game.title,
-            'image_url': game.image_url or '',
-            'genre': game.genre or '',
-        }
+    wishlist_ids, wishlisted_games_info = _wishlist_display(request.user)
     
     wishlist_json = json.dumps(wishlist_ids, cls=DjangoJSONEncoder)
     wishlisted_games_info_json = json.dumps(wishlisted_games_info, cls=DjangoJSONEncoder)
@@ -280,6 +308,8 @@ def steam_callback(request):
             # user.avatar_url = steam_info.get('avatarfull', '')
             pass
         user.save()
+        # 라이브러리 + 플레이 시간 기반 평가를 백그라운드로 준비 (온보딩 없이 바로 추천)
+        prefetch_library(user)
         
         messages.success(request, f"Steam 계정 '{steam_info.get('personaname', steam_id)}'이(가) 연동되었습니다!")
         return redirect(next_url)
@@ -318,6 +348,7 @@ def steam_callback(request):
                 # Set unusable password since they'll login via Steam
                 user.set_unusable_password()
                 user.save()
+                prefetch_library(user)
                 
                 login(request, user)
                 messages.success(request, f"Steam 계정으로 가입이 완료되었습니다! 환영합니다, {persona_name}님!")
@@ -354,15 +385,15 @@ def steam_library_api(request):
     """
     API endpoint to fetch user's Steam library - WITH DB CACHING
     
-    Flow:
+    Flow (users/steam_library.py get_library):
     1. Check DB cache first (instant: 0.01s)
-    2. If cache exists and fresh (< 24h) → return cached data
-    3. If cache missing or stale → fetch from Steam API → update cache
+    2. If cache exists → return cached data (stale (> 24h) → refreshed in background)
+    3. If cache missing → fetch from Steam API → update cache
     
     Query params:
         force_refresh: If 'true', always fetch fresh data from Steam
     """
-    from .models import SteamLibraryCache
+    from .steam_library import get_library
     
     user = request.user
     
@@ -374,68 +405,27 @@ def steam_library_api(request):
     
     force_refresh = request.GET.get('force_refresh', 'false').lower() == 'true'
     
-    # Step 1: Check DB cache
-    try:
-        cache = SteamLibraryCache.objects.get(user=user)
-        cache_exists = True
-        cache_is_fresh = not cache.is_stale(hours=24)
-    except SteamLibraryCache.DoesNotExist:
-        cache = None
-        cache_exists = False
-        cache_is_fresh = False
-    
-    # Step 2: Return cached data if fresh and not forcing refresh
-    if cache_exists and cache_is_fresh and not force_refresh:
-        print(f"[CACHE HIT] Returning cached library for {user.username}")
-        return JsonResponse({
-            'is_linked': True,
-            'steam_id': user.steam_id,
-            'library': cache.library_data,
-            'total_games': cache.total_games,
-            'total_playtime_hours': cache.total_playtime_hours,
-            'cached': True,
-            'cache_age_hours': round((timezone.now() - cache.last_updated).total_seconds() / 3600, 1)
-        })
-    
-    # Step 3: Fetch from Steam API
-    print(f"[CACHE MISS] Fetching fresh library from Steam for {user.username}")
-    library_data = get_game_recommendations_from_library(user.steam_id)
-    
-    # Step 4: Update cache
-    library_list = library_data.get('library', [])
-    total_games = library_data.get('total_games', 0)
-    total_hours = library_data.get('total_playtime_hours', 0)
-    
-    if cache_exists:
-        cache.library_data = library_list
-        cache.total_games = total_games
-        cache.total_playtime_hours = total_hours
-        cache.save()
-    else:
-        SteamLibraryCache.objects.create(
-            user=user,
-            library_data=library_list,
-            total_games=total_games,
-            total_playtime_hours=total_hours
-        )
-    
-    print(f"[CACHE UPDATED] Saved {total_games} games to cache for {user.username}")
+    library = get_library(user, force=force_refresh)
     
     return JsonResponse({
         'is_linked': True,
         'steam_id': user.steam_id,
-        'library': library_list,
-        'total_games': total_games,
-        'total_playtime_hours': total_hours,
-        'cached': False
+        'library': library.preview,
+        'total_games': library.total_games,
+        'total_playtime_hours': library.total_playtime_hours,
+        'cached': library.cached,
+        'stale': library.stale,
+        'cache_age_hours': library.age_hours
     })
 
 
 @login_required
 def steam_recently_played_api(request):
     """
-    API endpoint to fetch user's recently played games
+    API endpoint to fetch user's recently played games (SteamLibraryCache)
     """
+    from .steam_library import get_library
+    
     user = request.user
     
     if not user.is_steam_linked or not user.steam_id:
@@ -444,7 +434,8 @@ def steam_recently_played_api(request):
             'is_linked': False
         }, status=400)
     
-    recently_played = get_steam_recently_played(user.steam_id, count=20)
+    # 라이브러리 캐시와 함께 갱신됨 (stale-while-revalidate)
+    recently_played = get_library(user).recently_played
     
     return JsonResponse({
         'is_linked': True,
@@ -452,6 +443,31 @@ def steam_recently_played_api(request):
     })
 
 
+@login_required
+def steam_popular_api(request):
+    """
+    API endpoint for Steam games most owned by our users (SteamOwnership GROUP BY)
+    
+    Query params:
+        limit: 결과 수 (기본 20, 최대 100)
+        exclude_owned: 'true' 면 요청한 유저가 이미 가진 게임 제외 (기본 true)
+    """
+    from .steam_ownership import popular_among_users
+    
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), 100)
+    except ValueError:
+        limit = 20
+    exclude_owned = request.GET.get('exclude_owned', 'true').lower() == 'true'
+    
+    games = popular_among_users(limit=limit, exclude_user=request.user if exclude_owned else None)
+    
+    return JsonResponse({
+        'games': games,
+        'count': len(games)
+    })
+
+
 @login_required
 def personalized_recommendations_api(request):
     """
@@ -465,27 +481,31 @@ def personalized_recommendations_api(request):
     3. 둘 다 없음 → 온보딩 필요 안내
     """
     from .recommendation import get_personalized_recommendations, RAWG_API_KEY
-    from .steam_auth import get_steam_owned_games
+    from .steam_library import get_library
+    from .steam_ownership import get_owned
     from .onboarding import get_recommendations_for_user
     from .models import GameRating, OnboardingStatus
+    from .timing import stage
     
     user = request.user
     
     print(f"[DEBUG] personalized_recommendations_api called")
     print(f"[DEBUG] User: {user.email}, Steam linked: {user.is_steam_linked}")
     
-    # 평가 데이터 수 확인
-    rating_count = GameRating.objects.filter(user=user, score__gt=0).count()
-    print(f"[DEBUG] User rating count: {rating_count}")
-    
     # Steam 라이브러리 가져오기 (보조 데이터용)
     steam_library = None
-    owned_game_names = []
+    owned = None
     if user.is_steam_linked and user.steam_id:
-        steam_library = get_steam_owned_games(user.steam_id)
+        with stage('steam_library'):
+            steam_library = get_library(user).games
+            owned = get_owned(user)
         if steam_library:
-            owned_game_names = [g.get('name', '').lower() for g in steam_library if g.get('name')]
-            print(f"[DEBUG] Steam library loaded: {len(steam_library)} games")
+            print(f"[DEBUG] Steam library loaded: {len(steam_library)} games, {len(owned)} owned appids")
+    
+    # 평가 데이터 수 확인 (라이브러리를 처음 가져오면 플레이 시간 기반 평가가 추가되므로 그 뒤에)
+    with stage('rating_count'):
+        rating_count = GameRating.objects.filter(user=user, score__gt=0).count()
+    print(f"[DEBUG] User rating count: {rating_count}")
     
     # 방법 1: 온보딩/평가 데이터 (3개 이상) → 최우선!
     # Steam 연동 여부와 관계없이 평가 데이터가 있으면 이를 우선 사용
@@ -498,24 +518,26 @@ def personalized_recommendations_api(request):
             recommendations = result['recommendations']
             
             # Steam 라이브러리가 있으면, 이미 소유한 게임 제외 (보조 역할)
-            if owned_game_names:
+            if owned:
                 original_count = len(recommendations)
-                recommendations = [
-                    rec for rec in recommendations 
-                    if rec.get('title', '').lower() not in owned_game_names
-                ]
+                with stage('owned_filter'):
+                    # 앱 ID / Game id / RAWG id 집합 연산 (SteamOwnership)
+                    recommendations = [
+                        rec for rec in recommendations 
+                        if not owned.contains(rec)
+                    ]
                 filtered_count = original_count - len(recommendations)
                 if filtered_count > 0:
                     print(f"[DEBUG] Filtered {filtered_count} owned games from recommendations")
             
             method = result.get('method', 'onboarding_based')
-            if steam_library and owned_game_names:
+            if steam_library and owned:
                 method = f"{method}_with_steam_filter"
             
             return JsonResponse({
                 'is_personalized': True,
                 'recommendations': recommendations,
-                'message': f'평가 데이터({rating_count}개) 기반 추천입니다.' + (f' (스팀 보유 게임 {len(owned_game_names)}개 제외)' if owned_game_names else ''),
+                'message': f'평가 데이터({rating_count}개) 기반 추천입니다.' + (f' (스팀 보유 게임 {len(owned)}개 제외)' if owned else ''),
                 'genres_analysis': None,
                 'method': method
             })
@@ -538,7 +560,8 @@ def personalized_recommendations_api(request):
         result = get_personalized_recommendations(
             steam_library=steam_library,
             sale_games=sale_games,
-            limit=250
+            limit=250,
+            owned=owned
         )
         result['message'] = result.get('message', '') + f' (더 정확한 추천을 원하시면 게임을 평가해주세요! 현재 {rating_count}개/최소 3개)'
         return JsonResponse(result)
@@ -574,10 +597,10 @@ def personalized_recommendations_api(request):
 import json
 import requests
 from django.contrib.auth.decorators import login_required
+from games import http_client
 from django.views.decorators.http import require_http_methods
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from .steam_auth import get_steam_owned_games, get_steam_recently_played
 
 @login_required
 @require_http_methods(["POST"])
@@ -586,9 +609,18 @@ def ai_chat_api(request):
     AI Game Recommendation Chatbot API
     Uses Google Gemini 2.5 Flash Lite via SSAFY GMS API
     Native Google Generative Language API format
+    
+    유저 컨텍스트(취향 요약, Steam 라이브러리, 제외 목록)는 users/chat_context.py 캐시 사용
+    대화 기록은 서버 세션(users/chat_session.py): 요청은 {message, session_id}, 응답에 session_id 포함
+    (session_id 없이 history 를 보내는 이전 클라이언트는 새 세션에 옮겨 담음)
+    Server-Timing: chat_context (컨텍스트/세션 조회) + chat_llm (Gemini 응답 대기) + chat_summary (요약 시)
     """
     import os
     from dotenv import load_dotenv
+    from .ai_chat import CHAT_URL, build_chat_payload
+    from .chat_context import get_chat_context, render_system_prompt
+    from .chat_session import get_session, prompt_history, record_exchange, render_summary_block
+    from .timing import stage
     load_dotenv()
     
     # Get API key from environment
@@ -603,7 +635,6 @@ def ai_chat_api(request):
     try:
         data = json.loads(request.body)
         user_message = data.get('message', '').strip()
-        chat_history = data.get('history', [])
         
         if not user_message:
             return JsonResponse({
@@ -612,152 +643,26 @@ def ai_chat_api(request):
             }, status=400)
         
         # =================================================================
-        # [컨텍스트 수집] 사용자 데이터 (Steam, 온보딩 평가)
+        # [컨텍스트] 유저별 캐시 (평가 / Steam 라이브러리 변경 시에만 재구성)
         # =================================================================
         user = request.user
-        steam_context = ""
-        onboarding_context = ""
-        is_steam_linked = user.is_steam_linked and user.steam_id
         user_nickname = user.nickname or user.username or "게이머"
         
-        # 제외할 게임 목록 (보유중 + 평가함)
-        owned_games_list = []
-        rated_games_list = []
-        low_playtime_games = []
-        
-        # 1. 온보딩 및 평가 데이터
-        from .models import GameRating
-        user_ratings = GameRating.objects.filter(user=user).select_related('game').order_by('-score', '-created_at')
-        
-        if user_ratings.exists():
-            liked_games = []
-            disliked_games = []
-            all_rated = []
-            genre_counts = {}
-            
-            for rating in user_ratings:
-                game = rating.game
-                all_rated.append(game.title)
-                
-                # 선호도 분류
-                if rating.score >= 3.5:
-                    liked_games.append(f"- {game.title} (⭐{rating.score})")
-                    # 장르 집계
-                    if game.genre and game.genre != 'Unknown':
-                        for g in game.genre.split(','):
-                            genre_counts[g.strip()] = genre_counts.get(g.strip(), 0) + 1
-                elif rating.score <= 0:
-                    disliked_games.append(f"- {game.title}")
-            
-            rated_games_list = all_rated
-            top_genres = [k for k, v in sorted(genre_counts.items(), key=lambda item: item[1], reverse=True)[:3]]
-            
-            onboarding_context = f"""
-[평가 데이터]
-- 선호 장르: {', '.join(top_genres)}
-- 좋아한 게임: {', '.join(liked_games[:7])}
-- 싫어한 게임: {', '.join(disliked_games[:5])}
-"""
-
-        # 2. Steam 라이브러리 데이터
-        if is_steam_linked:
-            try:
-                steam_library = get_steam_owned_games(user.steam_id)
-                if steam_library:
-                    # 플레이 시간순 정렬
-                    sorted_games = sorted(steam_library, key=lambda x: x.get('playtime_forever', 0), reverse=True)
-                    owned_games_list = [g.get('name') for g in steam_library if g.get('name')]
-                    
-                    # 상위 플레이 게임
-                    top_played = [f"{g['name']}({round(g['playtime_forever']/60, 1)}시간)" for g in sorted_games[:5]]
-                    
-                    # 찍먹 게임 (2시간 미만)
-                    low_playtime = [g['name'] for g in steam_library if 0 < g.get('playtime_forever', 0) < 120]
-                    low_playtime_games = low_playtime
-                    
-                    steam_context = f"""
-[Steam 라이브러리]
-- 최다 플레이: {', '.join(top_played)}
-- 보유 게임 수: {len(steam_library)}개
-"""
-            except Exception as e:
-                print(f"Steam fetch error: {e}")
-
-        # =================================================================
-        # [프롬프트 구성] 시스템 프롬프트 작성
-        # =================================================================
-        system_prompt_text = f"""당신은 '게임 큐레이터 AI'입니다. 게임 추천 전문가로서 다음 역할을 수행합니다:
-
-🎮 **전문 분야**
-- 모든 플랫폼(PC, 콘솔, 모바일)의 게임에 대한 깊은 지식
-- 장르별 특성과 대표 게임들을 잘 알고 있음
-- 최신 인기 게임과 숨겨진 명작까지 폭넓게 추천 가능
-- Steam, Epic Games, PlayStation, Xbox, Nintendo 등 모든 플랫폼 게임 추천
-
-📊 **추천 스타일**
-- 유저의 취향과 플레이 스타일을 파악하여 맞춤 추천
-- 게임의 장점, 특징, 플레이 시간, 난이도 등을 설명
-- 이모지를 활용하여 친근하고 재미있게 대화
-
-🚫 **중요: 추천 규칙**
-1. 유저가 이미 평가하거나 보유한 게임은 새 게임 추천에서 **반드시 제외**합니다
-2. 추천할 때 반드시 유저가 플레이/평가한 게임과 비교하며 설명해주세요:
-   - "'{user_nickname}님이 좋아하신 OO 게임처럼 △△한 요소가 있어서..."
-   - "OO 게임과 장르가 비슷하고, 스토리 전개 방식도 닮아있어요"
-   - "OO를 즐기셨다면 이 게임의 ◇◇ 시스템도 마음에 드실 거예요"
-3. 유저의 선호 장르와 좋아하는 게임의 공통점을 분석해서 추천 이유를 구체적으로 설명해주세요
-4. 유저가 싫어한 게임과 비슷한 장르/스타일은 피해주세요 (있다면)
-5. 보유했지만 플레이타임이 짧은 게임이 있다면 마지막에 "💡 참고로, 이미 가지고 계신 'OO'도 한번 플레이해보세요! 숨겨진 명작일 수 있어요" 추가
-
-💡 **응답 규칙**
-- 항상 한국어로 답변
-- 게임 이름은 정확하게 표기 (원제 + 한글명 병기 권장)
-- 1-5개 정도의 게임을 추천할 때는 번호 리스트로 정리
-- 각 게임마다 장르, 특징, **왜 유저 취향에 맞는지** 구체적으로 설명
-- 마지막에 추가 질문을 유도하는 문구 추가
-{onboarding_context}
-{steam_context}
-
-사용자가 게임 외의 질문을 하면, 친절하게 게임 추천 관련 질문으로 유도해주세요."""
+        with stage('chat_context'):
+            chat_context = get_chat_context(user)
+            session = get_session(user, data.get('session_id'), seed_history=data.get('history'))
+            system_prompt_text = render_system_prompt(chat_context, user_nickname) + render_summary_block(session)
+            chat_history = prompt_history(session)
 
         # =================================================================
-        # [데이터 포맷팅] Gemini Native 형식으로 변환
+        # [데이터 포맷팅] Gemini Native 형식으로 변환 (스트리밍 API 와 공용)
         # =================================================================
-        
-        # 1. 채팅 히스토리 변환 (role: assistant -> model)
-        gemini_contents = []
-        for msg in chat_history[-10:]:
-            role = "model" if msg.get('role') == 'assistant' else "user"
-            gemini_contents.append({
-                "role": role,
-                "parts": [{"text": msg.get('content', '')}]
-            })
-        
-        # 2. 현재 사용자 메시지 추가
-        gemini_contents.append({
-            "role": "user",
-            "parts": [{"text": user_message}]
-        })
-
-        # 3. Payload 구성
-        payload = {
-            "systemInstruction": {
-                "parts": [{"text": system_prompt_text}]
-            },
-            "contents": gemini_contents,
-            "generationConfig": {
-                "temperature": 0.7,
-                "maxOutputTokens": 2048,  # 채팅용으로 충분한 길이
-                "topP": 0.8,
-                "topK": 40
-            }
-        }
+        payload = build_chat_payload(system_prompt_text, chat_history, user_message)
 
         # =================================================================
         # [API 요청] Gemini API 호출 (Native EndPoint)
         # =================================================================
-        # 주의: gms.ssafy.io 경로 사용, 모델명 gemini-2.5-flash-lite 적용
-        url = "https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/gemini-2.5-flash-lite:generateContent"
+        url = CHAT_URL
         
         # 인증은 쿼리 파라미터로 전달
         params = {
@@ -768,13 +673,15 @@ def ai_chat_api(request):
             'Content-Type': 'application/json'
         }
         
-        response = requests.post(
-            url,
-            params=params,
-            headers=headers,
-            json=payload,
-            timeout=30  # Flash 모델은 빠르므로 30초면 충분
-        )
+        with stage('chat_llm'):
+            response = http_client.post(
+                url,
+                params=params,
+                headers=headers,
+                json=payload,
+                timeout=30,  # Flash 모델은 빠르므로 30초면 충분
+                retries=0  # 요청 경로에서는 백오프 대기 없이 바로 오류 응답
+            )
         
         # =================================================================
         # [응답 처리] Gemini 응답 파싱
@@ -787,11 +694,13 @@ def ai_chat_api(request):
                 candidates = result.get('candidates', [])
                 if candidates and candidates[0].get('content'):
                     ai_text = candidates[0]['content']['parts'][0]['text']
+                    record_exchange(session, user_message, ai_text)
                     
                     return JsonResponse({
                         'success': True,
                         'message': ai_text,
-                        'role': 'assistant'
+                        'role': 'assistant',
+                        'session_id': session.pk
                     })
                 else:
                     return JsonResponse({
@@ -822,6 +731,76 @@ def ai_chat_api(request):
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
 
 
+@login_required
+@require_http_methods(["POST"])
+async def ai_chat_stream_api(request):
+    """
+    AI 챗봇 스트리밍 API (Server-Sent Events)
+
+    요청 형식({message, session_id})과 프롬프트는 ai_chat_api 와 동일,
+    응답은 text/event-stream 으로 토큰이 생성되는 대로 전달 (이벤트 형식은 users/ai_chat.py 참고)
+    세션 ID 는 X-Chat-Session 헤더, 답변은 스트림이 끝난 뒤 세션에 저장
+    async view 이므로 ASGI 에서는 스트림이 워커 스레드를 점유하지 않음
+    WSGI(runserver)에서는 동기 제너레이터로 스트리밍 (스트림 동안 워커 스레드 하나 점유)
+    (GMS_API_KEY 는 settings 에서 .env 를 이미 읽어 둠)
+    """
+    from asgiref.sync import sync_to_async
+    from django.core.handlers.asgi import ASGIRequest
+    from django.http import StreamingHttpResponse
+    from .ai_chat import build_chat_payload, relay_chat_stream, relay_chat_stream_sync
+    from .chat_context import get_chat_context, render_system_prompt
+    from .chat_session import get_session, prompt_history, record_exchange, render_summary_block
+    from .timing import stage
+
+    api_key = os.getenv('GMS_API_KEY')
+    if not api_key:
+        return JsonResponse({
+            'error': 'API 키가 설정되지 않았습니다.',
+            'success': False
+        }, status=500)
+
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return JsonResponse({'success': False, 'error': '잘못된 JSON 형식입니다.'}, status=400)
+
+    user_message = data.get('message', '').strip()
+    if not user_message:
+        return JsonResponse({
+            'error': '메시지를 입력해주세요.',
+            'success': False
+        }, status=400)
+
+    user = await request.auser()
+    user_nickname = user.nickname or user.username or "게이머"
+
+    def load_prompt():
+        chat_context = get_chat_context(user)
+        session = get_session(user, data.get('session_id'), seed_history=data.get('history'))
+        system_prompt_text = render_system_prompt(chat_context, user_nickname) + render_summary_block(session)
+        return session, system_prompt_text, prompt_history(session)
+
+    with stage('chat_context'):
+        session, system_prompt_text, chat_history = await sync_to_async(load_prompt)()
+
+    def save_reply(ai_text):
+        record_exchange(session, user_message, ai_text)
+
+    async def asave_reply(ai_text):
+        await sync_to_async(save_reply)(ai_text)
+
+    payload = build_chat_payload(system_prompt_text, chat_history, user_message)
+    if isinstance(request, ASGIRequest):
+        events = relay_chat_stream(payload, api_key, on_complete=asave_reply)
+    else:
+        # WSGI 는 async 이터레이터를 끝까지 모은 뒤 보내므로 동기 제너레이터로 스트리밍
+        events = relay_chat_stream_sync(payload, api_key, on_complete=save_reply)
+    response = StreamingHttpResponse(events, content_type='text/event-stream; charset=utf-8')
+    response['X-Chat-Session'] = str(session.pk)
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx 프록시 버퍼링 끄기
+    return response
+
 @login_required
 @require_http_methods(["POST"])
 def translate_text_api(request):
@@ -831,6 +810,7 @@ def translate_text_api(request):
     """
     import os
     from dotenv import load_dotenv
+    from games.translation_cache import PERSONA_PROMPT_VERSION, get_or_translate
     load_dotenv()
     
     # Get API key from environment
@@ -857,6 +837,7 @@ def translate_text_api(request):
             text = text[:5000]
         
         # Build translation prompt for Gemini - Professional Game Translator Persona
+        # (프롬프트를 바꾸면 translation_cache.PERSONA_PROMPT_VERSION 을 올릴 것)
         prompt = f"""당신은 10년 경력의 전문 게임 로컬라이제이션 번역가입니다. 
 수많은 AAA 타이틀과 인디 게임의 한국어화 작업을 담당해온 베테랑으로, 게임 문화와 한국 게이머들의 언어 습관을 깊이 이해하고 있습니다.
 
@@ -890,29 +871,37 @@ def translate_text_api(request):
 
 한국어 번역:"""
         
-        # Call Gemini 2.0 Flash Lite API (much faster!)
-        response = requests.post(
-            f"https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-lite:generateContent?key={api_key}",
-            headers={
-                "Content-Type": "application/json"
-            },
-            json={
-                "contents": [
-                    {
-                        "parts": [
-                            {
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ]
-            },
-            timeout=30  # Gemini is much faster
-        )
-        
-        print(f"[DEBUG] Gemini Response Status: {response.status_code}")
-        
-        if response.status_code == 200:
+        upstream = {}
+
+        def call_gemini(source):
+            # Call Gemini 2.0 Flash Lite API (much faster!)
+            response = http_client.post(
+                f"https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-lite:generateContent?key={api_key}",
+                headers={
+                    "Content-Type": "application/json"
+                },
+                json={
+                    "contents": [
+                        {
+                            "parts": [
+                                {
+                                    "text": prompt
+                                }
+                            ]
+                        }
+                    ]
+                },
+                timeout=30,  # Gemini is much faster
+                retries=0  # 요청 경로에서는 백오프 대기 없이 바로 오류 응답
+            )
+            
+            print(f"[DEBUG] Gemini Response Status: {response.status_code}")
+            upstream['status'] = response.status_code
+            
+            if response.status_code != 200:
+                print(f"[DEBUG] Gemini error response: {response.text}")
+                return None
+            
             result = response.json()
             
             # Parse Gemini response format
@@ -922,24 +911,32 @@ def translate_text_api(request):
                 parts = content.get('parts', [])
                 if parts and len(parts) > 0:
                     translated_text = parts[0].get('text', '')
-                    
                     if translated_text:
-                        return JsonResponse({
-                            'success': True,
-                            'translated': translated_text.strip()
-                        })
+                        return translated_text.strip()
             
             print(f"[DEBUG] Gemini result structure: {result}")
+            return None
+        
+        # 공용 번역 캐시 (같은 텍스트는 재번역 안 함, 동시 요청은 Gemini 한 번만 호출)
+        translated_text, cached = get_or_translate(text, call_gemini, PERSONA_PROMPT_VERSION, origin='api')
+        
+        if translated_text:
             return JsonResponse({
-                'error': '번역 결과를 받지 못했습니다.',
-                'success': False
-            }, status=500)
-        else:
-            print(f"[DEBUG] Gemini error response: {response.text}")
+                'success': True,
+                'translated': translated_text,
+                'cached': cached
+            })
+        
+        status = upstream.get('status', 200)
+        if status != 200:
             return JsonResponse({
-                'error': f'번역 서버 오류 (Status: {response.status_code})',
+                'error': f'번역 서버 오류 (Status: {status})',
                 'success': False
-            }, status=response.status_code)
+            }, status=status)
+        return JsonResponse({
+            'error': '번역 결과를 받지 못했습니다.',
+            'success': False
+        }, status=500)
             
     except requests.Timeout:
         return JsonResponse({
@@ -978,25 +975,11 @@ def onboarding_status_api(request):
     
     user = request.user
     
-    # 사용자의 모든 평가 데이터 가져오기
-    ratings_data = {}
-    rated_games_info = {}
-    
-    ratings = GameRating.objects.filter(user=user).select_related('game')
+    # 사용자가 직접 매긴 평가 데이터 가져오기 (RAWG ID가 없으면 로컬 ID 사용, 한국 게임 등)
+    ratings_data, rated_games_info = _ratings_display(user)
     
-    for rating in ratings:
-        # RAWG ID가 없으면 로컬 ID 사용 (한국 게임 등)
-        game_id = str(rating.game.rawg_id) if rating.game.rawg_id else str(rating.game.id)
-        ratings_data[game_id] = rating.score
-        
-        # 게임 정보 저장
-        rated_games_info[game_id] = {
-            'title': rating.game.title,
-            'image_url': rating.game.image_url or '',
-            'genre': rating.game.genre or '',
-        }
-    
-    rating_count = len(ratings_data)
+    # 온보딩 필요 여부는 플레이 시간 기반 평가까지 포함 (추천에 쓰이는 평가 수)
+    rating_count = GameRating.objects.filter(user=user).count()
     
     # 온보딩 상태 확인
     try:
@@ -1030,23 +1013,8 @@ def onboarding_status_api(request):
         'is_steam_linked': user.is_steam_linked,
     }
     
-    # 찜한 게임 상세 정보 추가 (user.wishlist 사용)
-    wishlisted_games_info = {}
-    for game in user.wishlist.all():
-        # main_view와 동일한 ID 결정 로직: rawg_id 우선, 없으면 steam_appid
-        if game.rawg_id:
-            game_id = str(game.rawg_id)
-        elif game.steam_appid:
-            game_id = str(game.steam_appid)
-        else:
-            game_id = str(game.id)
-        
-        wishlisted_games_info[game_id] = {
-            'title': game.title,
-            'image_url': game.image_url or '',
-            'genre': game.genre or '',
-        }
-            
+    # 찜한 게임 상세 정보 추가 (main_view 와 같은 ID)
+    _, wishlisted_games_info = _wishlist_display(user)
     response_data['wishlisted_games_info'] = wishlisted_games_info
     
     # Steam 연동된 경우 추가 정보 제공
@@ -1072,23 +1040,18 @@ def onboarding_games_api(request):
         - page: 현재 페이지 (1부터 시작, 기본값 1)
         - korean_mode: 'true'면 한국 유명 게임 목록 (Steam 미경험자용)
     """
-    from .models import GameRating
     from .onboarding import get_onboarding_games
     
     step = int(request.GET.get('step', 0))
     page = int(request.GET.get('page', 1))
     korean_mode = request.GET.get('korean_mode', 'false').lower() == 'true'
     
-    # 이미 평가한 게임 ID 목록
-    rated_games = list(GameRating.objects.filter(
-        user=request.user
-    ).values_list('game__rawg_id', flat=True))
-    
+    # 이미 평가한 게임 제외는 get_onboarding_games 에서 처리 (덱 비트맵 / rawg_id 목록)
     result = get_onboarding_games(
         step=step, 
-        exclude_rated=rated_games, 
         page=page,
-        korean_mode=korean_mode
+        korean_mode=korean_mode,
+        user=request.user
     )
     
     return JsonResponse(result)
@@ -1110,6 +1073,7 @@ def onboarding_rate_api(request):
     from .onboarding import save_user_rating
     from .models import OnboardingStatus
     from games.models import Game
+    from games.resolver import RAWG, resolve_game
     
     try:
         data = json.loads(request.body)
@@ -1121,22 +1085,23 @@ def onboarding_rate_api(request):
         if not game_id:
             return JsonResponse({'error': '게임 ID가 필요합니다.'}, status=400)
         
-        # 게임이 DB에 없으면 생성
-        game, created = Game.objects.get_or_create(
-            rawg_id=game_id,
-            defaults={
-                'title': game_title,
-                'image_url': game_image,
-                'genre': 'Unknown'
-            }
-        )
+        # 게임이 DB에 없으면 생성 (중복 rawg_id 가 있으면 pk 가 가장 작은 게임)
+        game = resolve_game(game_id, spaces=(RAWG,), use_unknown_cache=False)
+        if game is None:
+            game = Game.objects.create(
+                rawg_id=game_id,
+                title=game_title,
+                image_url=game_image,
+                genre='Unknown'
+            )
         
         # 평가 저장
         rating = save_user_rating(
             user=request.user,
             game_id=game.id,
             score=score,
-            is_onboarding=True
+            is_onboarding=True,
+            game=game
         )
         
         # 온보딩 상태 업데이트
@@ -1273,16 +1238,16 @@ def get_game_rating_api(request, rawg_id):
         {score: float} or {score: null}
     """
     from .models import GameRating
-    from games.models import Game
+    from games.resolver import RAWG, resolve_game_id
     
     try:
-        # 중복 rawg_id가 있을 수 있으므로 filter 사용
-        game = Game.objects.filter(rawg_id=rawg_id).first()
-        if not game:
+        # 중복 rawg_id가 있으면 pk 가 가장 작은 게임 (별칭 맵에 있으면 게임 조회 없이 pk 만)
+        game_pk = resolve_game_id(rawg_id, spaces=(RAWG,))
+        if game_pk is None:
             return JsonResponse({'score': None, 'game_exists': False})
-        rating = GameRating.objects.filter(user=request.user, game=game).first()
+        rating = GameRating.objects.filter(user=request.user, game_id=game_pk).first()
         if rating:
-            return JsonResponse({'score': rating.score, 'game_id': game.id})
+            return JsonResponse({'score': rating.score, 'game_id': game_pk})
         else:
             return JsonResponse({'score': None, 'game_exists': True})
     except Exception as e:
@@ -1349,7 +1314,8 @@ def get_user_profile_api(request, username):
     """
     API to fetch a user's public profile data.
     """
-    from .models import GameRating, SteamLibraryCache
+    from .models import SteamLibraryCache
+    from .steam_library import LIBRARY_PREVIEW
     
     target_user = None
     
@@ -1374,45 +1340,14 @@ def get_user_profile_api(request, username):
         'is_me': request.user == target_user
     }
     
-    # Wishlist (RAWG ID를 우선으로 사용, 없으면 steam_appid)
-    wishlist_ids = []
-    wishlisted_games_info = {}
-    
-    for game in target_user.wishlist.all():
-        # main_view와 동일한 ID 결정 로직
-        if game.rawg_id:
-            game_id = game.rawg_id
-        elif game.steam_appid:
-            game_id = game.steam_appid
-        else:
-            game_id = game.id
-        wishlist_ids.append(game_id)
-        
-        # 상세 정보도 함께 제공 (프로필 모달 타이틀 표시용)
-        wishlisted_games_info[str(game_id)] = {
-            'title': game.title,
-            'image_url': game.image_url or '',
-            'genre': game.genre or '',
-        }
+    # Wishlist (main_view 와 같은 ID, 프로필 모달 타이틀 표시용 상세 정보 포함)
+    wishlist_ids, wishlisted_games_info = _wishlist_display(target_user)
         
     data['wishlist'] = wishlist_ids
     data['wishlisted_games_info'] = wishlisted_games_info
     
     # Ratings (Onboarding) - return the ratings map {game_id: score}
-    ratings_qs = GameRating.objects.filter(user=target_user).select_related('game')
-    ratings_map = {}
-    rated_games_info = {}
-    
-    for r in ratings_qs:
-        game_id = str(r.game.rawg_id) if r.game.rawg_id else str(r.game.id)
-        ratings_map[game_id] = r.score
-        
-        # 상세 정보 저장
-        rated_games_info[game_id] = {
-            'title': r.game.title,
-            'image_url': r.game.image_url or '',
-            'genre': r.game.genre or '',
-        }
+    ratings_map, rated_games_info = _ratings_display(target_user)
         
     data['onboardingRatings'] = ratings_map
     data['rated_games_info'] = rated_games_info
@@ -1422,7 +1357,7 @@ def get_user_profile_api(request, username):
     if steam_cache:
         data['steamTotalGames'] = steam_cache.total_games
         data['steamTotalHours'] = steam_cache.total_playtime_hours
-        data['steamLibrary'] = steam_cache.library_data
+        data['steamLibrary'] = steam_cache.library_data[:LIBRARY_PREVIEW]
     else:
         data['steamTotalGames'] = 0
         data['steamTotalHours'] = 0
@@ -1828,7 +1763,7 @@ def genre_analysis_api(request):
     원형 차트용 데이터 반환
     """
     from .models import GameRating
-    from collections import Counter
+    from games.genre_index import count_genres
     
     user = request.user
     
@@ -1836,7 +1771,7 @@ def genre_analysis_api(request):
     liked_ratings = GameRating.objects.filter(
         user=user, 
         score__gt=0
-    ).select_related('game')
+    )
     
     if liked_ratings.count() == 0:
         return JsonResponse({
@@ -1845,16 +1780,8 @@ def genre_analysis_api(request):
             'genres': []
         })
     
-    # 장르 카운트
-    genre_counter = Counter()
-    for rating in liked_ratings:
-        game = rating.game
-        if game.genre and game.genre not in ['Unknown', '게임', '']:
-            # 장르가 콤마로 구분되어 있을 수 있음
-            genres = [g.strip() for g in game.genre.split(',')]
-            for genre in genres:
-                if genre:
-                    genre_counter[genre] += 1
+    # 장르 카운트 (정규화 장르 인덱스 GROUP BY, Unknown/게임 값은 인덱스에서 제외됨)
+    genre_counter = count_genres(liked_ratings.values('game_id'))
     
     if not genre_counter:
         return JsonResponse({
@@ -1915,8 +1842,9 @@ def steam_style_recommendations_api(request):
     """
     from .models import GameRating
     from games.models import Game, GameScreenshot
-    import requests
-    import os
+    from games.genre_index import get_games_by_genres
+    from games.jobs import PRIORITY_LOW, enqueue
+    from datetime import timedelta
     
     user = request.user
     page = int(request.GET.get('page', 1))
@@ -1959,25 +1887,15 @@ def steam_style_recommendations_api(request):
         # DB에서 스크린샷 가져오기
         screenshots = list(GameScreenshot.objects.filter(game=game).values_list('image_url', flat=True)[:4])
         
-        # DB에 없으면 RAWG API에서 가져오기
+        # DB에 없으면 RAWG 조회를 작업 큐에 넣고 이번 응답은 빈 목록 (다음 조회부터 표시)
         if not screenshots and game.rawg_id:
             try:
-                api_key = os.getenv('RAWG_API_KEY')
-                if api_key:
-                    response = requests.get(
-                        f"https://api.rawg.io/api/games/{game.rawg_id}/screenshots",
-                        params={'key': api_key, 'page_size': 4},
-                        timeout=5
-                    )
-                    if response.status_code == 200:
-                        data = response.json()
-                        screenshots = [s['image'] for s in data.get('results', [])[:4]]
-                        
-                        # DB에 저장
-                        for url in screenshots:
-                            GameScreenshot.objects.get_or_create(game=game, image_url=url)
+                enqueue(
+                    'games.fetch_screenshots', {'game_id': game.id},
+                    key=f'screenshots:{game.id}', priority=PRIORITY_LOW, recent=timedelta(days=1)
+                )
             except Exception as e:
-                print(f"Screenshot fetch error: {e}")
+                print(f"Screenshot enqueue error: {e}")
         
         return screenshots
     
@@ -1994,23 +1912,12 @@ def steam_style_recommendations_api(request):
         
         # 같은 장르 게임 찾기 (한 개씩)
         # 메타크리틱 50점 이상 또는 점수 없는 게임만 (평이 너무 낮은 게임 제외)
-        similar_games = Game.objects.filter(
-            genre__icontains=liked_genre
-        ).exclude(
-            id__in=rated_game_ids
-        ).exclude(
-            id__in=wishlisted_ids
-        ).exclude(
-            id=liked_game['id']
-        ).exclude(
-            id__in=used_game_ids
-        ).exclude(
-            metacritic_score__lt=50,  # 메타크리틱 50점 미만 제외
-            metacritic_score__isnull=False  # 점수 없는 건 허용
-        ).order_by(
-            models.F('metacritic_score').desc(nulls_last=True),  # 메타크리틱 높은 순
-            '-rawg_id'
-        )[:5]
+        similar_games = get_games_by_genres(
+            [liked_genre],
+            exclude_ids=rated_game_ids | wishlisted_ids | used_game_ids | {liked_game['id']},
+            limit=5,
+            min_metacritic=50  # 메타크리틱 50점 미만 제외 (점수 없는 건 허용)
+        )
         
         for game in similar_games:
             if game.id in used_game_ids:
@@ -2046,21 +1953,12 @@ def steam_style_recommendations_api(request):
         if not wish_genre or wish_genre in ['Unknown', '']:
             continue
         
-        similar_games = Game.objects.filter(
-            genre__icontains=wish_genre
-        ).exclude(
-            id__in=rated_game_ids
-        ).exclude(
-            id__in=wishlisted_ids
-        ).exclude(
-            id__in=used_game_ids
-        ).exclude(
-            metacritic_score__lt=50,
-            metacritic_score__isnull=False
-        ).order_by(
-            models.F('metacritic_score').desc(nulls_last=True),
-            '-rawg_id'
-        )[:3]
+        similar_games = get_games_by_genres(
+            [wish_genre],
+            exclude_ids=rated_game_ids | wishlisted_ids | used_game_ids,
+            limit=3,
+            min_metacritic=50
+        )
         
         for game in similar_games:
             if game.id in used_game_ids:
@@ -2106,19 +2004,12 @@ def steam_style_recommendations_api(request):
             if len(recommendations) >= 100: 
                 break
                 
-            fallback_games = Game.objects.filter(
-                genre__icontains=genre
-            ).exclude(
-                id__in=used_game_ids
-            ).exclude(
-                id__in=rated_game_ids
-            ).exclude(
-                metacritic_score__lt=50,
-                metacritic_score__isnull=False
-            ).order_by(
-                models.F('metacritic_score').desc(nulls_last=True),
-                '-rawg_id'
-            )[:10]
+            fallback_games = get_games_by_genres(
+                [genre],
+                exclude_ids=used_game_ids | rated_game_ids,
+                limit=10,
+                min_metacritic=50
+            )
             
             for game in fallback_games:
                 if game.id in used_game_ids:
@@ -2228,30 +2119,26 @@ def cheapshark_url_api(request, steam_appid):
 @require_http_methods(["POST"])
 def generate_ai_profile_api(request):
     """
-    AI 프로필 이미지 생성 API
+    AI 프로필 이미지 생성 API (백그라운드 작업)
     
     Gemini 2.0 Flash Exp Image Generation 모델을 사용하여
     사용자의 사진을 게임 캐릭터 스타일로 변환하거나,
     닉네임/취향 장르 기반으로 새로운 프로필 이미지 생성
     
+    이미지 생성은 최대 60초가 걸리므로 작업 큐(users.generate_ai_profile)에 넣고 바로 응답,
+    클라이언트는 /games/api/jobs/<job_id>/ 를 폴링 (유저당 진행 중인 생성은 1개)
+    
     Request Body (Gemini API 형식):
         - contents: [{parts: [{text: prompt}, {inlineData: {mimeType, data}}]}]
         - generationConfig: {responseModalities: ["Text", "Image"]}
     
-    Response:
+    Response (202):
         - success: bool
-        - image_base64: 생성된 이미지 (base64 encoded)
-        - text: AI 텍스트 응답 (있는 경우)
+        - job_id, status: 작업 상태 (완료 시 result.image_base64 / result.text)
     """
-    import os
-    import base64
-    from dotenv import load_dotenv
-    load_dotenv()
+    from games.jobs import PRIORITY_HIGH, enqueue, job_status
     
-    # Get API key from environment
-    api_key = os.getenv('GMS_API_KEY')
-    
-    if not api_key:
+    if not os.getenv('GMS_API_KEY'):
         return JsonResponse({
             'error': 'API 키가 설정되지 않았습니다.',
             'success': False
@@ -2259,88 +2146,26 @@ def generate_ai_profile_api(request):
     
     try:
         data = json.loads(request.body)
-        
-        # Gemini Image Generation API endpoint
-        url = f"https://gms.ssafy.io/gmsapi/generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash-exp-image-generation:generateContent?key={api_key}"
-        
-        headers = {
-            'Content-Type': 'application/json'
-        }
-        
-        # Forward the request body as-is (already in Gemini format)
-        response = requests.post(
-            url,
-            headers=headers,
-            json=data,
-            timeout=60  # Image generation takes longer
-        )
-        
-        print(f"[DEBUG] Gemini Image Gen Response Status: {response.status_code}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            
-            # Parse Gemini response
-            candidates = result.get('candidates', [])
-            if candidates and len(candidates) > 0:
-                content = candidates[0].get('content', {})
-                parts = content.get('parts', [])
-                
-                image_base64 = None
-                text_response = None
-                
-                for part in parts:
-                    # Check for inline image data
-                    if 'inlineData' in part:
-                        image_base64 = part['inlineData'].get('data')
-                    # Check for text
-                    if 'text' in part:
-                        text_response = part['text']
-                
-                if image_base64:
-                    return JsonResponse({
-                        'success': True,
-                        'image_base64': image_base64,
-                        'text': text_response
-                    })
-                else:
-                    return JsonResponse({
-                        'success': False,
-                        'error': '이미지가 생성되지 않았습니다.',
-                        'text': text_response
-                    }, status=500)
-            
-            return JsonResponse({
-                'success': False,
-                'error': 'AI가 응답을 생성하지 못했습니다.'
-            }, status=500)
-            
-        else:
-            print(f"[DEBUG] Gemini error response: {response.text}")
-            return JsonResponse({
-                'success': False,
-                'error': f'AI 서버 오류 (Status: {response.status_code})',
-                'debug': response.text[:500] if response.text else ''
-            }, status=response.status_code)
-            
     except json.JSONDecodeError:
         return JsonResponse({
             'success': False,
             'error': '잘못된 JSON 형식입니다.'
         }, status=400)
-    except requests.Timeout:
-        return JsonResponse({
-            'success': False,
-            'error': 'AI 서버 응답 시간이 초과되었습니다. 다시 시도해주세요.'
-        }, status=504)
-    except Exception as e:
-        import traceback
-        print(f"AI Profile generation error: {e}")
-        print(traceback.format_exc())
+    
+    if not isinstance(data, dict) or not data.get('contents'):
         return JsonResponse({
             'success': False,
-            'error': str(e)
-        }, status=500)
+            'error': '요청 내용이 비어 있습니다.'
+        }, status=400)
+    
+    job = enqueue(
+        'users.generate_ai_profile',
+        {'request': data},
+        key=f'ai-profile:{request.user.pk}',
+        priority=PRIORITY_HIGH,
+        owner=request.user,
+    )
+    return JsonResponse({'success': True, **job_status(job)}, status=202)
 
 
 # =============================================================================
@@ -2503,3 +2328,40 @@ def update_profile_api(request):
         import traceback
         print(traceback.format_exc())
         return JsonResponse({'success': False, 'error': str(e)}, status=500)
+
+
+# =============================================================================
+# Server-Timing 통계 (관리자 전용)
+# =============================================================================
+
+@login_required
+@require_http_methods(["GET", "POST"])
+def timing_stats_api(request):
+    """
+    추천 단계별 롤링 히스토그램 조회 (관리자 전용)
+    
+    GET: 단계별 p50/p95/p99, 평균 DB 쿼리 수, 평균 HTTP 시간, 버킷 분포 + RAWG 응답 / 번역 캐시 적중률
+    POST: 통계 초기화
+    
+    ※ 프로세스(워커)별 메모리 집계이므로 워커마다 값이 다를 수 있음
+    """
+    from .timing import get_timing_stats, reset_timing_stats
+    from games.rawg_cache import get_cache_stats, reset_cache_stats
+    from games import translation_cache
+    
+    if not request.user.is_staff:
+        return JsonResponse({'success': False, 'error': '관리자만 접근할 수 있습니다.'}, status=403)
+    
+    if request.method == 'POST':
+        reset_timing_stats()
+        reset_cache_stats()
+        translation_cache.reset_cache_stats()
+        return JsonResponse({'success': True, 'message': '타이밍 통계가 초기화되었습니다.'})
+    
+    return JsonResponse({
+        'success': True,
+        'pid': os.getpid(),
+        'stages': get_timing_stats(),
+        'rawg_cache': get_cache_stats(),
+        'translation_cache': translation_cache.get_cache_stats()
+    })